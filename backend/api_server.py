@@ -4,53 +4,64 @@ FastAPI를 사용하여 업비트와 바이낸스 데이터를 제공합니다.
 """
 import sys
 import os
-from anyio import to_thread
-import pyupbit
 
 # 상위 디렉토리를 path에 추가하여 기존 모듈 import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Optional, List, Dict, Callable, Awaitable, Any, Iterable, Set, Tuple, Literal
+from dataclasses import asdict, dataclass, replace
+from functools import partial
 from datetime import datetime
+import asyncio
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # 기존 API 모듈 import (Async versions from backend.services)
 from backend.services.upbit_api import (
     get_upbit_balance,
     get_upbit_holdings,
-    get_upbit_top_volume_coins
+    get_upbit_top_volume_coins,
+    get_upbit_krw_prices,
+    get_usdt_krw_rate
 )
 from backend.services.binance_api import (
     get_binance_balance,
     get_binance_holdings,
-    get_binance_top_volume_coins
+    get_binance_top_volume_coins,
+    get_binance_usdt_prices
 )
 from backend.services.stock_api import (
     get_kospi_top_volume, get_kosdaq_top_volume, get_us_top_volume,
     get_major_indices, get_sector_performance, get_stock_news,
-    get_crypto_fear_greed, get_whale_alerts, get_etf_top_volume
+    get_crypto_fear_greed, get_etf_top_volume, get_usd_krw_rate
 )
-
-
-# === 환율 조회 함수 ===
-
-def _get_usdt_krw_rate_sync() -> float:
-    """
-    업비트에서 USDT/KRW 환율을 조회합니다.
-    조회 실패 시 기본값 1,450원을 반환합니다.
-    """
-    try:
-        rate = pyupbit.get_current_price("KRW-USDT")
-        if rate:
-            return float(rate)
-    except Exception as e:
-        print(f"환율 조회 실패: {e}")
-    return 1450.0  # 기본값
-
-async def get_usdt_krw_rate() -> float:
-    return await to_thread.run_sync(_get_usdt_krw_rate_sync)
+from backend.services import circuit, deadline, executors, lazy, market_hours, metrics, tracing
+from backend.services.config import binance_configured, upbit_configured
+from backend.services.portfolio import PositionTable, build_positions
+from backend.services.premium import PremiumBook
+from backend.services.screener import ScreenerTable, parse_filter
+from backend.services.sectors import (
+    CONSTITUENTS_TTL, QUOTES_TTL, build_heatmap, fetch_constituents, fetch_quotes, members_from_quotes
+)
+from backend.services.indicators import IndicatorEngine, INDICATOR_SECTIONS, load_recent_bars, record_bars
+from backend.services.quotes import (
+    binance_top_coin, etf_item, korea_stock, to_columns, to_rows, upbit_top_coin, us_stock
+)
+from backend.services.snapshot import (
+    Snapshot, SnapshotCache, EncodedBodyCache, make_snapshot, make_etag, compose_object,
+    negotiate_encoding, untracked, MIN_COMPRESS_BYTES
+)
+from backend.services.history import record_portfolio, get_portfolio_history
+from backend.services.shared_cache import backend_from_env, LeaderElection
+from backend.services.alerts import AlertEngine, RULE_KINDS, SECTION_SOURCES, UNIVERSE_SECTIONS, ticks_from_section
+from backend.services.whale_feed import get_feed as get_whale_feed
+from backend.services.deltas import Delta, DeltaBook
 
 app = FastAPI(
     title="Coin Dashboard API",
@@ -68,6 +79,91 @@ app.add_middleware(
 )
 
 
+# === 메트릭 수집 ===
+
+# 전용 익스큐터(services.executors)를 쓰지 않는 작업용 기본 익스큐터 (대기열 깊이 노출용)
+DEFAULT_EXECUTOR_WORKERS = int(os.getenv("DEFAULT_EXECUTOR_WORKERS", "32"))
+# 요청을 받기 시작한 뒤 지연 import 대상(pandas/yfinance/pyupbit/binance/bs4)을 백그라운드에서 미리 import
+LAZY_IMPORT_WARMUP = os.getenv("LAZY_IMPORT_WARMUP", "1") != "0"
+
+# === 지연 예산 (데드라인) ===
+# 요청마다 전체 지연 예산을 두고, 하위 호출(익스큐터, HTTP, yfinance)은 남은 시간만 사용합니다.
+# 예산 안에 새 스냅샷이 준비되지 않으면 마지막 스냅샷을 stale 로 응답하고(없으면 504),
+# 여러 요청이 공유하는 섹션 생성은 요청과 분리된 자체 예산(SECTION_FETCH_BUDGET)으로 끝까지 실행해 캐시를 채웁니다.
+REQUEST_BUDGET = float(os.getenv("REQUEST_BUDGET", "8"))
+SECTION_FETCH_BUDGET = float(os.getenv("SECTION_FETCH_BUDGET", "20"))
+# 경로 접두사별 예산 (None 이면 예산 없음). 나열되지 않은 경로는 REQUEST_BUDGET
+ENDPOINT_BUDGETS: Dict[str, Optional[float]] = {
+    "/api/alerts/stream": None,
+    "/api/sections/stream": None,
+    "/api/stock/news/": float(os.getenv("NEWS_REQUEST_BUDGET", "6")),
+}
+
+
+def _request_budget(path: str) -> Optional[float]:
+    for prefix, budget in ENDPOINT_BUDGETS.items():
+        if path.startswith(prefix):
+            return budget
+    return REQUEST_BUDGET
+
+
+@app.on_event("startup")
+async def _start_runtime_metrics():
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=DEFAULT_EXECUTOR_WORKERS, thread_name_prefix="dashboard")
+    loop.set_default_executor(executor)
+    metrics.track_executor("default", executor)
+    app.state.loop_monitor = asyncio.create_task(metrics.monitor_event_loop())
+    app.state.leader_tasks = asyncio.create_task(_run_leader_tasks())
+    app.state.circuit_prober = asyncio.create_task(_probe_upstreams())
+    if LAZY_IMPORT_WARMUP:
+        lazy.warm_up_in_background()
+    try:
+        restored = INDICATORS.load(await load_recent_bars())
+        if restored:
+            print(f"Indicator state restored for {restored} symbols")
+    except Exception as e:
+        print(f"Indicator warm start failed: {e}")
+
+
+@app.on_event("shutdown")
+async def _stop_runtime_metrics():
+    for attr in ("loop_monitor", "leader_tasks", "circuit_prober"):
+        task = getattr(app.state, attr, None)
+        if task:
+            task.cancel()
+    LEADER.release()
+    executors.shutdown()
+
+
+@app.middleware("http")
+async def _record_http_metrics(request: Request, call_next):
+    with tracing.span(f"{request.method} {request.url.path}", kind=tracing.KIND_SERVER, **{
+        "http.request.method": request.method,
+        "url.path": request.url.path,
+    }) as sp, deadline.budget(_request_budget(request.url.path)):
+        start = time.perf_counter()
+        response = await call_next(request)
+        # 경로 파라미터가 카디널리티를 늘리지 않도록 라우트 템플릿을 사용
+        route = request.scope.get("route")
+        path = route.path if route else "unmatched"
+        metrics.HTTP_LATENCY.observe(
+            time.perf_counter() - start, route=path, method=request.method, status=response.status_code
+        )
+        sp.set_attribute("http.route", path)
+        sp.set_attribute("http.response.status_code", response.status_code)
+        length = response.headers.get("content-length")
+        if length is not None:
+            metrics.HTTP_RESPONSE_BYTES.set(int(length), route=path)
+            sp.set_attribute("http.response.body.size", int(length))
+        return response
+
+
+@app.exception_handler(deadline.DeadlineExceeded)
+async def _deadline_exceeded(request: Request, exc: deadline.DeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": f"Upstream data not ready within budget: {exc}"})
+
+
 # === Pydantic 모델 정의 ===
 
 class UpbitBalance(BaseModel):
@@ -98,9 +194,10 @@ class UpbitHolding(BaseModel):
     
     total: float
     avg_buy_price: float
-    current_price: float
-    eval_amount: float
-    profit_rate: float = Field(alias="profit_loss_percent")
+    # 현재가 조회에 실패한 코인은 평가금액/수익률을 알 수 없음 (null)
+    current_price: Optional[float]
+    eval_amount: Optional[float]
+    profit_rate: Optional[float] = Field(alias="profit_loss_percent")
     
     # Missing in upbit_api.py output but in frontend interface: 
     # balance, locked (optional?)
@@ -127,6 +224,14 @@ class BinanceHolding(BaseModel):
     eval_amount: float
 
 
+class Indicators(BaseModel):
+    ma: Optional[float]               # 20봉 이동평균
+    rsi: Optional[float]              # 14봉 RSI
+    vwap: Optional[float]             # 20봉 VWAP
+    bollinger_upper: Optional[float]  # 20봉, ±2σ
+    bollinger_lower: Optional[float]
+    bars: int                         # 창에 들어 있는 닫힌 봉 수
+
 class UpbitTopCoin(BaseModel):
     market: str
     korean_name: str 
@@ -135,6 +240,7 @@ class UpbitTopCoin(BaseModel):
     trade_price: float
     current_price: float
     change_rate: float
+    indicators: Optional[Indicators] = None
     
     class Config:
         populate_by_name = True
@@ -145,8 +251,10 @@ class BinanceTopCoin(BaseModel):
     current_price: float
     change_rate: float = Field(alias="price_change_percent")
     quote_volume: float
-    current_price_krw: float
-    quote_volume_krw: float
+    # USDT/KRW 환율 조회에 실패하면 null
+    current_price_krw: Optional[float]
+    quote_volume_krw: Optional[float]
+    indicators: Optional[Indicators] = None
     
     class Config:
         populate_by_name = True
@@ -167,6 +275,26 @@ class WhaleAlert(BaseModel):
     class Config:
         populate_by_name = True
 
+class PremiumCoin(BaseModel):
+    asset: str
+    upbit_krw: float
+    binance_usdt: float
+    binance_krw: float
+    premium_percent: float
+    average_percent: Optional[float]  # 이력 버퍼 기간의 이동평균
+    samples: int
+
+class ScreenerItem(BaseModel):
+    market: str
+    symbol: str
+    name: str
+    currency: str
+    native_price: float             # 거래 통화 기준 현재가
+    price: float                    # KRW 환산
+    change_rate: float
+    volume: Optional[float]
+    trade_value: Optional[float]    # KRW 환산 (ETF 는 없음)
+
 class DashboardData(BaseModel):
     upbit_balance: Optional[UpbitBalance]
     upbit_holdings: Optional[List[UpbitHolding]]
@@ -187,6 +315,7 @@ class KoreaStock(BaseModel):
     change_rate: float
     trade_volume: int
     trade_value: int
+    indicators: Optional[Indicators] = None
 
 class USStock(BaseModel):
     symbol: str
@@ -197,6 +326,7 @@ class USStock(BaseModel):
     trade_value: float
     current_price_krw: float
     trade_value_krw: float
+    indicators: Optional[Indicators] = None
 
 class StockIndex(BaseModel):
     name: str
@@ -206,10 +336,25 @@ class StockIndex(BaseModel):
     current_price_krw: float
 
 class SectorInfo(BaseModel):
+    code: Optional[str] = None
     name: str
     change_rate: float
     volume: str
 
+class SectorStock(BaseModel):
+    code: str
+    name: str
+    current_price: int
+    change_rate: float
+    trade_volume: int
+    trade_value: int
+
+class SectorDetail(BaseModel):
+    code: Optional[str]
+    name: str
+    change_rate: float
+    stocks: List[SectorStock]
+
 class ETFItem(BaseModel):
     symbol: str
     name: str
@@ -226,12 +371,693 @@ class StockDashboardData(BaseModel):
     etf_ranking: Optional[List[ETFItem]]
     last_updated: str
     
+class FxRates(BaseModel):
+    usdt_krw: Optional[float]
+    usd_krw: float
+    last_updated: str
+
+class PortfolioPosition(BaseModel):
+    venue: str
+    asset: str
+    quantity: float
+    avg_cost: Optional[float]
+    price: Optional[float]       # 시세 조회 실패 시 null
+    currency: str
+    fx_rate: Optional[float]
+    value_krw: Optional[float]   # 현재가나 환율을 모르면 null (합계에서 제외)
+    cost_krw: Optional[float]
+    pnl_krw: Optional[float]
+    pnl_percent: Optional[float]
+    weight: Optional[float]
+
+class Portfolio(BaseModel):
+    currency: str
+    total_value_krw: float
+    total_cost_krw: float
+    total_pnl_krw: float
+    total_pnl_percent: float
+    fx_rates: dict
+    unpriced: List[str] = []     # 합계에서 빠진 포지션 ("venue:asset")
+    # 입력 섹션(잔고/보유/환율) 중 조회 실패로 비었거나 stale 인 것. 하나라도 있으면 complete=false
+    degraded_sections: List[str] = []
+    complete: bool = True        # 모든 입력과 시세가 최신일 때만 true (히스토리는 complete 인 것만 기록)
+    positions: List[PortfolioPosition]
+
+class EquityPoint(BaseModel):
+    ts: int          # 버킷 시작 시각 (unix seconds)
+    open: float
+    high: float
+    low: float
+    close: float
+    pnl: float
+    samples: int
+
+class HistorySummary(BaseModel):
+    start_value: float
+    end_value: float
+    change: float
+    change_percent: float
+    high: float
+    low: float
+
+class PortfolioHistory(BaseModel):
+    resolution: str
+    start: int
+    end: int
+    points: List[EquityPoint]
+    summary: Optional[HistorySummary]
+
 class NewsItem(BaseModel):
     title: str
     link: str
     date: str
     source: str
 
+class AlertRuleRequest(BaseModel):
+    symbol: str = Field(description="source:code (upbit:KRW-BTC, binance:BTCUSDT, naver:005930, yahoo:NVDA)")
+    kind: Literal[RULE_KINDS]
+    value: float = Field(description="가격(price_*), 평균 대비 배수(volume_spike), 등락률 %(change_rate)")
+
+class AlertRule(BaseModel):
+    id: int
+    symbol: str
+    kind: str
+    value: float
+    created_at: float
+    # 최근 시세 소스(전체 종목 섹션)에 종목이 있는지. false 면 시세가 들어오지 않아 알림이 발생하지 않음 (모르면 null)
+    tracked: Optional[bool] = None
+
+class AlertEvent(BaseModel):
+    id: int
+    rule_id: int
+    symbol: str
+    kind: str
+    threshold: float
+    observed: float
+    message: str
+    ts: float
+
+class SectionDelta(BaseModel):
+    version: int
+    base_version: int
+    inserted: List[Dict[str, Any]]
+    updated: Dict[str, Dict[str, Any]] = Field(description="종목 키 → 바뀐 필드")
+    removed: List[str]
+    ranks: Dict[str, int] = Field(description="순위가 바뀐 종목 키 → 새 순위 (0부터)")
+    ts: float
+
+class SectionDeltas(BaseModel):
+    section: str
+    key: str = Field(description="행의 종목 키 필드")
+    version: int
+    reset: bool = Field(description="true 면 rows 가 전체 행 (이전 상태를 버리고 다시 시작)")
+    rows: Optional[List[Dict[str, Any]]] = None
+    deltas: List[SectionDelta] = []
+
+
+# === 스냅샷 (검증 1회 + 인코딩된 JSON 재사용) ===
+
+@dataclass(frozen=True)
+class Section:
+    fetch: Callable[[], Awaitable[Any]]
+    adapter: TypeAdapter
+    ttl: float  # 초
+    # 서킷 브레이커로 보호되는 업스트림. 생성 중 실패하면 마지막 정상 스냅샷을 stale 로 제공
+    upstreams: Tuple[str, ...] = ()
+    # 서비스가 시세 레코드(Quote)를 반환하는 섹션의 응답 형식 변환 (스냅샷 생성 시 한 번)
+    present: Optional[Callable[[Any], Any]] = None
+    # 데이터가 바뀌는 거래 시장. 모두 닫혀 있으면 다음 개장까지 갱신 주기를 늘림 (암호화폐/환율은 없음)
+    markets: Tuple[str, ...] = ()
+    # 순위 섹션의 종목 키 필드. 지정하면 이전 스냅샷과 비교해 바뀐 행(delta)만 기록/발행
+    delta_key: Optional[str] = None
+
+    def current_ttl(self) -> float:
+        return market_hours.section_ttl(self.markets, self.ttl)
+
+
+# 전체 종목 섹션은 응답으로 내보내지 않으므로 행마다 dict 를 만들지 않고 열 배열로 보관
+UNIVERSE_ADAPTER = TypeAdapter(Optional[Dict[str, list]])
+
+
+SCREENER_UNIVERSE = 1000  # 소스별 최대 종목 수 (사실상 소스가 주는 전체)
+
+KRX_MARKET = (market_hours.KRX,)
+US_MARKET = (market_hours.US,)
+
+SECTIONS = {
+    # Crypto
+    "usdt_krw": Section(get_usdt_krw_rate, TypeAdapter(Optional[float]), 5, ("upbit",)),
+    "upbit_balance": Section(get_upbit_balance, TypeAdapter(Optional[UpbitBalance]), 5, ("upbit",)),
+    "upbit_holdings": Section(get_upbit_holdings, TypeAdapter(Optional[List[UpbitHolding]]), 5, ("upbit",)),
+    "upbit_top_volume": Section(
+        lambda: get_upbit_top_volume_coins(10), TypeAdapter(Optional[List[UpbitTopCoin]]), 5, ("upbit",),
+        partial(to_rows, upbit_top_coin), delta_key="market"),
+    "binance_balance": Section(get_binance_balance, TypeAdapter(Optional[BinanceBalance]), 5, ("binance",)),
+    "binance_holdings": Section(get_binance_holdings, TypeAdapter(Optional[List[BinanceHolding]]), 5, ("binance",)),
+    "binance_top_volume": Section(
+        lambda: _binance_top_volume(10), TypeAdapter(Optional[List[BinanceTopCoin]]), 5, ("binance",),
+        partial(to_rows, binance_top_coin), delta_key="symbol"),
+    "fear_greed": Section(get_crypto_fear_greed, TypeAdapter(Optional[CryptoFearGreed]), 60, ("alternative_me",)),
+    "whale_alerts": Section(lambda: _whale_alerts(5), TypeAdapter(Optional[List[WhaleAlert]]), 5),
+    "upbit_prices": Section(get_upbit_krw_prices, TypeAdapter(Optional[Dict[str, float]]), 5, ("upbit",)),
+    "binance_prices": Section(get_binance_usdt_prices, TypeAdapter(Optional[Dict[str, float]]), 5, ("binance",)),
+    "crypto_premium": Section(lambda: _crypto_premium(), TypeAdapter(Optional[List[PremiumCoin]]), 5),
+    "usd_krw": Section(get_usd_krw_rate, TypeAdapter(float), 60, ("yahoo",)),
+    "portfolio": Section(lambda: _portfolio(), TypeAdapter(Optional[Portfolio]), 5),
+    # Stock
+    "kospi_top": Section(
+        lambda: get_kospi_top_volume(10), TypeAdapter(Optional[List[KoreaStock]]), 30, ("naver",),
+        partial(to_rows, korea_stock), KRX_MARKET, delta_key="code"),
+    "kosdaq_top": Section(
+        lambda: get_kosdaq_top_volume(10), TypeAdapter(Optional[List[KoreaStock]]), 30, ("naver",),
+        partial(to_rows, korea_stock), KRX_MARKET, delta_key="code"),
+    "us_top": Section(
+        lambda: get_us_top_volume(10), TypeAdapter(Optional[List[USStock]]), 30, ("yahoo",),
+        partial(to_rows, us_stock), US_MARKET, delta_key="symbol"),
+    "indices": Section(
+        get_major_indices, TypeAdapter(Optional[List[StockIndex]]), 30, ("yahoo",), markets=KRX_MARKET + US_MARKET),
+    "sectors": Section(lambda: _top_sectors(10), TypeAdapter(Optional[List[SectorInfo]]), 60, markets=KRX_MARKET),
+    "etf_ranking": Section(
+        lambda: get_etf_top_volume("us", 10), TypeAdapter(Optional[List[ETFItem]]), 30, ("yahoo",),
+        partial(to_rows, etf_item), US_MARKET, delta_key="symbol"),
+    # Screener (소스별 전체 종목, 스크리너 조회 시에만 갱신)
+    "kospi_universe": Section(
+        lambda: get_kospi_top_volume(SCREENER_UNIVERSE), UNIVERSE_ADAPTER, 30, ("naver",), to_columns, KRX_MARKET),
+    "kosdaq_universe": Section(
+        lambda: get_kosdaq_top_volume(SCREENER_UNIVERSE), UNIVERSE_ADAPTER, 30, ("naver",), to_columns, KRX_MARKET),
+    "us_universe": Section(
+        lambda: get_us_top_volume(SCREENER_UNIVERSE), UNIVERSE_ADAPTER, 30, ("yahoo",), to_columns, US_MARKET),
+    "etf_universe": Section(
+        lambda: get_etf_top_volume("us", SCREENER_UNIVERSE), UNIVERSE_ADAPTER, 30, ("yahoo",), to_columns, US_MARKET),
+    "upbit_universe": Section(
+        lambda: get_upbit_top_volume_coins(SCREENER_UNIVERSE), UNIVERSE_ADAPTER, 10, ("upbit",), to_columns),
+    "binance_universe": Section(
+        lambda: _binance_top_volume(SCREENER_UNIVERSE), UNIVERSE_ADAPTER, 10, ("binance",), to_columns),
+    # Sector drill-down (업종 목록 → 구성 종목(긴 TTL) → 구성 종목 시세(짧은 TTL))
+    "sector_groups": Section(
+        lambda: get_sector_performance(None), TypeAdapter(Optional[List[SectorInfo]]), 60, ("naver",),
+        markets=KRX_MARKET),
+    "sector_constituents": Section(
+        lambda: _sector_constituents(), TypeAdapter(Optional[Dict[str, Dict[str, List[str]]]]), CONSTITUENTS_TTL,
+        markets=KRX_MARKET),
+    "sector_heatmap": Section(
+        lambda: _sector_heatmap(), TypeAdapter(Optional[List[SectorDetail]]), QUOTES_TTL, ("naver",),
+        markets=KRX_MARKET),
+}
+
+DASHBOARD_SECTIONS = [
+    "upbit_balance", "upbit_holdings", "upbit_top_volume",
+    "binance_balance", "binance_holdings", "binance_top_volume",
+    "fear_greed", "whale_alerts",
+]
+STOCK_DASHBOARD_SECTIONS = ["kospi_top", "kosdaq_top", "us_top", "indices", "sectors", "etf_ranking"]
+
+NEWS_TTL = 300
+NEWS_ADAPTER = TypeAdapter(List[NewsItem])
+NEWS_UPSTREAMS = ("google_news",)
+
+# 멀티 워커 배포 시 SNAPSHOT_BACKEND=file|redis 로 워커 간 스냅샷을 공유
+SNAPSHOT_BACKEND = backend_from_env()
+LEADER = LeaderElection(SNAPSHOT_BACKEND)
+SNAPSHOTS = SnapshotCache(backend=SNAPSHOT_BACKEND)
+NEWS_SNAPSHOTS = SnapshotCache(max_entries=256)
+ENCODED_BODIES = EncodedBodyCache()
+ALERTS = AlertEngine()
+DELTAS = DeltaBook({name: section.delta_key for name, section in SECTIONS.items() if section.delta_key})
+INDICATORS = IndicatorEngine()
+ALERT_ADAPTER = TypeAdapter(AlertEvent)
+SECTION_DELTAS_ADAPTER = TypeAdapter(SectionDeltas)
+
+
+PORTFOLIO = PositionTable()
+
+# 거래소별 계정 섹션 (키가 설정된 거래소만 포트폴리오 입력으로 요구)
+ACCOUNT_SECTIONS = {
+    "upbit": ("upbit_balance", "upbit_holdings"),
+    "binance": ("binance_balance", "binance_holdings"),
+}
+_ACCOUNT_SECTION_NAMES = {name for names in ACCOUNT_SECTIONS.values() for name in names}
+
+
+def _required_inputs() -> Set[str]:
+    required = set()
+    if upbit_configured():
+        required.update(ACCOUNT_SECTIONS["upbit"])
+    if binance_configured():
+        # 바이낸스 자산은 USDT/KRW 환율로 환산
+        required.update(ACCOUNT_SECTIONS["binance"] + ("usdt_krw",))
+    return required
+
+
+def _degraded_inputs(snapshots: Iterable[Snapshot]) -> List[str]:
+    """키가 설정된 거래소의 입력 섹션 중 조회에 실패했거나(None) 마지막 정상 스냅샷(stale)인 것"""
+    required = _required_inputs()
+    return [s.name for s in snapshots if s.name in required and (s.data is None or s.stale)]
+
+
+async def _portfolio() -> Optional[dict]:
+    """
+    업비트/바이낸스 잔고·보유 섹션을 합쳐 KRW 기준 포트폴리오를 계산합니다.
+    한 거래소 조회가 실패하면 나머지 거래소만으로 계산하되 complete=false 로 표시합니다.
+    """
+    up_bal, up_hold, bn_bal, bn_hold, rate = inputs = await asyncio.gather(
+        get_section("upbit_balance"), get_section("upbit_holdings"),
+        get_section("binance_balance"), get_section("binance_holdings"),
+        get_section("usdt_krw"),
+    )
+    positions = build_positions(up_bal.data, up_hold.data, bn_bal.data, bn_hold.data)
+    if not positions:
+        return None
+    with tracing.span("portfolio.sync", **{"result.rows": len(positions)}) as sp:
+        recomputed = PORTFOLIO.sync(positions, {"USDT": rate.data})
+        sp.set_attribute("portfolio.recomputed_rows", recomputed)
+        summary = PORTFOLIO.summary()
+    summary["degraded_sections"] = _degraded_inputs(inputs)
+    summary["complete"] = not summary["degraded_sections"] and not summary["unpriced"]
+    return summary
+
+
+PREMIUM = PremiumBook()
+_premium_applied: Dict[str, str] = {}  # 시세 섹션 → 프리미엄 열에 마지막으로 반영한 ETag
+
+
+async def _crypto_premium() -> Optional[List[dict]]:
+    """업비트/바이낸스 전체 시세 섹션 중 새 스냅샷이 나온 쪽만 프리미엄 열에 반영합니다."""
+    upbit, binance, rate = await asyncio.gather(
+        get_section("upbit_prices"), get_section("binance_prices"), get_section("usdt_krw"),
+    )
+    with tracing.span("premium.update") as sp:
+        recomputed = PREMIUM.set_rate(rate.data)
+        for snapshot, update in ((upbit, PREMIUM.update_upbit), (binance, PREMIUM.update_binance)):
+            if snapshot.data and _premium_applied.get(snapshot.name) != snapshot.etag:
+                _premium_applied[snapshot.name] = snapshot.etag
+                recomputed += update(snapshot.data)
+        sp.set_attribute("premium.recomputed_rows", recomputed)
+        PREMIUM.record()
+        return PREMIUM.ranked()
+
+
+SCREENER = ScreenerTable()
+SCREENER_SOURCES = {
+    "kospi": "kospi_universe", "kosdaq": "kosdaq_universe", "us": "us_universe", "etf": "etf_universe",
+    "upbit": "upbit_universe", "binance": "binance_universe",
+}
+SCREENER_ADAPTER = TypeAdapter(List[ScreenerItem])
+
+
+async def _sync_screener() -> None:
+    """소스 섹션 스냅샷 중 바뀐 것이 있으면 스크리너 테이블과 정렬 인덱스를 다시 만듭니다."""
+    names = list(SCREENER_SOURCES.values()) + ["usd_krw"]
+    snapshots = await asyncio.gather(*(get_section(name) for name in names))
+    usd_krw = snapshots[-1]
+    for market, snapshot in zip(SCREENER_SOURCES, snapshots):
+        # ETF 는 KRW 환산에 환율을 쓰므로 환율 스냅샷도 버전에 포함
+        SCREENER.sync(market, f"{snapshot.etag}{usd_krw.etag}", snapshot.data, usd_krw.data)
+    with tracing.span("screener.refresh") as sp:
+        if SCREENER.refresh():
+            sp.set_attribute("result.rows", len(SCREENER))
+
+
+async def _top_sectors(limit: int) -> Optional[List[dict]]:
+    # 대시보드 섹터 순위는 전체 업종 목록 스냅샷의 상위 N개 (같은 페이지를 두 번 받지 않도록)
+    groups = await get_section("sector_groups")
+    return groups.data[:limit] if groups.data else None
+
+
+async def _sector_constituents() -> Optional[Dict[str, dict]]:
+    """업종별 구성 종목. 조회에 실패한 업종은 이전 스냅샷의 목록을 유지합니다."""
+    groups = await get_section("sector_groups")
+    if not groups.data:
+        return None
+    codes = [group["code"] for group in groups.data if group.get("code")]
+    previous = SNAPSHOTS.latest("sector_constituents")
+    previous = previous.data if previous is not None and previous.data else {}
+    fetched = await fetch_constituents(codes)
+    members = {}
+    for code in codes:  # 목록에서 빠진 업종은 버림
+        quotes = fetched.get(code)
+        if quotes is not None:
+            members[code] = members_from_quotes(quotes)
+        elif code in previous:
+            members[code] = previous[code]
+    return members or None
+
+
+async def _sector_heatmap() -> Optional[List[dict]]:
+    """전체 업종의 구성 종목 시세. 구성 종목은 캐시된 목록을 쓰고 시세만 묶음 요청으로 다시 조회합니다."""
+    groups, constituents = await asyncio.gather(get_section("sector_groups"), get_section("sector_constituents"))
+    if not groups.data or not constituents.data:
+        return None
+    symbols = list(dict.fromkeys(code for member in constituents.data.values() for code in member["codes"]))
+    quotes = await fetch_quotes(symbols)
+    if quotes is None:
+        return None
+    with tracing.span("sector_heatmap.build", **{"input.rows": len(quotes)}):
+        return build_heatmap(groups.data, constituents.data, quotes)
+
+
+async def _binance_top_volume(limit: int):
+    # KRW 환산에 사용하는 환율은 usdt_krw 스냅샷을 공유
+    rate = await get_section("usdt_krw")
+    return await get_binance_top_volume_coins(limit, rate.data)
+
+
+async def _whale_alerts(limit: int) -> Optional[List[dict]]:
+    # 수집 작업이 채운 링 버퍼에서 최신 N건만 읽음 (요청 경로에서 업스트림 호출 없음)
+    if not LEADER.is_leader:
+        # 링 버퍼는 수집을 맡은 리더 워커에만 있으므로 리더가 공유한 마지막 스냅샷을 사용
+        shared = SNAPSHOTS.latest("whale_alerts")
+        return shared.data if shared is not None else None
+    return get_whale_feed().latest(limit)
+
+
+def _last_good(cache: SnapshotCache, name: str, upstreams: Iterable[str], started: float) -> Optional[Snapshot]:
+    """
+    생성 도중 업스트림이 실패했거나 차단 중이면(또는 생성 예산을 다 써서 결과가 불완전하면)
+    마지막 정상 스냅샷을 stale 로 표시해 반환합니다.
+    서비스 함수는 실패 시 빈 값/기본값을 반환하므로, 그 결과로 정상 데이터를 덮어쓰지 않습니다.
+    """
+    degraded = bool(upstreams) and circuit.degraded_since(upstreams, started)
+    if not degraded and not deadline.expired():
+        return None
+    previous = cache.latest(name)
+    if previous is None or not previous.data:
+        return None
+    return previous.as_stale()
+
+
+def _section_producer(name: str) -> Callable[[], Awaitable[Snapshot]]:
+    section = SECTIONS[name]
+
+    async def produce() -> Snapshot:
+        started = time.time()
+        # 공유 생성 작업은 먼저 도착한 요청의 예산이 아닌 자체 예산을 사용
+        with deadline.budget(SECTION_FETCH_BUDGET, detached=True):
+            try:
+                data = await section.fetch()
+            except Exception as e:
+                print(f"Section {name} fetch failed: {e}")
+                data = None
+            stale = _last_good(SNAPSHOTS, name, section.upstreams, started)
+        if stale is not None:
+            return stale
+        if name in INDICATOR_SECTIONS and data:
+            # 순위 섹션은 새 시세를 봉에 반영하고 지표 필드를 붙임 (닫힌 봉은 저장)
+            with tracing.span("indicators.update", section=name):
+                INDICATORS.attach(data)
+            closed = INDICATORS.drain_closed()
+            if closed:
+                await record_bars(closed)
+        quotes = data
+        delta = None
+        with tracing.span("model.build", section=name):
+            if section.present is not None:
+                data = section.present(data)
+            if section.delta_key is not None:
+                snapshot, delta = _delta_snapshot(name, section.adapter, data)
+            else:
+                # 빈 결과는 기존 응답과 동일하게 null 로 내려보냄
+                snapshot = make_snapshot(name, data if data else None, section.adapter)
+                if data is not None and not data:
+                    # 스냅샷 데이터는 빈 결과([])를 그대로 보관해 조회 실패(None)와 구분 (보유 코인 없음 등)
+                    snapshot = replace(snapshot, data=data)
+        if name in SECTION_SOURCES:
+            # 새 시세마다 알림 규칙 평가 (순위 섹션은 값이 바뀌었거나 새로 순위에 든 종목만)
+            if section.delta_key is not None:
+                changed = delta.changed_keys() if delta is not None else set()
+                quotes = [q for q in quotes or () if q.symbol in changed]
+            with tracing.span("alerts.evaluate", section=name, **{"input.rows": len(quotes or ())}):
+                ALERTS.evaluate(ticks_from_section(name, quotes))
+        return snapshot
+
+    return produce
+
+
+def _delta_snapshot(name: str, adapter: TypeAdapter, data: Any) -> Tuple[Snapshot, Optional[Delta]]:
+    """
+    순위 섹션 스냅샷. 응답 행(JSON 형식)을 이전 행과 비교해 delta 를 기록하고,
+    바뀐 행이 없으면 다시 인코딩하지 않고 이전 스냅샷의 본문/ETag 를 그대로 사용합니다.
+    조회에 실패했으면(None/빈 결과) 비교하지 않고 이전 행과 버전을 유지한 채 마지막 스냅샷을 stale 로 제공합니다
+    (모든 행을 제외했다가 다음 갱신에 다시 추가하는 delta 를 만들지 않도록).
+    """
+    if not data:
+        previous = SNAPSHOTS.latest(name)
+        if previous is not None and previous.data:
+            return previous.as_stale(), None
+        return make_snapshot(name, None, adapter), None
+    validated = adapter.validate_python(data)
+    rows = adapter.dump_python(validated, mode="json", by_alias=True)
+    previous = SNAPSHOTS.latest(name)
+    if previous is not None:
+        # 다른 워커(이전 리더 등)가 공유 저장소에 만든 더 새 버전부터 이어서 비교 (버전이 뒤로 가지 않도록)
+        DELTAS.sync(name, previous.version, previous.data)
+    delta = DELTAS.update(name, rows)
+    version = DELTAS.current(name)[0]
+    if delta is None and previous is not None and previous.version == version:
+        return replace(previous, created_at=time.time(), stale=False, checked_at=None), None
+    body = adapter.dump_json(validated, by_alias=True)
+    snapshot = Snapshot(name=name, data=rows, body=body, etag=make_etag(body), created_at=time.time(), version=version)
+    return snapshot, delta
+
+
+async def _within_budget(cache: SnapshotCache, name: str, pending: Awaitable[Snapshot]) -> Snapshot:
+    """
+    캐시 조회 결과를 기다립니다. 생성 작업이 남은 예산 안에 끝나지 않으면 마지막 스냅샷을 stale 로 반환하고
+    (생성은 백그라운드에서 계속), 스냅샷이 없으면 DeadlineExceeded (504)
+    """
+    try:
+        return await pending
+    except deadline.DeadlineExceeded:
+        previous = cache.latest(name)
+        if previous is None:
+            raise
+        return previous.as_stale()
+
+
+async def get_section(name: str) -> Snapshot:
+    """섹션 스냅샷을 반환합니다. TTL 이 지났을 때만 업스트림을 호출하고 검증/인코딩합니다."""
+    pending = SNAPSHOTS.get(name, _section_producer(name), SECTIONS[name].current_ttl())
+    return await _within_budget(SNAPSHOTS, name, pending)
+
+
+# === 백그라운드 선갱신 ===
+# 최근 조회된 섹션은 만료 직전에 미리 갱신해 요청 경로에서 업스트림 대기가 없도록 합니다.
+# 일정 시간 조회가 없는 섹션은 갱신을 멈춰 불필요한 업스트림 호출을 막습니다.
+
+SECTION_REFRESH = os.getenv("SECTION_REFRESH", "1") != "0"
+REFRESH_AHEAD_RATIO = 0.8   # TTL 의 80% 가 지나면 갱신
+REFRESH_IDLE_AFTER = 120    # 초
+
+
+async def _refresh_sections(interval: float = 0.5) -> None:
+    refreshing = set()
+
+    async def refresh(name: str) -> None:
+        try:
+            with untracked():
+                await SNAPSHOTS.refresh(name, _section_producer(name))
+        finally:
+            refreshing.discard(name)
+
+    while True:
+        now = time.time()
+        # 알림 규칙이 걸린 시세 섹션은 조회가 없어도 계속 갱신
+        watched_sources = ALERTS.watched_sources()
+        # 변경분 스트림 구독자가 있는 섹션도 계속 갱신
+        streamed = DELTAS.watched()
+        for name, section in SECTIONS.items():
+            watched = SECTION_SOURCES.get(name) in watched_sources or name in streamed
+            if name in refreshing or (not watched and SNAPSHOTS.idle_for(name) > REFRESH_IDLE_AFTER):
+                continue
+            snapshot = SNAPSHOTS.latest(name)
+            if snapshot is None and not watched:
+                continue
+            # 시장이 닫힌 섹션은 데이터가 바뀌지 않으므로 미리 갱신하지 않고 만료 시점에만 갱신
+            ahead = 1.0 if market_hours.is_closed(section.markets, now) else REFRESH_AHEAD_RATIO
+            if snapshot is None or now - snapshot.checked >= section.current_ttl() * ahead:
+                refreshing.add(name)
+                asyncio.create_task(refresh(name))
+        await asyncio.sleep(interval)
+
+
+# === 업스트림 복구 확인 ===
+# 차단(open)된 업스트림은 재시도 시각이 지나면 요청 경로 대신 백그라운드에서 섹션을 갱신해 시험 호출합니다.
+# 성공하면 브레이커가 닫히고 stale 스냅샷이 새 스냅샷으로 교체됩니다. 브레이커는 워커별이므로 모든 워커에서 실행합니다.
+
+CIRCUIT_PROBE_INTERVAL = 1.0
+
+
+async def _probe_upstreams(interval: float = CIRCUIT_PROBE_INTERVAL) -> None:
+    while True:
+        for upstream in circuit.due_for_probe():
+            # 계정 섹션은 키가 없으면 업스트림을 호출하지 않으므로 시험 호출에 쓰지 않음
+            name = next((n for n, section in SECTIONS.items()
+                         if upstream in section.upstreams and n not in _ACCOUNT_SECTION_NAMES), None)
+            if name is None:
+                continue  # 섹션이 없는 업스트림(뉴스 등)은 다음 요청이 시험 호출
+            try:
+                with untracked():
+                    await SNAPSHOTS.refresh(name, _section_producer(name))
+            except Exception as e:
+                print(f"Upstream probe failed ({upstream}): {e}")
+        await asyncio.sleep(interval)
+
+
+# === 고래 이체 수집 ===
+# 소스 어댑터(whale_feed)를 주기적으로 조회해 링 버퍼에 넣고, 새 이체가 있으면 섹션 스냅샷을 바로 갱신합니다.
+
+WHALE_POLL_INTERVAL = float(os.getenv("WHALE_POLL_INTERVAL", "30"))
+
+
+async def _ingest_whale_transfers(interval: float) -> None:
+    feed = get_whale_feed()
+    print(f"Whale feed source: {feed.source.name}")
+    while True:
+        try:
+            added = await executors.run(executors.WEB, feed.poll)
+            if added:
+                with untracked():
+                    await SNAPSHOTS.refresh("whale_alerts", _section_producer("whale_alerts"))
+        except Exception as e:
+            print(f"Whale feed poll failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# === 포트폴리오 히스토리 기록 ===
+
+PORTFOLIO_HISTORY_INTERVAL = float(os.getenv("PORTFOLIO_HISTORY_INTERVAL", "60"))
+
+
+async def _record_portfolio_sample() -> bool:
+    """
+    현재 포트폴리오를 히스토리에 한 건 기록합니다. 기록했으면 True.
+    일부 거래소/시세가 빠진(complete=false) 포트폴리오나 stale 스냅샷은 자산 곡선에 거짓 하락/중복을 만들므로 건너뜁니다.
+    """
+    with untracked():
+        snapshot = await get_section("portfolio")
+    if not snapshot.data or snapshot.stale or not snapshot.data.get("complete", True):
+        return False
+    await record_portfolio(snapshot.data)
+    return True
+
+
+async def _record_portfolio_history(interval: float) -> None:
+    while True:
+        try:
+            await _record_portfolio_sample()
+        except Exception as e:
+            print(f"Portfolio history record failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# === 리더 작업 ===
+# 선갱신, 히스토리 기록, 고래 이체 수집은 리더 워커 하나만 수행합니다 (업스트림 호출/DB 기록 중복 방지).
+# 리더가 종료되면 다음 확인 주기에 다른 워커가 이어받습니다.
+
+LEADER_CHECK_INTERVAL = 2.0
+
+
+async def _run_leader_tasks() -> None:
+    tasks: List[asyncio.Task] = []
+    try:
+        while True:
+            is_leader = LEADER.check()
+            if is_leader and not tasks:
+                if SECTION_REFRESH:
+                    tasks.append(asyncio.create_task(_refresh_sections()))
+                if PORTFOLIO_HISTORY_INTERVAL > 0:
+                    tasks.append(asyncio.create_task(_record_portfolio_history(PORTFOLIO_HISTORY_INTERVAL)))
+                if WHALE_POLL_INTERVAL > 0:
+                    tasks.append(asyncio.create_task(_ingest_whale_transfers(WHALE_POLL_INTERVAL)))
+            elif not is_leader and tasks:
+                for task in tasks:
+                    task.cancel()
+                tasks = []
+            await asyncio.sleep(LEADER_CHECK_INTERVAL)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        # 압축 표현의 ETag("<hash>-gzip")도 같은 내용으로 취급
+        for encoding in ("gzip", "br"):
+            suffix = f'-{encoding}"'
+            if candidate.endswith(suffix):
+                candidate = candidate[:-len(suffix)] + '"'
+        if candidate == etag:
+            return True
+    return False
+
+
+def _max_age(snapshots: List[Snapshot], ttls: List[float]) -> int:
+    """가장 먼저 만료되는 스냅샷까지 남은 시간 (초)"""
+    now = time.time()
+    return max(0, int(min(s.checked + ttl - now for s, ttl in zip(snapshots, ttls))))
+
+
+def _snapshot_response(request: Request, body: bytes, etag: str, max_age: int,
+                       stale: Iterable[str] = ()) -> Response:
+    headers = {"Cache-Control": f"private, max-age={max_age}", "Vary": "Accept-Encoding"}
+    stale = list(stale)
+    if stale:
+        # 업스트림 장애로 마지막 정상 스냅샷을 제공 중인 섹션
+        headers["X-Stale-Sections"] = ",".join(stale)
+    encoding = None
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    # 표현(압축 방식)마다 다른 ETag 를 사용 (304 에도 200 과 같은 값을 보냄)
+    headers["ETag"] = f'{etag[:-1]}-{encoding}"' if encoding else etag
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        body = ENCODED_BODIES.get(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _parse_sections(sections: Optional[str], available: List[str]) -> List[str]:
+    """?sections=a,b 쿼리를 검증합니다. 지정하지 않으면 전체 섹션을 반환합니다."""
+    if not sections:
+        return available
+    names = [name.strip() for name in sections.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {', '.join(unknown)} (available: {', '.join(available)})"
+        )
+    # 응답 필드 순서는 요청 순서와 무관하게 고정
+    return [name for name in available if name in names]
+
+
+async def _section_response(request: Request, name: str) -> Response:
+    snapshot = await get_section(name)
+    return _snapshot_response(request, snapshot.body, snapshot.etag, _max_age([snapshot], [SECTIONS[name].current_ttl()]),
+                              stale=[name] if snapshot.stale else ())
+
+
+async def _composed_response(request: Request, names: List[str]) -> Response:
+    """섹션 스냅샷을 이미 인코딩된 바이트 그대로 이어 붙여 응답합니다."""
+    snapshots = await asyncio.gather(*(get_section(name) for name in names))
+    # last_updated 는 가장 오래된 섹션의 생성 시각 (응답 데이터가 최소한 이 시점 이후의 것임)
+    last_updated = datetime.fromtimestamp(min(s.created_at for s in snapshots)).isoformat()
+    etag = make_etag(last_updated, *(f"{name}={s.etag}" for name, s in zip(names, snapshots)))
+    max_age = _max_age(snapshots, [SECTIONS[name].current_ttl() for name in names])
+    fields = [(name, s.body) for name, s in zip(names, snapshots)]
+    fields.append(("last_updated", json.dumps(last_updated).encode()))
+    stale = [name for name, s in zip(names, snapshots) if s.stale]
+    return _snapshot_response(request, compose_object(fields), etag, max_age, stale=stale)
+
 
 # === API 엔드포인트 ===
 
@@ -240,92 +1066,482 @@ async def root():
     return {"message": "Coin Dashboard API is running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus 스크레이프 엔드포인트"""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/api/dashboard", response_model=DashboardData)
-async def dashboard():
-    """암호화폐 대시보드 전체 데이터 조회 (Crypto)"""
+async def dashboard(request: Request, sections: Optional[str] = None):
+    """
+    암호화폐 대시보드 전체 데이터 조회 (Crypto)
+    ?sections=upbit_top_volume,fear_greed 로 필요한 섹션만 받을 수 있습니다.
+    """
+    names = _parse_sections(sections, DASHBOARD_SECTIONS)
     try:
-        # Parallel execution could be better, but consecutive await is fine for now
-        # Ideally: await asyncio.gather(...)
-        import asyncio
-        
-        # Balance & Holdings & Rate
-        # We need rate for Binance Top Volume calculation
-        usdt_krw = await get_usdt_krw_rate()
-        
-        # Asyncio Gather for parallel execution
-        # Results order: up_bal, up_hold, bn_bal, bn_hold, up_top, bn_top, fg, whale
-        results = await asyncio.gather(
-            get_upbit_balance(),
-            get_upbit_holdings(),
-            get_binance_balance(),
-            get_binance_holdings(),
-            get_upbit_top_volume_coins(10),
-            get_binance_top_volume_coins(10, usdt_krw),
-            get_crypto_fear_greed(),
-            get_whale_alerts(5),
-            return_exceptions=True
-        )
-        
-        # Unpack results, handling exceptions if any (basic None fallback)
-        up_bal = results[0] if not isinstance(results[0], Exception) else None
-        up_hold = results[1] if not isinstance(results[1], Exception) else None
-        bn_bal = results[2] if not isinstance(results[2], Exception) else None
-        bn_hold = results[3] if not isinstance(results[3], Exception) else None
-        up_top = results[4] if not isinstance(results[4], Exception) else None
-        bn_top = results[5] if not isinstance(results[5], Exception) else None
-        fg = results[6] if not isinstance(results[6], Exception) else None
-        whale = results[7] if not isinstance(results[7], Exception) else None
-        
-        return DashboardData(
-            upbit_balance=UpbitBalance(**up_bal) if up_bal else None,
-            upbit_holdings=[UpbitHolding(**h) for h in up_hold] if up_hold else None,
-            upbit_top_volume=[UpbitTopCoin(**c) for c in up_top] if up_top else None,
-            binance_balance=BinanceBalance(**bn_bal) if bn_bal else None,
-            binance_holdings=[BinanceHolding(**h) for h in bn_hold] if bn_hold else None,
-            binance_top_volume=[BinanceTopCoin(**c) for c in bn_top] if bn_top else None,
-            fear_greed=CryptoFearGreed(**fg) if fg else None,
-            whale_alerts=[WhaleAlert(**w) for w in whale] if whale else None,
-            last_updated=datetime.now().isoformat()
-        )
+        return await _composed_response(request, names)
+    except deadline.DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"Error in dashboard: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/stock/dashboard", response_model=StockDashboardData)
-async def stock_dashboard():
-    """주식 대시보드 전체 데이터 조회"""
+async def stock_dashboard(request: Request, sections: Optional[str] = None):
+    """
+    주식 대시보드 전체 데이터 조회
+    ?sections=kospi_top,indices 로 필요한 섹션만 받을 수 있습니다.
+    """
+    names = _parse_sections(sections, STOCK_DASHBOARD_SECTIONS)
     try:
-        kospi = await get_kospi_top_volume(10)
-        kosdaq = await get_kosdaq_top_volume(10)
-        us = await get_us_top_volume(10)
-        indices = await get_major_indices()
-        sectors = await get_sector_performance()
-        etfs = await get_etf_top_volume("us", 10) 
-        
-        return StockDashboardData(
-            kospi_top=[KoreaStock(**s) for s in kospi] if kospi else None,
-            kosdaq_top=[KoreaStock(**s) for s in kosdaq] if kosdaq else None,
-            us_top=[USStock(**s) for s in us] if us else None,
-            indices=[StockIndex(**i) for i in indices] if indices else None,
-            sectors=[SectorInfo(**s) for s in sectors] if sectors else None,
-            etf_ranking=[ETFItem(**e) for e in etfs] if etfs else None,
-            last_updated=datetime.now().isoformat()
-        )
+        return await _composed_response(request, names)
+    except deadline.DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"Error in stock_dashboard: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# === 섹션별 엔드포인트 (대시보드와 같은 스냅샷 공유) ===
+
+@app.get("/api/upbit/balance", response_model=Optional[UpbitBalance])
+async def upbit_balance(request: Request):
+    return await _section_response(request, "upbit_balance")
+
+
+@app.get("/api/upbit/holdings", response_model=Optional[List[UpbitHolding]])
+async def upbit_holdings(request: Request):
+    return await _section_response(request, "upbit_holdings")
+
+
+@app.get("/api/upbit/top-volume", response_model=Optional[List[UpbitTopCoin]])
+async def upbit_top_volume(request: Request):
+    return await _section_response(request, "upbit_top_volume")
+
+
+@app.get("/api/binance/balance", response_model=Optional[BinanceBalance])
+async def binance_balance(request: Request):
+    return await _section_response(request, "binance_balance")
+
+
+@app.get("/api/binance/holdings", response_model=Optional[List[BinanceHolding]])
+async def binance_holdings(request: Request):
+    return await _section_response(request, "binance_holdings")
+
+
+@app.get("/api/binance/top-volume", response_model=Optional[List[BinanceTopCoin]])
+async def binance_top_volume(request: Request):
+    return await _section_response(request, "binance_top_volume")
+
+
+@app.get("/api/fx", response_model=FxRates)
+async def fx_rates(request: Request):
+    """USDT/KRW (업비트), USD/KRW 환율"""
+    return await _composed_response(request, ["usdt_krw", "usd_krw"])
+
+
+@app.get("/api/crypto/fear-greed", response_model=Optional[CryptoFearGreed])
+async def crypto_fear_greed(request: Request):
+    return await _section_response(request, "fear_greed")
+
+
+@app.get("/api/crypto/whale-alerts", response_model=Optional[List[WhaleAlert]])
+async def crypto_whale_alerts(request: Request):
+    return await _section_response(request, "whale_alerts")
+
+
+@app.get("/api/crypto/premium", response_model=Optional[List[PremiumCoin]])
+async def crypto_premium(request: Request):
+    """업비트-바이낸스 공통 코인의 김치 프리미엄 (내림차순)"""
+    return await _section_response(request, "crypto_premium")
+
+
+@app.get("/api/screener", response_model=List[ScreenerItem])
+async def screener(
+    filter: List[str] = Query([], description="조건 (반복 가능), 예: change_rate>5, trade_value>=1e10"),
+    market: Optional[str] = Query(None, description="쉼표 구분 시장: kospi,kosdaq,us,etf,upbit,binance"),
+    sort: str = Query("-trade_value", description="정렬 열 (앞에 - 를 붙이면 내림차순)"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """국내/미국 주식, ETF, 업비트/바이낸스 코인 통합 스크리너 (가격·거래대금은 KRW 환산)"""
+    try:
+        conditions = [parse_filter(expression) for expression in filter]
+        markets = [m.strip() for m in market.split(",") if m.strip()] if market else None
+        await _sync_screener()
+        with tracing.span("screener.query", conditions=len(conditions)) as sp:
+            rows = SCREENER.query(conditions, markets, sort.lstrip("-"), sort.startswith("-"), limit)
+            sp.set_attribute("result.rows", len(rows))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    body = SCREENER_ADAPTER.dump_json(SCREENER_ADAPTER.validate_python(rows))
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/stock/kospi/top", response_model=Optional[List[KoreaStock]])
+async def stock_kospi_top(request: Request):
+    return await _section_response(request, "kospi_top")
+
+
+@app.get("/api/stock/kosdaq/top", response_model=Optional[List[KoreaStock]])
+async def stock_kosdaq_top(request: Request):
+    return await _section_response(request, "kosdaq_top")
+
+
+@app.get("/api/stock/us/top", response_model=Optional[List[USStock]])
+async def stock_us_top(request: Request):
+    return await _section_response(request, "us_top")
+
+
+@app.get("/api/stock/indices", response_model=Optional[List[StockIndex]])
+async def stock_indices(request: Request):
+    return await _section_response(request, "indices")
+
+
+@app.get("/api/stock/sectors", response_model=Optional[List[SectorInfo]])
+async def stock_sectors(request: Request):
+    return await _section_response(request, "sectors")
+
+
+@app.get("/api/stock/sectors/heatmap", response_model=Optional[List[SectorDetail]])
+async def stock_sector_heatmap(request: Request):
+    """전체 업종의 구성 종목 시세 (업종 안에서는 거래대금 내림차순)"""
+    return await _section_response(request, "sector_heatmap")
+
+
+SECTOR_DETAIL_ADAPTER = TypeAdapter(Optional[SectorDetail])
+SECTOR_UPSTREAMS = ("naver",)
+# 업종별 상세 (전체 히트맵이 아직 만들어지지 않았을 때 조회한 업종 하나씩)
+SECTOR_DETAIL_SNAPSHOTS = SnapshotCache(max_entries=128)
+
+
+def _sector_detail_producer(group: dict) -> Callable[[], Awaitable[Snapshot]]:
+    """업종 상세 페이지 한 번으로 구성 종목과 시세를 함께 조회합니다 (전체 업종 히트맵을 기다리지 않음)."""
+    code = group["code"]
+
+    async def produce() -> Snapshot:
+        started = time.time()
+        with deadline.budget(SECTION_FETCH_BUDGET, detached=True):
+            quotes = (await fetch_constituents([code]))[code]
+            stale = _last_good(SECTOR_DETAIL_SNAPSHOTS, code, SECTOR_UPSTREAMS, started)
+        if stale is None and quotes is None:
+            # 조회 실패: 이전 상세가 있으면 stale 로 유지
+            previous = SECTOR_DETAIL_SNAPSHOTS.latest(code)
+            stale = previous.as_stale() if previous is not None else None
+        if stale is not None:
+            return stale
+        if quotes is None:
+            return make_snapshot(code, None, SECTOR_DETAIL_ADAPTER)
+        with tracing.span("model.build", model="SectorDetail", **{"input.rows": len(quotes)}):
+            (sector,) = build_heatmap([group], {code: members_from_quotes(quotes)}, quotes)
+            return make_snapshot(code, sector, SECTOR_DETAIL_ADAPTER)
+
+    return produce
+
+
+@app.get("/api/stock/sectors/{code}", response_model=SectorDetail)
+async def stock_sector_detail(code: str, request: Request):
+    """
+    업종 하나의 구성 종목 시세 (code: 네이버 업종 번호, /api/stock/sectors 의 code)
+    전체 히트맵이 최신이면 그 결과를 쓰고, 아니면 이 업종만 조회해 업종별로 캐시합니다.
+    """
+    ttl = SECTIONS["sector_heatmap"].current_ttl()
+    heatmap = SNAPSHOTS.latest("sector_heatmap")
+    if heatmap is not None and heatmap.data and not heatmap.stale and time.time() - heatmap.checked < ttl:
+        sector = next((s for s in heatmap.data if s["code"] == code), None)
+        if sector is not None:
+            body = SECTOR_DETAIL_ADAPTER.dump_json(SECTOR_DETAIL_ADAPTER.validate_python(sector))
+            return _snapshot_response(request, body, make_etag(body), _max_age([heatmap], [ttl]))
+
+    groups = await get_section("sector_groups")
+    group = next((g for g in groups.data or [] if g.get("code") == code), None)
+    if group is None:
+        if groups.data is None:
+            raise HTTPException(status_code=503, detail="Sector list unavailable")
+        raise HTTPException(status_code=404, detail=f"Unknown sector: {code}")
+    pending = SECTOR_DETAIL_SNAPSHOTS.get(code, _sector_detail_producer(group), ttl)
+    snapshot = await _within_budget(SECTOR_DETAIL_SNAPSHOTS, code, pending)
+    if snapshot.data is None:
+        raise HTTPException(status_code=503, detail=f"Sector detail unavailable: {code}")
+    return _snapshot_response(request, snapshot.body, snapshot.etag, _max_age([snapshot], [ttl]),
+                              stale=["sector"] if snapshot.stale else ())
+
+
+@app.get("/api/stock/etf/top", response_model=Optional[List[ETFItem]])
+async def stock_etf_top(request: Request):
+    return await _section_response(request, "etf_ranking")
+
+
+@app.get("/api/portfolio", response_model=Optional[Portfolio])
+async def portfolio(request: Request):
+    """업비트 + 바이낸스 통합 포트폴리오 (KRW 기준 평가금액/손익/비중)"""
+    return await _section_response(request, "portfolio")
+
+
+_RANGE_UNITS = {"h": 3600, "d": 86400, "w": 7 * 86400, "m": 30 * 86400, "y": 365 * 86400}
+
+
+@app.get("/api/portfolio/history", response_model=PortfolioHistory)
+async def portfolio_history(
+    range: str = Query("1d", description="조회 구간 (예: 6h, 1d, 7d, 3m, 1y)"),
+    resolution: str = Query("auto", description="auto | raw | hourly | daily"),
+):
+    """포트폴리오 자산 곡선 (기록 시점별 또는 시간/일 단위 OHLC 집계)"""
+    match = re.fullmatch(r"(\d+)([hdwmy])", range)
+    if not match or int(match.group(1)) <= 0:
+        raise HTTPException(status_code=400, detail=f"Invalid range: {range}")
+    if resolution not in ("auto", "raw", "hourly", "daily"):
+        raise HTTPException(status_code=400, detail=f"Invalid resolution: {resolution}")
+    span_seconds = int(match.group(1)) * _RANGE_UNITS[match.group(2)]
+    try:
+        return await get_portfolio_history(span_seconds, resolution)
+    except deadline.DeadlineExceeded:
+        raise
+    except Exception as e:
+        print(f"Error in portfolio_history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/stock/news/{query}", response_model=List[NewsItem])
-async def stock_news_search(query: str):
+async def stock_news_search(query: str, request: Request):
     """주식 뉴스 검색"""
     try:
-        data = await get_stock_news(query)
-        return [NewsItem(**item) for item in data]
+        async def produce() -> Snapshot:
+            started = time.time()
+            with deadline.budget(SECTION_FETCH_BUDGET, detached=True):
+                data = await get_stock_news(query)
+                stale = _last_good(NEWS_SNAPSHOTS, query, NEWS_UPSTREAMS, started)
+            if stale is not None:
+                return stale
+            with tracing.span("model.build", model="NewsItem", **{"result.rows": len(data)}):
+                return make_snapshot(query, data, NEWS_ADAPTER)
+
+        snapshot = await _within_budget(NEWS_SNAPSHOTS, query, NEWS_SNAPSHOTS.get(query, produce, NEWS_TTL))
+        return _snapshot_response(request, snapshot.body, snapshot.etag, _max_age([snapshot], [NEWS_TTL]),
+                                  stale=["news"] if snapshot.stale else ())
+    except deadline.DeadlineExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# === 알림 ===
+# 규칙과 알림 스트림은 워커별입니다 (멀티 워커 배포 시 규칙 등록과 구독이 같은 워커에 연결되어야 함).
+
+ALERT_KEEPALIVE = 15.0  # 초
+
+
+def _tracked_symbols(source: str, snapshots: Iterable[Optional[Snapshot]]) -> Optional[Set[str]]:
+    """소스의 전체 종목 섹션 스냅샷에 있는 종목 키. 스냅샷이 하나도 없으면 None (알 수 없음)"""
+    columns = [s.data for s in snapshots if s is not None and s.data]
+    if not columns:
+        return None
+    return {f"{source}:{symbol}" for data in columns for symbol in data["symbol"]}
+
+
+def _rule_payload(rule, tracked: Dict[str, Optional[Set[str]]]) -> dict:
+    symbols = tracked.get(rule.symbol.partition(":")[0])
+    return {**asdict(rule), "tracked": None if symbols is None else rule.symbol in symbols}
+
+
+@app.get("/api/alerts/rules", response_model=List[AlertRule])
+async def list_alert_rules():
+    # 조회 없이 마지막 전체 종목 스냅샷으로 판단 (순위 밖으로 빠진 국내/미국 종목은 tracked=false)
+    tracked = {source: _tracked_symbols(source, (SNAPSHOTS.latest(name) for name in names))
+               for source, names in UNIVERSE_SECTIONS.items()}
+    return [_rule_payload(rule, tracked) for rule in ALERTS.rules()]
+
+
+@app.post("/api/alerts/rules", response_model=AlertRule, status_code=201)
+async def create_alert_rule(rule: AlertRuleRequest):
+    """시세 소스에 없는 종목(오타, 상장 폐지, 네이버/야후 조회 범위 밖)의 규칙은 알림이 발생하지 않으므로 거부합니다."""
+    source = rule.symbol.partition(":")[0]
+    symbols = None
+    if source in UNIVERSE_SECTIONS:
+        try:
+            snapshots = await asyncio.gather(*(get_section(name) for name in UNIVERSE_SECTIONS[source]))
+        except deadline.DeadlineExceeded:
+            snapshots = []  # 전체 종목을 아직 받지 못함: 등록은 허용하고 목록 조회 시 tracked 로 알림
+        symbols = _tracked_symbols(source, snapshots)
+        if symbols is not None and rule.symbol not in symbols:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{rule.symbol} is not tracked by the {source} quote source (no ticks would reach this rule)"
+            )
+    try:
+        return _rule_payload(ALERTS.add_rule(rule.symbol, rule.kind, rule.value), {source: symbols})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.delete("/api/alerts/rules/{rule_id}", status_code=204)
+async def delete_alert_rule(rule_id: int):
+    if not ALERTS.remove_rule(rule_id):
+        raise HTTPException(status_code=404, detail=f"Alert rule {rule_id} not found")
+    return Response(status_code=204)
+
+
+@app.get("/api/alerts", response_model=List[AlertEvent])
+async def recent_alerts(after: int = Query(0, ge=0)):
+    """최근 알림 (after 이후 id)"""
+    return [asdict(alert) for alert in ALERTS.recent(after)]
+
+
+def _sse_event(alert) -> bytes:
+    data = ALERT_ADAPTER.dump_json(ALERT_ADAPTER.validate_python(asdict(alert)))
+    return b"id: %d\nevent: alert\ndata: %s\n\n" % (alert.id, data)
+
+
+@app.get("/api/alerts/stream")
+async def alert_stream(request: Request):
+    """
+    알림 스트림 (Server-Sent Events).
+    재연결 시 Last-Event-ID 이후의 최근 알림을 먼저 보냅니다.
+    """
+    try:
+        last_id = int(request.headers.get("last-event-id", "0"))
+    except ValueError:
+        last_id = 0
+    queue = ALERTS.subscribe()
+
+    async def events():
+        try:
+            sent = last_id
+            for alert in ALERTS.recent(last_id):
+                sent = alert.id
+                yield _sse_event(alert)
+            while True:
+                try:
+                    alert = await asyncio.wait_for(queue.get(), timeout=ALERT_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if alert.id > sent:
+                    sent = alert.id
+                    yield _sse_event(alert)
+        finally:
+            ALERTS.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# === 순위 섹션 변경분 ===
+# 거래량 상위 섹션은 새 스냅샷마다 이전 스냅샷과 종목 키로 비교한 delta(추가/변경/제외/순위 변경)를 버전과 함께 기록합니다.
+# 클라이언트는 처음에 전체 행(reset)을 받고, 이후에는 바뀐 행만 받아 적용합니다.
+# 버전은 스냅샷과 함께 공유 저장소에 저장되므로, 리더가 아닌 워커도 공유 스냅샷을 반영(sync)해 같은 버전을 제공합니다.
+
+DELTA_STREAM_SYNC = 1.0  # 초, 스트림이 공유 스냅샷을 다시 확인하는 간격 (다른 워커가 만든 delta 반영)
+
+
+def _delta_payload(name: str, deltas: Optional[List[Delta]]) -> bytes:
+    """deltas 가 None 이면 현재 전체 행(reset). 버전은 포함된 마지막 delta 의 버전"""
+    version, rows = DELTAS.current(name)
+    if deltas:
+        version = deltas[-1].version
+    payload = {"section": name, "key": SECTIONS[name].delta_key, "version": version, "reset": deltas is None}
+    if deltas is None:
+        payload["rows"] = rows
+    else:
+        payload["deltas"] = [{
+            "version": d.version, "base_version": d.base_version, "inserted": d.inserted, "updated": d.updated,
+            "removed": d.removed, "ranks": d.ranks, "ts": d.ts,
+        } for d in deltas]
+    return SECTION_DELTAS_ADAPTER.dump_json(SECTION_DELTAS_ADAPTER.validate_python(payload))
+
+
+async def _synced_section(name: str) -> None:
+    # 다른 워커(리더)가 만든 공유 스냅샷은 이 워커의 생성 경로를 거치지 않으므로 조회 시점에 반영
+    snapshot = await get_section(name)
+    DELTAS.sync(name, snapshot.version, snapshot.data)
+
+
+async def _sync_streamed(names: List[str]) -> None:
+    """
+    스트림 구독 중인 섹션을 공유 스냅샷과 맞춥니다. 조회로 집계되므로 리더는 다른 워커의 구독 섹션도 계속 갱신합니다.
+    조회 실패는 다음 확인 때 다시 시도합니다.
+    """
+    results = await asyncio.gather(*(_synced_section(name) for name in names), return_exceptions=True)
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"Section {name} stream sync failed: {result!r}")
+
+
+@app.get("/api/sections/{name}/deltas", response_model=SectionDeltas)
+async def section_deltas(name: str, since: Optional[int] = Query(None, ge=0, description="마지막으로 받은 버전")):
+    """
+    순위 섹션 변경분 조회.
+    since 이후의 delta 만 반환하고, since 가 없거나 보관 범위(DELTA_HISTORY) 밖이면 전체 행(reset)을 반환합니다.
+    """
+    if not DELTAS.tracks(name):
+        raise HTTPException(status_code=404,
+                            detail=f"Unknown section: {name} (available: {', '.join(DELTAS.sections())})")
+    await _synced_section(name)
+    deltas = DELTAS.since(name, since) if since is not None else None
+    return Response(content=_delta_payload(name, deltas), media_type="application/json")
+
+
+def _sse_delta(event: str, body: bytes) -> bytes:
+    return b"event: %s\ndata: %s\n\n" % (event.encode(), body)
+
+
+@app.get("/api/sections/stream")
+async def section_stream(sections: Optional[str] = None):
+    """
+    순위 섹션 변경분 스트림 (Server-Sent Events).
+    연결 시 섹션별 전체 행(reset)을 먼저 보내고, 이후 새 스냅샷마다 바뀐 행만(delta) 보냅니다.
+    구독 중인 섹션은 조회가 없어도 계속 갱신됩니다. 멀티 워커 배포에서는 리더가 갱신한 공유 스냅샷을
+    DELTA_STREAM_SYNC 마다 확인해 반영합니다.
+    """
+    names = _parse_sections(sections, DELTAS.sections())
+    queue = DELTAS.subscribe(names)
+    try:
+        await asyncio.gather(*(_synced_section(name) for name in names))
+    except BaseException:
+        DELTAS.unsubscribe(queue)
+        raise
+
+    async def events():
+        try:
+            sent = {}
+            for name in names:
+                sent[name] = DELTAS.current(name)[0]
+                yield _sse_delta("reset", _delta_payload(name, None))
+            idle_since = time.monotonic()
+            while True:
+                try:
+                    delta = await asyncio.wait_for(queue.get(), timeout=DELTA_STREAM_SYNC)
+                except asyncio.TimeoutError:
+                    # 반영된 delta 는 대기열로 들어옴
+                    await _sync_streamed(names)
+                    if time.monotonic() - idle_since >= ALERT_KEEPALIVE:
+                        idle_since = time.monotonic()
+                        yield b": keepalive\n\n"
+                    continue
+                last = sent[delta.section]
+                if delta.version <= last:
+                    continue
+                idle_since = time.monotonic()
+                if delta.base_version != last:
+                    # 대기열이 넘쳐 중간 delta 를 놓쳤으면 전체 행으로 다시 시작
+                    sent[delta.section] = DELTAS.current(delta.section)[0]
+                    yield _sse_delta("reset", _delta_payload(delta.section, None))
+                else:
+                    sent[delta.section] = delta.version
+                    yield _sse_delta("delta", _delta_payload(delta.section, [delta]))
+        finally:
+            DELTAS.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 if __name__ == "__main__":
     import uvicorn
     # reload=True is useful for dev
-    uvicorn.run("api_server:app", host="0.0.0.0", port=8000, reload=True)
+    workers = int(os.getenv("API_WORKERS", "1"))
+    if workers > 1:
+        # 멀티 워커는 reload 와 함께 쓸 수 없고, 워커 간 스냅샷 공유가 필요함
+        os.environ.setdefault("SNAPSHOT_BACKEND", "file")
+        uvicorn.run("api_server:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run("api_server:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,228 @@
+"""
+알림 규칙 엔진 모듈
+새 섹션 스냅샷(업비트/바이낸스/네이버/야후 시세)이 만들어질 때마다 사용자 규칙을 평가해 알림을 발행합니다.
+시세는 순위 섹션과 소스별 전체 종목 섹션(UNIVERSE_SECTIONS)에서 받으므로 상위 N개 밖 종목의 규칙도 평가됩니다.
+
+    price_above   : 가격이 value 를 아래에서 위로 돌파
+    price_below   : 가격이 value 를 위에서 아래로 돌파
+    volume_spike  : 24시간 거래량이 이동평균의 value 배 이상
+    change_rate   : 등락률 절댓값이 value(%) 이상
+
+규칙은 종목 키("upbit:KRW-BTC", "binance:BTCUSDT", "naver:005930", "yahoo:NVDA")로 색인되어,
+평가 비용은 전체 규칙 수가 아니라 값이 바뀐 종목 수(와 그 종목의 규칙 수)에 비례합니다.
+조건 규칙(volume_spike/change_rate)은 조건이 거짓 → 참으로 바뀔 때만 한 번 알립니다.
+규칙과 구독자는 프로세스(워커)별입니다.
+"""
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Set
+
+from backend.services.quotes import Quote
+
+RULE_KINDS = ("price_above", "price_below", "volume_spike", "change_rate")
+SOURCES = ("upbit", "binance", "naver", "yahoo")
+
+# 거래량 이동평균 (지수 이동평균, 갱신마다 반영)
+VOLUME_EMA_ALPHA = 0.1
+VOLUME_MIN_SAMPLES = 5   # 평균이 안정되기 전에는 volume_spike 를 평가하지 않음
+
+RECENT_ALERTS = 200      # 재연결 시 다시 보낼 최근 알림 수
+SUBSCRIBER_QUEUE = 100   # 구독자별 대기 알림 수 (넘치면 가장 오래된 알림부터 버림)
+
+
+@dataclass(frozen=True)
+class Tick:
+    symbol: str          # 종목 키 (source:code)
+    price: float
+    volume: float
+    change_rate: float   # %
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: int
+    symbol: str
+    kind: str
+    value: float
+    created_at: float
+
+
+@dataclass(frozen=True)
+class Alert:
+    id: int
+    rule_id: int
+    symbol: str
+    kind: str
+    threshold: float
+    observed: float
+    message: str
+    ts: float
+
+
+class _VolumeStats:
+    __slots__ = ("mean", "samples")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.samples = 0
+
+    def update(self, volume: float) -> None:
+        self.samples += 1
+        self.mean = volume if self.samples == 1 else self.mean + VOLUME_EMA_ALPHA * (volume - self.mean)
+
+
+class AlertEngine:
+    def __init__(self):
+        self._rules: Dict[int, Rule] = {}
+        self._by_symbol: Dict[str, Dict[int, Rule]] = {}
+        self._active: Set[int] = set()          # 조건이 참인 상태의 규칙 (중복 알림 방지)
+        self._last: Dict[str, Tick] = {}
+        self._volume: Dict[str, _VolumeStats] = {}
+        self._rule_ids = itertools.count(1)
+        self._alert_ids = itertools.count(1)
+        self._recent: Deque[Alert] = deque(maxlen=RECENT_ALERTS)
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    # --- 규칙 관리 ---
+
+    def add_rule(self, symbol: str, kind: str, value: float) -> Rule:
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown rule kind: {kind} (available: {', '.join(RULE_KINDS)})")
+        source, _, code = symbol.partition(":")
+        if source not in SOURCES or not code:
+            raise ValueError(f"Symbol must be <source>:<code> with source in {', '.join(SOURCES)}")
+        if value <= 0:
+            raise ValueError("Rule value must be positive")
+        rule = Rule(next(self._rule_ids), symbol, kind, float(value), time.time())
+        self._rules[rule.id] = rule
+        self._by_symbol.setdefault(symbol, {})[rule.id] = rule
+        # 조건 규칙은 마지막 시세로 바로 평가 (다음 변경을 기다리지 않음)
+        last = self._last.get(symbol)
+        if last is not None and kind not in ("price_above", "price_below"):
+            stats = self._volume[symbol]
+            alert = self._check(rule, last, None, stats.mean, stats.samples)
+            if alert is not None:
+                self._publish(alert)
+        return rule
+
+    def remove_rule(self, rule_id: int) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        rules = self._by_symbol[rule.symbol]
+        del rules[rule_id]
+        if not rules:
+            del self._by_symbol[rule.symbol]
+        self._active.discard(rule_id)
+        return True
+
+    def rules(self) -> List[Rule]:
+        return list(self._rules.values())
+
+    def watched_sources(self) -> Set[str]:
+        return {symbol.partition(":")[0] for symbol in self._by_symbol}
+
+    # --- 평가 ---
+
+    def evaluate(self, ticks: Iterable[Tick]) -> List[Alert]:
+        """새 시세 목록을 반영하고, 값이 바뀐 종목의 규칙만 평가해 발생한 알림을 반환합니다."""
+        fired = []
+        for tick in ticks:
+            prev = self._last.get(tick.symbol)
+            if prev == tick:
+                continue
+            self._last[tick.symbol] = tick
+            stats = self._volume.get(tick.symbol)
+            if stats is None:
+                stats = self._volume[tick.symbol] = _VolumeStats()
+            # 이번 값이 섞이기 전의 평균과 비교
+            volume_mean, volume_samples = stats.mean, stats.samples
+            if prev is None or prev.volume != tick.volume:
+                stats.update(tick.volume)
+            for rule in list(self._by_symbol.get(tick.symbol, {}).values()):
+                alert = self._check(rule, tick, prev, volume_mean, volume_samples)
+                if alert is not None:
+                    fired.append(alert)
+        for alert in fired:
+            self._publish(alert)
+        return fired
+
+    def _check(self, rule: Rule, tick: Tick, prev: Optional[Tick],
+               volume_mean: float, volume_samples: int) -> Optional[Alert]:
+        if rule.kind == "price_above":
+            if prev is not None and prev.price < rule.value <= tick.price:
+                return self._alert(rule, tick.price, f"{rule.symbol} 가격 {tick.price:,.4g} 이(가) {rule.value:,.4g} 상향 돌파")
+            return None
+        if rule.kind == "price_below":
+            if prev is not None and prev.price > rule.value >= tick.price:
+                return self._alert(rule, tick.price, f"{rule.symbol} 가격 {tick.price:,.4g} 이(가) {rule.value:,.4g} 하향 돌파")
+            return None
+        if rule.kind == "volume_spike":
+            ratio = tick.volume / volume_mean if volume_samples >= VOLUME_MIN_SAMPLES and volume_mean > 0 else 0.0
+            return self._edge(rule, ratio >= rule.value, ratio,
+                              f"{rule.symbol} 24시간 거래량이 평균의 {ratio:.1f}배")
+        # change_rate
+        return self._edge(rule, abs(tick.change_rate) >= rule.value, tick.change_rate,
+                          f"{rule.symbol} 등락률 {tick.change_rate:+.2f}%")
+
+    def _edge(self, rule: Rule, condition: bool, observed: float, message: str) -> Optional[Alert]:
+        if not condition:
+            self._active.discard(rule.id)
+            return None
+        if rule.id in self._active:
+            return None
+        self._active.add(rule.id)
+        return self._alert(rule, observed, message)
+
+    def _alert(self, rule: Rule, observed: float, message: str) -> Alert:
+        return Alert(next(self._alert_ids), rule.id, rule.symbol, rule.kind, rule.value, observed, message, time.time())
+
+    # --- 발행/구독 ---
+
+    def _publish(self, alert: Alert) -> None:
+        self._recent.append(alert)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(alert)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def recent(self, after_id: int = 0) -> List[Alert]:
+        return [alert for alert in self._recent if alert.id > after_id]
+
+
+# === 섹션 시세 레코드 → 틱 ===
+
+# 소스별 전체 종목 섹션. 순위(상위 N) 밖 종목의 규칙도 평가하고, 규칙 등록 시 추적 가능한 종목인지 확인
+UNIVERSE_SECTIONS = {
+    "upbit": ("upbit_universe",),
+    "binance": ("binance_universe",),
+    "naver": ("kospi_universe", "kosdaq_universe"),
+    "yahoo": ("us_universe", "etf_universe"),
+}
+
+SECTION_SOURCES = {
+    "upbit_top_volume": "upbit",
+    "binance_top_volume": "binance",
+    "kospi_top": "naver",
+    "kosdaq_top": "naver",
+    "us_top": "yahoo",
+    "etf_ranking": "yahoo",
+    **{name: source for source, names in UNIVERSE_SECTIONS.items() for name in names},
+}
+
+
+def ticks_from_section(name: str, quotes: Optional[List[Quote]]) -> List[Tick]:
+    if name not in SECTION_SOURCES or not quotes:
+        return []
+    return [Tick(q.key, q.price, q.volume, q.change_rate) for q in quotes]
@@ -1,196 +1,215 @@
 """
 바이낸스(Binance) API 모듈
-잔액 조회, 보유 코인 조회, 거래량 상위 코인 조회 기능 제공 (Async with anyio)
+잔액 조회, 보유 코인 조회, 거래량 상위 코인 조회, 전체 USDT 마켓 시세 조회 기능 제공 (Async, exchange 익스큐터)
 """
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
-from typing import Optional
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
 from backend.services.config import BINANCE_ACCESS_KEY, BINANCE_SECRET_KEY, validate_binance_keys
-from anyio import to_thread
+from backend.services.metrics import instrument
+from backend.services import circuit, executors, httpclient, tracing
+from backend.services.lazy import lazy_import
+from backend.services.quotes import Quote
 
-def _get_binance_client_sync() -> Optional[Client]:
+binance_client = lazy_import("binance.client")  # aiohttp/dateparser 를 함께 불러오므로 첫 호출 시 import
+
+# 클라이언트는 프로세스당 하나만 만들어 재사용 (생성 시 ping 요청이 나가므로 호출마다 만들지 않음)
+_CLIENT: Optional["binance_client.Client"] = None
+_CLIENT_LOCK = threading.Lock()
+
+def _get_binance_client_sync() -> Optional["binance_client.Client"]:
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
     if not validate_binance_keys():
         return None
-    try:
-        return Client(BINANCE_ACCESS_KEY, BINANCE_SECRET_KEY)
-    except Exception as e:
-        print(f"❌ Binance 클라이언트 생성 실패: {e}")
-        return None
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            try:
+                _CLIENT = binance_client.Client(BINANCE_ACCESS_KEY, BINANCE_SECRET_KEY)
+            except Exception as e:
+                print(f"❌ Binance 클라이언트 생성 실패: {e}")
+                return None
+    return _CLIENT
+
+def _fetch_account(client) -> list:
+    # SDK 호출도 바이낸스 브레이커에 기록 (실패하면 계정 섹션이 마지막 정상 스냅샷을 stale 로 제공)
+    with circuit.guard("binance"), tracing.span("binance.get_account", kind=tracing.KIND_CLIENT):
+        account = client.get_account()
+    return account['balances']
+
+
+def _usdt_balance(balances: list) -> dict:
+    usdt_balance = {"total_usdt": 0, "available_usdt": 0, "locked_usdt": 0}
+    for balance in balances:
+        if balance['asset'] == 'USDT':
+            usdt_balance['available_usdt'] = float(balance['free'])
+            usdt_balance['locked_usdt'] = float(balance['locked'])
+            usdt_balance['total_usdt'] = usdt_balance['available_usdt'] + usdt_balance['locked_usdt']
+            break
+    return usdt_balance
 
+
+def _valuate_holdings(client, balances: list) -> list:
+    holdings = []
+
+    # Get all prices efficiently
+    # get_all_tickers returns list of dicts [{'symbol': 'BTCUSDT', 'price': '...'}]
+    with circuit.guard("binance"), tracing.span("binance.get_all_tickers", kind=tracing.KIND_CLIENT) as sp:
+        tickers = client.get_all_tickers()
+        sp.set_attribute("result.rows", len(tickers))
+    price_map = {t['symbol']: float(t['price']) for t in tickers}
+
+    for balance in balances:
+        asset = balance['asset']
+        if asset == 'USDT':
+            continue
+
+        free = float(balance['free'])
+        locked = float(balance['locked'])
+        total = free + locked
+
+        if total > 0:
+            # Estimate price in USDT
+            symbol = f"{asset}USDT"
+            current_price = price_map.get(symbol, 0.0)
+
+            # Filter small dust
+            eval_amount = total * current_price
+            if eval_amount < 1: # Skip dust < 1 USDT
+                continue
+
+            holdings.append({
+                "asset": asset,
+                "symbol": symbol,
+                "total": total,
+                "current_price": current_price,
+                "eval_amount": eval_amount
+            })
+
+    holdings.sort(key=lambda x: x['eval_amount'], reverse=True)
+    return holdings
+
+
+@instrument("binance_balance")
 def _get_binance_balance_sync() -> Optional[dict]:
     client = _get_binance_client_sync()
     if not client:
         return None
     try:
-        account = client.get_account()
-        balances = account['balances']
-        usdt_balance = {"total_usdt": 0, "available_usdt": 0, "locked_usdt": 0}
-        for balance in balances:
-            if balance['asset'] == 'USDT':
-                usdt_balance['available_usdt'] = float(balance['free'])
-                usdt_balance['locked_usdt'] = float(balance['locked'])
-                usdt_balance['total_usdt'] = usdt_balance['available_usdt'] + usdt_balance['locked_usdt']
-                break
-        return usdt_balance
+        return _usdt_balance(_fetch_account(client))
     except Exception as e:
         print(f"❌ 잔액 조회 실패: {e}")
         return None
 
-async def get_binance_balance() -> Optional[dict]:
-    return await to_thread.run_sync(_get_binance_balance_sync)
-
+@instrument("binance_holdings")
 def _get_binance_holdings_sync() -> Optional[list]:
     client = _get_binance_client_sync()
     if not client:
         return None
     try:
-        account = client.get_account()
-        balances = account['balances']
-        holdings = []
-        
-        # Get all prices efficiently
-        # get_all_tickers returns list of dicts [{'symbol': 'BTCUSDT', 'price': '...'}]
-        tickers = client.get_all_tickers()
-        price_map = {t['symbol']: float(t['price']) for t in tickers}
-        
-        for balance in balances:
-            asset = balance['asset']
-            if asset == 'USDT':
-                continue
-                
-            free = float(balance['free'])
-            locked = float(balance['locked'])
-            total = free + locked
-            
-            if total > 0:
-                # Estimate price in USDT
-                symbol = f"{asset}USDT"
-                current_price = price_map.get(symbol, 0.0)
-                
-                # Filter small dust
-                eval_amount = total * current_price
-                if eval_amount < 1: # Skip dust < 1 USDT
-                    continue
-                    
-                holdings.append({
-                    "asset": asset,
-                    "symbol": symbol,
-                    "total": total,
-                    "current_price": current_price,
-                    "eval_amount": eval_amount
-                })
-        
-        holdings.sort(key=lambda x: x['eval_amount'], reverse=True)
-        return holdings
+        return _valuate_holdings(client, _fetch_account(client))
     except Exception as e:
         print(f"❌ 보유 코인 조회 실패: {e}")
         return None
 
-async def get_binance_holdings() -> Optional[list]:
-    return await to_thread.run_sync(_get_binance_holdings_sync)
+@instrument("binance_account")
+def _get_binance_account_sync() -> Tuple[Optional[dict], Optional[list]]:
+    """잔액과 보유 코인을 계좌 조회 한 번으로 함께 반환합니다 (CLI 용)."""
+    client = _get_binance_client_sync()
+    if not client:
+        return None, None
+    try:
+        balances = _fetch_account(client)
+    except Exception as e:
+        print(f"❌ 계좌 조회 실패: {e}")
+        return None, None
+    try:
+        holdings = _valuate_holdings(client, balances)
+    except Exception as e:
+        print(f"❌ 보유 코인 조회 실패: {e}")
+        holdings = None
+    return _usdt_balance(balances), holdings
 
-def _get_binance_top_volume_coins_sync(limit: int = 10) -> Optional[list]:
+@instrument("binance_top_volume")
+def _get_binance_top_volume_coins_sync(limit: int = 10, usdt_krw: Optional[float] = None) -> Optional[List[Quote]]:
     try:
-        import requests
         url = "https://api.binance.com/api/v3/ticker/24hr"
-        response = requests.get(url, timeout=5)
+        response = httpclient.get(url, timeout=5)
         
         if response.status_code != 200:
             return None
             
-        tickers = response.json()
+        with tracing.span("decode", **{"input.bytes": len(response.content)}) as sp:
+            tickers = response.json()
+            sp.set_attribute("result.rows", len(tickers))
         
-        # Filter USDT pairs only
-        usdt_tickers = [t for t in tickers if t['symbol'].endswith('USDT')]
-        
-        # Sort by quoteVolume (USDT volume)
-        sorted_tickers = sorted(usdt_tickers, key=lambda x: float(x['quoteVolume']), reverse=True)
-        
-        top_coins = []
-        for t in sorted_tickers[:limit]:
-            symbol = t['symbol']
-            base_asset = symbol.replace("USDT", "")
-            current_price = float(t['lastPrice'])
-            price_change_percent = float(t['priceChangePercent'])
-            quote_volume = float(t['quoteVolume'])
-            
-            top_coins.append({
-                "symbol": symbol,
-                "base_asset": base_asset,
-                "current_price": current_price,
-                "price_change_percent": price_change_percent,
-                "quote_volume": quote_volume,
-                "trade_volume": quote_volume,
-                "trade_price": quote_volume
-            })
+        with tracing.span("transform") as sp:
+            top_coins = executors.run_cpu(_build_top_coins, tickers, limit, usdt_krw)
+            sp.set_attribute("result.rows", len(top_coins))
         return top_coins
     except Exception as e:
         print(f"❌ 상위 코인 조회 실패: {e}")
         return None
 
-# Async Wrappers using loop.run_in_executor as requested
-import asyncio
-from functools import partial
 
-async def get_binance_balance() -> Optional[dict]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_binance_balance_sync)
+def _build_top_coins(tickers: list, limit: int, usdt_krw: Optional[float]) -> List[Quote]:
+    # 환율을 모르면 KRW 환산 값은 nan (응답에서는 null)
+    if usdt_krw is None:
+        usdt_krw = math.nan
+    # Filter USDT pairs only
+    usdt_tickers = [t for t in tickers if t['symbol'].endswith('USDT')]
+    
+    # Sort by quoteVolume (USDT volume)
+    sorted_tickers = sorted(usdt_tickers, key=lambda x: float(x['quoteVolume']), reverse=True)
+    
+    top_coins = []
+    for t in sorted_tickers[:limit]:
+        symbol = t['symbol']
+        current_price = float(t['lastPrice'])
+        quote_volume = float(t['quoteVolume'])
+        
+        top_coins.append(Quote(
+            source="binance",
+            symbol=symbol,
+            name=symbol.replace("USDT", ""),  # base asset
+            price=current_price,
+            change_rate=float(t['priceChangePercent']),
+            volume=float(t['volume']),
+            trade_value=quote_volume,
+            price_krw=current_price * usdt_krw,
+            trade_value_krw=quote_volume * usdt_krw,
+        ))
+    return top_coins
 
-async def get_binance_holdings() -> Optional[list]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_binance_holdings_sync)
 
-def _get_binance_top_volume_coins_sync(limit: int = 10, usdt_krw: float = 1450.0) -> Optional[list]:
+@instrument("binance_prices")
+def _get_binance_usdt_prices_sync() -> Optional[Dict[str, float]]:
+    """전체 USDT 마켓 현재가 (기준 자산 → USDT 가격)"""
     try:
-        import requests
-        url = "https://api.binance.com/api/v3/ticker/24hr"
-        response = requests.get(url, timeout=5)
-        
+        response = httpclient.get("https://api.binance.com/api/v3/ticker/price", timeout=5)
         if response.status_code != 200:
             return None
-            
-        tickers = response.json()
-        
-        # Filter USDT pairs only
-        usdt_tickers = [t for t in tickers if t['symbol'].endswith('USDT')]
-        
-        # Sort by quoteVolume (USDT volume)
-        sorted_tickers = sorted(usdt_tickers, key=lambda x: float(x['quoteVolume']), reverse=True)
-        
-        top_coins = []
-        for t in sorted_tickers[:limit]:
-            symbol = t['symbol']
-            base_asset = symbol.replace("USDT", "")
-            current_price = float(t['lastPrice'])
-            price_change_percent = float(t['priceChangePercent'])
-            quote_volume = float(t['quoteVolume'])
-            
-            top_coins.append({
-                "symbol": symbol,
-                "base_asset": base_asset,
-                "current_price": current_price,
-                "price_change_percent": price_change_percent,
-                "quote_volume": quote_volume,
-                "current_price_krw": current_price * usdt_krw,
-                "quote_volume_krw": quote_volume * usdt_krw
-            })
-        return top_coins
+        return {
+            t['symbol'][:-len("USDT")]: float(t['price'])
+            for t in response.json() if t['symbol'].endswith('USDT')
+        }
     except Exception as e:
-        print(f"❌ 상위 코인 조회 실패: {e}")
+        print(f"❌ USDT 마켓 시세 조회 실패: {e}")
         return None
 
-# Async Wrappers using loop.run_in_executor as requested
-import asyncio
-from functools import partial
-
+# Async Wrappers (거래소 호출 전용 익스큐터)
 async def get_binance_balance() -> Optional[dict]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_binance_balance_sync)
+    return await executors.run(executors.EXCHANGE, _get_binance_balance_sync)
 
 async def get_binance_holdings() -> Optional[list]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_binance_holdings_sync)
+    return await executors.run(executors.EXCHANGE, _get_binance_holdings_sync)
+
+async def get_binance_account() -> Tuple[Optional[dict], Optional[list]]:
+    return await executors.run(executors.EXCHANGE, _get_binance_account_sync)
+
+async def get_binance_top_volume_coins(limit: int = 10, usdt_krw: Optional[float] = None) -> Optional[List[Quote]]:
+    return await executors.run(executors.EXCHANGE, _get_binance_top_volume_coins_sync, limit, usdt_krw)
 
-async def get_binance_top_volume_coins(limit: int = 10, usdt_krw: float = 1450.0):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_binance_top_volume_coins_sync, limit, usdt_krw))
+async def get_binance_usdt_prices() -> Optional[Dict[str, float]]:
+    return await executors.run(executors.EXCHANGE, _get_binance_usdt_prices_sync)
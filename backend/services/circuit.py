@@ -0,0 +1,168 @@
+"""
+서킷 브레이커 모듈
+업스트림별로 연속 실패를 세고, 임계값을 넘으면 일정 시간 호출을 차단(open)합니다.
+차단 중에는 타임아웃(5초)을 기다리지 않고 즉시 CircuitOpenError 로 실패하며,
+재시도 시각이 지나면(half-open) 한 번의 시험 호출만 통과시켜 복구 여부를 확인합니다.
+
+    CIRCUIT_FAILURE_THRESHOLD=3   (open 으로 전환되는 연속 실패 횟수)
+    CIRCUIT_RESET_TIMEOUT=30      (open 유지 시간(초), 이후 시험 호출 허용)
+
+요청 데드라인(DeadlineExceeded)으로 중단된 호출은 업스트림 장애가 아니므로 성공/실패 어느 쪽으로도 세지 않습니다.
+브레이커 상태는 프로세스(워커)별입니다.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from backend.services import metrics
+from backend.services.deadline import DeadlineExceeded
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+# 호스트 → 업스트림 이름 (등록되지 않은 호스트는 호스트 이름을 그대로 사용)
+UPSTREAM_HOSTS = {
+    "api.upbit.com": "upbit",
+    "api.binance.com": "binance",
+    "finance.naver.com": "naver",
+    "polling.finance.naver.com": "naver",
+    "news.google.com": "google_news",
+    "api.alternative.me": "alternative_me",
+    "api.whale-alert.io": "whale_alert",
+    "query1.finance.yahoo.com": "yahoo",
+    "query2.finance.yahoo.com": "yahoo",
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """업스트림 브레이커가 열려 있어 호출하지 않고 실패함"""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_failure_at = 0.0
+        self._trial_inflight = False
+        self._lock = threading.Lock()
+        metrics.CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], upstream=name)
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            print(f"Circuit {self.name}: {self.state} -> {state}")
+            self.state = state
+            metrics.CIRCUIT_STATE.set(_STATE_VALUES[state], upstream=self.name)
+
+    def probe_due(self) -> bool:
+        """open 상태이고 재시도 시각이 지났는지 (백그라운드 프로브 대상)"""
+        return self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.probe_due():
+                self._transition(HALF_OPEN)
+            # half-open 에서는 시험 호출 하나만 통과
+            if self.state == HALF_OPEN and not self._trial_inflight:
+                self._trial_inflight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_inflight = False
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.time()
+            self.failures += 1
+            self.last_failure_at = now
+            self._trial_inflight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = now
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출 (데드라인 초과). half-open 시험 호출 자리만 돌려줌"""
+        with self._lock:
+            self._trial_inflight = False
+
+    def degraded_since(self, ts: float) -> bool:
+        """ts 이후 실패했거나 현재 차단 중인지 (해당 시점 이후의 응답을 신뢰할 수 없음)"""
+        return self.state != CLOSED or self.last_failure_at >= ts
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(upstream, CircuitBreaker(upstream))
+    return breaker
+
+
+def upstream_for(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    return UPSTREAM_HOSTS.get(host, host)
+
+
+def before_call(upstream: str) -> CircuitBreaker:
+    """호출 전 확인. 차단 중이면 CircuitOpenError 를 발생시킵니다."""
+    breaker = get_breaker(upstream)
+    if not breaker.allow():
+        metrics.CIRCUIT_REJECTED.inc(upstream=upstream)
+        raise CircuitOpenError(f"{upstream} circuit is open")
+    return breaker
+
+
+@contextmanager
+def guard(upstream: str):
+    """블록 안에서 예외가 발생하면 실패, 정상 종료하면 성공으로 기록합니다 (SDK 호출용)."""
+    breaker = before_call(upstream)
+    try:
+        yield breaker
+    except DeadlineExceeded:
+        breaker.release()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+
+
+def degraded_since(upstreams: Iterable[str], ts: float) -> bool:
+    return any(get_breaker(u).degraded_since(ts) for u in upstreams)
+
+
+def due_for_probe() -> List[str]:
+    return [name for name, breaker in list(_breakers.items()) if breaker.probe_due()]
+
+
+def states() -> Dict[str, str]:
+    return {name: breaker.state for name, breaker in list(_breakers.items())}
+
+
+def reset(upstream: Optional[str] = None) -> None:
+    """브레이커 상태 초기화 (테스트/벤치마크용)"""
+    with _registry_lock:
+        for name in [upstream] if upstream else list(_breakers):
+            _breakers.pop(name, None)
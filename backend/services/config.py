@@ -16,10 +16,23 @@ UPBIT_SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
 BINANCE_ACCESS_KEY = os.getenv("BINANCE_ACCESS_KEY")
 BINANCE_SECRET_KEY = os.getenv("BINANCE_SECRET_KEY")
 
+# Whale Alert API 설정 (고래 이체 피드, 없으면 시뮬레이션 데이터 사용)
+WHALE_ALERT_API_KEY = os.getenv("WHALE_ALERT_API_KEY")
+
+
+def upbit_configured() -> bool:
+    """Upbit API 키가 설정되어 있는지 (메시지 출력 없음)"""
+    return bool(UPBIT_ACCESS_KEY and UPBIT_SECRET_KEY)
+
+
+def binance_configured() -> bool:
+    """Binance API 키가 설정되어 있는지 (메시지 출력 없음)"""
+    return bool(BINANCE_ACCESS_KEY and BINANCE_SECRET_KEY)
+
 
 def validate_upbit_keys() -> bool:
     """Upbit API 키가 설정되어 있는지 확인합니다."""
-    if not UPBIT_ACCESS_KEY or not UPBIT_SECRET_KEY:
+    if not upbit_configured():
         print("❌ Upbit API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
         return False
     return True
@@ -27,7 +40,7 @@ def validate_upbit_keys() -> bool:
 
 def validate_binance_keys() -> bool:
     """Binance API 키가 설정되어 있는지 확인합니다."""
-    if not BINANCE_ACCESS_KEY or not BINANCE_SECRET_KEY:
+    if not binance_configured():
         print("❌ Binance API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
         return False
     return True
@@ -0,0 +1,101 @@
+"""
+데드라인 모듈
+요청(또는 섹션 생성) 단위로 전체 지연 예산을 정하고, 그 안에서 실행되는 모든 하위 호출이
+남은 시간만 사용하도록 합니다. 데드라인은 contextvar 로 전달되므로 익스큐터 워커 스레드
+(executors.run 이 컨텍스트를 복사)와 내부 태스크에도 그대로 적용됩니다.
+
+    with deadline.budget(8):                       # 이 블록 전체 예산 8초 (바깥 예산이 더 짧으면 그쪽)
+        httpclient.get(url, timeout=5)             # min(5, 남은 시간) 으로 요청, 이미 지났으면 요청하지 않음
+        await deadline.wait(some_coroutine())      # 남은 시간 안에 끝나지 않으면 취소하고 DeadlineExceeded
+
+데드라인이 지나면 대기열에서 아직 시작하지 않은 익스큐터 작업은 취소되고,
+이미 실행 중인 동기 작업은 다음 확인 지점(HTTP 호출, check())에서 중단됩니다.
+데드라인이 없으면(백그라운드 작업 등) 모든 함수는 기존 타임아웃을 그대로 사용합니다.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 절대 마감 시각 (time.monotonic 기준), 없으면 None
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청/섹션의 지연 예산을 모두 사용함 (업스트림 장애가 아니므로 브레이커에 실패로 기록하지 않음)"""
+
+
+@contextmanager
+def budget(seconds: Optional[float], detached: bool = False) -> Iterator[None]:
+    """
+    블록 안의 작업에 seconds 초 예산을 부여합니다 (None 또는 0 이하면 예산 없음).
+    바깥 데드라인이 더 이르면 바깥 데드라인을 유지합니다.
+    detached=True 이면 바깥 데드라인과 무관하게 새 예산을 사용합니다
+    (여러 요청이 함께 기다리는 공유 작업이 먼저 온 요청의 예산에 묶이지 않도록).
+    """
+    deadline = None if detached else _DEADLINE.get()
+    if seconds is not None and seconds > 0:
+        own = time.monotonic() + seconds
+        deadline = own if deadline is None else min(deadline, own)
+    token = _DEADLINE.set(deadline)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초). 데드라인이 없으면 None"""
+    deadline = _DEADLINE.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """데드라인이 지났으면 DeadlineExceeded (반복 호출 사이의 확인 지점)"""
+    if expired():
+        raise DeadlineExceeded("deadline exceeded")
+
+
+def timeout(default: float) -> float:
+    """하위 호출에 쓸 타임아웃: min(default, 남은 시간). 이미 지났으면 DeadlineExceeded"""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("deadline exceeded")
+    return min(default, left)
+
+
+def share(fraction: float, cap: Optional[float] = None) -> Optional[float]:
+    """남은 시간의 일부(초). 뒤에 이어지는 단계가 쓸 시간을 남겨 둘 때 사용합니다."""
+    left = remaining()
+    if left is None:
+        return cap
+    left = max(0.0, left) * fraction
+    return left if cap is None else min(left, cap)
+
+
+async def wait(awaitable: Awaitable[T]) -> T:
+    """남은 시간 안에 awaitable 을 기다립니다. 시간이 지나면 취소하고 DeadlineExceeded"""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        # 코루틴은 시작하지 않은 채로 닫고, Future 는 취소
+        future = asyncio.ensure_future(awaitable)
+        future.cancel()
+        raise DeadlineExceeded("deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except DeadlineExceeded:
+        raise
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"deadline exceeded after waiting {left:.2f}s") from None
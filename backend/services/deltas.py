@@ -0,0 +1,177 @@
+"""
+스냅샷 차분 모듈
+순위 섹션(업비트/바이낸스/코스피/코스닥/미국/ETF 거래량 상위)의 연속된 스냅샷을 종목 키로 비교해
+바뀐 부분(delta)만 만듭니다. 행은 응답 JSON 과 같은 형식(alias 기준, nan → null)으로 비교합니다.
+
+    inserted : 새로 순위에 든 행 (행 전체)
+    updated  : 값이 바뀐 행 (키 → 바뀐 필드만)
+    removed  : 순위에서 빠진 키
+    ranks    : 순위가 바뀐 키(새로 든 행 포함) → 새 순위 (0부터). 없는 키는 이전 순위 그대로
+
+섹션마다 변경이 있을 때만 버전을 올리고, 최근 DELTA_HISTORY 개를 보관해
+클라이언트가 ?since=버전 이후의 변경분만 받을 수 있게 합니다 (보관 범위 밖이면 전체 행으로 다시 시작).
+
+버전은 변경을 만든 시각(ms, 이전 버전보다 항상 큼)이며 스냅샷과 함께 공유 저장소에 저장됩니다.
+다른 워커(리더)가 만든 스냅샷은 sync() 로 이 워커의 현재 행과 비교해 같은 버전의 delta 로 반영하므로,
+어느 워커에 연결해도 같은 버전 번호를 보게 됩니다 (워커가 건너뛴 중간 버전은 delta 하나로 합쳐짐).
+구독자는 프로세스(워커)별입니다.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+DELTA_HISTORY = int(os.getenv("DELTA_HISTORY", "120"))   # 섹션별 보관 delta 수
+SUBSCRIBER_QUEUE = 100   # 구독자별 대기 delta 수 (넘치면 가장 오래된 것부터 버림 → 구독자는 전체 행으로 다시 시작)
+
+
+@dataclass(frozen=True)
+class Delta:
+    section: str
+    key: str                        # 행의 종목 키 필드 (market, symbol, code)
+    version: int
+    base_version: int               # 이 delta 를 적용할 이전 버전
+    inserted: List[dict]
+    updated: Dict[str, dict]
+    removed: List[str]
+    ranks: Dict[str, int]
+    ts: float
+
+    def changed_keys(self) -> Set[str]:
+        """값이 바뀌었거나 새로 든 행의 키 (순위만 바뀐 행은 제외)"""
+        return set(self.updated).union(row[self.key] for row in self.inserted)
+
+
+def _same(a, b) -> bool:
+    # nan 은 자기 자신과 같지 않으므로 별도 처리 (v != v 는 nan 일 때만 참)
+    return a == b or (a != a and b != b)
+
+
+def diff_rows(key: str, previous: List[dict], index: Dict[str, int], rows: List[dict]
+              ) -> Tuple[List[dict], Dict[str, dict], List[str], Dict[str, int], Dict[str, int]]:
+    """
+    이전 행(previous, 키 → 순위 index)과 새 행을 비교합니다.
+    반환: (inserted, updated, removed, ranks, 새 index)
+    """
+    new_index: Dict[str, int] = {}
+    inserted: List[dict] = []
+    updated: Dict[str, dict] = {}
+    ranks: Dict[str, int] = {}
+    for rank, row in enumerate(rows):
+        code = row[key]
+        new_index[code] = rank
+        old_rank = index.get(code)
+        if old_rank is None:
+            inserted.append(row)
+            ranks[code] = rank
+            continue
+        if old_rank != rank:
+            ranks[code] = rank
+        old = previous[old_rank]
+        if old is row:
+            continue
+        changed = {field: value for field, value in row.items() if field not in old or not _same(old[field], value)}
+        if changed:
+            updated[code] = changed
+    removed = [code for code in index if code not in new_index]
+    return inserted, updated, removed, ranks, new_index
+
+
+class _SectionLog:
+    __slots__ = ("key", "rows", "index", "version", "history")
+
+    def __init__(self, key: str, history: int):
+        self.key = key
+        self.rows: List[dict] = []
+        self.index: Dict[str, int] = {}
+        self.version = 0
+        self.history: Deque[Delta] = deque(maxlen=history)
+
+
+class DeltaBook:
+    """섹션별 현재 행 + 버전 + 최근 delta 보관, delta 구독자에게 발행"""
+
+    def __init__(self, keys: Dict[str, str], history: int = DELTA_HISTORY):
+        self._logs: Dict[str, _SectionLog] = {name: _SectionLog(key, history) for name, key in keys.items()}
+        self._subscribers: Dict[asyncio.Queue, FrozenSet[str]] = {}
+
+    def tracks(self, name: str) -> bool:
+        return name in self._logs
+
+    def sections(self) -> List[str]:
+        return list(self._logs)
+
+    def update(self, name: str, rows: Optional[List[dict]]) -> Optional[Delta]:
+        """
+        새 행 목록을 반영합니다. 바뀐 것이 없으면 None (버전 유지, 이전 행 객체 유지)
+        rows 가 None/빈 목록이면 조회 실패로 보고 반영하지 않습니다 (순위 섹션이 실제로 비는 경우는 없음).
+        """
+        log = self._logs[name]
+        return self._apply(name, log, rows, max(log.version + 1, int(time.time() * 1000)))
+
+    def sync(self, name: str, version: Optional[int], rows: Optional[List[dict]]) -> Optional[Delta]:
+        """
+        다른 워커가 만든(공유 저장소의) version 스냅샷 행을 반영합니다.
+        이 워커의 현재 버전보다 새 버전일 때만 현재 행과 비교해 그 버전의 delta 를 기록합니다
+        (행이 같아도 버전을 맞추기 위해 빈 delta 를 기록).
+        """
+        log = self._logs[name]
+        if version is None or version <= log.version:
+            return None
+        return self._apply(name, log, rows, version, always=True)
+
+    def _apply(self, name: str, log: _SectionLog, rows: Optional[List[dict]], version: int,
+               always: bool = False) -> Optional[Delta]:
+        if not rows or (rows is log.rows and not always):
+            return None
+        inserted, updated, removed, ranks, index = diff_rows(log.key, log.rows, log.index, rows)
+        if not (inserted or updated or removed or ranks or always):
+            return None
+        delta = Delta(name, log.key, version, log.version, inserted, updated, removed, ranks, time.time())
+        log.rows, log.index, log.version = rows, index, delta.version
+        log.history.append(delta)
+        self._publish(delta)
+        return delta
+
+    def current(self, name: str) -> Tuple[int, List[dict]]:
+        """(버전, 현재 행)"""
+        log = self._logs[name]
+        return log.version, log.rows
+
+    def since(self, name: str, version: int) -> Optional[List[Delta]]:
+        """
+        version 이후의 delta 목록. 보관 범위 밖이거나 이 워커가 모르는 버전(다른 워커에서 받은 중간 버전 등)이면
+        None (전체 행으로 다시 시작)
+        """
+        log = self._logs[name]
+        if version == log.version:
+            return []
+        history = list(log.history)
+        for i, delta in enumerate(history):
+            if delta.base_version == version:
+                return history[i:]
+        return None
+
+    # --- 발행/구독 ---
+
+    def _publish(self, delta: Delta) -> None:
+        for queue, names in self._subscribers.items():
+            if delta.section not in names:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(delta)
+
+    def subscribe(self, names: Iterable[str]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+        self._subscribers[queue] = frozenset(names)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.pop(queue, None)
+
+    def watched(self) -> Set[str]:
+        """구독자가 있는 섹션 (조회가 없어도 계속 갱신)"""
+        return set().union(*self._subscribers.values()) if self._subscribers else set()
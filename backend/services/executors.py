@@ -0,0 +1,154 @@
+"""
+익스큐터 모듈
+워크로드 종류별로 크기가 제한된 익스큐터를 분리해, 느린 소스가 다른 소스의 워커를 점유하지 못하게 합니다.
+
+    exchange : 업비트/바이낸스 API 호출 (빠른 I/O)          EXECUTOR_EXCHANGE_WORKERS=16
+    web      : Naver/Yahoo/RSS 등 외부 웹 호출 (느린 I/O)   EXECUTOR_WEB_WORKERS=16
+    storage  : 로컬 SQLite 등 저장소 I/O                    EXECUTOR_STORAGE_WORKERS=2
+    cpu      : HTML 파싱, DataFrame/리스트 변환 (CPU)       EXECUTOR_CPU_WORKERS=CPU 코어 수
+               CPU_EXECUTOR=thread|process (process 이면 GIL 없이 병렬 처리)
+
+워크로드별 대기열 깊이와 대기 시간(제출 → 실행 시작)은 /metrics 로 노출됩니다.
+요청 데드라인(services.deadline)이 있으면 남은 시간까지만 기다리고, 그때까지 시작하지 못한 작업은 취소합니다.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Callable, Dict
+
+from backend.services import deadline, metrics, tracing
+
+EXCHANGE = "exchange"
+WEB = "web"
+STORAGE = "storage"
+CPU = "cpu"
+
+_DEFAULT_WORKERS = {
+    EXCHANGE: 16,
+    WEB: 16,
+    STORAGE: 2,
+    CPU: os.cpu_count() or 2,
+}
+
+_executors: Dict[str, Executor] = {}
+_inflight: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _workers(kind: str) -> int:
+    return max(1, int(os.getenv(f"EXECUTOR_{kind.upper()}_WORKERS", str(_DEFAULT_WORKERS[kind]))))
+
+
+def _uses_processes(kind: str) -> bool:
+    return kind == CPU and os.getenv("CPU_EXECUTOR", "thread").lower() == "process"
+
+
+def _create(kind: str) -> Executor:
+    workers = _workers(kind)
+    if _uses_processes(kind):
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # 프로세스 풀은 내부 대기열을 노출하지 않으므로 실행 중인 작업 수로 대기 건수를 추정
+        metrics.EXECUTOR_QUEUE_DEPTH.set_function(lambda: max(0, _inflight.get(kind, 0) - workers), executor=kind)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{kind}")
+        metrics.track_executor(kind, executor)
+    metrics.EXECUTOR_WORKERS.set(workers, executor=kind)
+    return executor
+
+
+def get_executor(kind: str) -> Executor:
+    executor = _executors.get(kind)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(kind)
+            if executor is None:
+                _inflight[kind] = 0
+                executor = _executors[kind] = _create(kind)
+    return executor
+
+
+def shutdown() -> None:
+    with _lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
+
+
+def _timed_call(func: Callable, args: tuple, kwargs: dict):
+    """
+    워커에서 실행 시작 시각과 (결과, 예외)를 함께 반환 (프로세스 풀에서도 동작하도록 모듈 최상위 함수).
+    예외도 값으로 돌려받아, 실패한 작업의 대기 시간도 실제 시작 시각 기준으로 기록합니다.
+    """
+    started = time.time()
+    try:
+        return started, func(*args, **kwargs), None
+    except Exception as e:
+        return started, None, e
+
+
+def _submit(kind: str, executor: Executor, call: Callable) -> Future:
+    """
+    작업을 제출하고 실행 중인 작업 수에 더합니다. 수는 호출자가 기다림을 그만둘 때가 아니라
+    작업이 실제로 끝나거나 취소될 때 줄어듭니다 (데드라인 초과 후에도 워커를 점유 중인 작업을 대기열 깊이에 반영).
+    """
+    submitted = time.time()
+    with _lock:
+        _inflight[kind] = _inflight.get(kind, 0) + 1
+    future = executor.submit(call)
+    future.add_done_callback(partial(_track_end, kind, submitted))
+    return future
+
+
+def _track_end(kind: str, submitted: float, future: Future) -> None:
+    with _lock:
+        _inflight[kind] -= 1
+    if future.cancelled() or future.exception() is not None:
+        # 시작하지 못하고 취소된 작업(또는 프로세스 풀 오류)은 시작 시각을 모름: 끝날 때까지 기다린 시간을 기록
+        # (대기열이 포화된 바로 그 순간에 대기 시간이 0 으로 기록되지 않도록)
+        started = time.time()
+    else:
+        started = future.result()[0]
+    metrics.EXECUTOR_QUEUE_WAIT.observe(max(0.0, started - submitted), executor=kind)
+
+
+async def run(kind: str, func: Callable, *args, **kwargs):
+    """
+    이벤트 루프에서 func 를 kind 익스큐터로 실행하고 결과를 기다립니다.
+    데드라인이 지나면 DeadlineExceeded (대기열에 남은 작업은 실행되지 않음)
+    """
+    deadline.check()
+    executor = get_executor(kind)
+    call = partial(_timed_call, func, args, kwargs)
+    if not _uses_processes(kind):
+        # 워커 스레드에는 contextvars 가 복사되지 않으므로 부모 스팬과 데드라인을 전달
+        call = tracing.bind(call)
+    # 기다림을 그만두면(데드라인 초과/취소) asyncio Future 취소가 제출된 작업으로 전달됨
+    _, result, error = await deadline.wait(asyncio.wrap_future(_submit(kind, executor, call)))
+    if error is not None:
+        raise error
+    return result
+
+
+def run_cpu(func: Callable, *args, **kwargs):
+    """
+    I/O 워커 스레드(동기 코드)에서 CPU 작업을 cpu 익스큐터에 맡기고 결과를 기다립니다.
+    CPU 작업 동시 실행 수가 제한되며, CPU_EXECUTOR=process 이면 GIL 경합 없이 병렬로 처리됩니다.
+    """
+    deadline.check()
+    executor = get_executor(CPU)
+    call = partial(_timed_call, func, args, kwargs)
+    if not _uses_processes(CPU):
+        call = tracing.bind(call)
+    future = _submit(CPU, executor, call)
+    try:
+        _, result, error = future.result(timeout=deadline.remaining())
+    except FutureTimeoutError:
+        future.cancel()
+        raise deadline.DeadlineExceeded("deadline exceeded waiting for cpu executor") from None
+    if error is not None:
+        raise error
+    return result
@@ -0,0 +1,184 @@
+"""
+포트폴리오 히스토리 모듈
+주기적으로 포트폴리오 스냅샷(총 평가금액/손익 + 자산별 수량·평가금액)을 SQLite 에 기록하고,
+기록 시점에 시간/일 단위 OHLC 집계를 함께 갱신해 긴 구간의 자산 곡선도 즉시 조회할 수 있게 합니다.
+
+    PORTFOLIO_HISTORY_DB=portfolio_history.sqlite3   (저장 경로)
+    PORTFOLIO_HISTORY_INTERVAL=60                    (기록 주기(초), 0 이면 기록 안 함)
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from backend.services import executors, tracing
+
+HOUR = 3600
+DAY = 86400
+# 일 단위 집계 경계: KST 자정
+BUCKET_TZ_OFFSET = 9 * HOUR
+
+RESOLUTIONS = {"hourly": HOUR, "daily": DAY}
+# 보관 기간 (초). daily 는 영구 보관
+RETENTION = {"raw": 7 * DAY, "hourly": 90 * DAY}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts INTEGER PRIMARY KEY,
+    total_value REAL NOT NULL,
+    total_cost REAL NOT NULL,
+    total_pnl REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sample_positions (
+    ts INTEGER NOT NULL,
+    venue TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (ts, venue, asset)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    pnl REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (resolution, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (resolution, bucket, open, high, low, close, pnl, samples)
+VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT (resolution, bucket) DO UPDATE SET
+    high = max(high, excluded.high),
+    low = min(low, excluded.low),
+    close = excluded.close,
+    pnl = excluded.pnl,
+    samples = samples + 1
+"""
+
+
+def bucket_start(ts: int, size: int) -> int:
+    return (ts + BUCKET_TZ_OFFSET) // size * size - BUCKET_TZ_OFFSET
+
+
+def pick_resolution(span_seconds: int) -> str:
+    """조회 구간 길이에 맞는 해상도 (포인트 수 ~ 수백 개 수준)"""
+    if span_seconds <= 2 * DAY:
+        return "raw"
+    if span_seconds <= 60 * DAY:
+        return "hourly"
+    return "daily"
+
+
+class HistoryStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._last_prune = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record(self, portfolio: dict, ts: Optional[int] = None) -> None:
+        """포트폴리오 요약(PositionTable.summary 형식) 한 건을 기록하고 집계를 갱신합니다."""
+        ts = int(ts if ts is not None else time.time())
+        value = portfolio["total_value_krw"]
+        pnl = portfolio["total_pnl_krw"]
+        positions = [
+            (ts, p["venue"], p["asset"], p["quantity"], p["value_krw"])
+            for p in portfolio.get("positions", [])
+        ]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO samples (ts, total_value, total_cost, total_pnl) VALUES (?, ?, ?, ?)",
+                (ts, value, portfolio["total_cost_krw"], pnl),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sample_positions (ts, venue, asset, quantity, value) VALUES (?, ?, ?, ?, ?)",
+                positions,
+            )
+            for resolution, size in RESOLUTIONS.items():
+                self._conn.execute(
+                    _UPSERT_ROLLUP, (resolution, bucket_start(ts, size), value, value, value, value, pnl)
+                )
+            if ts - self._last_prune >= HOUR:
+                self._prune(ts)
+                self._last_prune = ts
+
+    def _prune(self, now: int) -> None:
+        raw_cutoff = now - RETENTION["raw"]
+        self._conn.execute("DELETE FROM samples WHERE ts < ?", (raw_cutoff,))
+        self._conn.execute("DELETE FROM sample_positions WHERE ts < ?", (raw_cutoff,))
+        self._conn.execute(
+            "DELETE FROM rollups WHERE resolution = 'hourly' AND bucket < ?", (now - RETENTION["hourly"],)
+        )
+
+    def equity_curve(self, start: int, end: int, resolution: str) -> List[dict]:
+        """[start, end] 구간의 자산 곡선. raw 는 기록 시점별, 그 외는 집계 버킷별 OHLC"""
+        with self._lock:
+            if resolution == "raw":
+                rows = self._conn.execute(
+                    "SELECT ts, total_value, total_value, total_value, total_value, total_pnl, 1 "
+                    "FROM samples WHERE ts BETWEEN ? AND ? ORDER BY ts",
+                    (start, end),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT bucket, open, high, low, close, pnl, samples FROM rollups "
+                    "WHERE resolution = ? AND bucket BETWEEN ? AND ? ORDER BY bucket",
+                    (resolution, bucket_start(start, RESOLUTIONS[resolution]), end),
+                ).fetchall()
+        return [
+            {"ts": r[0], "open": r[1], "high": r[2], "low": r[3], "close": r[4], "pnl": r[5], "samples": r[6]}
+            for r in rows
+        ]
+
+    def history(self, span_seconds: int, resolution: str = "auto", now: Optional[int] = None) -> dict:
+        now = int(now if now is not None else time.time())
+        start = now - span_seconds
+        if resolution == "auto":
+            resolution = pick_resolution(span_seconds)
+        with tracing.span("history.query", resolution=resolution, span_seconds=span_seconds) as sp:
+            points = self.equity_curve(start, now, resolution)
+            sp.set_attribute("result.rows", len(points))
+        summary = None
+        if points:
+            first, last = points[0]["open"], points[-1]["close"]
+            summary = {
+                "start_value": first,
+                "end_value": last,
+                "change": last - first,
+                "change_percent": (last - first) / first * 100 if first else 0.0,
+                "high": max(p["high"] for p in points),
+                "low": min(p["low"] for p in points),
+            }
+        return {"resolution": resolution, "start": start, "end": now, "points": points, "summary": summary}
+
+
+_STORE: Optional[HistoryStore] = None
+
+
+def get_store() -> HistoryStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = HistoryStore(os.getenv("PORTFOLIO_HISTORY_DB", "portfolio_history.sqlite3"))
+    return _STORE
+
+
+async def record_portfolio(portfolio: dict) -> None:
+    await executors.run(executors.STORAGE, lambda: get_store().record(portfolio))
+
+
+async def get_portfolio_history(span_seconds: int, resolution: str = "auto") -> dict:
+    return await executors.run(executors.STORAGE, lambda: get_store().history(span_seconds, resolution))
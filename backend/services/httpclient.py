@@ -0,0 +1,54 @@
+"""
+HTTP 클라이언트 모듈
+서비스 모듈이 사용하는 requests 호출을 한 곳에서 감싸 트레이싱 속성(URL, 상태 코드, 바이트 수)과
+서비스 함수별 응답 바이트 수(metrics)를 기록하고,
+업스트림별 서킷 브레이커(circuit)에 성공/실패를 반영합니다.
+요청 데드라인(deadline)이 있으면 타임아웃을 남은 시간으로 줄이고, 이미 지났으면 요청하지 않습니다.
+"""
+from urllib.parse import urlsplit
+
+import requests
+
+from backend.services import circuit, deadline, metrics, tracing
+
+DEFAULT_TIMEOUT = 5
+
+
+def get(url: str, params: dict = None, headers: dict = None, timeout: float = DEFAULT_TIMEOUT) -> requests.Response:
+    """
+    requests.get 래퍼.
+    DNS/TLS/응답 대기 시간은 requests에서 분리되지 않으므로 http.fetch 스팬 하나로 기록하고,
+    헤더 수신까지의 시간(elapsed)을 별도 속성으로 남깁니다.
+    업스트림 브레이커가 열려 있으면 요청하지 않고 CircuitOpenError 를 발생시킵니다.
+    연결 오류/타임아웃, 5xx, 429 응답은 실패로 기록합니다.
+    데드라인 때문에 줄어든 타임아웃이 지나면 실패로 기록하지 않고 DeadlineExceeded 를 발생시킵니다.
+    """
+    effective = deadline.timeout(timeout)
+    breaker = circuit.before_call(circuit.upstream_for(url))
+    with tracing.span("http.fetch", kind=tracing.KIND_CLIENT, **{
+        "http.request.method": "GET",
+        "server.address": urlsplit(url).hostname,
+        "url.full": url,
+    }) as sp:
+        try:
+            response = requests.get(url, params=params, headers=headers, timeout=effective)
+        except requests.Timeout as e:
+            if effective < timeout:
+                breaker.release()
+                sp.set_attribute("deadline.exceeded", True)
+                raise deadline.DeadlineExceeded(f"deadline exceeded fetching {url}") from e
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        sp.set_attribute("http.response.status_code", response.status_code)
+        size = len(response.content)
+        sp.set_attribute("http.response.body.size", size)
+        metrics.record_payload_bytes(size)
+        sp.set_attribute("http.elapsed_to_headers_ms", round(response.elapsed.total_seconds() * 1000, 2))
+        return response
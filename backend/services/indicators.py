@@ -0,0 +1,341 @@
+"""
+기술 지표 모듈 (MA, RSI, VWAP, 볼린저 밴드)
+순위 섹션(업비트/바이낸스/코스피/코스닥/미국) 스냅샷이 만들어질 때마다 종목별 시세를 일정 간격의 봉으로 묶고,
+봉이 닫히면 종목별 고정 크기 NumPy 버퍼와 누적 합계를 갱신해 지표를 O(1) 로 계산합니다.
+한 섹션의 종목들은 한 번의 벡터 연산으로 함께 갱신됩니다.
+
+    MA / 볼린저 밴드 : 최근 20봉 종가 평균 ± 2 표준편차
+    RSI              : 14봉 Wilder 평활
+    VWAP             : 최근 20봉 거래량 가중 평균가 (봉 거래량 = 누적 거래량 증가분)
+
+닫힌 봉은 SQLite 에 저장해 재시작 시 최근 봉을 한 번에 읽어 상태를 복원합니다 (종목 축으로 벡터화).
+
+    INDICATOR_BAR_SECONDS=60                  (봉 간격(초))
+    INDICATOR_BAR_DB=indicator_bars.sqlite3   (봉 저장 경로, 빈 값이면 저장 안 함)
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.services import executors
+from backend.services.quotes import Quote
+
+WINDOW = 20          # MA / 볼린저 / VWAP 봉 수
+RSI_PERIOD = 14
+BOLLINGER_K = 2.0
+# 재시작 시 읽을 봉 수 (RSI 평활이 안정되도록 창보다 길게)
+WARM_BARS = 100
+
+BAR_SECONDS = int(os.getenv("INDICATOR_BAR_SECONDS", "60"))
+
+Bar = Tuple[str, int, float, float]   # (종목 키, 봉 시작 시각, 종가, 거래량)
+
+
+# 지표를 붙이는 순위 섹션 (시세 레코드 목록)
+INDICATOR_SECTIONS = {"upbit_top_volume", "binance_top_volume", "kospi_top", "kosdaq_top", "us_top"}
+
+
+class IndicatorEngine:
+    """
+    종목별 행을 가진 열 저장소.
+    닫힌 봉은 행마다 WINDOW 칸 링 버퍼에 쌓고, 종가 합/제곱합(기준가 차이로 보관해 정밀도 유지),
+    가격×거래량 합, 거래량 합, RSI 평균 상승/하락폭을 봉마다 차이만큼 갱신합니다.
+    링 버퍼가 한 바퀴 돌 때마다 합계를 버퍼에서 다시 계산해 부동소수점 오차 누적을 막습니다.
+    """
+
+    def __init__(self, bar_seconds: int = BAR_SECONDS, capacity: int = 64):
+        self.bar_seconds = bar_seconds
+        self.keys: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._capacity = 0
+        self._closed: List[Bar] = []   # 저장 대기 중인 닫힌 봉
+        self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _allocate(self, capacity: int) -> None:
+        """행 용량을 capacity 로 늘립니다 (기존 값 유지, 새 행은 빈 상태)."""
+        old = self._capacity
+
+        def grow(name: str, fill, dtype=np.float64, width: Optional[int] = None):
+            shape = (capacity,) if width is None else (capacity, width)
+            array = np.full(shape, fill, dtype=dtype)
+            if old:
+                array[:old] = getattr(self, name)
+            setattr(self, name, array)
+
+        grow("_close", np.nan, width=WINDOW)
+        grow("_volume", 0.0, width=WINDOW)
+        grow("_pos", 0, np.intp)
+        grow("_count", 0, np.intp)
+        grow("_ref", np.nan)           # 합계 기준가 (큰 가격의 제곱합 상쇄 오차 방지)
+        grow("_sum", 0.0)              # Σ(종가 - 기준가)
+        grow("_sum_sq", 0.0)           # Σ(종가 - 기준가)²
+        grow("_pv", 0.0)               # Σ(종가 × 거래량)
+        grow("_vol", 0.0)              # Σ 거래량
+        grow("_last_close", np.nan)
+        grow("_avg_gain", 0.0)
+        grow("_avg_loss", 0.0)
+        grow("_rsi_n", 0, np.intp)     # RSI 에 반영된 변화 수 (RSI_PERIOD 까지)
+        # 만들어지는 중인 봉
+        grow("_bar_start", -1, np.int64)
+        grow("_bar_close", np.nan)
+        grow("_bar_volume", 0.0)
+        grow("_last_cum", np.nan)      # 직전 누적 거래량
+        self._capacity = capacity
+
+    def rows_for(self, keys: Iterable[str]) -> np.ndarray:
+        indices = []
+        for key in keys:
+            row = self._index.get(key)
+            if row is None:
+                row = self._index[key] = len(self.keys)
+                self.keys.append(key)
+            indices.append(row)
+        if len(self.keys) > self._capacity:
+            self._allocate(max(len(self.keys), self._capacity * 2))
+        return np.array(indices, dtype=np.intp)
+
+    # --- 봉 반영 ---
+
+    def _push(self, rows: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> None:
+        """닫힌 봉 하나씩을 각 행에 반영합니다 (행 중복 없음)."""
+        if rows.size == 0:
+            return
+        ref = self._ref[rows]
+        ref = np.where(np.isnan(ref), closes, ref)
+        self._ref[rows] = ref
+        pos = self._pos[rows]
+        full = self._count[rows] >= WINDOW
+        old_close = self._close[rows, pos]
+        old_volume = self._volume[rows, pos]
+        old_diff = np.where(full, old_close - ref, 0.0)
+        diff = closes - ref
+        self._sum[rows] += diff - old_diff
+        self._sum_sq[rows] += diff * diff - old_diff * old_diff
+        self._pv[rows] += closes * volumes - np.where(full, old_close * old_volume, 0.0)
+        self._vol[rows] += volumes - np.where(full, old_volume, 0.0)
+        self._close[rows, pos] = closes
+        self._volume[rows, pos] = volumes
+        pos = (pos + 1) % WINDOW
+        self._pos[rows] = pos
+        self._count[rows] = np.minimum(self._count[rows] + 1, WINDOW)
+
+        # RSI: 처음 RSI_PERIOD 개 변화는 단순 평균, 이후 Wilder 평활 (avg += (x - avg) / k)
+        previous = self._last_close[rows]
+        has_previous = ~np.isnan(previous)
+        delta = np.where(has_previous, closes - np.nan_to_num(previous), 0.0)
+        n = self._rsi_n[rows]
+        k = np.minimum(n + 1, RSI_PERIOD)
+        avg_gain = self._avg_gain[rows]
+        avg_loss = self._avg_loss[rows]
+        self._avg_gain[rows] = np.where(has_previous, avg_gain + (np.maximum(delta, 0.0) - avg_gain) / k, avg_gain)
+        self._avg_loss[rows] = np.where(has_previous, avg_loss + (np.maximum(-delta, 0.0) - avg_loss) / k, avg_loss)
+        self._rsi_n[rows] = np.where(has_previous, k, n)
+        self._last_close[rows] = closes
+
+        # 링 버퍼가 한 바퀴 돈 행은 버퍼에서 합계를 다시 계산
+        wrapped = rows[(pos == 0) & (self._count[rows] == WINDOW)]
+        if wrapped.size:
+            window = self._close[wrapped]
+            ref = window[:, -1]
+            diff = window - ref[:, None]
+            self._ref[wrapped] = ref
+            self._sum[wrapped] = diff.sum(axis=1)
+            self._sum_sq[wrapped] = (diff * diff).sum(axis=1)
+            self._pv[wrapped] = (window * self._volume[wrapped]).sum(axis=1)
+            self._vol[wrapped] = self._volume[wrapped].sum(axis=1)
+
+    def observe(self, keys: List[str], prices: np.ndarray, cumulative_volumes: np.ndarray,
+                now: Optional[float] = None) -> np.ndarray:
+        """
+        한 섹션의 현재가/누적 거래량을 반영합니다. 봉 간격이 바뀐 종목은 이전 봉을 닫아 지표에 반영합니다.
+        반환값은 keys 순서의 행 번호입니다.
+        """
+        now = time.time() if now is None else now
+        bucket = int(now) // self.bar_seconds * self.bar_seconds
+        rows = self.rows_for(keys)
+        if rows.size == 0:
+            return rows
+
+        closing = (self._bar_start[rows] >= 0) & (self._bar_start[rows] < bucket)
+        closing_rows = rows[closing]
+        if closing_rows.size:
+            closes = self._bar_close[closing_rows]
+            volumes = self._bar_volume[closing_rows]
+            self._push(closing_rows, closes, volumes)
+            starts = self._bar_start[closing_rows]
+            self._closed.extend(zip(
+                [self.keys[i] for i in closing_rows.tolist()], starts.tolist(), closes.tolist(), volumes.tolist()
+            ))
+
+        opening = rows[self._bar_start[rows] != bucket]
+        self._bar_start[opening] = bucket
+        self._bar_volume[opening] = 0.0
+
+        # 봉 거래량 = 누적 거래량 증가분 (일 초기화/24시간 창 이동으로 줄어든 경우는 0)
+        last = self._last_cum[rows]
+        increase = np.where(np.isnan(last), 0.0, np.maximum(cumulative_volumes - np.nan_to_num(last), 0.0))
+        self._bar_volume[rows] += increase
+        self._last_cum[rows] = cumulative_volumes
+        self._bar_close[rows] = prices
+        return rows
+
+    def drain_closed(self) -> List[Bar]:
+        closed, self._closed = self._closed, []
+        return closed
+
+    def load(self, bars: List[Bar]) -> int:
+        """
+        저장된 봉(종목/시각 오름차순, BarStore.recent 형식)으로 상태를 복원합니다.
+        종목별 봉을 오른쪽 정렬한 행렬로 만든 뒤 시각 열마다 모든 종목을 한 번에 반영합니다.
+        """
+        if not bars:
+            return 0
+        keys, counts = zip(*((key, sum(1 for _ in group)) for key, group in groupby(bar[0] for bar in bars)))
+        rows = self.rows_for(keys)
+        counts = np.array(counts, dtype=np.intp)
+        length = int(counts.max())
+        # 각 봉의 (종목, 열) 위치: 종목 안에서의 순번을 오른쪽 끝에 맞춤
+        group = np.repeat(np.arange(len(keys)), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        column = length - counts[group] + (np.arange(len(bars)) - starts)
+        closes = np.full((len(keys), length), np.nan)
+        volumes = np.zeros((len(keys), length))
+        closes[group, column] = np.fromiter((bar[2] for bar in bars), dtype=np.float64, count=len(bars))
+        volumes[group, column] = np.fromiter((bar[3] for bar in bars), dtype=np.float64, count=len(bars))
+        for column in range(length):
+            present = ~np.isnan(closes[:, column])
+            self._push(rows[present], closes[present, column], volumes[present, column])
+        return len(keys)
+
+    # --- 지표 ---
+
+    def values(self, rows: np.ndarray) -> List[Optional[dict]]:
+        """행별 지표. 닫힌 봉이 없는 종목은 None, 창이 차지 않은 지표는 None 입니다."""
+        count = self._count[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_diff = self._sum[rows] / count
+            mean = self._ref[rows] + mean_diff
+            std = np.sqrt(np.maximum(self._sum_sq[rows] / count - mean_diff * mean_diff, 0.0))
+            vwap = np.where(self._vol[rows] > 0, self._pv[rows] / self._vol[rows], np.nan)
+            avg_gain = self._avg_gain[rows]
+            avg_loss = self._avg_loss[rows]
+            rsi = np.where(avg_loss > 0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss), 100.0)
+        full = count >= WINDOW
+        rsi_ready = self._rsi_n[rows] >= RSI_PERIOD
+        result = []
+        for n, is_full, ma, sd, vw, r, r_ready in zip(
+                count.tolist(), full.tolist(), mean.tolist(), std.tolist(), vwap.tolist(), rsi.tolist(),
+                rsi_ready.tolist()):
+            if n == 0:
+                result.append(None)
+                continue
+            result.append({
+                "ma": ma if is_full else None,
+                "rsi": r if r_ready else None,
+                "vwap": None if math.isnan(vw) else vw,
+                "bollinger_upper": ma + BOLLINGER_K * sd if is_full else None,
+                "bollinger_lower": ma - BOLLINGER_K * sd if is_full else None,
+                "bars": n,
+            })
+        return result
+
+    def attach(self, quotes: List[Quote], now: Optional[float] = None) -> None:
+        """시세 레코드를 반영하고 각 레코드의 indicators 필드를 채웁니다."""
+        keys = [q.key for q in quotes]
+        prices = np.fromiter((q.price for q in quotes), dtype=np.float64, count=len(quotes))
+        volumes = np.fromiter((q.volume for q in quotes), dtype=np.float64, count=len(quotes))
+        rows = self.observe(keys, prices, volumes, now)
+        for quote, indicators in zip(quotes, self.values(rows)):
+            quote.indicators = indicators
+
+
+# === 봉 저장소 ===
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    key TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    PRIMARY KEY (key, ts)
+) WITHOUT ROWID;
+"""
+
+RETENTION_BARS = WARM_BARS * 2
+
+
+class BarStore:
+    def __init__(self, path: str, bar_seconds: int = BAR_SECONDS):
+        self.path = path
+        self.bar_seconds = bar_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._last_prune = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def append(self, bars: List[Bar]) -> None:
+        if not bars:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO bars (key, ts, close, volume) VALUES (?, ?, ?, ?)", bars)
+            now = max(ts for _, ts, _, _ in bars)
+            if now - self._last_prune >= 3600:
+                self._conn.execute("DELETE FROM bars WHERE ts < ?", (now - RETENTION_BARS * self.bar_seconds,))
+                self._last_prune = now
+
+    def recent(self, limit: int = WARM_BARS, now: Optional[float] = None) -> List[Bar]:
+        """종목별 최근 limit 개 봉 (limit 봉 간격 이내, 종목/시각 오름차순)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, ts, close, volume FROM ("
+                "  SELECT key, ts, close, volume, ROW_NUMBER() OVER (PARTITION BY key ORDER BY ts DESC) AS rn"
+                "  FROM bars WHERE ts >= ?"
+                ") WHERE rn <= ? ORDER BY key, ts",
+                (int(now - limit * self.bar_seconds), limit),
+            ).fetchall()
+
+
+_STORE: Optional[BarStore] = None
+
+
+def get_store() -> Optional[BarStore]:
+    global _STORE
+    path = os.getenv("INDICATOR_BAR_DB", "indicator_bars.sqlite3")
+    if _STORE is None and path:
+        _STORE = BarStore(path)
+    return _STORE
+
+
+def _recent_bars_sync() -> List[Bar]:
+    store = get_store()
+    return store.recent() if store is not None else []
+
+
+def _record_bars_sync(bars: List[Bar]) -> None:
+    store = get_store()
+    if store is not None:
+        store.append(bars)
+
+
+async def load_recent_bars() -> List[Bar]:
+    return await executors.run(executors.STORAGE, _recent_bars_sync)
+
+
+async def record_bars(bars: List[Bar]) -> None:
+    await executors.run(executors.STORAGE, _record_bars_sync, bars)
@@ -0,0 +1,70 @@
+"""
+지연 import 모듈
+무거운 외부 라이브러리(pyupbit, python-binance, yfinance, pandas, BeautifulSoup)를 처음 사용할 때 import 합니다.
+서버/CLI 시작 시에는 import 하지 않고, 서버는 요청을 받기 시작한 뒤 백그라운드 스레드에서 미리 import 합니다.
+
+    yf = lazy_import("yfinance")      # 모듈처럼 사용: yf.Ticker(...) 호출 시점에 import
+    warm_up()                         # 등록된 모듈을 모두 import (LAZY_IMPORT_WARMUP=0 이면 서버에서 생략)
+"""
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Optional
+
+# 등록된 지연 모듈 (이름 → 프록시)
+_MODULES: Dict[str, "LazyModule"] = {}
+
+
+class LazyModule:
+    """첫 속성 접근 시 실제 모듈을 import 하는 모듈 대리 객체"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            # import 는 인터프리터의 모듈별 잠금으로 직렬화되므로 동시에 접근해도 한 번만 실행됨
+            module = self._module = importlib.import_module(self._name)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    module = _MODULES.get(name)
+    if module is None:
+        module = _MODULES[name] = LazyModule(name)
+    return module
+
+
+def warm_up() -> Dict[str, float]:
+    """등록된 지연 모듈을 모두 import 하고 모듈별 소요 시간(초)을 반환합니다."""
+    elapsed = {}
+    for name, module in list(_MODULES.items()):
+        if module.loaded:
+            continue
+        start = time.perf_counter()
+        try:
+            module._load()
+        except ImportError as e:
+            print(f"Lazy import warm-up failed ({name}): {e}")
+            continue
+        elapsed[name] = time.perf_counter() - start
+    return elapsed
+
+
+def warm_up_in_background() -> threading.Thread:
+    thread = threading.Thread(target=warm_up, name="lazy-import-warmup", daemon=True)
+    thread.start()
+    return thread
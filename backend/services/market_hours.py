@@ -0,0 +1,149 @@
+"""
+장 운영 시간 모듈
+KRX/미국 정규장 시간, 주말, 휴장일(market_calendar.json)을 기준으로 섹션 갱신 주기를 조정합니다.
+
+    장중            : 섹션 기본 TTL
+    장 마감 후      : 마감 + MARKET_CLOSE_GRACE(기본 600초) 이후 받은 스냅샷은 다음 개장까지 유지
+                      (MARKET_CLOSED_TTL, 기본 3600초마다 한 번만 다시 확인, 0 이면 다음 개장까지 고정)
+    암호화폐/환율   : 시장 구분 없음 (항상 기본 TTL)
+
+휴장일/단축 거래일(수능일, 연초 개장일, 미국 반일장)은 매년 거래소 공지에 맞춰 달력 파일에 추가합니다.
+MARKET_HOURS=0 이면 시장 시간과 무관하게 기본 TTL 을 사용합니다.
+"""
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from backend.services import metrics
+
+ENABLED = os.getenv("MARKET_HOURS", "1") != "0"
+CLOSE_GRACE = float(os.getenv("MARKET_CLOSE_GRACE", "600"))     # 마감 후 종가 확정까지 (초)
+CLOSED_TTL = float(os.getenv("MARKET_CLOSED_TTL", "3600"))      # 휴장 중 재확인 간격 (초, 0 이면 고정)
+CALENDAR_FILE = os.getenv(
+    "MARKET_CALENDAR_FILE", os.path.join(os.path.dirname(os.path.dirname(__file__)), "market_calendar.json"))
+
+KRX = "krx"
+US = "us"
+
+_SEARCH_DAYS = 14  # 앞뒤 세션을 찾을 때 최대 탐색 일수 (연휴 포함)
+
+
+def _clock(text: str) -> Tuple[int, int]:
+    hour, minute = text.split(":")
+    return int(hour), int(minute)
+
+
+class MarketCalendar:
+    def __init__(self, name: str, timezone: str, open: str, close: str,
+                 holidays: Iterable[str] = (), sessions: Optional[Dict[str, list]] = None):
+        self.name = name
+        self.tz = ZoneInfo(timezone)
+        self.open = _clock(open)
+        self.close = _clock(close)
+        self.holidays = {date.fromisoformat(day) for day in holidays}
+        # 개장/마감 시각이 다른 날 (수능일, 반일장 등)
+        self.sessions = {date.fromisoformat(day): (_clock(start), _clock(end))
+                         for day, (start, end) in (sessions or {}).items()}
+        # (상태 유효 구간 시작, 끝, 장중 여부, 마지막 마감 확정 시각)
+        self._state: Tuple[float, float, bool, Optional[float]] = (0.0, 0.0, False, None)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day: date) -> Optional[Tuple[float, float]]:
+        """해당 날짜 정규장의 (개장, 마감) epoch 초. 휴장일이면 None"""
+        if not self.is_trading_day(day):
+            return None
+        start, end = self.sessions.get(day, (self.open, self.close))
+        opened = datetime(day.year, day.month, day.day, *start, tzinfo=self.tz)
+        closed = datetime(day.year, day.month, day.day, *end, tzinfo=self.tz)
+        return opened.timestamp(), closed.timestamp()
+
+    def _compute(self, now: float) -> Tuple[float, float, bool, Optional[float]]:
+        today = datetime.fromtimestamp(now, self.tz).date()
+        # 오늘 세션이 진행 중(마감 확정 전)이면 장중
+        current = self.session(today)
+        if current is not None and current[0] <= now < current[1] + CLOSE_GRACE:
+            return current[0], current[1] + CLOSE_GRACE, True, None
+        settled = None
+        for back in range(_SEARCH_DAYS):
+            session = self.session(today - timedelta(days=back))
+            if session is not None and session[1] + CLOSE_GRACE <= now:
+                settled = session[1] + CLOSE_GRACE
+                break
+        until = now + 86400.0
+        for ahead in range(_SEARCH_DAYS):
+            session = self.session(today + timedelta(days=ahead))
+            if session is not None and session[0] > now:
+                until = session[0]
+                break
+        return (settled if settled is not None else now), until, False, settled
+
+    def state(self, now: float) -> Tuple[bool, Optional[float]]:
+        """(장중 여부, 마지막 마감 확정 시각). 다음 개장/마감 확정 전까지는 계산 결과를 재사용합니다."""
+        start, until, is_open, settled = self._state
+        if not start <= now < until:
+            start, until, is_open, settled = self._state = self._compute(now)
+        return is_open, settled
+
+    def is_open(self, now: Optional[float] = None) -> bool:
+        return self.state(time.time() if now is None else now)[0]
+
+
+def load_calendars(path: str = CALENDAR_FILE) -> Dict[str, MarketCalendar]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Market calendar load failed ({path}): {e}")
+        return {}
+    return {name: MarketCalendar(name, **spec) for name, spec in raw.items()}
+
+
+CALENDARS = load_calendars()
+for _calendar in CALENDARS.values():
+    metrics.MARKET_OPEN.set_function(lambda c=_calendar: float(c.is_open()), market=_calendar.name)
+
+
+def is_trading_day(market: str, day: date) -> bool:
+    calendar = CALENDARS.get(market)
+    return calendar.is_trading_day(day) if calendar is not None else day.weekday() < 5
+
+
+def is_open(market: str, now: Optional[float] = None) -> bool:
+    calendar = CALENDARS.get(market)
+    return calendar.is_open(now) if calendar is not None else True
+
+
+def section_ttl(markets: Iterable[str], ttl: float, now: Optional[float] = None) -> float:
+    """
+    시장 시간을 반영한 섹션 TTL.
+    모든 시장이 닫혀 있으면 마지막 마감 확정 이후 경과 시간을 TTL 로 사용하므로,
+    마감 확정 뒤에 받은 스냅샷은 다음 개장까지(또는 CLOSED_TTL 동안) 만료되지 않습니다.
+    """
+    if not ENABLED or not markets:
+        return ttl
+    now = time.time() if now is None else now
+    settled_at = None
+    for market in markets:
+        calendar = CALENDARS.get(market)
+        if calendar is None:
+            return ttl
+        is_open, settled = calendar.state(now)
+        if is_open or settled is None:
+            return ttl
+        settled_at = settled if settled_at is None else max(settled_at, settled)
+    closed_for = now - settled_at
+    if CLOSED_TTL > 0:
+        closed_for = min(closed_for, CLOSED_TTL)
+    return max(ttl, closed_for)
+
+
+def is_closed(markets: Iterable[str], now: Optional[float] = None) -> bool:
+    """섹션의 모든 시장이 닫혀 있는지 (시장 구분이 없는 섹션은 항상 False)"""
+    if not ENABLED or not markets:
+        return False
+    return not any(is_open(market, now) for market in markets)
@@ -0,0 +1,299 @@
+"""
+메트릭 모듈
+서비스 함수별 지연시간/오류/페이로드 크기와 이벤트 루프 지연, 익스큐터 대기열 깊이를
+Prometheus 텍스트 포맷(0.0.4)으로 노출합니다. (외부 의존성 없음)
+"""
+import asyncio
+import functools
+import math
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.services import tracing
+
+# 업스트림 호출 기준 버킷 (5ms ~ 10s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._functions: Dict[tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        """렌더링 시점에 값을 계산하는 콜백을 등록합니다."""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+        for key, fn in functions:
+            try:
+                values[key] = float(fn())
+            except Exception:
+                continue
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[tuple, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for i, bound in enumerate(self.buckets):
+                cumulative += state[i]
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# === 서비스 함수 메트릭 ===
+SOURCE_LATENCY = REGISTRY.register(Histogram(
+    "dashboard_source_latency_seconds", "Latency of upstream service functions", ["source"]))
+SOURCE_CALLS = REGISTRY.register(Counter(
+    "dashboard_source_calls_total", "Service function calls by outcome (ok/empty/error)", ["source", "outcome"]))
+SOURCE_ERRORS = REGISTRY.register(Counter(
+    "dashboard_source_errors_total", "Service function failures (exception raised or empty result)", ["source", "kind"]))
+SOURCE_PAYLOAD_ROWS = REGISTRY.register(Gauge(
+    "dashboard_source_payload_rows", "Rows returned by the last service function call", ["source"]))
+SOURCE_PAYLOAD_BYTES = REGISTRY.register(Gauge(
+    "dashboard_source_payload_bytes",
+    "Upstream response bytes read by the last service function call (HTTP sources only)", ["source"]))
+
+# === HTTP 엔드포인트 메트릭 ===
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "dashboard_http_request_duration_seconds", "API endpoint latency", ["route", "method", "status"]))
+HTTP_RESPONSE_BYTES = REGISTRY.register(Gauge(
+    "dashboard_http_response_bytes", "Body size of the last response per route", ["route"]))
+
+# === 런타임 메트릭 ===
+EVENT_LOOP_LAG = REGISTRY.register(Gauge(
+    "dashboard_event_loop_lag_seconds", "Scheduling delay of the asyncio event loop"))
+EXECUTOR_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "dashboard_executor_queue_depth", "Tasks waiting for a worker thread", ["executor"]))
+EXECUTOR_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "dashboard_executor_queue_wait_seconds", "Time from submission until a worker starts the task", ["executor"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)))
+EXECUTOR_WORKERS = REGISTRY.register(Gauge(
+    "dashboard_executor_workers", "Configured worker count per executor", ["executor"]))
+
+# === 업스트림 서킷 브레이커 메트릭 ===
+CIRCUIT_STATE = REGISTRY.register(Gauge(
+    "dashboard_circuit_state", "Circuit breaker state per upstream (0=closed, 1=half_open, 2=open)", ["upstream"]))
+CIRCUIT_REJECTED = REGISTRY.register(Counter(
+    "dashboard_circuit_rejected_total", "Upstream calls short-circuited by an open breaker", ["upstream"]))
+
+# === 장 운영 시간 ===
+MARKET_OPEN = REGISTRY.register(Gauge(
+    "dashboard_market_open", "Whether the market session is open (1) or closed (0) per market calendar", ["market"]))
+
+
+def _payload_rows(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple, dict)):
+        return len(result)
+    return 1
+
+
+# 실행 중인 서비스 함수가 읽은 업스트림 응답 바이트 ([합계], 없으면 None)
+# 익스큐터 워커 스레드에도 컨텍스트가 복사되므로 같은 리스트에 더해짐
+_PAYLOAD_BYTES: ContextVar[Optional[List[int]]] = ContextVar("payload_bytes", default=None)
+
+
+def record_payload_bytes(size: int) -> None:
+    """업스트림 응답 크기를 현재 서비스 함수 호출에 더합니다 (httpclient 가 호출)."""
+    counter = _PAYLOAD_BYTES.get()
+    if counter is not None:
+        counter[0] += size
+
+
+def instrument(source: str):
+    """
+    서비스 함수(동기)의 지연시간, 결과 건수, 응답 바이트 수, 실패 여부를 기록하는 데코레이터.
+    서비스 함수는 예외를 삼키고 None/빈 리스트를 반환하므로 빈 결과도 실패로 집계합니다.
+    응답 바이트 수는 httpclient 로 받은 업스트림 응답 크기의 합이며, HTTP 요청이 없었으면
+    (pyupbit/python-binance/yfinance 등 라이브러리 호출) 기록하지 않습니다.
+    호출 전체는 service.<source> 스팬으로 기록됩니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracing.span(f"service.{source}", **{"service.source": source}) as sp:
+                counter = [0]
+                token = _PAYLOAD_BYTES.set(counter)
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    SOURCE_LATENCY.observe(time.perf_counter() - start, source=source)
+                    SOURCE_CALLS.inc(source=source, outcome="error")
+                    SOURCE_ERRORS.inc(source=source, kind="exception")
+                    raise
+                finally:
+                    _PAYLOAD_BYTES.reset(token)
+                    # 다른 서비스 함수 안에서 호출된 경우 바깥 호출에도 합산
+                    record_payload_bytes(counter[0])
+                SOURCE_LATENCY.observe(time.perf_counter() - start, source=source)
+                if counter[0]:
+                    SOURCE_PAYLOAD_BYTES.set(counter[0], source=source)
+                    sp.set_attribute("result.bytes", counter[0])
+                rows = _payload_rows(result)
+                SOURCE_PAYLOAD_ROWS.set(rows, source=source)
+                sp.set_attribute("result.rows", rows)
+                if rows == 0:
+                    SOURCE_CALLS.inc(source=source, outcome="empty")
+                    SOURCE_ERRORS.inc(source=source, kind="empty")
+                    sp.set_status(tracing.STATUS_ERROR, "empty result")
+                else:
+                    SOURCE_CALLS.inc(source=source, outcome="ok")
+                return result
+        return wrapper
+    return decorator
+
+
+def track_executor(name: str, executor) -> None:
+    """ThreadPoolExecutor의 대기열 깊이를 게이지로 노출합니다."""
+    queue = getattr(executor, "_work_queue", None)
+    if queue is not None:
+        EXECUTOR_QUEUE_DEPTH.set_function(queue.qsize, executor=name)
+
+
+async def monitor_event_loop(interval: float = 0.5) -> None:
+    """주기적으로 sleep 오차를 측정해 이벤트 루프 지연을 기록합니다."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, loop.time() - start - interval))
@@ -0,0 +1,199 @@
+"""
+포트폴리오 모듈
+업비트(KRW)와 바이낸스(USDT) 보유 자산을 하나의 열 기반 포지션 테이블로 합쳐
+KRW 기준 평가금액, 손익, 비중을 NumPy 벡터 연산으로 계산합니다.
+새 시세가 들어오면 가격(또는 환율)이 바뀐 행만 다시 계산합니다.
+현재가나 환율을 모르는(nan) 포지션은 0원으로 평가하지 않고 합계에서 빼며 unpriced 로 표시합니다.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+BASE_CURRENCY = "KRW"
+
+
+@dataclass(frozen=True)
+class Position:
+    venue: str          # upbit / binance
+    asset: str
+    quantity: float
+    avg_cost: float     # 매수 평균가 (quote 통화, 알 수 없으면 nan)
+    price: float        # 현재가 (quote 통화, 시세 조회 실패 시 nan)
+    currency: str       # quote 통화 (KRW / USDT)
+
+
+def positions_from_upbit(balance: Optional[dict], holdings: Optional[list]) -> List[Position]:
+    positions = []
+    if balance:
+        # 현금은 손익 계산에서 제외 (평균가 nan)
+        positions.append(Position("upbit", "KRW", balance["total_krw"], math.nan, 1.0, "KRW"))
+    for h in holdings or []:
+        positions.append(Position("upbit", h["coin"], h["total"], h["avg_buy_price"], h["current_price"], "KRW"))
+    return positions
+
+
+def positions_from_binance(balance: Optional[dict], holdings: Optional[list]) -> List[Position]:
+    positions = []
+    if balance:
+        positions.append(Position("binance", "USDT", balance["total_usdt"], math.nan, 1.0, "USDT"))
+    # 바이낸스 계정 API는 매수 평균가를 제공하지 않음
+    for h in holdings or []:
+        positions.append(Position("binance", h["asset"], h["total"], math.nan, h["current_price"], "USDT"))
+    return positions
+
+
+class PositionTable:
+    """
+    포지션 열 저장소.
+    보유 구성(종목/수량/평균가)이 바뀌면 테이블을 다시 만들고,
+    가격·환율만 바뀌면 해당 행만 재평가하며 합계는 차이만큼만 갱신합니다.
+    """
+
+    def __init__(self):
+        self._fx: Dict[str, float] = {BASE_CURRENCY: 1.0}
+        self._load([])
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _load(self, positions: List[Position]) -> None:
+        self.keys: List[Tuple[str, str]] = [(p.venue, p.asset) for p in positions]
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self.venue = np.array([p.venue for p in positions], dtype=object)
+        self.asset = np.array([p.asset for p in positions], dtype=object)
+        self.currency = np.array([p.currency for p in positions], dtype=object)
+        self.quantity = np.array([p.quantity for p in positions], dtype=np.float64)
+        self.avg_cost = np.array([p.avg_cost for p in positions], dtype=np.float64)
+        self.price = np.array([p.price for p in positions], dtype=np.float64)
+        self.fx = np.array([self._fx.get(p.currency, math.nan) for p in positions], dtype=np.float64)
+        self.has_cost = ~np.isnan(self.avg_cost)
+        # 파생 열 (KRW)
+        self.priced = np.zeros(len(positions), dtype=bool)   # 현재가와 환율을 모두 아는 행
+        self.value = np.zeros(len(positions))
+        self.cost = np.zeros(len(positions))
+        self.total_value = 0.0
+        self.total_cost = 0.0
+        self.costed_value = 0.0   # 평균가를 아는 행의 평가금액 합 (손익 계산용)
+        self._revalue(np.arange(len(positions)))
+
+    def _revalue(self, rows: np.ndarray) -> None:
+        if rows.size == 0:
+            return
+        old_value = self.value[rows]
+        old_cost = self.cost[rows]
+        value = self.quantity[rows] * self.price[rows] * self.fx[rows]
+        priced = np.isfinite(value)
+        # 시세를 모르는 행은 평가금액/원가 모두 합계에서 제외 (0원 평가로 손실처럼 보이지 않도록)
+        value = np.where(priced, value, 0.0)
+        cost = np.where(self.has_cost[rows] & priced, self.quantity[rows] * self.avg_cost[rows] * self.fx[rows], 0.0)
+        cost = np.nan_to_num(cost)
+        self.priced[rows] = priced
+        self.value[rows] = value
+        self.cost[rows] = cost
+        costed = self.has_cost[rows]
+        self.total_value += float(np.sum(value - old_value))
+        self.total_cost += float(np.sum(cost - old_cost))
+        self.costed_value += float(np.sum((value - old_value)[costed]))
+
+    def set_fx(self, currency: str, rate: Optional[float]) -> int:
+        """quote 통화의 KRW 환율을 갱신하고, 재계산한 행 수를 반환합니다. 환율을 모르면(None) nan"""
+        rate = math.nan if rate is None else rate
+        current = self._fx.get(currency)
+        if current == rate or (current is not None and math.isnan(current) and math.isnan(rate)):
+            return 0
+        self._fx[currency] = rate
+        rows = np.flatnonzero(self.currency == currency)
+        self.fx[rows] = rate
+        self._revalue(rows)
+        return int(rows.size)
+
+    def update_prices(self, prices: Dict[Tuple[str, str], float]) -> int:
+        """(venue, asset) → 현재가 틱을 반영합니다. 가격이 실제로 바뀐 행만 재계산합니다."""
+        pairs = [(self._index[key], price) for key, price in prices.items() if key in self._index]
+        if not pairs:
+            return 0
+        rows = np.fromiter((i for i, _ in pairs), dtype=np.intp, count=len(pairs))
+        new_prices = np.fromiter((p for _, p in pairs), dtype=np.float64, count=len(pairs))
+        # nan → nan 은 바뀌지 않은 것으로 취급
+        changed = (new_prices != self.price[rows]) & ~(np.isnan(new_prices) & np.isnan(self.price[rows]))
+        rows = rows[changed]
+        self.price[rows] = new_prices[changed]
+        self._revalue(rows)
+        return int(rows.size)
+
+    def sync(self, positions: List[Position], fx: Dict[str, float]) -> int:
+        """
+        계정 조회 결과 전체를 반영합니다.
+        보유 구성이 같으면 환율/가격 변경분만 재계산하고, 다르면 테이블을 다시 만듭니다.
+        """
+        recomputed = 0
+        for currency, rate in fx.items():
+            recomputed += self.set_fx(currency, rate)
+        same_layout = (
+            [(p.venue, p.asset) for p in positions] == self.keys
+            and np.array_equal(self.quantity, np.array([p.quantity for p in positions], dtype=np.float64))
+            and np.array_equal(self.avg_cost, np.array([p.avg_cost for p in positions], dtype=np.float64),
+                               equal_nan=True)
+        )
+        if not same_layout:
+            self._load(positions)
+            return len(positions)
+        return recomputed + self.update_prices({(p.venue, p.asset): p.price for p in positions})
+
+    def rows(self) -> List[dict]:
+        """평가금액 내림차순 포지션 목록 (비중 포함). NaN 은 None 으로 변환합니다."""
+        if not self.keys:
+            return []
+        weight = self.value / self.total_value if self.total_value > 0 else np.zeros(len(self.keys))
+        weight = np.where(self.priced, weight, np.nan)
+        costed = self.has_cost & self.priced
+        pnl = np.where(costed, self.value - self.cost, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pnl_percent = np.where(costed & (self.cost > 0), pnl / self.cost * 100, np.nan)
+        order = np.argsort(-self.value, kind="stable")
+        return [
+            {
+                "venue": self.venue[i],
+                "asset": self.asset[i],
+                "quantity": float(self.quantity[i]),
+                "avg_cost": _none_if_nan(self.avg_cost[i]),
+                "price": _none_if_nan(self.price[i]),
+                "currency": self.currency[i],
+                "fx_rate": _none_if_nan(self.fx[i]),
+                "value_krw": float(self.value[i]) if self.priced[i] else None,
+                "cost_krw": float(self.cost[i]) if costed[i] else None,
+                "pnl_krw": _none_if_nan(pnl[i]),
+                "pnl_percent": _none_if_nan(pnl_percent[i]),
+                "weight": _none_if_nan(weight[i]),
+            }
+            for i in order
+        ]
+
+    def unpriced(self) -> List[str]:
+        """현재가나 환율을 몰라 합계에서 빠진 포지션 ("venue:asset")"""
+        return [f"{self.venue[i]}:{self.asset[i]}" for i in np.flatnonzero(~self.priced)]
+
+    def summary(self) -> dict:
+        pnl = self.costed_value - self.total_cost
+        return {
+            "currency": BASE_CURRENCY,
+            "total_value_krw": self.total_value,
+            "total_cost_krw": self.total_cost,
+            "total_pnl_krw": pnl,
+            "total_pnl_percent": pnl / self.total_cost * 100 if self.total_cost > 0 else 0.0,
+            "fx_rates": {currency: _none_if_nan(rate) for currency, rate in self._fx.items()},
+            "unpriced": self.unpriced(),
+            "positions": self.rows(),
+        }
+
+
+def _none_if_nan(value) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def build_positions(upbit_balance, upbit_holdings, binance_balance, binance_holdings) -> List[Position]:
+    return positions_from_upbit(upbit_balance, upbit_holdings) + positions_from_binance(binance_balance, binance_holdings)
+
@@ -0,0 +1,133 @@
+"""
+김치 프리미엄 모듈
+업비트 KRW 시세와 바이낸스 USDT 시세를 기준 자산(BTC, ETH, ...)으로 맞춰
+공통 코인의 프리미엄을 NumPy 벡터 연산으로 계산합니다.
+
+    premium(%) = (업비트 KRW 가격 / (바이낸스 USDT 가격 × USDT/KRW 환율) - 1) × 100
+
+두 거래소 가격은 자산별 열에 보관하며, 한쪽 시세가 바뀌면 바뀐 행만, 환율이 바뀌면 전체 열을 다시 계산합니다.
+기록 시점마다 프리미엄 열을 고정 크기 이력 버퍼에 넣고, 이동평균은 합계/개수 차이만으로 갱신합니다.
+"""
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 이력 버퍼 크기 (기록 횟수). 5초마다 기록하면 1시간
+DEFAULT_HISTORY_SIZE = 720
+
+
+class PremiumBook:
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.history_size = history_size
+        self.assets: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.krw = np.empty(0)        # 업비트 KRW 가격 (없으면 nan)
+        self.usdt = np.empty(0)       # 바이낸스 USDT 가격 (없으면 nan)
+        self.premium = np.empty(0)    # % (한쪽에만 있는 자산은 nan)
+        self.rate = math.nan          # USDT/KRW
+        self._history = np.empty((history_size, 0))
+        self._history_sum = np.empty(0)
+        self._history_count = np.empty(0, dtype=np.int64)
+        self._samples = 0             # 누적 기록 수 (다음 행 = _samples % history_size)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def _ensure(self, assets) -> None:
+        """처음 보는 자산의 열을 nan 으로 추가합니다 (상장 시에만 발생)."""
+        new = [asset for asset in assets if asset not in self._index]
+        if not new:
+            return
+        for asset in new:
+            self._index[asset] = len(self.assets)
+            self.assets.append(asset)
+        pad = np.full(len(new), np.nan)
+        self.krw = np.concatenate([self.krw, pad])
+        self.usdt = np.concatenate([self.usdt, pad])
+        self.premium = np.concatenate([self.premium, pad])
+        self._history = np.hstack([self._history, np.full((self.history_size, len(new)), np.nan)])
+        self._history_sum = np.concatenate([self._history_sum, np.zeros(len(new))])
+        self._history_count = np.concatenate([self._history_count, np.zeros(len(new), dtype=np.int64)])
+
+    def _recompute(self, rows: np.ndarray) -> None:
+        if rows.size == 0:
+            return
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.premium[rows] = (self.krw[rows] / (self.usdt[rows] * self.rate) - 1.0) * 100.0
+
+    def _update_side(self, side: str, prices: Dict[str, float]) -> int:
+        self._ensure(prices)
+        column = getattr(self, side)
+        present = np.fromiter((self._index[asset] for asset in prices), dtype=np.intp, count=len(prices))
+        values = np.fromiter(prices.values(), dtype=np.float64, count=len(prices))
+        # nan 과의 비교는 항상 "다름" 이므로 새로 들어온 자산도 바뀐 행으로 처리됨
+        changed = values != column[present]
+        rows = present[changed]
+        column[rows] = values[changed]
+        # 이번 시세에서 빠진 자산(상장 폐지/거래 중지)은 nan 으로 비움
+        listed = np.zeros(len(self.assets), dtype=bool)
+        listed[present] = True
+        delisted = np.flatnonzero(~listed & ~np.isnan(column))
+        column[delisted] = np.nan
+        rows = np.concatenate([rows, delisted])
+        self._recompute(rows)
+        return int(rows.size)
+
+    def update_upbit(self, prices: Dict[str, float]) -> int:
+        """업비트 전체 KRW 시세를 반영하고, 다시 계산한 행 수를 반환합니다."""
+        return self._update_side("krw", prices)
+
+    def update_binance(self, prices: Dict[str, float]) -> int:
+        """바이낸스 전체 USDT 시세를 반영하고, 다시 계산한 행 수를 반환합니다."""
+        return self._update_side("usdt", prices)
+
+    def set_rate(self, rate: Optional[float]) -> int:
+        """USDT/KRW 환율을 갱신합니다. 환율 조회에 실패했으면(None) 프리미엄을 nan 으로 비움"""
+        rate = math.nan if rate is None else rate
+        if rate == self.rate or (math.isnan(rate) and math.isnan(self.rate)):
+            return 0
+        self.rate = rate
+        self._recompute(np.arange(len(self.assets)))
+        return len(self.assets)
+
+    def record(self) -> None:
+        """현재 프리미엄 열을 이력 버퍼에 넣고, 밀려난 기록만큼 이동평균 합계를 조정합니다."""
+        slot = self._samples % self.history_size
+        evicted = self._history[slot]
+        valid = ~np.isnan(evicted)
+        self._history_sum[valid] -= evicted[valid]
+        self._history_count[valid] -= 1
+        current = self.premium
+        valid = ~np.isnan(current)
+        self._history_sum[valid] += current[valid]
+        self._history_count[valid] += 1
+        self._history[slot] = current
+        self._samples += 1
+
+    def ranked(self, limit: Optional[int] = None) -> List[dict]:
+        """양쪽 거래소에 모두 상장된 코인을 프리미엄 내림차순으로 반환합니다."""
+        rows = np.flatnonzero(~np.isnan(self.premium))
+        rows = rows[np.argsort(-self.premium[rows], kind="stable")]
+        if limit is not None:
+            rows = rows[:limit]
+        count = self._history_count[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            average = self._history_sum[rows] / count
+        # 원소별 NumPy 스칼라 접근 대신 열 단위로 한 번에 파이썬 값으로 변환
+        columns = zip(
+            rows.tolist(), self.krw[rows].tolist(), self.usdt[rows].tolist(), (self.usdt[rows] * self.rate).tolist(),
+            self.premium[rows].tolist(), average.tolist(), count.tolist(),
+        )
+        return [
+            {
+                "asset": self.assets[i],
+                "upbit_krw": krw,
+                "binance_usdt": usdt,
+                "binance_krw": binance_krw,
+                "premium_percent": premium,
+                "average_percent": avg if samples else None,
+                "samples": samples,
+            }
+            for i, krw, usdt, binance_krw, premium, avg, samples in columns
+        ]
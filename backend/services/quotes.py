@@ -0,0 +1,120 @@
+"""
+시세 레코드 모듈
+업비트/바이낸스/네이버/야후 서비스가 공통으로 반환하는 종목 시세 레코드(Quote)와,
+레코드를 API 응답 형식으로 바꾸는 변환 함수를 제공합니다.
+
+서비스 내부(순위 정렬, 기술 지표, 알림 평가, 스크리너)는 레코드를 그대로 사용하고,
+API 스키마(dict) 변환은 스냅샷을 만들 때 한 번만 수행합니다.
+
+    quote.key  : 종목 키 (upbit:KRW-BTC, binance:BTCUSDT, naver:005930, yahoo:NVDA)
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(slots=True)
+class Quote:
+    source: str             # upbit | binance | naver | yahoo
+    symbol: str             # KRW-BTC, BTCUSDT, 005930, NVDA
+    name: str               # 업비트 한글명, 바이낸스 기준 자산, 종목명
+    price: float            # 거래 통화 기준 현재가
+    change_rate: float      # 등락률 (%)
+    volume: float           # 거래량 (주/코인 수)
+    trade_value: float      # 거래대금 (거래 통화, 없으면 nan)
+    price_krw: float        # KRW 환산 현재가 (환율을 모르면 nan)
+    trade_value_krw: float  # KRW 환산 거래대금 (없으면 nan)
+    english_name: str = ""  # 업비트 영문명
+    indicators: Optional[dict] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.symbol}"
+
+
+# === 레코드 → API 스키마 (스냅샷 생성 시점에만 호출) ===
+
+def upbit_top_coin(q: Quote) -> dict:
+    return {
+        "market": q.symbol,
+        "korean_name": q.name,
+        "english_name": q.english_name,
+        "current_price": q.price,
+        "change_rate": q.change_rate,
+        "trade_volume": q.volume,
+        "trade_price": q.trade_value,
+        "indicators": q.indicators,
+    }
+
+
+def binance_top_coin(q: Quote) -> dict:
+    return {
+        "symbol": q.symbol,
+        "base_asset": q.name,
+        "current_price": q.price,
+        "price_change_percent": q.change_rate,
+        "quote_volume": q.trade_value,
+        "current_price_krw": q.price_krw,
+        "quote_volume_krw": q.trade_value_krw,
+        "indicators": q.indicators,
+    }
+
+
+def korea_stock(q: Quote) -> dict:
+    return {
+        "code": q.symbol,
+        "name": q.name,
+        "current_price": q.price,
+        "change_rate": q.change_rate,
+        "trade_volume": q.volume,
+        "trade_value": q.trade_value,
+        "indicators": q.indicators,
+    }
+
+
+def us_stock(q: Quote) -> dict:
+    return {
+        "symbol": q.symbol,
+        "name": q.name,
+        "current_price": q.price,
+        "change_rate": q.change_rate,
+        "trade_volume": q.volume,
+        "trade_value": q.trade_value,
+        "current_price_krw": q.price_krw,
+        "trade_value_krw": q.trade_value_krw,
+        "indicators": q.indicators,
+    }
+
+
+def etf_item(q: Quote) -> dict:
+    return {
+        "symbol": q.symbol,
+        "name": q.name,
+        "current_price": q.price,
+        "change_rate": q.change_rate,
+        "trade_volume": q.volume,
+    }
+
+
+def to_rows(schema, quotes: Optional[List[Quote]]) -> Optional[List[dict]]:
+    """레코드 목록을 API 응답 행(dict) 목록으로 변환합니다. 빈 결과는 None (기존 응답과 동일하게 null)."""
+    return [schema(q) for q in quotes] if quotes else None
+
+
+# === 레코드 → 열 배열 (전체 종목 섹션) ===
+# 행마다 dict 를 만들지 않고 필드별 리스트 하나씩만 만듭니다. JSON 으로 직렬화할 수 있어 공유 저장소에도 그대로 보관됩니다.
+
+COLUMN_FIELDS = ("symbol", "name", "price", "change_rate", "volume", "trade_value", "price_krw", "trade_value_krw")
+_NULLABLE_FIELDS = {"trade_value", "price_krw", "trade_value_krw"}
+
+
+def to_columns(quotes: Optional[List[Quote]]) -> Optional[Dict[str, list]]:
+    if not quotes:
+        return None
+    columns = {}
+    for field in COLUMN_FIELDS:
+        values = [getattr(q, field) for q in quotes]
+        if field in _NULLABLE_FIELDS:
+            # nan 은 JSON 표준이 아니므로 None 으로 보관 (v != v 는 nan 일 때만 참)
+            values = [None if v != v else v for v in values]
+        columns[field] = values
+    return columns
@@ -0,0 +1,198 @@
+"""
+스크리너 모듈
+국내 주식(코스피/코스닥), 미국 주식/ETF, 업비트/바이낸스 코인을 하나의 열 기반 테이블로 정규화하고,
+열마다 정렬 인덱스를 유지해 조건 필터/정렬 조회를 목록 재탐색 없이 처리합니다.
+
+    price        : 현재가 (KRW 환산)
+    change_rate  : 등락률 (%)
+    volume       : 거래량 (주/코인 수)
+    trade_value  : 거래대금 (KRW 환산, ETF 는 없음)
+
+소스 섹션의 새 스냅샷이 들어오면(ETag 변경) 테이블과 인덱스를 다시 만들고, 조회는 인덱스만 사용합니다.
+"""
+import math
+import operator
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+COLUMNS = ("price", "change_rate", "volume", "trade_value")
+MARKETS = ("kospi", "kosdaq", "us", "etf", "upbit", "binance")
+
+_FILTER = re.compile(r"\s*(\w+)\s*(>=|<=|>|<|=)\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*")
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq}
+
+
+@dataclass(frozen=True)
+class Condition:
+    column: str
+    op: str
+    value: float
+
+
+def parse_filter(expression: str) -> Condition:
+    """'change_rate>5', 'trade_value>=1e9' 형식의 조건을 해석합니다."""
+    match = _FILTER.fullmatch(expression)
+    if not match:
+        raise ValueError(f"Invalid filter: {expression!r} (expected <column><op><number>, e.g. change_rate>5)")
+    column, op, value = match.groups()
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown filter column: {column} (available: {', '.join(COLUMNS)})")
+    return Condition(column, op, float(value))
+
+
+# === 전체 종목 섹션(열 배열) → 정규화 열 ===
+
+MARKET_CURRENCY = {"kospi": "KRW", "kosdaq": "KRW", "us": "USD", "etf": "USD", "upbit": "KRW", "binance": "USDT"}
+_FIELDS = ("symbol", "name", "native_price") + COLUMNS
+
+
+def _normalize(market: str, columns: Optional[Dict[str, list]], usd_krw: float) -> Dict[str, np.ndarray]:
+    """quotes.to_columns 형식의 열 배열을 KRW 기준 열로 바꿉니다 (None 은 nan)."""
+    if not columns:
+        return {field: np.empty(0, dtype=object if field in ("symbol", "name") else np.float64) for field in _FIELDS}
+    native = np.array(columns["price"], dtype=np.float64)
+    price = np.array(columns["price_krw"], dtype=np.float64)
+    if market == "etf":
+        # ETF 순위는 KRW 환산가가 없어 USD/KRW 환율로 환산
+        price = native * usd_krw
+    return {
+        "symbol": np.array(columns["symbol"], dtype=object),
+        "name": np.array(columns["name"], dtype=object),
+        "native_price": native,
+        "price": price,
+        "change_rate": np.array(columns["change_rate"], dtype=np.float64),
+        "volume": np.array(columns["volume"], dtype=np.float64),
+        "trade_value": np.array(columns["trade_value_krw"], dtype=np.float64),
+    }
+
+
+class ScreenerTable:
+    def __init__(self):
+        self._segments: Dict[str, Tuple[str, Dict[str, np.ndarray]]] = {}   # 시장 → (버전, 열)
+        self._dirty = False
+        self._build([])
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def sync(self, market: str, version: str, columns: Optional[Dict[str, list]], usd_krw: float) -> bool:
+        """시장별 소스 데이터를 반영합니다. 버전(ETag)이 같으면 아무것도 하지 않습니다."""
+        segment = self._segments.get(market)
+        if segment is not None and segment[0] == version:
+            return False
+        self._segments[market] = (version, _normalize(market, columns, usd_krw))
+        self._dirty = True
+        return True
+
+    def refresh(self) -> bool:
+        """변경된 소스가 있으면 테이블과 정렬 인덱스를 다시 만듭니다."""
+        if not self._dirty:
+            return False
+        parts = []
+        for code, market in enumerate(MARKETS):
+            segment = self._segments.get(market)
+            if segment is None:
+                continue
+            part = segment[1]
+            # 같은 시장의 중복 종목은 처음 행만 사용
+            _, keep = np.unique(part["symbol"], return_index=True)
+            keep.sort()
+            if market == "etf" and "us" in self._segments:
+                # 미국 주식 목록과 ETF 목록에 모두 있는 종목은 한 번만 (거래대금이 있는 미국 주식 행 우선)
+                keep = keep[~np.isin(part["symbol"][keep], self._segments["us"][1]["symbol"])]
+            parts.append((code, {field: values[keep] for field, values in part.items()}))
+        self._build(parts)
+        self._dirty = False
+        return True
+
+    def _build(self, parts: List[Tuple[int, Dict[str, np.ndarray]]]) -> None:
+        def concat(field: str, dtype) -> np.ndarray:
+            return np.concatenate([part[field] for _, part in parts]) if parts else np.empty(0, dtype=dtype)
+
+        self.symbol = concat("symbol", object)
+        self.name = concat("name", object)
+        self.native_price = concat("native_price", np.float64)
+        self.market = np.concatenate([np.full(len(part["symbol"]), code, dtype=np.int8) for code, part in parts]) \
+            if parts else np.empty(0, dtype=np.int8)
+        self.columns: Dict[str, np.ndarray] = {column: concat(column, np.float64) for column in COLUMNS}
+        # 열별 정렬 인덱스: 값이 있는 행의 오름차순 행 번호 + 정렬된 값 (값이 없는 행은 별도 보관)
+        self._order: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._missing: Dict[str, np.ndarray] = {}
+        for column, values in self.columns.items():
+            present = ~np.isnan(values)
+            order = np.flatnonzero(present)
+            order = order[np.argsort(values[order], kind="stable")]
+            self._order[column] = order
+            self._sorted[column] = values[order]
+            self._missing[column] = np.flatnonzero(~present)
+
+    def _range(self, condition: Condition) -> np.ndarray:
+        """정렬 인덱스에서 이분 탐색으로 조건을 만족하는 행 번호 구간을 찾습니다."""
+        values = self._sorted[condition.column]
+        side_lo, side_hi = {
+            ">": ("right", None), ">=": ("left", None),
+            "<": (None, "left"), "<=": (None, "right"), "=": ("left", "right"),
+        }[condition.op]
+        lo = int(np.searchsorted(values, condition.value, side=side_lo)) if side_lo else 0
+        hi = int(np.searchsorted(values, condition.value, side=side_hi)) if side_hi else len(values)
+        return self._order[condition.column][lo:max(lo, hi)]
+
+    def query(self, conditions: List[Condition], markets: Optional[List[str]] = None,
+              sort: str = "trade_value", descending: bool = True, limit: int = 50) -> List[dict]:
+        if sort not in COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort} (available: {', '.join(COLUMNS)})")
+        unknown = [m for m in markets or [] if m not in MARKETS]
+        if unknown:
+            raise ValueError(f"Unknown market: {', '.join(unknown)} (available: {', '.join(MARKETS)})")
+
+        mask: Optional[np.ndarray] = None
+        if conditions:
+            # 가장 좁은 구간의 조건으로 후보를 뽑고 나머지 조건은 후보에만 적용
+            ranges = [(self._range(c), c) for c in conditions]
+            ranges.sort(key=lambda item: len(item[0]))
+            candidates = ranges[0][0]
+            for _, condition in ranges[1:]:
+                if candidates.size == 0:
+                    break
+                values = self.columns[condition.column][candidates]
+                candidates = candidates[_OPS[condition.op](values, condition.value)]
+            mask = np.zeros(len(self.symbol), dtype=bool)
+            mask[candidates] = True
+        if markets:
+            codes = np.array([MARKETS.index(m) for m in markets], dtype=np.int8)
+            in_market = np.isin(self.market, codes)
+            mask = in_market if mask is None else mask & in_market
+
+        order = self._order[sort]
+        order = np.concatenate([order[::-1] if descending else order, self._missing[sort]])
+        if mask is not None:
+            order = order[mask[order]]
+        return self.rows(order[:limit])
+
+    def rows(self, indices: np.ndarray) -> List[dict]:
+        columns = {column: values[indices].tolist() for column, values in self.columns.items()}
+        symbols = self.symbol[indices].tolist()
+        names = self.name[indices].tolist()
+        native = self.native_price[indices].tolist()
+        markets = self.market[indices].tolist()
+        result = []
+        for n in range(len(symbols)):
+            market = MARKETS[markets[n]]
+            volume = columns["volume"][n]
+            trade_value = columns["trade_value"][n]
+            result.append({
+                "market": market,
+                "symbol": symbols[n],
+                "name": names[n],
+                "currency": MARKET_CURRENCY[market],
+                "native_price": native[n],
+                "price": columns["price"][n],
+                "change_rate": columns["change_rate"][n],
+                "volume": None if math.isnan(volume) else volume,
+                "trade_value": None if math.isnan(trade_value) else trade_value,
+            })
+        return result
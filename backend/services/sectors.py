@@ -0,0 +1,198 @@
+"""
+섹터 상세 모듈
+네이버 업종별 시세(sise_group)의 업종 링크를 따라가 업종별 구성 종목을 모으고,
+구성 종목 시세를 묶음 요청으로 갱신해 전체 KRX 종목 섹터 히트맵을 만듭니다.
+
+    구성 종목 : 업종 상세 페이지(sise_group_detail), 업종 수만큼 요청   SECTOR_CONSTITUENTS_TTL=3600
+    종목 시세 : 네이버 실시간 시세 API, 100종목씩 묶어서 요청          SECTOR_QUOTES_TTL=30
+    SECTOR_FETCH_CONCURRENCY=8   (업종 상세/시세 동시 요청 수 상한, web 익스큐터를 독점하지 않도록)
+
+구성 종목은 자주 바뀌지 않으므로 긴 TTL 로 캐시하고, 시세만 짧은 TTL 로 다시 조회합니다.
+"""
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional
+
+from backend.services import executors, httpclient, tracing
+from backend.services.lazy import lazy_import
+from backend.services.metrics import instrument
+from backend.services.quotes import Quote
+from backend.services.stock_api import NAVER_HEADERS
+
+SECTOR_DETAIL_URL = "https://finance.naver.com/sise/sise_group_detail.naver"
+REALTIME_URL = "https://polling.finance.naver.com/api/realtime/domestic/stock/"
+
+CONSTITUENTS_TTL = float(os.getenv("SECTOR_CONSTITUENTS_TTL", "3600"))
+QUOTES_TTL = float(os.getenv("SECTOR_QUOTES_TTL", "30"))
+FETCH_CONCURRENCY = max(1, int(os.getenv("SECTOR_FETCH_CONCURRENCY", "8")))
+QUOTE_BATCH = 100
+
+bs4 = lazy_import("bs4")
+
+
+def _number(text: str) -> float:
+    return float(text.strip().replace(",", "").replace("%", "").replace("+", ""))
+
+
+# === 업종 상세 (구성 종목) ===
+
+def _parse_sector_detail_html(content: bytes) -> List[Quote]:
+    """네이버 업종 상세(sise_group_detail) HTML을 구성 종목 시세 레코드로 변환합니다."""
+    with tracing.span("decode", **{"input.bytes": len(content)}):
+        html = content.decode('euc-kr', 'replace')
+
+    with tracing.span("parse"):
+        soup = bs4.BeautifulSoup(html, 'html.parser')
+        table = soup.select_one('table.type_5')
+        if not table:
+            return []
+        rows = table.find_all('tr')
+
+    with tracing.span("transform", **{"input.rows": len(rows)}) as sp:
+        stocks = []
+        for row in rows:
+            # 0: 종목명(링크), 1: 현재가, 2: 전일비, 3: 등락률, 4/5: 매수/매도호가, 6: 거래량, 7: 거래대금(백만)
+            cols = row.find_all('td')
+            if len(cols) < 8:
+                continue
+            name_tag = cols[0].find('a')
+            if not name_tag or 'code=' not in name_tag.get('href', ''):
+                continue
+            try:
+                price = int(_number(cols[1].text))
+                volume = int(_number(cols[6].text))
+                stocks.append(Quote(
+                    source="naver",
+                    symbol=name_tag['href'].split('code=')[-1].strip(),
+                    name=name_tag.text.strip(),
+                    price=price,
+                    change_rate=_number(cols[3].text),
+                    volume=volume,
+                    trade_value=price * volume,
+                    price_krw=price,
+                    trade_value_krw=price * volume,
+                ))
+            except ValueError:
+                continue
+        sp.set_attribute("result.rows", len(stocks))
+    return stocks
+
+
+@instrument("sector_detail")
+def _get_sector_detail_sync(code: str) -> Optional[List[Quote]]:
+    """업종 하나의 구성 종목. 실패하면 None (빈 업종과 구분해 이전 목록을 유지하도록)"""
+    try:
+        response = httpclient.get(SECTOR_DETAIL_URL, params={"type": "upjong", "no": code},
+                                  headers=NAVER_HEADERS, timeout=5)
+        if response.status_code != 200:
+            return None
+        return executors.run_cpu(_parse_sector_detail_html, response.content)
+    except Exception as e:
+        print(f"Sector detail fetch failed ({code}): {e}")
+        return None
+
+
+# === 실시간 시세 (묶음 요청) ===
+
+def _parse_realtime(data: dict) -> List[Quote]:
+    quotes = []
+    for item in data.get("datas") or []:
+        try:
+            price = int(_number(item["closePrice"]))
+            volume = int(_number(item["accumulatedTradingVolume"]))
+        except (KeyError, ValueError):
+            continue
+        quotes.append(Quote(
+            source="naver",
+            symbol=item["itemCode"],
+            name=item.get("stockName", item["itemCode"]),
+            price=price,
+            change_rate=_number(item.get("fluctuationsRatio", "0")),
+            volume=volume,
+            trade_value=price * volume,
+            price_krw=price,
+            trade_value_krw=price * volume,
+        ))
+    return quotes
+
+
+@instrument("naver_realtime")
+def _get_realtime_quotes_sync(codes: List[str]) -> Optional[List[Quote]]:
+    try:
+        response = httpclient.get(REALTIME_URL + ",".join(codes), headers=NAVER_HEADERS, timeout=5)
+        if response.status_code != 200:
+            return None
+        return _parse_realtime(response.json())
+    except Exception as e:
+        print(f"Naver realtime quote fetch failed: {e}")
+        return None
+
+
+# === 동시 요청 수 제한 ===
+
+async def _bounded(fn: Callable, items: list, limit: int = FETCH_CONCURRENCY) -> list:
+    """
+    items 마다 fn 을 web 익스큐터에서 실행하되 동시에 최대 limit 개만 실행합니다 (입력 순서로 반환).
+    일부 호출이 예외(DeadlineExceeded 등)로 끝나도 나머지 결과는 버리지 않고, 실패한 항목은 None 입니다.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def call(item):
+        async with semaphore:
+            return await executors.run(executors.WEB, fn, item)
+
+    results = await asyncio.gather(*(call(item) for item in items), return_exceptions=True)
+    failed = [result for result in results if isinstance(result, BaseException)]
+    if failed:
+        print(f"Sector fetch failed for {len(failed)}/{len(items)} items: {failed[0]!r}")
+    return [None if isinstance(result, BaseException) else result for result in results]
+
+
+async def fetch_constituents(codes: List[str]) -> Dict[str, Optional[List[Quote]]]:
+    """업종 번호 → 구성 종목 (실패한 업종은 None)"""
+    return dict(zip(codes, await _bounded(_get_sector_detail_sync, codes)))
+
+
+async def fetch_quotes(symbols: List[str]) -> Optional[List[Quote]]:
+    """종목 시세를 QUOTE_BATCH 개씩 묶어 조회합니다. 일부 묶음이 실패하면 나머지만 반환합니다."""
+    batches = [symbols[i:i + QUOTE_BATCH] for i in range(0, len(symbols), QUOTE_BATCH)]
+    results = await _bounded(_get_realtime_quotes_sync, batches)
+    if batches and all(result is None for result in results):
+        return None
+    return [quote for result in results if result for quote in result]
+
+
+# === 히트맵 ===
+
+def members_from_quotes(quotes: List[Quote]) -> Dict[str, List[str]]:
+    """구성 종목 캐시 항목 (JSON 으로 공유 저장소에 보관)"""
+    return {"codes": [q.symbol for q in quotes], "names": [q.name for q in quotes]}
+
+
+def build_heatmap(groups: List[dict], members: Dict[str, dict], quotes: List[Quote]) -> List[dict]:
+    """업종 목록 + 구성 종목 + 종목 시세 → 업종별 구성 종목 시세 (업종 안에서는 거래대금 내림차순)"""
+    by_code = {q.symbol: q for q in quotes}
+    heatmap = []
+    for group in groups:
+        member = members.get(group.get("code") or "")
+        stocks = []
+        for code, name in zip(member["codes"], member["names"]) if member else ():
+            quote = by_code.get(code)
+            if quote is None:
+                continue
+            stocks.append({
+                "code": code,
+                "name": name,
+                "current_price": quote.price,
+                "change_rate": quote.change_rate,
+                "trade_volume": quote.volume,
+                "trade_value": quote.trade_value,
+            })
+        stocks.sort(key=lambda s: s["trade_value"], reverse=True)
+        heatmap.append({
+            "code": group.get("code"),
+            "name": group["name"],
+            "change_rate": group["change_rate"],
+            "stocks": stocks,
+        })
+    return heatmap
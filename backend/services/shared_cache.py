@@ -0,0 +1,259 @@
+"""
+공유 스냅샷 저장소 모듈
+여러 uvicorn 워커가 같은 섹션 스냅샷을 읽도록 프로세스 밖 저장소를 제공하고,
+백그라운드 갱신/기록 작업을 정확히 하나의 워커(리더)만 수행하도록 리더를 선출합니다.
+
+    SNAPSHOT_BACKEND=memory|file|redis   (기본값: memory - 단일 프로세스)
+    SNAPSHOT_DIR=/dev/shm/coin-dashboard (file 모드 저장 경로, tmpfs 권장)
+    REDIS_URL=redis://localhost:6379/0   (redis 모드, redis 패키지 필요)
+
+redis 를 사용할 수 없으면 file, file 도 사용할 수 없으면 memory 로 대체합니다.
+"""
+import json
+import os
+import socket
+import tempfile
+import uuid
+from typing import Optional
+
+from backend.services.snapshot import Snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# 워커 식별자 (로그/리더 키 값)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def encode_snapshot(snapshot: Snapshot) -> bytes:
+    """헤더(JSON 한 줄) + 본문 바이트. 원본 데이터는 내부 소비자(포트폴리오 등)를 위해 함께 보관합니다."""
+    header = {
+        "name": snapshot.name, "etag": snapshot.etag, "created_at": snapshot.created_at,
+        "stale": snapshot.stale, "checked_at": snapshot.checked_at, "version": snapshot.version, "data": snapshot.data,
+    }
+    return json.dumps(header, ensure_ascii=False).encode() + b"\n" + snapshot.body
+
+
+def decode_snapshot(raw: bytes) -> Snapshot:
+    header, _, body = raw.partition(b"\n")
+    meta = json.loads(header)
+    return Snapshot(
+        name=meta["name"], data=meta["data"], body=body, etag=meta["etag"], created_at=meta["created_at"],
+        stale=meta.get("stale", False), checked_at=meta.get("checked_at"), version=meta.get("version"),
+    )
+
+
+class MemoryBackend:
+    """단일 프로세스용. 공유 저장소가 없으며 항상 리더입니다."""
+    name = "memory"
+
+    def load(self, name: str) -> Optional[Snapshot]:
+        return None
+
+    def store(self, snapshot: Snapshot) -> None:
+        pass
+
+    def touch(self, name: str, ts: float) -> None:
+        pass
+
+    def last_access(self, name: str) -> Optional[float]:
+        return None
+
+    def try_acquire_leader(self) -> bool:
+        return True
+
+    def release_leader(self) -> None:
+        pass
+
+
+class FileBackend:
+    """
+    디렉터리(가능하면 tmpfs) 기반 공유 저장소.
+    스냅샷은 임시 파일 작성 후 rename 으로 교체하므로 읽는 쪽은 항상 완전한 파일을 봅니다.
+    리더는 leader.lock 파일의 flock 을 가진 워커이며, 프로세스가 죽으면 OS 가 잠금을 해제합니다.
+    """
+    name = "file"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = None
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{name}.{suffix}")
+
+    def load(self, name: str) -> Optional[Snapshot]:
+        try:
+            with open(self._path(name, "snapshot"), "rb") as f:
+                return decode_snapshot(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Shared snapshot load failed ({name}): {e}")
+            return None
+
+    def store(self, snapshot: Snapshot) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{snapshot.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_snapshot(snapshot))
+            os.replace(tmp, self._path(snapshot.name, "snapshot"))
+        except Exception as e:
+            print(f"Shared snapshot store failed ({snapshot.name}): {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def touch(self, name: str, ts: float) -> None:
+        path = self._path(name, "access")
+        try:
+            os.utime(path, (ts, ts))
+        except FileNotFoundError:
+            open(path, "a").close()
+            os.utime(path, (ts, ts))
+
+    def last_access(self, name: str) -> Optional[float]:
+        try:
+            return os.stat(self._path(name, "access")).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def try_acquire_leader(self) -> bool:
+        if self._lock_file is not None:
+            return True
+        if fcntl is None:
+            return True
+        f = open(os.path.join(self.directory, "leader.lock"), "a+")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(WORKER_ID)
+        f.flush()
+        self._lock_file = f
+        return True
+
+    def release_leader(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class RedisBackend:
+    """
+    로컬 Redis 기반 공유 저장소.
+    리더는 SET NX PX 로 임대(lease)를 얻고, 임대 시간 안에 갱신하지 못하면 다른 워커가 이어받습니다.
+    """
+    name = "redis"
+    PREFIX = "coin-dashboard"
+    LEADER_LEASE_MS = 10_000
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._client.ping()
+        self._leader_key = f"{self.PREFIX}:leader"
+
+    def load(self, name: str) -> Optional[Snapshot]:
+        try:
+            raw = self._client.get(f"{self.PREFIX}:snapshot:{name}")
+            return decode_snapshot(raw) if raw else None
+        except Exception as e:
+            print(f"Shared snapshot load failed ({name}): {e}")
+            return None
+
+    def store(self, snapshot: Snapshot) -> None:
+        try:
+            self._client.set(f"{self.PREFIX}:snapshot:{snapshot.name}", encode_snapshot(snapshot))
+        except Exception as e:
+            print(f"Shared snapshot store failed ({snapshot.name}): {e}")
+
+    def touch(self, name: str, ts: float) -> None:
+        try:
+            self._client.set(f"{self.PREFIX}:access:{name}", ts)
+        except Exception:
+            pass
+
+    def last_access(self, name: str) -> Optional[float]:
+        try:
+            value = self._client.get(f"{self.PREFIX}:access:{name}")
+            return float(value) if value else None
+        except Exception:
+            return None
+
+    def try_acquire_leader(self) -> bool:
+        try:
+            if self._client.set(self._leader_key, WORKER_ID, nx=True, px=self.LEADER_LEASE_MS):
+                return True
+            # 이미 리더라면 임대 연장
+            current = self._client.get(self._leader_key)
+            if current and current.decode() == WORKER_ID:
+                self._client.pexpire(self._leader_key, self.LEADER_LEASE_MS)
+                return True
+        except Exception as e:
+            print(f"Leader election failed: {e}")
+        return False
+
+    def release_leader(self) -> None:
+        try:
+            current = self._client.get(self._leader_key)
+            if current and current.decode() == WORKER_ID:
+                self._client.delete(self._leader_key)
+        except Exception:
+            pass
+
+
+def _default_snapshot_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "coin-dashboard")
+
+
+def backend_from_env():
+    mode = os.getenv("SNAPSHOT_BACKEND", "memory").lower()
+    if mode == "redis":
+        if redis is None:
+            print("SNAPSHOT_BACKEND=redis 이지만 redis 패키지가 없어 file 백엔드를 사용합니다.")
+            mode = "file"
+        else:
+            try:
+                return RedisBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+            except Exception as e:
+                print(f"Redis 연결 실패 ({e}), file 백엔드를 사용합니다.")
+                mode = "file"
+    if mode == "file":
+        try:
+            return FileBackend(os.getenv("SNAPSHOT_DIR") or _default_snapshot_dir())
+        except Exception as e:
+            print(f"공유 스냅샷 디렉터리 준비 실패 ({e}), 프로세스 내 캐시를 사용합니다.")
+    return MemoryBackend()
+
+
+class LeaderElection:
+    """주기적으로 리더 자격을 확인/갱신합니다. is_leader 는 마지막 확인 결과입니다."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.is_leader = False
+
+    def check(self) -> bool:
+        was_leader = self.is_leader
+        self.is_leader = self.backend.try_acquire_leader()
+        if self.is_leader != was_leader:
+            role = "leader" if self.is_leader else "follower"
+            print(f"[{WORKER_ID}] snapshot backend={self.backend.name}, role={role}")
+        return self.is_leader
+
+    def release(self) -> None:
+        if self.is_leader:
+            self.backend.release_leader()
+            self.is_leader = False
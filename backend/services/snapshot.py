@@ -0,0 +1,245 @@
+"""
+스냅샷 모듈
+섹션 데이터를 생성 시점에 한 번만 검증하고, 인코딩된 JSON 바이트와 ETag 로 보관합니다.
+캐시 히트 시에는 Pydantic 모델 생성/검증 없이 저장된 바이트를 그대로 응답합니다.
+압축(gzip/br)된 본문도 ETag 별로 한 번만 만들어 재사용합니다.
+"""
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from backend.services import deadline
+
+try:
+    import brotli  # 선택 의존성: 설치된 경우에만 br 인코딩 제공
+except ImportError:
+    brotli = None
+
+# 이보다 작은 본문은 압축 이득보다 오버헤드가 큼
+MIN_COMPRESS_BYTES = 1024
+
+
+# 백그라운드 작업(선갱신, 히스토리 기록)의 조회는 "최근 사용"으로 집계하지 않음
+_track_access: contextvars.ContextVar[bool] = contextvars.ContextVar("snapshot_track_access", default=True)
+
+
+@contextmanager
+def untracked():
+    token = _track_access.set(False)
+    try:
+        yield
+    finally:
+        _track_access.reset(token)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    name: str
+    data: Any           # 서비스 함수가 반환한 원본 데이터 (내부 소비자용)
+    body: bytes         # 검증 후 인코딩된 JSON
+    etag: str
+    created_at: float   # time.time()
+    stale: bool = False                 # 업스트림 장애로 마지막 정상 스냅샷을 재사용 중
+    checked_at: Optional[float] = None  # 마지막 생성 시도 시각 (stale 스냅샷은 created_at 과 다름)
+    version: Optional[int] = None       # 순위 섹션의 delta 버전 (공유 저장소로 워커 간에 함께 전달)
+
+    @property
+    def checked(self) -> float:
+        """TTL/선갱신 기준 시각"""
+        return self.checked_at if self.checked_at is not None else self.created_at
+
+    def as_stale(self) -> "Snapshot":
+        """같은 데이터/ETag 를 유지한 채 stale 로 표시하고 확인 시각만 갱신한 스냅샷"""
+        return replace(self, stale=True, checked_at=time.time())
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def make_snapshot(name: str, data: Any, adapter: TypeAdapter) -> Snapshot:
+    """
+    데이터를 한 번 검증하고 JSON 바이트로 인코딩합니다.
+    FastAPI response_model 과 동일하게 alias 기준으로 직렬화합니다.
+    """
+    validated = adapter.validate_python(data)
+    body = adapter.dump_json(validated, by_alias=True)
+    return Snapshot(name=name, data=data, body=body, etag=make_etag(body), created_at=time.time())
+
+
+def compose_object(fields: Iterable[Tuple[str, bytes]]) -> bytes:
+    """이미 인코딩된 필드 값들을 이어 붙여 JSON 객체 바이트를 만듭니다."""
+    return b"{" + b",".join(json.dumps(key).encode() + b":" + value for key, value in fields) + b"}"
+
+
+class SnapshotCache:
+    """
+    이름별 스냅샷 캐시 (TTL + single-flight).
+    같은 이름에 대한 동시 요청은 하나의 생성 작업(태스크)을 남은 데드라인까지만 기다립니다 (초과 시 DeadlineExceeded).
+    기다리던 요청이 취소되거나 먼저 포기해도 생성 작업은 끝까지 실행되어 캐시를 채웁니다.
+    max_entries 를 지정하면 가장 오래 사용되지 않은 항목부터 제거합니다 (뉴스 검색어 등).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, backend=None):
+        self.max_entries = max_entries
+        # 여러 워커가 공유하는 저장소 (shared_cache 의 백엔드). 로컬 사전은 L1 캐시로 동작
+        self.backend = backend
+        self._snapshots: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[Snapshot]"] = {}
+        self._last_access: Dict[str, float] = {}
+        self._shared_touch: Dict[str, float] = {}
+
+    def peek(self, name: str) -> Optional[Snapshot]:
+        return self._snapshots.get(name)
+
+    def put(self, snapshot: Snapshot) -> None:
+        self._snapshots[snapshot.name] = snapshot
+        self._snapshots.move_to_end(snapshot.name)
+        if self.max_entries is not None:
+            while len(self._snapshots) > self.max_entries:
+                evicted, _ = self._snapshots.popitem(last=False)
+                self._last_access.pop(evicted, None)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._last_access.clear()
+
+    def latest(self, name: str) -> Optional[Snapshot]:
+        """로컬과 공유 저장소 중 더 최근 스냅샷 (만료 여부 무관)"""
+        snapshot = self._snapshots.get(name)
+        if self.backend is not None:
+            shared = self.backend.load(name)
+            if shared is not None and (snapshot is None or shared.checked > snapshot.checked):
+                return shared
+        return snapshot
+
+    def idle_for(self, name: str) -> float:
+        """마지막 조회 이후 경과 시간 (모든 워커 기준, 조회된 적 없으면 inf)"""
+        last = self._last_access.get(name)
+        if self.backend is not None:
+            shared = self.backend.last_access(name)
+            if shared is not None and (last is None or shared > last):
+                last = shared
+        return time.time() - last if last is not None else float("inf")
+
+    def _touch(self, name: str) -> None:
+        now = time.time()
+        self._last_access[name] = now
+        # 공유 저장소에는 초당 1회까지만 기록
+        if self.backend is not None and now - self._shared_touch.get(name, 0.0) >= 1.0:
+            self._shared_touch[name] = now
+            self.backend.touch(name, now)
+
+    def _save(self, snapshot: Snapshot) -> None:
+        self.put(snapshot)
+        if self.backend is not None:
+            self.backend.store(snapshot)
+
+    def _fresh(self, name: str, ttl: float) -> Optional[Snapshot]:
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and time.time() - snapshot.checked < ttl:
+            if self.max_entries is not None:
+                self._snapshots.move_to_end(name)
+            return snapshot
+        # 로컬에 없거나 만료되었으면 다른 워커(리더)가 갱신한 스냅샷을 확인
+        if self.backend is not None:
+            shared = self.backend.load(name)
+            if shared is not None and time.time() - shared.checked < ttl:
+                self.put(shared)
+                return shared
+        return None
+
+    async def get(self, name: str, producer: Callable[[], Awaitable[Snapshot]], ttl: float) -> Snapshot:
+        if _track_access.get():
+            self._touch(name)
+        snapshot = self._fresh(name, ttl)
+        if snapshot is not None:
+            return snapshot
+        return await self._produce(name, producer)
+
+    async def refresh(self, name: str, producer: Callable[[], Awaitable[Snapshot]]) -> Snapshot:
+        """TTL 과 무관하게 새 스냅샷을 만듭니다 (백그라운드 선갱신용). 기존 값은 교체 전까지 계속 제공됩니다."""
+        return await self._produce(name, producer)
+
+    async def _produce(self, name: str, producer: Callable[[], Awaitable[Snapshot]]) -> Snapshot:
+        task = self._inflight.get(name)
+        if task is None:
+            task = self._inflight[name] = asyncio.ensure_future(self._run(name, producer))
+            # 기다리던 요청이 모두 떠난 뒤 실패해도 "exception was never retrieved" 경고를 남기지 않음
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        # 기다리는 쪽이 취소되거나 데드라인이 지나도 생성 작업은 취소하지 않음
+        return await deadline.wait(asyncio.shield(task))
+
+    async def _run(self, name: str, producer: Callable[[], Awaitable[Snapshot]]) -> Snapshot:
+        try:
+            snapshot = await producer()
+            self._save(snapshot)
+            return snapshot
+        finally:
+            self._inflight.pop(name, None)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 압축 방식을 고릅니다 (br > gzip, q=0 제외)."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for coding in supported_encodings():
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class EncodedBodyCache:
+    """(ETag, 인코딩) 별 압축 본문 캐시. 같은 내용은 한 번만 압축합니다."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, etag: str, body: bytes, encoding: str) -> bytes:
+        key = (etag, encoding)
+        encoded = self._bodies.get(key)
+        if encoded is None:
+            encoded = compress(body, encoding)
+            self._bodies[key] = encoded
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        else:
+            self._bodies.move_to_end(key)
+        return encoded
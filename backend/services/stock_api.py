@@ -1,23 +1,32 @@
 """
 주식 API 모듈
-국내주식(코스피/코스닥)과 해외주식(미국) 데이터를 제공합니다. (Async with anyio)
+국내주식(코스피/코스닥)과 해외주식(미국) 데이터를 제공합니다. (Async, web 익스큐터)
+요청 데드라인(deadline)이 있으면 yfinance 호출도 남은 시간을 타임아웃으로 사용합니다
+(타임아웃을 받지 않는 fast_info/info 는 호출 전에 데드라인을 확인).
 """
+import math
 from datetime import datetime, timedelta
 from typing import Optional, List
-import requests
 import xml.etree.ElementTree as ET
-from urllib.parse import quote
-from anyio import to_thread
-import yfinance as yf
-import asyncio
-from functools import partial
-from bs4 import BeautifulSoup
-import pandas as pd
+from urllib.parse import parse_qs, quote, urlsplit
+from backend.services.metrics import instrument
+from backend.services import circuit, deadline, executors, httpclient, market_hours, tracing
+from backend.services.lazy import lazy_import
+from backend.services.quotes import Quote
+
+# 무거운 라이브러리는 첫 호출 시 import (서버/CLI 시작 시간 단축)
+yf = lazy_import("yfinance")
+pd = lazy_import("pandas")
+bs4 = lazy_import("bs4")
 
 # 한국 주식 (Legcay pykrx support removed or kept minimal if needed, but we use yfinance now)
 # 미국 주식
 YFINANCE_AVAILABLE = True
+YFINANCE_TIMEOUT = 10  # yfinance download/history 기본 타임아웃 (초)
+# 뉴스 검색어의 회사명 조회(yfinance info)에 쓸 최대 시간. 남은 예산의 절반을 넘지 않아 RSS 조회 시간을 남겨 둠
+NEWS_NAME_BUDGET = 2.0
 
+@instrument("usd_krw_rate")
 def _get_usd_krw_rate_sync() -> float:
     """
     USD/KRW 환율을 조회합니다 (Sync).
@@ -26,57 +35,90 @@ def _get_usd_krw_rate_sync() -> float:
     try:
         # pyupbit dependency usage for rate reduced to minimize mixed logic, 
         # or use yfinance for rate "KRW=X" 
-        ticker = yf.Ticker("KRW=X")
-        price = ticker.fast_info.last_price
-        if price:
-            return float(price)
+        deadline.check()
+        with circuit.guard("yahoo"), tracing.span("yfinance.fast_info", kind=tracing.KIND_CLIENT, symbol="KRW=X"):
+            ticker = yf.Ticker("KRW=X")
+            price = ticker.fast_info.last_price
+            if not price:
+                raise ValueError("KRW=X last_price unavailable")
+        return float(price)
     except Exception as e:
         print(f"환율 조회 실패: {e}")
     return 1450.0  # 기본값
 
 async def get_usd_krw_rate() -> float:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_usd_krw_rate_sync)
+    return await executors.run(executors.WEB, _get_usd_krw_rate_sync)
 
 
 def get_recent_trading_dates(days: int = 7) -> List[str]:
     """
     최근 거래일 후보 목록을 반환합니다 (YYYYMMDD 형식).
+    주말과 KRX 휴장일(market_calendar.json)은 제외합니다.
     """
     dates = []
     today = datetime.now()
     for i in range(days):
         check_date = today - timedelta(days=i)
-        if check_date.weekday() < 5:  # 월~금
+        if market_hours.is_trading_day(market_hours.KRX, check_date.date()):
             dates.append(check_date.strftime("%Y%m%d"))
     return dates
 
 
+NAVER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
 def _get_real_korea_stock_data_sync(market="kospi", limit=10):
     """
     네이버 금융 거래상위 페이지 크롤링하여 실시간 거래량 상위 종목 조회
-    market: "kospi" or "kosdaq"
+    market: "kospi" or "kosdaq" (메트릭은 시장별 소스로 기록)
     """
+    if market == "kospi":
+        return _get_kospi_top_volume_sync(limit)
+    return _get_kosdaq_top_volume_sync(limit)
+
+
+@instrument("kospi_top_volume")
+def _get_kospi_top_volume_sync(limit=10):
+    return _fetch_korea_top_volume("kospi", limit)
+
+
+@instrument("kosdaq_top_volume")
+def _get_kosdaq_top_volume_sync(limit=10):
+    return _fetch_korea_top_volume("kosdaq", limit)
+
+
+def _fetch_korea_top_volume(market: str, limit: int) -> List[Quote]:
     try:
         sosok = "0" if market == "kospi" else "1"
         url = f"https://finance.naver.com/sise/sise_quant.naver?sosok={sosok}"
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        
-        response = requests.get(url, headers=headers, timeout=5)
+        response = httpclient.get(url, headers=NAVER_HEADERS, timeout=5)
         if response.status_code != 200:
             return []
             
-        # Naver Finance uses EUC-KR
-        soup = BeautifulSoup(response.content.decode('euc-kr', 'replace'), 'html.parser')
+        return executors.run_cpu(_parse_korea_stock_html, response.content, limit)
         
+    except Exception as e:
+        print(f"Korean stock fetch error: {e}")
+        return []
+
+
+def _parse_korea_stock_html(content: bytes, limit: int = 10) -> List[Quote]:
+    """네이버 거래상위(sise_quant) HTML을 종목 리스트로 변환합니다."""
+    # Naver Finance uses EUC-KR
+    with tracing.span("decode", **{"input.bytes": len(content)}):
+        html = content.decode('euc-kr', 'replace')
+
+    with tracing.span("parse"):
+        soup = bs4.BeautifulSoup(html, 'html.parser')
         table = soup.select_one('table.type_2')
         if not table:
             return []
-            
         rows = table.find_all('tr')
+
+    with tracing.span("transform", **{"input.rows": len(rows)}) as sp:
         data_list = []
         
         count = 0
@@ -117,23 +159,23 @@ def _get_real_korea_stock_data_sync(market="kospi", limit=10):
                 # or use column 6 (check unit). Column 6 is 'Transaction Amount (Million)'.
                 trade_value = current_price * trade_volume
                 
-                data_list.append({
-                    "code": code,
-                    "name": name_kor,
-                    "current_price": current_price,
-                    "change_rate": change_rate,
-                    "trade_volume": trade_volume,
-                    "trade_value": trade_value
-                })
+                data_list.append(Quote(
+                    source="naver",
+                    symbol=code,
+                    name=name_kor,
+                    price=current_price,
+                    change_rate=change_rate,
+                    volume=trade_volume,
+                    trade_value=trade_value,
+                    price_krw=current_price,
+                    trade_value_krw=trade_value,
+                ))
                 count += 1
             except Exception as e:
                 continue
+        sp.set_attribute("result.rows", len(data_list))
                 
-        return data_list
-        
-    except Exception as e:
-        print(f"Korean stock fetch error: {e}")
-        return []
+    return data_list
 
 
 
@@ -162,7 +204,8 @@ US_STOCK_NAMES = {
     "XOM": "Exxon Mobil", "CVX": "Chevron Corp", "PFE": "Pfizer Inc", "MRK": "Merck & Co", "LLY": "Eli Lilly and Company"
 }
 
-def _get_us_top_volume_sync(limit: int = 10) -> Optional[List[dict]]:
+@instrument("us_top_volume")
+def _get_us_top_volume_sync(limit: int = 10) -> Optional[List[Quote]]:
     try:
         usd_krw_rate = _get_usd_krw_rate_sync()
         
@@ -175,62 +218,20 @@ def _get_us_top_volume_sync(limit: int = 10) -> Optional[List[dict]]:
         # period="1d", group_by='ticker' ensures we get a structure we can iterate easily
         # threads=True is default but explicit is good
         try:
-            df = yf.download(target_symbols, period="1d", group_by='ticker', progress=False, threads=True)
+            with circuit.guard("yahoo"), \
+                    tracing.span("yfinance.download", kind=tracing.KIND_CLIENT, **{"symbols": len(target_symbols)}):
+                df = yf.download(target_symbols, period="1d", group_by='ticker', progress=False, threads=True,
+                                 timeout=deadline.timeout(YFINANCE_TIMEOUT))
+                # yfinance 는 차단/오류 시 예외 대신 빈 DataFrame 을 반환
+                if df.empty:
+                    raise ValueError("empty download")
         except Exception as e:
             print(f"Batch download failed: {e}")
             return []
 
-        stocks_data = []
-        
-        for symbol in target_symbols:
-            try:
-                # Handle MultiIndex DataFrame from yf.download
-                if len(target_symbols) > 1:
-                    # If multiple tickers, df has top level column as ticker
-                    ticker_data = df[symbol]
-                else:
-                    # If single ticker (unlikely here but safe), no top level
-                    ticker_data = df
-
-                if ticker_data.empty:
-                    continue
-
-                # Get latest row
-                latest = ticker_data.iloc[-1]
-                
-                # Check for NaNs
-                if pd.isna(latest['Close']) or pd.isna(latest['Volume']):
-                    continue
-
-                current_price = float(latest['Close'])
-                volume = int(latest['Volume'])
-                open_price = float(latest['Open'])
-                
-                # Calculate change from Open of the day
-                change_rate = 0.0
-                if open_price > 0:
-                    change_rate = ((current_price - open_price) / open_price) * 100
-                    
-                trade_value = current_price * volume
-                
-                # Use mapped name if available, else symbol
-                full_name = US_STOCK_NAMES.get(symbol, symbol)
-                
-                stocks_data.append({
-                    'symbol': symbol,
-                    'name': full_name,
-                    'current_price': round(current_price, 2),
-                    'change_rate': round(change_rate, 2),
-                    'trade_volume': volume,
-                    'trade_value': round(trade_value, 2),
-                    'current_price_krw': round(current_price * usd_krw_rate),
-                    'trade_value_krw': round(trade_value * usd_krw_rate)
-                })
-            except Exception:
-                continue
-                
-        # Sort by Volume (Most Active)
-        stocks_data.sort(key=lambda x: x['trade_volume'], reverse=True)
+        with tracing.span("transform", **{"input.rows": len(df)}) as sp:
+            stocks_data = executors.run_cpu(_build_us_stocks, df, target_symbols, usd_krw_rate)
+            sp.set_attribute("result.rows", len(stocks_data))
         return stocks_data[:limit]
 
     except Exception as e:
@@ -238,6 +239,64 @@ def _get_us_top_volume_sync(limit: int = 10) -> Optional[List[dict]]:
         return []
 
 
+def _build_us_stocks(df, target_symbols: List[str], usd_krw_rate: float) -> List[Quote]:
+    """yf.download 배치 결과(DataFrame)를 거래량 내림차순 종목 리스트로 변환합니다."""
+    stocks_data = []
+    
+    for symbol in target_symbols:
+        try:
+            # Handle MultiIndex DataFrame from yf.download
+            if len(target_symbols) > 1:
+                # If multiple tickers, df has top level column as ticker
+                ticker_data = df[symbol]
+            else:
+                # If single ticker (unlikely here but safe), no top level
+                ticker_data = df
+
+            if ticker_data.empty:
+                continue
+
+            # Get latest row
+            latest = ticker_data.iloc[-1]
+            
+            # Check for NaNs
+            if pd.isna(latest['Close']) or pd.isna(latest['Volume']):
+                continue
+
+            current_price = float(latest['Close'])
+            volume = int(latest['Volume'])
+            open_price = float(latest['Open'])
+            
+            # Calculate change from Open of the day
+            change_rate = 0.0
+            if open_price > 0:
+                change_rate = ((current_price - open_price) / open_price) * 100
+                
+            trade_value = current_price * volume
+            
+            # Use mapped name if available, else symbol
+            full_name = US_STOCK_NAMES.get(symbol, symbol)
+            
+            stocks_data.append(Quote(
+                source="yahoo",
+                symbol=symbol,
+                name=full_name,
+                price=round(current_price, 2),
+                change_rate=round(change_rate, 2),
+                volume=volume,
+                trade_value=round(trade_value, 2),
+                price_krw=round(current_price * usd_krw_rate),
+                trade_value_krw=round(trade_value * usd_krw_rate),
+            ))
+        except Exception:
+            continue
+            
+    # Sort by Volume (Most Active)
+    stocks_data.sort(key=lambda x: x.volume, reverse=True)
+    return stocks_data
+
+
+@instrument("major_indices")
 def _get_major_indices_sync() -> List[dict]:
     indices = [
         {"name": "KOSPI", "symbol": "^KS11"},
@@ -251,8 +310,11 @@ def _get_major_indices_sync() -> List[dict]:
         usd_krw = _get_usd_krw_rate_sync()
         for idx in indices:
             try:
-                ticker = yf.Ticker(idx['symbol'])
-                hist = ticker.history(period="5d")
+                with circuit.guard("yahoo"), \
+                        tracing.span("yfinance.history", kind=tracing.KIND_CLIENT, symbol=idx['symbol']) as sp:
+                    ticker = yf.Ticker(idx['symbol'])
+                    hist = ticker.history(period="5d", timeout=deadline.timeout(YFINANCE_TIMEOUT))
+                    sp.set_attribute("result.rows", len(hist))
                 if len(hist) >= 2:
                     current = hist['Close'].iloc[-1]
                     prev = hist['Close'].iloc[-2]
@@ -272,109 +334,121 @@ def _get_major_indices_sync() -> List[dict]:
     return result
 
 
-def _get_sector_performance_sync() -> List[dict]:
+@instrument("sector_performance")
+def _get_sector_performance_sync(limit: Optional[int] = 10) -> List[dict]:
     """
     네이버 금융 섹터별 시세 (업종별 시세) 크롤링
+    limit=None 이면 전체 업종 (섹터 히트맵용)
     """
     try:
         url = "https://finance.naver.com/sise/sise_group.naver?type=upjong"
         # Naver requires headers
-        headers = {
-             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        res = requests.get(url, headers=headers, timeout=5)
+        res = httpclient.get(url, headers=NAVER_HEADERS, timeout=5)
         if res.status_code != 200:
              return []
              
-        # EUC-KR decode
-        soup = BeautifulSoup(res.content.decode('euc-kr', 'replace'), 'html.parser')
+        return executors.run_cpu(_parse_sector_html, res.content)[:limit]
         
+    except Exception as e:
+        print(f"Sector scraping failed: {e}")
+        return []
+
+
+def _parse_sector_html(content: bytes) -> List[dict]:
+    """네이버 업종별 시세(sise_group) HTML을 등락률 내림차순 업종 리스트로 변환합니다."""
+    # EUC-KR decode
+    with tracing.span("decode", **{"input.bytes": len(content)}):
+        html = content.decode('euc-kr', 'replace')
+
+    with tracing.span("parse"):
+        soup = bs4.BeautifulSoup(html, 'html.parser')
         table = soup.select_one('table.type_1')
         if not table:
             return []
-            
         rows = table.find_all('tr')
+
+    with tracing.span("transform", **{"input.rows": len(rows)}):
         sectors = []
-        
+    
         for row in rows:
             cols = row.find_all('td')
             if len(cols) < 2: 
                 continue
-            
+        
             # Col 0: Name (with Link)
             # Col 1: Change Rate (span)
-            
+        
             name_tag = cols[0].find('a')
             if not name_tag:
                 continue
-                
-            name = name_tag.text.strip()
             
+            name = name_tag.text.strip()
+        
             change_tag = cols[1].find('span')
             if not change_tag:
                 continue
-                
+            
             change_text = change_tag.text.strip().replace('%', '').replace('+', '')
             try:
                 change_rate = float(change_text)
             except:
                 change_rate = 0.0
-            
+        
             # Naver format: 
             # If + : red, If -: blue.
             # We just need the float.
-            
+        
             volume_label = "강세" if change_rate > 1.0 else ("약세" if change_rate < -1.0 else "보합")
-            
+        
             sectors.append({
+                # 업종 상세 링크(sise_group_detail.naver?type=upjong&no=278)의 업종 번호
+                "code": parse_qs(urlsplit(name_tag.get('href', '')).query).get('no', [None])[0],
                 "name": name,
                 "change_rate": change_rate,
                 "volume": volume_label # reusing 'volume' field for trend label
             })
-            
+        
         # Optional: return top 3 and bottom 3? Or just top 10?
         # User asked for "Sector fluctuation status".
         # Let's return Top 5 and Bottom 5 wrapped or just list sorted by change?
         # Typically "Performance" implies ranking.
         # Let's sort by change rate descending.
         sectors.sort(key=lambda x: x['change_rate'], reverse=True)
-        
-        return sectors[:10] # Return Top 10 hottest sectors
-        
-    except Exception as e:
-        print(f"Sector scraping failed: {e}")
-        return []
+    
+        return sectors
 
 
-def _get_stock_news_sync(query: str, limit: int = 5) -> List[dict]:
+def _resolve_news_query_sync(query: str) -> str:
+    """티커(NVDA 등)를 회사명으로 바꿔 뉴스 검색 정확도를 높입니다. 실패하면 검색어를 그대로 사용합니다."""
     try:
-        # Resolve Symbol to Full Name for better news results dynamically
-        search_query = query
-        try:
-            # Check if query looks like a ticker (e.g. "NVDA", "AAPL")
-            # If we just removed the mapping, we need another way?
-            # Or we just assume if it's 3-5 chars it might be a ticker.
-            # Let's try to fetch name via yf.Ticker for ANY query.
-            # This is slow if we do it for list, but for single search it's okay.
+        deadline.check()
+        # Let's try to fetch name via yf.Ticker for ANY query.
+        # This is slow if we do it for list, but for single search it's okay.
+        with tracing.span("yfinance.info", kind=tracing.KIND_CLIENT, symbol=query):
             ticker = yf.Ticker(query)
             # info property triggers a network request
-            info = ticker.info 
-            if 'shortName' in info:
-                search_query = info['shortName']
-            elif 'longName' in info:
-                search_query = info['longName']
-                
-        except Exception as e:
-            # Just log and fallback to original query
-            print(f"Failed to resolve company name for {query}: {e}")
-            pass
-        
+            info = ticker.info
+        if 'shortName' in info:
+            return info['shortName']
+        elif 'longName' in info:
+            return info['longName']
+    except Exception as e:
+        # Just log and fallback to original query
+        print(f"Failed to resolve company name for {query}: {e}")
+    return query
+
+
+@instrument("stock_news")
+def _fetch_news_sync(search_query: str, limit: int = 5) -> List[dict]:
+    try:
         encoded_query = quote(search_query)
         url = f"https://news.google.com/rss/search?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
-        response = requests.get(url, timeout=5)
+        response = httpclient.get(url, timeout=5)
         if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            items = root.findall('.//item')
+            with tracing.span("parse", **{"input.bytes": len(response.content)}) as sp:
+                root = ET.fromstring(response.content)
+                items = root.findall('.//item')
+                sp.set_attribute("result.rows", len(items))
             news_list = []
             for item in items[:limit]:
                 title = item.find('title').text if item.find('title') is not None else "No Title"
@@ -393,10 +467,16 @@ def _get_stock_news_sync(query: str, limit: int = 5) -> List[dict]:
     return []
 
 
+def _get_stock_news_sync(query: str, limit: int = 5) -> List[dict]:
+    # Resolve Symbol to Full Name for better news results dynamically
+    return _fetch_news_sync(_resolve_news_query_sync(query), limit)
+
+
+@instrument("crypto_fear_greed")
 def _get_crypto_fear_greed_sync() -> dict:
     try:
         url = "https://api.alternative.me/fng/"
-        response = requests.get(url, timeout=5)
+        response = httpclient.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             if data['data']:
@@ -411,34 +491,8 @@ def _get_crypto_fear_greed_sync() -> dict:
     return {"value": 50, "value_classification": "Neutral", "timestamp": 0}
 
 
-def _get_whale_alerts_sync(limit: int = 5) -> List[dict]:
-    # Simulation
-    import random
-    coins = ["BTC", "ETH", "XRP", "USDT", "SOL", "DOGE"]
-    exchanges = ["Binance", "Coinbase", "Upbit", "Kraken", "Unknown Wallet"]
-    alerts = []
-    current_time = datetime.now()
-    for i in range(limit):
-        time_offset = random.randint(1, 60)
-        timestamp = (current_time - timedelta(minutes=time_offset)).isoformat()
-        coin = random.choice(coins)
-        amount = random.randint(1000, 100000)
-        from_ex = random.choice(exchanges)
-        to_ex = random.choice(exchanges)
-        if from_ex == to_ex: to_ex = "Wallet"
-        alerts.append({
-            "key": f"{i}",
-            "time": timestamp,
-            "coin": coin,
-            "amount": amount,
-            "from": from_ex,
-            "to": to_ex,
-            "value_usd": amount * (50000 if coin=="BTC" else 3000 if coin=="ETH" else 1) 
-        })
-    return alerts
-
-
-def _get_etf_top_volume_sync(market: str = "us", limit: int = 10) -> List[dict]:
+@instrument("etf_top_volume")
+def _get_etf_top_volume_sync(market: str = "us", limit: int = 10) -> List[Quote]:
     # Implementation simliar to get_real_korea_stock_data but for ETFs
     # Assuming similar implementation is needed or we use a basic list
     symbols = [
@@ -461,51 +515,59 @@ def _get_etf_top_volume_sync(market: str = "us", limit: int = 10) -> List[dict]:
     try:
         tickers = yf.Tickers(" ".join(symbols))
         result = []
-        for sym in symbols:
-            try:
-                t = tickers.tickers[sym]
-                # Fast info
-                current = None
-                volume = None
-                prev = None
+        # fast_info 속성 접근 시 종목별로 네트워크 요청이 발생
+        with tracing.span("yfinance.fast_info", kind=tracing.KIND_CLIENT, **{"symbols": len(symbols)}):
+            for sym in symbols:
+                try:
+                    t = tickers.tickers[sym]
+                    # Fast info
+                    current = None
+                    volume = None
+                    prev = None
                 
-                if hasattr(t, 'fast_info'):
-                    try:
-                        current = t.fast_info.last_price
-                        volume = t.fast_info.last_volume
-                        prev = t.fast_info.previous_close
-                    except:
-                        pass
+                    if hasattr(t, 'fast_info'):
+                        try:
+                            deadline.check()
+                            with circuit.guard("yahoo"):
+                                current = t.fast_info.last_price
+                                volume = t.fast_info.last_volume
+                                prev = t.fast_info.previous_close
+                        except:
+                            pass
                 
-                if current is None:
-                    continue
+                    if current is None:
+                        continue
                 
-                change_rate = 0.0
-                if prev:
-                    change_rate = ((current - prev)/prev)*100
+                    change_rate = 0.0
+                    if prev:
+                        change_rate = ((current - prev)/prev)*100
                 
-                result.append({
-                    "symbol": sym,
-                    "name": name_map.get(sym, sym),
-                    "current_price": current,
-                    "change_rate": change_rate,
-                    "trade_volume": int(volume)
-                })
-            except:
-                continue
+                    # 거래대금/KRW 환산가는 제공하지 않음 (스크리너가 환율로 환산)
+                    result.append(Quote(
+                        source="yahoo",
+                        symbol=sym,
+                        name=name_map.get(sym, sym),
+                        price=current,
+                        change_rate=change_rate,
+                        volume=int(volume),
+                        trade_value=math.nan,
+                        price_krw=math.nan,
+                        trade_value_krw=math.nan,
+                    ))
+                except:
+                    continue
         
         # Sort by volume
-        result.sort(key=lambda x: x.get('trade_volume', 0), reverse=True)
+        result.sort(key=lambda x: x.volume, reverse=True)
         return result[:limit]
 
     except Exception:
         pass
     return []
 
-# Async Wrappers using loop.run_in_executor
+# Async Wrappers (외부 웹 소스는 web 익스큐터에서 실행)
 async def get_real_korea_stock_data(market="kospi", limit=10):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_real_korea_stock_data_sync, market, limit))
+    return await executors.run(executors.WEB, _get_real_korea_stock_data_sync, market, limit)
 
 async def get_kospi_top_volume(limit=10):
     return await get_real_korea_stock_data("kospi", limit)
@@ -514,29 +576,26 @@ async def get_kosdaq_top_volume(limit=10):
     return await get_real_korea_stock_data("kosdaq", limit)
 
 async def get_us_top_volume(limit=10):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_us_top_volume_sync, limit))
+    return await executors.run(executors.WEB, _get_us_top_volume_sync, limit)
 
 async def get_major_indices():
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_major_indices_sync)
+    return await executors.run(executors.WEB, _get_major_indices_sync)
 
-async def get_sector_performance():
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_sector_performance_sync)
+async def get_sector_performance(limit: Optional[int] = 10):
+    return await executors.run(executors.WEB, _get_sector_performance_sync, limit)
 
 async def get_etf_top_volume(market="us", limit=10):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_etf_top_volume_sync, market, limit))
+    return await executors.run(executors.WEB, _get_etf_top_volume_sync, market, limit)
 
 async def get_stock_news(query):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_stock_news_sync, query))
+    # 회사명 조회는 예산의 일부만 기다림. 초과하면 검색어 그대로 RSS 조회
+    # (yfinance info 는 타임아웃을 받지 않으므로 실행 중인 호출은 yfinance 자체 타임아웃까지 워커를 점유할 수 있음)
+    try:
+        with deadline.budget(deadline.share(0.5, NEWS_NAME_BUDGET)):
+            search_query = await executors.run(executors.WEB, _resolve_news_query_sync, query)
+    except deadline.DeadlineExceeded:
+        search_query = query
+    return await executors.run(executors.WEB, _fetch_news_sync, search_query)
 
 async def get_crypto_fear_greed():
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_crypto_fear_greed_sync)
-
-async def get_whale_alerts(limit=5):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_whale_alerts_sync, limit))
+    return await executors.run(executors.WEB, _get_crypto_fear_greed_sync)
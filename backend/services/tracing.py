@@ -0,0 +1,188 @@
+"""
+트레이싱 모듈
+엔드포인트 → 서비스 호출 → 세부 단계(HTTP fetch, decode, parse, transform, model build)
+단위의 스팬을 기록합니다. 출력은 OTLP/JSON 호환 형식(한 줄에 하나의 resourceSpans)이며
+TRACE_EXPORTER 환경 변수로 stdout/file 내보내기를 선택합니다.
+
+    TRACE_EXPORTER=none|stdout|file   (기본값: none)
+    TRACE_FILE=traces.jsonl           (file 모드 출력 경로)
+"""
+import contextvars
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+SERVICE_NAME = "coin-dashboard-api"
+SCOPE_NAME = "backend.services.tracing"
+
+# OTLP StatusCode
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# OTLP SpanKind
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "kind",
+                 "start_ns", "end_ns", "attributes", "status_code", "status_message")
+
+    def __init__(self, name: str, parent: Optional["Span"], kind: int = KIND_INTERNAL):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else ""
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = {}
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_status(self, code: int, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """트레이싱 비활성화 시 사용되는 빈 스팬 (오버헤드 최소화)"""
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def set_status(self, code, message=""):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesExporter:
+    """스팬을 OTLP/JSON resourceSpans 형식으로 한 줄씩 기록합니다."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._resource = {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]}
+
+    def export(self, span: Span) -> None:
+        record = {
+            "resourceSpans": [{
+                "resource": self._resource,
+                "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [span.to_otlp()]}],
+            }]
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+def _exporter_from_env() -> Optional[JsonLinesExporter]:
+    mode = os.getenv("TRACE_EXPORTER", "none").lower()
+    if mode == "stdout":
+        return JsonLinesExporter(sys.stdout)
+    if mode == "file":
+        path = os.getenv("TRACE_FILE", "traces.jsonl")
+        return JsonLinesExporter(open(path, "a", encoding="utf-8"))
+    return None
+
+
+_exporter: Optional[JsonLinesExporter] = _exporter_from_env()
+
+
+def set_exporter(exporter: Optional[JsonLinesExporter]) -> None:
+    global _exporter
+    _exporter = exporter
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """현재 컨텍스트의 자식 스팬을 엽니다. 예외 발생 시 ERROR 상태로 기록합니다."""
+    exporter = _exporter
+    if exporter is None:
+        yield _NOOP_SPAN
+        return
+    sp = Span(name, _current_span.get(), kind)
+    sp.set_attributes(attributes)
+    token = _current_span.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.set_status(STATUS_ERROR, f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        sp.end_ns = time.time_ns()
+        try:
+            exporter.export(sp)
+        except Exception as e:
+            print(f"Trace export failed: {e}")
+
+
+def bind(func: Callable) -> Callable:
+    """
+    run_in_executor는 contextvars를 복사하지 않으므로,
+    제출 시점의 컨텍스트(부모 스팬)를 워커 스레드로 전달하도록 감쌉니다.
+    """
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, func)
+
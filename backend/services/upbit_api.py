@@ -1,65 +1,77 @@
 """
 업비트(Upbit) API 모듈
-잔액 조회, 보유 코인 조회, 거래량 상위 코인 조회 기능 제공 (Async with anyio)
+잔액 조회, 보유 코인 조회, 거래량 상위 코인 조회, 전체 KRW 마켓 시세 조회 기능 제공 (Async, exchange 익스큐터)
 """
-import pyupbit
-from typing import Optional
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 from backend.services.config import UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY, validate_upbit_keys
-from anyio import to_thread
-import requests
+from backend.services.metrics import instrument
+from backend.services import circuit, executors, httpclient, tracing
+from backend.services.lazy import lazy_import
+from backend.services.quotes import Quote
 
-def _get_upbit_client_sync() -> Optional[pyupbit.Upbit]:
+pyupbit = lazy_import("pyupbit")  # pandas 를 함께 불러오므로 첫 호출 시 import
+
+# 클라이언트는 프로세스당 하나만 만들어 재사용 (서버 섹션 갱신, CLI watch 모드)
+_CLIENT: Optional["pyupbit.Upbit"] = None
+_CLIENT_LOCK = threading.Lock()
+
+def _get_upbit_client_sync() -> Optional["pyupbit.Upbit"]:
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
     if not validate_upbit_keys():
         return None
-    try:
-        return pyupbit.Upbit(UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY)
-    except Exception as e:
-        print(f"❌ Upbit 클라이언트 생성 실패: {e}")
-        return None
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            try:
+                _CLIENT = pyupbit.Upbit(UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY)
+            except Exception as e:
+                print(f"❌ Upbit 클라이언트 생성 실패: {e}")
+                return None
+    return _CLIENT
 
-def _get_upbit_balance_sync() -> Optional[dict]:
-    upbit = _get_upbit_client_sync()
-    if not upbit:
-        return None
-    try:
+def _fetch_balances(upbit) -> list:
+    # SDK 호출도 업비트 브레이커에 기록 (실패하면 계정 섹션이 마지막 정상 스냅샷을 stale 로 제공)
+    with circuit.guard("upbit"), tracing.span("upbit.get_balances", kind=tracing.KIND_CLIENT) as sp:
         balances = upbit.get_balances()
-        krw_balance = {"total_krw": 0, "available_krw": 0, "locked_krw": 0}
-        for balance in balances:
-            if balance['currency'] == 'KRW':
-                krw_balance['available_krw'] = float(balance['balance'])
-                krw_balance['locked_krw'] = float(balance['locked'])
-                krw_balance['total_krw'] = krw_balance['available_krw'] + krw_balance['locked_krw']
-                break
-        return krw_balance
-    except Exception as e:
-        print(f"❌ 잔액 조회 실패: {e}")
-        return None
+        sp.set_attribute("result.rows", len(balances))
+    return balances
 
-async def get_upbit_balance() -> Optional[dict]:
-    return await to_thread.run_sync(_get_upbit_balance_sync)
 
-def _get_upbit_holdings_sync() -> Optional[list]:
-    upbit = _get_upbit_client_sync()
-    if not upbit:
-        return None
-    try:
-        balances = upbit.get_balances()
-        holdings = []
+def _krw_balance(balances: list) -> dict:
+    krw_balance = {"total_krw": 0, "available_krw": 0, "locked_krw": 0}
+    for balance in balances:
+        if balance['currency'] == 'KRW':
+            krw_balance['available_krw'] = float(balance['balance'])
+            krw_balance['locked_krw'] = float(balance['locked'])
+            krw_balance['total_krw'] = krw_balance['available_krw'] + krw_balance['locked_krw']
+            break
+    return krw_balance
+
+
+def _valuate_holdings(balances: list) -> list:
+    holdings = []
+    # 코인별 현재가 조회(N회 호출)가 포함되므로 루프 전체를 하나의 스팬으로 기록
+    with tracing.span("upbit.valuate_holdings", kind=tracing.KIND_CLIENT) as sp:
         for balance in balances:
             currency = balance['currency']
             if currency == 'KRW':
                 continue
-            
+
             total = float(balance['balance']) + float(balance['locked'])
             avg_buy_price = float(balance['avg_buy_price'])
-            current_price = pyupbit.get_current_price(f"KRW-{currency}") or 0.0
-            
+            current_price = _current_price(f"KRW-{currency}")
+
             if total > 0:
                 eval_amount = total * current_price
                 buy_amount = total * avg_buy_price
                 profit_loss = eval_amount - buy_amount
                 profit_loss_percent = (profit_loss / buy_amount * 100) if buy_amount > 0 else 0
-                
+
                 holdings.append({
                     "coin": currency,
                     "total": total,
@@ -70,46 +82,132 @@ def _get_upbit_holdings_sync() -> Optional[list]:
                     "profit_loss": profit_loss,
                     "profit_loss_percent": profit_loss_percent
                 })
-        holdings.sort(key=lambda x: x['eval_amount'], reverse=True)
-        return holdings
+        sp.set_attribute("result.rows", len(holdings))
+    # 시세를 모르는(nan) 코인은 맨 뒤로
+    holdings.sort(key=lambda x: (not math.isnan(x['eval_amount']), x['eval_amount']), reverse=True)
+    return holdings
+
+
+def _current_price(ticker: str) -> float:
+    """
+    코인 현재가. 조회에 실패하면 0원이 아닌 nan 을 반환해 평가금액/손익을 "알 수 없음"으로 표시합니다
+    (응답에서는 null, 포트폴리오에서는 시세 없는 포지션으로 표시).
+    """
+    try:
+        with circuit.guard("upbit"):
+            price = pyupbit.get_current_price(ticker)
     except Exception as e:
-        print(f"❌ 보유 코인 조회 실패: {e}")
+        print(f"현재가 조회 실패 ({ticker}): {e}")
+        return math.nan
+    return float(price) if price else math.nan
+
+
+@instrument("upbit_balance")
+def _get_upbit_balance_sync() -> Optional[dict]:
+    upbit = _get_upbit_client_sync()
+    if not upbit:
+        return None
+    try:
+        return _krw_balance(_fetch_balances(upbit))
+    except Exception as e:
+        print(f"❌ 잔액 조회 실패: {e}")
         return None
 
-async def get_upbit_holdings() -> Optional[list]:
-    return await to_thread.run_sync(_get_upbit_holdings_sync)
+@instrument("upbit_holdings")
+def _get_upbit_holdings_sync() -> Optional[list]:
+    upbit = _get_upbit_client_sync()
+    if not upbit:
+        return None
+    try:
+        return _valuate_holdings(_fetch_balances(upbit))
+    except Exception as e:
+        print(f"❌ 보유 코인 조회 실패: {e}")
+        return None
 
-_UPBIT_MARKET_NAMES = {}
+@instrument("upbit_account")
+def _get_upbit_account_sync() -> Tuple[Optional[dict], Optional[list]]:
+    """잔액과 보유 코인을 계좌 조회 한 번으로 함께 반환합니다 (CLI 용)."""
+    upbit = _get_upbit_client_sync()
+    if not upbit:
+        return None, None
+    try:
+        balances = _fetch_balances(upbit)
+    except Exception as e:
+        print(f"❌ 계좌 조회 실패: {e}")
+        return None, None
+    try:
+        holdings = _valuate_holdings(balances)
+    except Exception as e:
+        print(f"❌ 보유 코인 조회 실패: {e}")
+        holdings = None
+    return _krw_balance(balances), holdings
 
-def _get_market_names():
-    global _UPBIT_MARKET_NAMES
-    if _UPBIT_MARKET_NAMES:
-        return _UPBIT_MARKET_NAMES
+@instrument("usdt_krw_rate")
+def _get_usdt_krw_rate_sync() -> Optional[float]:
+    """
+    업비트에서 USDT/KRW 환율을 조회합니다.
+    조회 실패 시 None (임의의 기본값으로 바이낸스 자산을 환산하지 않도록)
+    """
     try:
-        import requests
-        market_url = "https://api.upbit.com/v1/market/all?isDetails=false"
-        market_response = requests.get(market_url, timeout=5)
-        if market_response.status_code == 200:
-            markets_data = market_response.json()
-            for m in markets_data:
-                if m['market'].startswith('KRW-'):
-                     _UPBIT_MARKET_NAMES[m['market']] = {
-                         "korean_name": m['korean_name'],
-                         "english_name": m['english_name']
-                     }
+        with circuit.guard("upbit"):
+            rate = pyupbit.get_current_price("KRW-USDT")
+        if rate:
+            return float(rate)
     except Exception as e:
-        print(f"Market name fetch failed: {e}")
+        print(f"환율 조회 실패: {e}")
+    return None
+
+# KRW 마켓 이름 (상장/폐지에 맞춰 주기적으로 다시 받음)
+MARKET_NAMES_TTL = float(os.getenv("UPBIT_MARKET_NAMES_TTL", "3600"))
+MARKET_NAMES_RETRY = 60.0   # 목록에 없는 마켓이 보이면 TTL 전이라도 다시 받되, 이 간격보다 자주 받지 않음
+_UPBIT_MARKET_NAMES: Dict[str, dict] = {}
+_MARKET_NAMES_CHECKED = 0.0
+_MARKET_NAMES_LOCK = threading.Lock()
+
+def _market_names_current(markets: Iterable[str]) -> bool:
+    age = time.time() - _MARKET_NAMES_CHECKED
+    if not _UPBIT_MARKET_NAMES or age >= MARKET_NAMES_TTL:
+        return False
+    return age < MARKET_NAMES_RETRY or all(m in _UPBIT_MARKET_NAMES for m in markets)
+
+@instrument("upbit_market_names")
+def _get_market_names(markets: Iterable[str] = ()) -> Dict[str, dict]:
+    """
+    KRW 마켓 → 한글/영문 이름. TTL 이 지났거나 markets 중 목록에 없는 마켓(신규 상장)이 있으면 다시 받습니다.
+    다시 받지 못하면 이전 목록을 유지합니다.
+    """
+    global _UPBIT_MARKET_NAMES, _MARKET_NAMES_CHECKED
+    markets = list(markets)
+    if _market_names_current(markets):
+        return _UPBIT_MARKET_NAMES
+    with _MARKET_NAMES_LOCK:
+        if _market_names_current(markets):  # 다른 워커 스레드가 방금 갱신함
+            return _UPBIT_MARKET_NAMES
+        _MARKET_NAMES_CHECKED = time.time()
+        try:
+            market_url = "https://api.upbit.com/v1/market/all?isDetails=false"
+            market_response = httpclient.get(market_url, timeout=5)
+            if market_response.status_code == 200:
+                _UPBIT_MARKET_NAMES = {
+                    m['market']: {"korean_name": m['korean_name'], "english_name": m['english_name']}
+                    for m in market_response.json() if m['market'].startswith('KRW-')
+                }
+        except Exception as e:
+            print(f"Market name fetch failed: {e}")
     return _UPBIT_MARKET_NAMES
 
-def _get_upbit_top_volume_coins_sync(limit: int = 10) -> Optional[list]:
+@instrument("upbit_top_volume")
+def _get_upbit_top_volume_coins_sync(limit: int = 10) -> Optional[List[Quote]]:
     try:
-        # 1. Fetch Market Codes for Korean Names (Cached)
-        name_map = _get_market_names()
-
-        # 2. Fetch Tickers for Volume
-        tickers = pyupbit.get_tickers(fiat="KRW")
+        # 1. Fetch Tickers for Volume
+        with tracing.span("upbit.get_tickers", kind=tracing.KIND_CLIENT) as sp:
+            tickers = pyupbit.get_tickers(fiat="KRW")
+            sp.set_attribute("result.rows", len(tickers) if tickers else 0)
         if not tickers:
             return None
+
+        # 2. Fetch Market Codes for Korean Names (Cached, 신규 상장 마켓이 보이면 다시 받음)
+        name_map = _get_market_names(tickers)
             
         url = "https://api.upbit.com/v1/ticker"
         # Split tickers into chunks if too many? typical is ~110, URI length limit might be hit?
@@ -120,53 +218,82 @@ def _get_upbit_top_volume_coins_sync(limit: int = 10) -> Optional[list]:
         # Try all. If error, fallback/chunk.
         markets_str = ",".join(tickers)
         
-        response = requests.get(url, params={"markets": markets_str}, timeout=5)
-        data = response.json()
-        
-        sorted_data = sorted(data, key=lambda x: x['acc_trade_price_24h'], reverse=True)
-        top_coins = []
+        response = httpclient.get(url, params={"markets": markets_str}, timeout=5)
+        with tracing.span("decode", **{"input.bytes": len(response.content)}) as sp:
+            data = response.json()
+            sp.set_attribute("result.rows", len(data))
         
-        for item in sorted_data[:limit]:
-            code = item['market']
-            # lookup name
-            names = name_map.get(code, {"korean_name": code, "english_name": code})
-            korean_name = names["korean_name"]
-            english_name = names["english_name"]
-            
-            current_price = item['trade_price']
-            prev_close = item['prev_closing_price']
-            change_rate = ((current_price - prev_close) / prev_close) * 100
-            volume_24h = item['acc_trade_volume_24h']
-            value_24h = item['acc_trade_price_24h']
-            
-            top_coins.append({
-                "market": code,
-                "korean_name": korean_name,
-                "english_name": english_name, 
-                "current_price": current_price,
-                "change_rate": change_rate,
-                "trade_volume": volume_24h, # standardized key
-                "trade_price": value_24h   # standardized key
-            })
-            
+        with tracing.span("transform") as sp:
+            top_coins = _build_top_coins(data, name_map, limit)
+            sp.set_attribute("result.rows", len(top_coins))
         return top_coins
 
     except Exception as e:
         print(f"❌ 상위 코인 조회 실패: {e}")
         return None
 
-# Async Wrappers using loop.run_in_executor as requested
-import asyncio
-from functools import partial
 
+def _build_top_coins(data: list, name_map: dict, limit: int) -> List[Quote]:
+    sorted_data = sorted(data, key=lambda x: x['acc_trade_price_24h'], reverse=True)
+    top_coins = []
+    
+    for item in sorted_data[:limit]:
+        code = item['market']
+        # lookup name
+        names = name_map.get(code, {"korean_name": code, "english_name": code})
+        
+        current_price = item['trade_price']
+        prev_close = item['prev_closing_price']
+        change_rate = ((current_price - prev_close) / prev_close) * 100
+        value_24h = item['acc_trade_price_24h']
+        
+        top_coins.append(Quote(
+            source="upbit",
+            symbol=code,
+            name=names["korean_name"],
+            english_name=names["english_name"],
+            price=current_price,
+            change_rate=change_rate,
+            volume=item['acc_trade_volume_24h'],
+            trade_value=value_24h,
+            price_krw=current_price,
+            trade_value_krw=value_24h,
+        ))
+        
+    return top_coins
+
+
+@instrument("upbit_prices")
+def _get_upbit_krw_prices_sync() -> Optional[Dict[str, float]]:
+    """전체 KRW 마켓 현재가 (기준 자산 → KRW 가격)"""
+    try:
+        markets = list(_get_market_names())
+        if not markets:
+            return None
+        response = httpclient.get("https://api.upbit.com/v1/ticker", params={"markets": ",".join(markets)}, timeout=5)
+        if response.status_code != 200:
+            return None
+        return {item['market'][len("KRW-"):]: float(item['trade_price']) for item in response.json()}
+    except Exception as e:
+        print(f"❌ KRW 마켓 시세 조회 실패: {e}")
+        return None
+
+
+# Async Wrappers (거래소 호출 전용 익스큐터)
 async def get_upbit_balance() -> Optional[dict]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_upbit_balance_sync)
+    return await executors.run(executors.EXCHANGE, _get_upbit_balance_sync)
 
 async def get_upbit_holdings() -> Optional[list]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _get_upbit_holdings_sync)
+    return await executors.run(executors.EXCHANGE, _get_upbit_holdings_sync)
+
+async def get_upbit_account() -> Tuple[Optional[dict], Optional[list]]:
+    return await executors.run(executors.EXCHANGE, _get_upbit_account_sync)
+
+async def get_usdt_krw_rate() -> Optional[float]:
+    return await executors.run(executors.EXCHANGE, _get_usdt_krw_rate_sync)
+
+async def get_upbit_top_volume_coins(limit: int = 10) -> Optional[List[Quote]]:
+    return await executors.run(executors.EXCHANGE, _get_upbit_top_volume_coins_sync, limit)
 
-async def get_upbit_top_volume_coins(limit: int = 10):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, partial(_get_upbit_top_volume_coins_sync, limit))
+async def get_upbit_krw_prices() -> Optional[Dict[str, float]]:
+    return await executors.run(executors.EXCHANGE, _get_upbit_krw_prices_sync)
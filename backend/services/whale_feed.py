@@ -0,0 +1,272 @@
+"""
+고래 이체 피드 모듈
+대규모 이체 내역을 소스 어댑터에서 주기적으로 수집해 트랜잭션 해시로 중복을 제거하고,
+고정 크기 링 버퍼(코인별/시간순 색인)에 보관합니다.
+대시보드는 버퍼의 최신 N건만 읽으므로 요청 경로에서 업스트림을 호출하지 않습니다.
+
+    WHALE_SOURCE=auto|whale_alert|replay|simulated
+        auto        : WHALE_ALERT_API_KEY 가 있으면 whale_alert, 없으면 simulated
+        whale_alert : Whale Alert API (https://api.whale-alert.io/v1/transactions)
+        replay      : 기록된 트랜잭션 파일을 순서대로 재생 (로컬 테스트용)
+        simulated   : 무작위 이체 생성 (개발용)
+    WHALE_MIN_VALUE_USD=500000
+    WHALE_REPLAY_FILE=benchmarks/fixtures/whale_alert_transactions.json
+    WHALE_POLL_INTERVAL=30     (수집 주기(초), 0 이면 수집 안 함)
+    WHALE_BUFFER_SIZE=1000
+"""
+import hashlib
+import json
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice, takewhile
+from typing import Deque, Dict, Iterator, List, Optional, Set
+
+from backend.services import httpclient
+from backend.services.config import WHALE_ALERT_API_KEY
+from backend.services.metrics import instrument
+
+WHALE_ALERT_URL = "https://api.whale-alert.io/v1/transactions"
+# 무료 요금제는 최근 1시간까지만 조회 가능
+MAX_LOOKBACK = 3600
+
+
+@dataclass(frozen=True)
+class Transfer:
+    key: str            # 중복 제거 키 (blockchain:hash)
+    coin: str
+    amount: float
+    value_usd: float
+    sender: str
+    receiver: str
+    ts: float
+
+    def as_alert(self) -> dict:
+        """WhaleAlert 응답 형식"""
+        return {
+            "key": self.key,
+            "time": datetime.fromtimestamp(self.ts).isoformat(),
+            "coin": self.coin,
+            "amount": self.amount,
+            "from": self.sender,
+            "to": self.receiver,
+            "value_usd": self.value_usd,
+        }
+
+
+def _party(side: Optional[dict]) -> str:
+    side = side or {}
+    owner = side.get("owner")
+    if owner:
+        return owner.title()
+    return "Unknown Wallet" if side.get("owner_type", "unknown") == "unknown" else side["owner_type"].title()
+
+
+def parse_whale_alert(tx: dict) -> Transfer:
+    """Whale Alert API 트랜잭션 → Transfer"""
+    return Transfer(
+        key=f"{tx['blockchain']}:{tx['hash']}",
+        coin=tx["symbol"].upper(),
+        amount=float(tx["amount"]),
+        value_usd=float(tx["amount_usd"]),
+        sender=_party(tx.get("from")),
+        receiver=_party(tx.get("to")),
+        ts=float(tx["timestamp"]),
+    )
+
+
+# === 소스 어댑터 ===
+# fetch(since) 는 since(epoch 초) 이후의 이체 목록을 반환합니다. 중복이 섞여 있어도 됩니다.
+
+class WhaleAlertSource:
+    name = "whale_alert"
+
+    def __init__(self, api_key: str, min_value_usd: int = 500_000):
+        self.api_key = api_key
+        self.min_value_usd = min_value_usd
+
+    @instrument("whale_alert")
+    def fetch(self, since: float) -> List[Transfer]:
+        start = int(max(since, time.time() - MAX_LOOKBACK))
+        params = {"api_key": self.api_key, "min_value": self.min_value_usd, "start": start}
+        transfers = []
+        try:
+            # 한 번에 최대 100건, cursor 로 이어서 조회
+            for _ in range(10):
+                response = httpclient.get(WHALE_ALERT_URL, params=params, timeout=5)
+                if response.status_code != 200:
+                    print(f"Whale Alert API error: {response.status_code}")
+                    break
+                data = response.json()
+                batch = data.get("transactions") or []
+                transfers.extend(parse_whale_alert(tx) for tx in batch)
+                if len(batch) < 100 or not data.get("cursor"):
+                    break
+                params["cursor"] = data["cursor"]
+        except Exception as e:
+            print(f"Whale Alert fetch failed: {e}")
+        return transfers
+
+
+class ReplaySource:
+    """
+    기록된 Whale Alert 응답 파일을 재생합니다. 마지막 트랜잭션이 현재 시각이 되도록 시각을 옮기고,
+    호출마다 batch 건씩 내보냅니다. 끝까지 재생하면 해시에 회차를 붙여 처음부터 반복합니다.
+    """
+    name = "replay"
+
+    def __init__(self, path: str, batch: int = 5):
+        with open(path, encoding="utf-8") as f:
+            self._transactions = sorted(json.load(f)["transactions"], key=lambda tx: tx["timestamp"])
+        self.batch = batch
+        self._position = 0
+        self._cycle = 0
+
+    def fetch(self, since: float) -> List[Transfer]:
+        if not self._transactions:
+            return []
+        items = []
+        for _ in range(self.batch):
+            if self._position == len(self._transactions):
+                self._position = 0
+                self._cycle += 1
+            items.append((self._cycle, self._transactions[self._position]))
+            self._position += 1
+        shift = time.time() - items[-1][1]["timestamp"]
+        transfers = []
+        for cycle, tx in items:
+            # 회차는 배치가 아닌 항목별 (한 배치가 처음으로 되돌아가는 경우)
+            suffix = f"#{cycle}" if cycle else ""
+            tx = {**tx, "hash": f"{tx['hash']}{suffix}", "timestamp": tx["timestamp"] + shift}
+            transfers.append(parse_whale_alert(tx))
+        return transfers
+
+
+class SimulatedSource:
+    """개발용 무작위 이체 (API 키가 없을 때)"""
+    name = "simulated"
+
+    COINS = {"BTC": 50000, "ETH": 3000, "XRP": 1, "USDT": 1, "SOL": 1, "DOGE": 1}
+    EXCHANGES = ["Binance", "Coinbase", "Upbit", "Kraken", "Unknown Wallet"]
+
+    def fetch(self, since: float) -> List[Transfer]:
+        now = time.time()
+        transfers = []
+        for _ in range(random.randint(1, 3)):
+            coin = random.choice(list(self.COINS))
+            amount = random.randint(1000, 100000)
+            sender = random.choice(self.EXCHANGES)
+            receiver = random.choice(self.EXCHANGES)
+            if sender == receiver:
+                receiver = "Wallet"
+            ts = now - random.uniform(0, 60)
+            key = "simulated:" + hashlib.blake2b(f"{coin}{amount}{ts}".encode(), digest_size=16).hexdigest()
+            transfers.append(Transfer(key, coin, float(amount), float(amount * self.COINS[coin]), sender, receiver, ts))
+        return transfers
+
+
+def source_from_env():
+    mode = os.getenv("WHALE_SOURCE", "auto").lower()
+    if mode == "auto":
+        mode = "whale_alert" if WHALE_ALERT_API_KEY else "simulated"
+    if mode == "whale_alert":
+        if WHALE_ALERT_API_KEY:
+            return WhaleAlertSource(WHALE_ALERT_API_KEY, int(os.getenv("WHALE_MIN_VALUE_USD", "500000")))
+        print("WHALE_SOURCE=whale_alert 이지만 WHALE_ALERT_API_KEY 가 없어 simulated 소스를 사용합니다.")
+    if mode == "replay":
+        path = os.getenv("WHALE_REPLAY_FILE", os.path.join("benchmarks", "fixtures", "whale_alert_transactions.json"))
+        try:
+            return ReplaySource(path)
+        except Exception as e:
+            print(f"Whale replay file load failed ({e}), simulated 소스를 사용합니다.")
+    return SimulatedSource()
+
+
+# === 링 버퍼 ===
+
+class TransferRing:
+    """
+    고정 크기 링 버퍼. 가장 오래된 이체부터 덮어쓰며, 해시 집합과 코인별 색인도 함께 정리합니다.
+    삽입 순서가 시간순이 되도록 수집 배치를 정렬해 넣습니다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._slots: List[Optional[Transfer]] = [None] * capacity
+        self._count = 0                      # 누적 삽입 수 (다음 슬롯 = _count % capacity)
+        self._keys: Set[str] = set()
+        self._by_coin: Dict[str, Deque[Transfer]] = {}
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add(self, transfer: Transfer) -> bool:
+        """새 이체면 추가하고 True, 이미 있는 해시면 False"""
+        if transfer.key in self._keys:
+            return False
+        slot = self._count % self.capacity
+        evicted = self._slots[slot]
+        if evicted is not None:
+            self._keys.discard(evicted.key)
+            # 코인별 색인도 삽입 순서이므로 제거 대상은 항상 해당 코인의 가장 오래된 항목
+            coin_index = self._by_coin[evicted.coin]
+            coin_index.popleft()
+            if not coin_index:
+                del self._by_coin[evicted.coin]
+        self._slots[slot] = transfer
+        self._keys.add(transfer.key)
+        self._by_coin.setdefault(transfer.coin, deque()).append(transfer)
+        self._count += 1
+        return True
+
+    def _newest_first(self, coin: Optional[str] = None) -> Iterator[Transfer]:
+        if coin is not None:
+            return reversed(self._by_coin.get(coin, ()))
+        return (self._slots[(self._count - 1 - i) % self.capacity] for i in range(len(self)))
+
+    def latest(self, n: int, coin: Optional[str] = None) -> List[Transfer]:
+        """최신순 n건 (O(n))"""
+        return list(islice(self._newest_first(coin), n))
+
+    def since(self, ts: float, coin: Optional[str] = None) -> List[Transfer]:
+        """ts 이후 이체 (최신순). 시간순으로 쌓여 있으므로 ts 보다 오래된 항목에서 멈춥니다."""
+        return list(takewhile(lambda transfer: transfer.ts >= ts, self._newest_first(coin)))
+
+    def coins(self) -> List[str]:
+        return list(self._by_coin)
+
+
+class WhaleFeed:
+    def __init__(self, source, capacity: int = 1000):
+        self.source = source
+        self.ring = TransferRing(capacity)
+        self._since = 0.0
+
+    def poll(self) -> int:
+        """소스에서 새 이체를 가져와 버퍼에 넣고, 새로 추가된 건수를 반환합니다 (동기, 익스큐터에서 실행)."""
+        transfers = sorted(self.source.fetch(self._since), key=lambda t: t.ts)
+        added = 0
+        for transfer in transfers:
+            if self.ring.add(transfer):
+                added += 1
+                self._since = max(self._since, transfer.ts)
+        return added
+
+    def latest(self, n: int, coin: Optional[str] = None) -> List[dict]:
+        return [transfer.as_alert() for transfer in self.ring.latest(n, coin)]
+
+
+_FEED: Optional[WhaleFeed] = None
+
+
+def get_feed() -> WhaleFeed:
+    global _FEED
+    if _FEED is None:
+        _FEED = WhaleFeed(source_from_env(), int(os.getenv("WHALE_BUFFER_SIZE", "1000")))
+    return _FEED
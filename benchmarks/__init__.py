@@ -0,0 +1,4 @@
+"""
+오프라인 벤치마크/부하 테스트 도구
+기록된 업스트림 응답(fixtures)을 재생하여 네트워크 없이 서비스 함수와 대시보드 엔드포인트를 측정합니다.
+"""
@@ -0,0 +1,159 @@
+"""
+로컬 대체 업스트림 서버 (부하 테스트용)
+
+    python -m benchmarks.fake_upstream --port 9100 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+
+Upbit, Binance, Naver, Yahoo, alternative.me, Google News 엔드포인트를 기록된 fixtures 로 흉내 냅니다.
+요청 경로는 /<원래 호스트>/<원래 경로> 형식이며, replay.install_redirect() 가 서비스 모듈의
+요청을 이 형식으로 바꿔 보냅니다. 지연시간/오류/타임아웃을 호스트별로 주입할 수 있습니다.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from benchmarks.upstream import UPSTREAM_HOSTS, route
+
+
+@dataclass
+class Fault:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 502
+    timeout_rate: float = 0.0
+    timeout_s: float = 30.0
+
+
+@dataclass
+class FaultConfig:
+    default: Fault = field(default_factory=Fault)
+    per_host: Dict[str, Fault] = field(default_factory=dict)
+
+    def for_host(self, host: str) -> Fault:
+        return self.per_host.get(host, self.default)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeUpstream/1.0"
+    protocol_version = "HTTP/1.1"
+    faults: FaultConfig = FaultConfig()
+    stats: Dict[str, int] = {}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _count(self, key: str) -> None:
+        with self.stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        path = "/" + path
+        if host not in UPSTREAM_HOSTS:
+            self._send(404, b'{"error":"unknown upstream"}', "application/json")
+            return
+
+        fault = self.faults.for_host(host)
+        delay = max(0.0, fault.latency_ms + random.uniform(-fault.jitter_ms, fault.jitter_ms)) / 1000.0
+        if delay:
+            time.sleep(delay)
+        if fault.timeout_rate and random.random() < fault.timeout_rate:
+            self._count(f"{host}:timeout")
+            time.sleep(fault.timeout_s)
+            return
+        if fault.error_rate and random.random() < fault.error_rate:
+            self._count(f"{host}:error")
+            self._send(fault.error_status, b'{"error":"injected"}', "application/json")
+            return
+
+        fixture = route(host, path, parts.query)
+        if fixture is None:
+            self._count(f"{host}:missing")
+            self._send(404, b'{"error":"no fixture"}', "application/json")
+            return
+        self._count(f"{host}:ok")
+        self._send(fixture.status, fixture.body, fixture.content_type, fixture.headers)
+
+    # Binance 서명 요청 등 POST/DELETE 는 사용하지 않지만 연결이 멈추지 않도록 응답
+    def do_POST(self):
+        self._send(405, b'{"error":"method not allowed"}', "application/json")
+
+
+def make_server(port: int = 9100, faults: Optional[FaultConfig] = None, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    handler = type("FakeUpstreamHandler", (_Handler,), {"faults": faults or FaultConfig(), "stats": {}})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(port: int = 0, faults: Optional[FaultConfig] = None) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 서버를 시작합니다. port=0 이면 임의 포트를 사용합니다."""
+    server = make_server(port, faults)
+    threading.Thread(target=server.serve_forever, name="fake-upstream", daemon=True).start()
+    return server
+
+
+def _parse_host_faults(values, base: Fault) -> Dict[str, Fault]:
+    """--host 'finance.naver.com:latency_ms=300,error_rate=0.1' 형식 파싱"""
+    per_host = {}
+    for value in values or []:
+        host, _, spec = value.partition(":")
+        fault = Fault(**vars(base))
+        for item in filter(None, spec.split(",")):
+            key, _, raw = item.partition("=")
+            setattr(fault, key, type(getattr(fault, key))(raw))
+        per_host[host] = fault
+    return per_host
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=502)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--host", action="append", dest="host_faults",
+                        help="per-host override, e.g. finance.naver.com:latency_ms=300,error_rate=0.1")
+
+
+def faults_from_args(args) -> FaultConfig:
+    base = Fault(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.timeout_rate)
+    return FaultConfig(base, _parse_host_faults(args.host_faults, base))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the upstream APIs")
+    parser.add_argument("--port", type=int, default=9100)
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    server = make_server(args.port, faults_from_args(args))
+    print(f"Fake upstream listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Requests served:", dict(sorted(server.RequestHandlerClass.stats.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+yfinance 대체 모듈 (벤치마크/부하 테스트 전용)
+yfinance는 자체 HTTP 세션(curl_cffi)을 사용하므로 requests 재생으로 가로챌 수 없습니다.
+이 모듈은 stock_api가 사용하는 API(download, Ticker, Tickers)만 구현하고,
+Yahoo v8 chart 엔드포인트를 requests로 호출해 같은 재생/리다이렉트 경로를 타도록 합니다.
+"""
+from datetime import datetime
+from typing import Dict, List, Union
+
+import pandas as pd
+import requests
+
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+
+def _chart(symbol: str, period: str = "1mo", timeout: float = 10) -> dict:
+    response = requests.get(
+        CHART_URL.format(symbol=requests.utils.quote(symbol, safe="")),
+        params={"range": period, "interval": "1d"},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.json()["chart"]["result"][0]
+
+
+def _frame(result: dict) -> pd.DataFrame:
+    quote = result["indicators"]["quote"][0]
+    index = pd.DatetimeIndex([datetime.fromtimestamp(ts) for ts in result.get("timestamp", [])], name="Date")
+    return pd.DataFrame({
+        "Open": quote["open"],
+        "High": quote["high"],
+        "Low": quote["low"],
+        "Close": quote["close"],
+        "Volume": quote["volume"],
+    }, index=index)
+
+
+class _FastInfo:
+    def __init__(self, meta: dict):
+        self.last_price = meta.get("regularMarketPrice")
+        self.last_volume = meta.get("regularMarketVolume")
+        self.previous_close = meta.get("previousClose")
+        self.currency = meta.get("currency")
+
+
+class Ticker:
+    def __init__(self, symbol: str):
+        self.ticker = symbol
+        self._meta = None
+
+    def _load_meta(self) -> dict:
+        if self._meta is None:
+            self._meta = _chart(self.ticker, "5d")["meta"]
+        return self._meta
+
+    @property
+    def fast_info(self) -> _FastInfo:
+        return _FastInfo(self._load_meta())
+
+    @property
+    def info(self) -> dict:
+        meta = self._load_meta()
+        return {"symbol": self.ticker, "shortName": meta.get("shortName"), "longName": meta.get("longName")}
+
+    def history(self, period: str = "1mo", **kwargs) -> pd.DataFrame:
+        return _frame(_chart(self.ticker, period))
+
+
+class Tickers:
+    def __init__(self, tickers: Union[str, List[str]]):
+        symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+        self.symbols = symbols
+        self.tickers: Dict[str, Ticker] = {s: Ticker(s) for s in symbols}
+
+
+def download(tickers: Union[str, List[str]], period: str = "1mo", group_by: str = "column",
+             progress: bool = True, threads: bool = True, timeout: float = 10, **kwargs) -> pd.DataFrame:
+    symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+    frames = {}
+    for symbol in symbols:
+        try:
+            frames[symbol] = _frame(_chart(symbol, period, timeout))
+        except Exception:
+            frames[symbol] = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+    if len(symbols) == 1:
+        return frames[symbols[0]]
+    # group_by='ticker' 와 동일한 (ticker, field) MultiIndex 컬럼
+    return pd.concat(frames, axis=1)
@@ -0,0 +1,313 @@
+"""
+부하 테스트 (로컬 대체 업스트림 사용)
+
+    # 한 번에: 대체 업스트림 + API 서버(서브프로세스) 기동 후 RPS 단계별 측정
+    python -m benchmarks.loadtest all --rps 2,5,10,20,40 --duration 10 --latency-ms 80
+
+    # 개별 실행
+    python -m benchmarks.fake_upstream --port 9100
+    python -m benchmarks.loadtest serve --upstream http://127.0.0.1:9100 --port 8001
+    python -m benchmarks.loadtest run --target http://127.0.0.1:8001 --rps 5,10,20
+
+엔드포인트별로 목표 RPS를 단계적으로 올리며(open-loop) 달성 RPS, 오류율, p50/p99와
+/metrics 의 익스큐터 대기열 깊이를 기록하고, 포화 지점을 보고합니다.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NEWS_QUERIES = ["NVDA", "AAPL", "TSLA", "MSFT", "AMZN", "META", "GOOGL", "AMD"]
+
+ENDPOINTS = {
+    "dashboard": "/api/dashboard",
+    "stock_dashboard": "/api/stock/dashboard",
+    "news": "/api/stock/news/{query}",
+}
+
+_QUEUE_DEPTH_RE = re.compile(r'^dashboard_executor_queue_depth\{[^}]*\} ([0-9.e+-]+)$', re.M)
+
+
+@dataclass
+class StepResult:
+    endpoint: str
+    target_rps: float
+    achieved_rps: float
+    requests: int
+    errors: int
+    timeouts: int
+    p50_ms: float
+    p99_ms: float
+    max_in_flight: int
+    max_queue_depth: float
+
+
+# === 최소 HTTP 클라이언트 (외부 의존성 없음) ===
+
+async def http_get(host: str, port: int, path: str, timeout: float) -> Tuple[int, bytes]:
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\nAccept: */*\r\n\r\n".encode()
+        )
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1]) if head else 0
+    return status, body
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100.0))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def _sample_queue_depth(host: str, port: int, stop: asyncio.Event, samples: List[float]) -> None:
+    while not stop.is_set():
+        try:
+            status, body = await http_get(host, port, "/metrics", 5)
+            if status == 200:
+                samples.extend(float(v) for v in _QUEUE_DEPTH_RE.findall(body.decode()))
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_step(target: str, endpoint: str, rps: float, duration: float, timeout: float) -> StepResult:
+    """open-loop: 응답을 기다리지 않고 1/rps 간격으로 요청을 발사합니다."""
+    parts = urlsplit(target)
+    host, port = parts.hostname, parts.port or 80
+    template = ENDPOINTS[endpoint]
+    latencies: List[float] = []
+    errors = timeouts = in_flight = max_in_flight = 0
+    queue_samples: List[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_queue_depth(host, port, stop, queue_samples))
+
+    async def one(i: int) -> None:
+        nonlocal errors, timeouts, in_flight, max_in_flight
+        path = template.format(query=NEWS_QUERIES[i % len(NEWS_QUERIES)])
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        start = time.perf_counter()
+        try:
+            status, _ = await http_get(host, port, path, timeout)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+        except asyncio.TimeoutError:
+            timeouts += 1
+        except Exception:
+            errors += 1
+        finally:
+            in_flight -= 1
+
+    total = max(1, int(rps * duration))
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    tasks = []
+    for i in range(total):
+        delay = t0 + i / rps - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - t0
+    stop.set()
+    await sampler
+
+    ordered = sorted(latencies)
+    return StepResult(
+        endpoint=endpoint,
+        target_rps=rps,
+        achieved_rps=round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        requests=total,
+        errors=errors,
+        timeouts=timeouts,
+        p50_ms=round(_percentile(ordered, 50) * 1000, 1),
+        p99_ms=round(_percentile(ordered, 99) * 1000, 1),
+        max_in_flight=max_in_flight,
+        max_queue_depth=max(queue_samples) if queue_samples else 0.0,
+    )
+
+
+def is_saturated(step: StepResult, slo_ms: float) -> bool:
+    failed = (step.errors + step.timeouts) / step.requests if step.requests else 0.0
+    return step.achieved_rps < 0.9 * step.target_rps or failed > 0.01 or step.p99_ms > slo_ms
+
+
+async def sweep(target: str, endpoints: List[str], rps_steps: List[float], duration: float,
+                timeout: float, slo_ms: float) -> List[StepResult]:
+    results = []
+    for endpoint in endpoints:
+        print(f"\n[{endpoint}] {ENDPOINTS[endpoint]}")
+        print(f"{'target':>8}{'achieved':>10}{'errors':>8}{'timeouts':>10}{'p50 ms':>10}{'p99 ms':>10}{'inflight':>10}{'queue':>8}")
+        saturated_at = None
+        for rps in rps_steps:
+            step = await run_step(target, endpoint, rps, duration, timeout)
+            results.append(step)
+            mark = "  <- saturated" if is_saturated(step, slo_ms) else ""
+            print(f"{step.target_rps:>8g}{step.achieved_rps:>10.2f}{step.errors:>8}{step.timeouts:>10}"
+                  f"{step.p50_ms:>10.1f}{step.p99_ms:>10.1f}{step.max_in_flight:>10}{step.max_queue_depth:>8g}{mark}")
+            if mark:
+                saturated_at = rps
+                break
+        if saturated_at is None:
+            print(f"  not saturated up to {rps_steps[-1]:g} rps")
+        else:
+            print(f"  saturation at ~{saturated_at:g} rps (p99 SLO {slo_ms:g} ms)")
+    return results
+
+
+# === 서브커맨드 ===
+
+def redirected_app():
+    """워커 프로세스마다 업스트림 리다이렉트를 설치한 뒤 앱을 반환하는 팩토리 (--workers > 1)"""
+    from benchmarks import replay
+    replay.install_redirect(os.environ["LOADTEST_UPSTREAM"])
+    from backend.api_server import app
+    return app
+
+
+def cmd_serve(args) -> int:
+    import uvicorn
+    # 대체 업스트림 데이터가 실제 포트폴리오 히스토리/공유 스냅샷에 섞이지 않도록 임시 디렉터리 사용
+    work_dir = tempfile.mkdtemp(prefix="loadtest-")
+    os.environ.setdefault("PORTFOLIO_HISTORY_DB", os.path.join(work_dir, "history.sqlite3"))
+    try:
+        if args.workers > 1:
+            # 워커 간 스냅샷 공유 + 리더 선출
+            os.environ["LOADTEST_UPSTREAM"] = args.upstream
+            os.environ.setdefault("SNAPSHOT_BACKEND", "file")
+            os.environ.setdefault("SNAPSHOT_DIR", os.path.join(work_dir, "snapshots"))
+            uvicorn.run("benchmarks.loadtest:redirected_app", factory=True, host="127.0.0.1", port=args.port,
+                        workers=args.workers, log_level="warning")
+        else:
+            from benchmarks import replay
+            replay.install_redirect(args.upstream)
+            from backend.api_server import app
+            uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+def _write_json(path: Optional[str], results: List[StepResult]) -> None:
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+
+def cmd_run(args) -> int:
+    results = asyncio.run(sweep(args.target, args.endpoints, args.rps, args.duration, args.timeout, args.slo_ms))
+    _write_json(args.json_path, results)
+    return 0
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            status, _ = asyncio.run(http_get("127.0.0.1", port, "/", 2))
+            if status == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"API server on port {port} did not become ready")
+
+
+def cmd_all(args) -> int:
+    from benchmarks import fake_upstream
+
+    upstream = fake_upstream.start_in_thread(0, fake_upstream.faults_from_args(args))
+    upstream_url = f"http://127.0.0.1:{upstream.server_address[1]}"
+    print(f"Fake upstream: {upstream_url}")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest", "serve", "--upstream", upstream_url, "--port", str(args.port),
+         "--workers", str(args.workers)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        _wait_ready(args.port)
+        results = asyncio.run(sweep(f"http://127.0.0.1:{args.port}", args.endpoints, args.rps,
+                                    args.duration, args.timeout, args.slo_ms))
+        _write_json(args.json_path, results)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        upstream.shutdown()
+        print("\nUpstream requests:", dict(sorted(upstream.RequestHandlerClass.stats.items())))
+    return 0
+
+
+def _rps_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def _endpoint_list(value: str) -> List[str]:
+    names = [v for v in value.split(",") if v]
+    unknown = set(names) - set(ENDPOINTS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    return names
+
+
+def main(argv=None) -> int:
+    from benchmarks.fake_upstream import add_fault_arguments
+
+    parser = argparse.ArgumentParser(description="Load test the API server against a local fake upstream")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run api_server with upstream calls redirected")
+    serve.add_argument("--upstream", required=True)
+    serve.add_argument("--port", type=int, default=8001)
+    serve.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (shared file snapshot backend)")
+    serve.set_defaults(func=cmd_serve)
+
+    def add_sweep_arguments(p):
+        p.add_argument("--endpoints", type=_endpoint_list, default=list(ENDPOINTS))
+        p.add_argument("--rps", type=_rps_list, default=[1, 2, 5, 10, 20, 40])
+        p.add_argument("--duration", type=float, default=10.0, help="seconds per RPS step")
+        p.add_argument("--timeout", type=float, default=30.0)
+        p.add_argument("--slo-ms", type=float, default=2000.0, help="p99 latency treated as saturation")
+        p.add_argument("--json", dest="json_path")
+
+    run = sub.add_parser("run", help="drive an already running api_server")
+    run.add_argument("--target", default="http://127.0.0.1:8001")
+    add_sweep_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    all_ = sub.add_parser("all", help="start fake upstream + api_server and run the sweep")
+    all_.add_argument("--port", type=int, default=8001)
+    all_.add_argument("--workers", type=int, default=1)
+    add_sweep_arguments(all_)
+    add_fault_arguments(all_)
+    all_.set_defaults(func=cmd_all)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+업스트림 응답 기록기 (네트워크 필요)
+
+    python -m benchmarks.record
+
+공개 엔드포인트 응답을 benchmarks/fixtures 에 저장합니다.
+계좌 응답(upbit_accounts.json, binance_account.json)은 개인 정보이므로 기록하지 않고
+저장소에 포함된 합성 데이터를 그대로 사용합니다.
+"""
+import csv
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from benchmarks.upstream import FIXTURE_DIR
+
+NAVER_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
+PUBLIC_FIXTURES = {
+    "upbit_market_all.json": ("https://api.upbit.com/v1/market/all?isDetails=false", None),
+    "binance_ticker_24hr.json": ("https://api.binance.com/api/v3/ticker/24hr", None),
+    "naver_sise_quant_kospi.html": ("https://finance.naver.com/sise/sise_quant.naver?sosok=0", NAVER_HEADERS),
+    "naver_sise_quant_kosdaq.html": ("https://finance.naver.com/sise/sise_quant.naver?sosok=1", NAVER_HEADERS),
+    "naver_sise_group.html": ("https://finance.naver.com/sise/sise_group.naver?type=upjong", NAVER_HEADERS),
+    # 업종 상세는 한 업종만 기록하고 재생 시 업종 번호별로 종목 코드를 옮겨 재사용
+    "naver_sise_group_detail.html": (
+        "https://finance.naver.com/sise/sise_group_detail.naver?type=upjong&no=278", NAVER_HEADERS),
+    "fng.json": ("https://api.alternative.me/fng/", None),
+    "google_news_rss.xml": ("https://news.google.com/rss/search?q=NVIDIA&hl=ko&gl=KR&ceid=KR:ko", None),
+}
+
+INDEX_SYMBOLS = ["^KS11", "^KQ11", "^DJI", "^IXIC", "^GSPC", "KRW=X"]
+ETF_SYMBOLS = [
+    "QQQ", "SPY", "TQQQ", "SOXL", "SQQQ", "JEPI", "SCHD", "IVV", "VTI", "VOO",
+    "IWM", "EEM", "GLD", "SLV", "ARKK", "HYG", "XLF", "XLK", "SMH", "LABU",
+]
+
+
+def _write(name: str, content: bytes) -> None:
+    with open(os.path.join(FIXTURE_DIR, name), "wb") as f:
+        f.write(content)
+    print(f"  recorded {name} ({len(content):,} bytes)")
+
+
+def record_public() -> None:
+    for name, (url, headers) in PUBLIC_FIXTURES.items():
+        response = requests.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        _write(name, response.content)
+
+    markets = [m["market"] for m in requests.get(PUBLIC_FIXTURES["upbit_market_all.json"][0], timeout=10).json()
+               if m["market"].startswith("KRW-")]
+    response = requests.get("https://api.upbit.com/v1/ticker", params={"markets": ",".join(markets)}, timeout=10)
+    response.raise_for_status()
+    _write("upbit_ticker.json", response.content)
+
+
+def record_yahoo(period: str = "3mo") -> None:
+    import yfinance as yf
+    from backend.services.stock_api import US_STOCK_NAMES
+
+    symbols = sorted(set(US_STOCK_NAMES) | set(ETF_SYMBOLS) | set(INDEX_SYMBOLS))
+    df = yf.download(symbols, period=period, group_by="ticker", progress=False, threads=True)
+    path = os.path.join(FIXTURE_DIR, "yahoo_daily.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["symbol", "date", "open", "high", "low", "close", "volume"])
+        for symbol in symbols:
+            bars = df[symbol].dropna()
+            for date, row in bars.iterrows():
+                writer.writerow([symbol, date.strftime("%Y-%m-%d"), round(row["Open"], 4), round(row["High"], 4),
+                                 round(row["Low"], 4), round(row["Close"], 4), int(row["Volume"])])
+    print(f"  recorded yahoo_daily.csv ({len(symbols)} symbols)")
+
+    names = {s: US_STOCK_NAMES.get(s, s) for s in symbols}
+    _write("yahoo_names.json", json.dumps(names, indent=1, ensure_ascii=False).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    record_public()
+    record_yahoo()
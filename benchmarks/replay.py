@@ -0,0 +1,107 @@
+"""
+업스트림 재생(replay) 트랜스포트
+requests.Session.request 를 기록된 응답으로 대체하고, yfinance를 fake_yfinance로 교체하며,
+루프백 이외의 소켓 연결을 차단해 벤치마크가 네트워크 없이 돌아가도록 보장합니다.
+
+install_redirect() 는 응답을 프로세스 안에서 만들지 않고 로컬 대체 서버(fake_upstream)로
+요청을 보내므로, 실제 소켓/스레드 비용이 포함된 부하 테스트에 사용합니다.
+
+backend 모듈을 import 하기 전에 install()/install_redirect() 를 호출해야 합니다.
+"""
+import datetime
+import os
+import socket
+import sys
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from benchmarks import fake_yfinance
+from benchmarks.upstream import UPSTREAM_HOSTS, route
+
+# 재생 시 사용하는 더미 API 키 (config.py 가 import 시점에 읽음)
+FAKE_KEYS = {
+    "UPBIT_ACCESS_KEY": "replay-access-key-0000000000000000",
+    "UPBIT_SECRET_KEY": "replay-secret-key-0000000000000000",
+    "BINANCE_ACCESS_KEY": "replay-access-key-0000000000000000",
+    "BINANCE_SECRET_KEY": "replay-secret-key-0000000000000000",
+}
+
+_original_request = requests.Session.request
+_original_connect = socket.socket.connect
+_LOOPBACK = ("127.0.0.1", "::1", "localhost")
+
+
+class NetworkDisabled(RuntimeError):
+    pass
+
+
+def build_response(method: str, url: str, status: int, body: bytes, headers: dict, content_type: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type, **headers})
+    response.url = url
+    response.encoding = "euc-kr" if "euc-kr" in content_type else "utf-8"
+    response.reason = "OK" if status < 400 else "Error"
+    response.elapsed = datetime.timedelta(0)
+    response.request = requests.Request(method, url).prepare()
+    return response
+
+
+def _replay_request(self, method, url, params=None, **kwargs):
+    parts = urlsplit(url)
+    query = parts.query
+    if params:
+        extra = urlencode(params, doseq=True) if not isinstance(params, (str, bytes)) else params
+        query = f"{query}&{extra}" if query else extra
+    fixture = route(parts.hostname or "", parts.path, query)
+    if fixture is None:
+        raise requests.ConnectionError(f"No recorded fixture for {method} {url}")
+    return build_response(method, url, fixture.status, fixture.body, fixture.headers, fixture.content_type)
+
+
+def _guarded_connect(self, address):
+    host = address[0] if isinstance(address, tuple) else address
+    if isinstance(host, str) and host not in _LOOPBACK and not host.startswith("127."):
+        raise NetworkDisabled(f"Network access is disabled during replay: {address}")
+    return _original_connect(self, address)
+
+
+def install_fake_yfinance() -> None:
+    sys.modules["yfinance"] = fake_yfinance
+    stock_api = sys.modules.get("backend.services.stock_api")
+    if stock_api is not None:
+        stock_api.yf = fake_yfinance
+
+
+def install() -> None:
+    """재생 트랜스포트를 설치합니다."""
+    for key, value in FAKE_KEYS.items():
+        os.environ.setdefault(key, value)
+    install_fake_yfinance()
+    requests.Session.request = _replay_request
+    socket.socket.connect = _guarded_connect
+
+
+def install_redirect(base_url: str) -> None:
+    """업스트림 호스트로 가는 요청을 base_url 의 대체 서버(/<host>/<path>)로 보냅니다."""
+    base_url = base_url.rstrip("/")
+
+    def _redirect_request(self, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        if parts.hostname in UPSTREAM_HOSTS:
+            url = f"{base_url}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return _original_request(self, method, url, *args, **kwargs)
+
+    for key, value in FAKE_KEYS.items():
+        os.environ.setdefault(key, value)
+    install_fake_yfinance()
+    requests.Session.request = _redirect_request
+    socket.socket.connect = _guarded_connect
+
+
+def uninstall() -> None:
+    requests.Session.request = _original_request
+    socket.socket.connect = _original_connect
@@ -0,0 +1,619 @@
+"""
+오프라인 벤치마크 실행기
+
+    python -m benchmarks.run                      # 측정 후 baseline.json 과 비교
+    python -m benchmarks.run --only upbit         # 이름에 'upbit' 가 포함된 케이스만
+    python -m benchmarks.run --update-baseline    # 현재 결과를 baseline.json 으로 저장
+
+기록된 fixtures 를 재생하므로 네트워크 없이 동작하며(루프백 외 연결 차단),
+서비스 함수별/엔드포인트별 처리량과 p50/p99 지연시간, 서버/CLI import 시간을 측정합니다.
+기준선 대비 tolerance 이상 느려진 케이스가 있으면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+# 저장소 루트를 path에 추가 (python benchmarks/run.py 로 실행하는 경우 대비)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import replay
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput: float  # ops/s
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100.0))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _summarize(name: str, samples: List[float]) -> Result:
+    ordered = sorted(samples)
+    total = sum(samples)
+    return Result(
+        name=name,
+        iterations=len(samples),
+        p50_ms=round(_percentile(ordered, 50) * 1000, 3),
+        p99_ms=round(_percentile(ordered, 99) * 1000, 3),
+        mean_ms=round(total / len(samples) * 1000, 3),
+        throughput=round(len(samples) / total, 1) if total > 0 else 0.0,
+    )
+
+
+def bench_sync(name: str, func: Callable, iterations: int, warmup: int) -> Result:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return _summarize(name, samples)
+
+
+# === 최소 ASGI 클라이언트 (httpx 없이 FastAPI 스택 전체를 통과) ===
+
+class AsgiClient:
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_task = None
+
+    async def startup(self) -> None:
+        self._lifespan_queue = asyncio.Queue()
+        started = asyncio.Event()
+
+        async def receive():
+            return await self._lifespan_queue.get()
+
+        async def send(message):
+            if message["type"] in ("lifespan.startup.complete", "lifespan.startup.failed"):
+                started.set()
+
+        self._lifespan_task = asyncio.create_task(
+            self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, send))
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        await started.wait()
+
+    async def shutdown(self) -> None:
+        if self._lifespan_queue is not None:
+            await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+            await asyncio.wait_for(self._lifespan_task, timeout=5)
+
+    async def get(self, path: str, headers: Optional[Dict[str, str]] = None, on_message=None):
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+        }
+        status = 0
+        body = bytearray()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            nonlocal status
+            if on_message is not None:
+                await on_message(message)
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, bytes(body)
+
+
+async def bench_endpoint(client: AsgiClient, name: str, case: "EndpointCase", iterations: int, warmup: int) -> Result:
+    from backend import api_server
+    headers = dict(case.headers or {})
+    if case.mode == "etag":
+        headers["If-None-Match"] = await _current_etag(client, case.path)
+    expected = 304 if case.mode == "etag" else 200
+
+    def reset():
+        # cold: 매 요청마다 스냅샷을 비워 업스트림 호출 + 검증/인코딩 경로를 측정
+        if case.mode == "cold":
+            api_server.SNAPSHOTS.clear()
+            api_server.NEWS_SNAPSHOTS.clear()
+
+    for _ in range(warmup):
+        reset()
+        status, _ = await client.get(case.path, headers)
+        if status != expected:
+            raise RuntimeError(f"{case.path} returned {status}")
+    samples = []
+    for _ in range(iterations):
+        reset()
+        start = time.perf_counter()
+        await client.get(case.path, headers)
+        samples.append(time.perf_counter() - start)
+    return _summarize(name, samples)
+
+
+async def _current_etag(client: AsgiClient, path: str) -> str:
+    etags = []
+
+    async def send_capture(message):
+        if message["type"] == "http.response.start":
+            for key, value in message.get("headers", []):
+                if key.lower() == b"etag":
+                    etags.append(value.decode())
+
+    status, _ = await client.get(path, on_message=send_capture)
+    if not etags:
+        raise RuntimeError(f"{path} returned no ETag")
+    return etags[-1]
+
+
+# === 케이스 정의 ===
+
+def service_cases() -> Dict[str, Callable]:
+    from backend.services import upbit_api, binance_api, sectors, stock_api
+    from backend.services.whale_feed import WhaleAlertSource
+    return {
+        "service.upbit_balance": upbit_api._get_upbit_balance_sync,
+        "service.upbit_holdings": upbit_api._get_upbit_holdings_sync,
+        "service.upbit_top_volume": partial(upbit_api._get_upbit_top_volume_coins_sync, 10),
+        "service.upbit_prices": upbit_api._get_upbit_krw_prices_sync,
+        "service.usdt_krw_rate": upbit_api._get_usdt_krw_rate_sync,
+        "service.binance_balance": binance_api._get_binance_balance_sync,
+        "service.binance_holdings": binance_api._get_binance_holdings_sync,
+        "service.binance_top_volume": partial(binance_api._get_binance_top_volume_coins_sync, 10, 1450.0),
+        "service.binance_prices": binance_api._get_binance_usdt_prices_sync,
+        "service.usd_krw_rate": stock_api._get_usd_krw_rate_sync,
+        "service.kospi_top_volume": partial(stock_api._get_real_korea_stock_data_sync, "kospi", 10),
+        "service.kosdaq_top_volume": partial(stock_api._get_real_korea_stock_data_sync, "kosdaq", 10),
+        "service.us_top_volume": partial(stock_api._get_us_top_volume_sync, 10),
+        "service.major_indices": stock_api._get_major_indices_sync,
+        "service.sector_performance": stock_api._get_sector_performance_sync,
+        "service.sector_detail": partial(sectors._get_sector_detail_sync, "278"),
+        "service.naver_realtime": partial(
+            sectors._get_realtime_quotes_sync, [str(100000 + n) for n in range(sectors.QUOTE_BATCH)]),
+        "service.stock_news": partial(stock_api._get_stock_news_sync, "NVDA"),
+        "service.crypto_fear_greed": stock_api._get_crypto_fear_greed_sync,
+        "service.whale_alert": partial(WhaleAlertSource("replay-key").fetch, 0),
+        "service.etf_top_volume": partial(stock_api._get_etf_top_volume_sync, "us", 10),
+        "engine.portfolio_tick": _portfolio_tick_case(),
+        "engine.history_30d": _history_case(30 * 86400),
+        "engine.history_1y": _history_case(365 * 86400),
+        "engine.alerts_10k": _alerts_case(),
+        "engine.whale_feed": _whale_feed_case(),
+        "engine.premium_tick": _premium_tick_case(),
+        "engine.indicators_bar": _indicators_bar_case(),
+        "engine.indicators_warm": _indicators_warm_case(),
+        "engine.screener_query": _screener_query_case(),
+        "engine.universe_snapshot": _universe_snapshot_case(),
+        "engine.section_delta": _section_delta_case(),
+    }
+
+
+_HISTORY_STORE = None
+
+
+def _history_case(span_seconds: int) -> Callable:
+    """1년치(10분 간격) 기록이 있는 임시 DB 에서 자산 곡선을 조회하는 비용"""
+    global _HISTORY_STORE
+    if _HISTORY_STORE is None:
+        import random
+        import tempfile
+        from backend.services.history import HistoryStore
+
+        path = os.path.join(tempfile.mkdtemp(prefix="bench-history-"), "history.sqlite3")
+        _HISTORY_STORE = HistoryStore(path)
+        rng = random.Random(7)
+        end = 1_790_000_000
+        value = 10_000_000.0
+        for ts in range(end - 365 * 86400, end, 600):
+            value *= 1 + rng.gauss(0, 0.002)
+            # 원본 기록은 보관 기간(7일)이 지나면 정리되고 시간/일 집계만 남음
+            _HISTORY_STORE.record({"total_value_krw": value, "total_cost_krw": 9_000_000.0,
+                                   "total_pnl_krw": value - 9_000_000.0, "positions": []}, ts)
+    return partial(_HISTORY_STORE.history, span_seconds, "auto", 1_790_000_000)
+
+
+def _portfolio_tick_case(rows: int = 2000, changed_ratio: float = 0.05) -> Callable:
+    """2,000개 포지션 중 5%의 가격이 바뀐 계정 조회 결과를 반영하는 비용"""
+    import random
+    from backend.services.portfolio import Position, PositionTable
+
+    rng = random.Random(42)
+    positions = [
+        Position("upbit" if i % 2 else "binance", f"A{i}", rng.uniform(0.1, 100), rng.uniform(1, 1000),
+                 rng.uniform(1, 1000), "KRW" if i % 2 else "USDT")
+        for i in range(rows)
+    ]
+    table = PositionTable()
+    table.sync(positions, {"USDT": 1450.0})
+
+    def tick():
+        for i in rng.sample(range(rows), int(rows * changed_ratio)):
+            p = positions[i]
+            positions[i] = Position(p.venue, p.asset, p.quantity, p.avg_cost, p.price * rng.uniform(0.99, 1.01),
+                                    p.currency)
+        table.sync(positions, {"USDT": 1450.0})
+
+    return tick
+
+
+def _alerts_case(symbols: int = 2000, rules: int = 10_000, changed_ratio: float = 0.05) -> Callable:
+    """2,000개 종목에 규칙 10,000개가 걸린 상태에서 5%의 시세가 바뀐 스냅샷을 평가하는 비용"""
+    import random
+    from backend.services.alerts import AlertEngine, RULE_KINDS, Tick
+
+    rng = random.Random(11)
+    ticks = [Tick(f"upbit:KRW-A{i}", rng.uniform(1, 1000), rng.uniform(1e3, 1e6), rng.uniform(-5, 5))
+             for i in range(symbols)]
+    engine = AlertEngine()
+    for i in range(rules):
+        tick = ticks[i % symbols]
+        kind = RULE_KINDS[i % len(RULE_KINDS)]
+        value = {"price_above": tick.price * 1.01, "price_below": tick.price * 0.99,
+                 "volume_spike": 3.0, "change_rate": 4.0}[kind]
+        engine.add_rule(tick.symbol, kind, value)
+    engine.evaluate(ticks)
+
+    def evaluate():
+        for i in rng.sample(range(symbols), int(symbols * changed_ratio)):
+            t = ticks[i]
+            ticks[i] = Tick(t.symbol, t.price * rng.uniform(0.98, 1.02), t.volume * rng.uniform(0.9, 1.2),
+                            t.change_rate + rng.uniform(-0.5, 0.5))
+        engine.evaluate(ticks)
+
+    return evaluate
+
+
+def _indicator_series(symbols: int, bars: int):
+    import numpy as np
+
+    rng = np.random.default_rng(5)
+    closes = rng.uniform(1, 1000, symbols) * np.cumprod(1 + rng.normal(0, 0.003, (bars, symbols)), axis=0)
+    volumes = np.cumsum(rng.uniform(1, 100, (bars, symbols)), axis=0)
+    return [f"S{i}" for i in range(symbols)], closes, volumes
+
+
+def _indicators_bar_case(symbols: int = 500) -> Callable:
+    """종목 500개의 봉이 모두 닫히는 시세 한 번을 반영하고 지표를 만드는 비용"""
+    from backend.services.indicators import IndicatorEngine
+
+    keys, closes, volumes = _indicator_series(symbols, 200)
+    engine = IndicatorEngine(bar_seconds=60)
+    counter = iter(range(10 ** 9))
+
+    def bar():
+        t = next(counter)
+        rows = engine.observe(keys, closes[t % 200], volumes[t % 200] + t, now=t * 60)
+        engine.values(rows)
+        engine.drain_closed()
+
+    for _ in range(60):
+        bar()
+    return bar
+
+
+def _indicators_warm_case(symbols: int = 500, bars: int = 100) -> Callable:
+    """종목 500개 × 100봉 저장 기록으로 지표 상태를 복원하는 비용 (재시작)"""
+    from backend.services.indicators import IndicatorEngine
+
+    keys, closes, volumes = _indicator_series(symbols, bars)
+    stored = [(key, t * 60, float(closes[t, i]), float(volumes[t, i])) for i, key in enumerate(keys) for t in range(bars)]
+    return lambda: IndicatorEngine(bar_seconds=60).load(stored)
+
+
+def _premium_tick_case(assets: int = 500, changed_ratio: float = 0.05) -> Callable:
+    """공통 코인 500개 중 5%의 업비트 시세가 바뀐 스냅샷을 반영하고 순위를 만드는 비용"""
+    import random
+    from backend.services.premium import PremiumBook
+
+    rng = random.Random(11)
+    usdt = {f"A{i}": rng.uniform(0.01, 1000) for i in range(assets)}
+    krw = {asset: price * 1450.0 * rng.uniform(0.97, 1.05) for asset, price in usdt.items()}
+    book = PremiumBook()
+    book.set_rate(1450.0)
+    book.update_binance(usdt)
+    book.update_upbit(krw)
+    names = list(krw)
+
+    def tick():
+        for asset in rng.sample(names, int(assets * changed_ratio)):
+            krw[asset] *= rng.uniform(0.99, 1.01)
+        book.update_upbit(krw)
+        book.record()
+        book.ranked()
+
+    return tick
+
+
+def _screener_query_case(rows: int = 3000) -> Callable:
+    """종목 3000개 테이블에서 조건 2개 + 정렬 + 상위 50개를 조회하는 비용 (인덱스 재구성 제외)"""
+    import random
+    from backend.services.quotes import Quote, to_columns
+    from backend.services.screener import ScreenerTable, parse_filter
+
+    rng = random.Random(13)
+
+    def quote(source: str, i: int, price: float) -> Quote:
+        volume = rng.uniform(1, 1e7)
+        return Quote(source, f"S{i}", f"종목{i}", price, rng.uniform(-30, 30), volume, price * volume,
+                     price, price * volume)
+
+    half = rows // 2
+    stocks = to_columns([quote("naver", i, rng.uniform(1000, 500000)) for i in range(half)])
+    coins = to_columns([quote("upbit", i, rng.uniform(1, 1e8)) for i in range(rows - half)])
+    table = ScreenerTable()
+    table.sync("kospi", "1", stocks, 1450.0)
+    table.sync("upbit", "1", coins, 1450.0)
+    table.refresh()
+    conditions = [parse_filter("change_rate>5"), parse_filter("trade_value>=1e10")]
+    return partial(table.query, conditions, None, "change_rate", True, 50)
+
+
+def _universe_snapshot_case(pairs: int = 2000) -> Callable:
+    """바이낸스 2000개 페어 티커 → 시세 레코드 → 열 배열 스냅샷 (전체 종목 섹션 1회 갱신의 변환 비용)"""
+    import random
+    from backend import api_server
+    from backend.services import binance_api
+    from backend.services.snapshot import make_snapshot
+
+    rng = random.Random(17)
+    tickers = [{
+        "symbol": f"C{i}USDT", "lastPrice": str(rng.uniform(0.01, 1000)),
+        "priceChangePercent": str(rng.uniform(-9, 9)), "volume": str(rng.uniform(1e3, 1e9)),
+        "quoteVolume": str(rng.uniform(1e5, 1e10)),
+    } for i in range(pairs)]
+    section = api_server.SECTIONS["binance_universe"]
+
+    def build():
+        quotes = binance_api._build_top_coins(tickers, pairs, 1450.0)
+        make_snapshot("binance_universe", section.present(quotes), section.adapter)
+
+    return build
+
+
+def _section_delta_case(rows: int = 1000, changed_ratio: float = 0.05) -> Callable:
+    """응답 행 1000개 중 5%의 가격이 바뀐 순위 스냅샷을 이전 스냅샷과 비교해 delta 를 만드는 비용"""
+    import random
+    from backend.services.deltas import DeltaBook
+
+    rng = random.Random(19)
+    current = [{"code": f"{i:06d}", "name": f"종목{i}", "current_price": rng.randint(1000, 500000),
+                "change_rate": rng.uniform(-30, 30), "trade_volume": rng.randint(1, 10 ** 7)} for i in range(rows)]
+    book = DeltaBook({"kospi_top": "code"})
+    book.update("kospi_top", current)
+
+    def tick():
+        nonlocal current
+        # 다음 스냅샷은 응답 JSON 을 새로 디코딩한 것과 같이 모든 행이 새 객체
+        current = [dict(row) for row in current]
+        for row in rng.sample(current, int(rows * changed_ratio)):
+            row["current_price"] += rng.choice((-5, 5))
+        book.update("kospi_top", current)
+
+    return tick
+
+
+def _whale_feed_case(capacity: int = 1000, batch: int = 20) -> Callable:
+    """가득 찬 링 버퍼에 20건(절반은 중복)을 넣고 대시보드용 최신 5건을 읽는 비용"""
+    from backend.services.whale_feed import Transfer, TransferRing
+
+    ring = TransferRing(capacity)
+    coins = ["BTC", "ETH", "XRP", "USDT", "SOL"]
+    counter = iter(range(10 ** 9))
+
+    def transfer(i: int) -> Transfer:
+        return Transfer(f"bench:{i}", coins[i % len(coins)], 1.0, 1e6, "Binance", "Unknown Wallet", float(i))
+
+    for _ in range(capacity):
+        ring.add(transfer(next(counter)))
+
+    def ingest():
+        last = next(counter)
+        for i in range(last - batch // 2, last + batch // 2):
+            ring.add(transfer(i))
+        ring.latest(5)
+
+    return ingest
+
+
+@dataclass
+class EndpointCase:
+    path: str
+    mode: str = "cold"  # cold: 스냅샷 없음 / hit: 스냅샷 재사용 / etag: If-None-Match → 304
+    headers: Optional[Dict[str, str]] = None
+
+
+ENDPOINT_CASES = {
+    "endpoint.dashboard": EndpointCase("/api/dashboard"),
+    "endpoint.stock_dashboard": EndpointCase("/api/stock/dashboard"),
+    "endpoint.stock_news": EndpointCase("/api/stock/news/NVDA"),
+    "endpoint.dashboard.hit": EndpointCase("/api/dashboard", "hit"),
+    "endpoint.stock_dashboard.hit": EndpointCase("/api/stock/dashboard", "hit"),
+    "endpoint.stock_news.hit": EndpointCase("/api/stock/news/NVDA", "hit"),
+    "endpoint.dashboard.304": EndpointCase("/api/dashboard", "etag"),
+    "endpoint.dashboard.gzip": EndpointCase("/api/dashboard", "hit", {"Accept-Encoding": "gzip"}),
+    "endpoint.dashboard.sections": EndpointCase("/api/dashboard?sections=upbit_top_volume,fear_greed", "hit"),
+    "endpoint.upbit_top_volume.hit": EndpointCase("/api/upbit/top-volume", "hit"),
+    "endpoint.portfolio": EndpointCase("/api/portfolio"),
+}
+
+
+# === import 시간 (새 인터프리터에서 측정) ===
+# 서버/CLI 시작 시 import 비용. 지연 import 대상(pandas/yfinance/pyupbit/binance/bs4)은 import.lazy_warm_up 에 집계
+
+IMPORT_CASES = {
+    "import.api_server": "import backend.api_server",
+    "import.cli": "import main",
+    "import.lazy_warm_up": None,
+}
+IMPORT_ITERATIONS = 10  # 케이스당 인터프리터를 새로 띄우므로 반복 수를 제한
+
+_IMPORT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+{setup}
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def bench_import(name: str, statement: Optional[str], iterations: int, warmup: int) -> Result:
+    import subprocess
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if statement is None:
+        # 서버 import 후 백그라운드 warm-up 이 실제로 import 하는 시간
+        setup, statement = "import backend.api_server", "from backend.services import lazy; lazy.warm_up()"
+    else:
+        setup = ""
+    script = _IMPORT_SCRIPT.format(root=root, setup=setup, statement=statement)
+    samples = []
+    for i in range(warmup + iterations):
+        out = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+        if i >= warmup:
+            samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return _summarize(name, samples)
+
+
+def run(only: Optional[str], iterations: int, warmup: int) -> List[Result]:
+    results = []
+    for name, statement in IMPORT_CASES.items():
+        if only and only not in name:
+            continue
+        results.append(bench_import(name, statement, min(iterations, IMPORT_ITERATIONS), 1))
+    for name, func in service_cases().items():
+        if only and only not in name:
+            continue
+        results.append(bench_sync(name, func, iterations, warmup))
+
+    endpoints = {n: p for n, p in ENDPOINT_CASES.items() if not only or only in n}
+    if endpoints:
+        from backend.api_server import app
+
+        async def _run_endpoints():
+            client = AsgiClient(app)
+            await client.startup()
+            try:
+                for name, case in endpoints.items():
+                    results.append(await bench_endpoint(client, name, case, iterations, warmup))
+            finally:
+                await client.shutdown()
+
+        asyncio.run(_run_endpoints())
+    return results
+
+
+# === 기준선 비교 ===
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path: str, results: List[Result]) -> None:
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {r.name: asdict(r) for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """결과 표를 출력하고, 기준선 대비 느려진 케이스 이름 목록을 반환합니다."""
+    regressions = []
+    header = f"{'case':<32}{'p50 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'Δp50':>9}{'Δp99':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        base = baseline.get(r.name)
+        d50 = d99 = ""
+        flag = ""
+        if base:
+            r50 = (r.p50_ms / base["p50_ms"] - 1) if base["p50_ms"] else 0.0
+            r99 = (r.p99_ms / base["p99_ms"] - 1) if base["p99_ms"] else 0.0
+            d50, d99 = f"{r50:+.0%}", f"{r99:+.0%}"
+            if r50 > tolerance or r99 > tolerance:
+                regressions.append(r.name)
+                flag = "  REGRESSION"
+        print(f"{r.name:<32}{r.p50_ms:>10.3f}{r.p99_ms:>10.3f}{r.throughput:>10.1f}{d50:>9}{d99:>9}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite (replays recorded upstream fixtures)")
+    parser.add_argument("--only", help="substring filter for case names")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.30, help="allowed slowdown vs baseline (0.30 = 30%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", dest="json_path", help="write raw results to this file")
+    args = parser.parse_args(argv)
+
+    # 백그라운드 선갱신이 측정 중 끼어들지 않도록 비활성화
+    os.environ.setdefault("SECTION_REFRESH", "0")
+    os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+    os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+    os.environ.setdefault("INDICATOR_BAR_DB", "")
+    replay.install()
+    results = run(args.only, args.iterations, args.warmup)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+    baseline = load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not baseline:
+        print("\nNo baseline found; run with --update-baseline to record one.")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+업스트림 응답 라우터
+서비스 모듈이 호출하는 외부 엔드포인트(Upbit, Binance, Naver, Yahoo, alternative.me, Google News, Whale Alert)를
+benchmarks/fixtures 의 기록된 응답으로 매핑합니다.
+재생(replay) 트랜스포트와 로컬 대체 서버가 같은 라우팅을 공유합니다.
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 업스트림 호스트 목록 (부하 테스트 시 로컬 서버로 리다이렉트되는 대상)
+UPSTREAM_HOSTS = (
+    "api.upbit.com",
+    "api.binance.com",
+    "finance.naver.com",
+    "polling.finance.naver.com",
+    "query1.finance.yahoo.com",
+    "query2.finance.yahoo.com",
+    "api.alternative.me",
+    "news.google.com",
+    "api.whale-alert.io",
+)
+
+UPBIT_HEADERS = {"Remaining-Req": "group=default; min=1800; sec=29"}
+
+
+@dataclass
+class FixtureResponse:
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    content_type: str = "application/json"
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _json_fixture(name: str):
+    return json.loads(load_fixture(name))
+
+
+@lru_cache(maxsize=None)
+def yahoo_bars() -> Dict[str, List[dict]]:
+    """yahoo_daily.csv (symbol,date,open,high,low,close,volume) → 종목별 일봉 리스트"""
+    bars: Dict[str, List[dict]] = {}
+    text = load_fixture("yahoo_daily.csv").decode("utf-8")
+    for row in csv.DictReader(text.splitlines()):
+        bars.setdefault(row["symbol"], []).append({
+            "date": row["date"],
+            "open": float(row["open"]),
+            "high": float(row["high"]),
+            "low": float(row["low"]),
+            "close": float(row["close"]),
+            "volume": int(row["volume"]),
+        })
+    return bars
+
+
+def _json(data, status: int = 200, headers: Optional[dict] = None) -> FixtureResponse:
+    return FixtureResponse(status, json.dumps(data).encode(), dict(headers or {}))
+
+
+def _first(query: Dict[str, List[str]], key: str, default: str = "") -> str:
+    values = query.get(key)
+    return values[0] if values else default
+
+
+# === Upbit ===
+
+def _upbit_market_all(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("upbit_market_all.json"), dict(UPBIT_HEADERS))
+
+
+def _upbit_ticker(query) -> FixtureResponse:
+    markets = set(",".join(query.get("markets", [])).split(","))
+    tickers = [t for t in _json_fixture("upbit_ticker.json") if t["market"] in markets]
+    if not tickers:
+        return _json({"error": {"name": 404, "message": "Code not found"}}, 404, UPBIT_HEADERS)
+    return _json(tickers, headers=UPBIT_HEADERS)
+
+
+def _upbit_accounts(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("upbit_accounts.json"), dict(UPBIT_HEADERS))
+
+
+# === Binance ===
+
+def _binance_ping(query) -> FixtureResponse:
+    return _json({})
+
+
+def _binance_time(query) -> FixtureResponse:
+    return _json({"serverTime": int(time.time() * 1000)})
+
+
+def _binance_ticker_24hr(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("binance_ticker_24hr.json"))
+
+
+def _binance_ticker_price(query) -> FixtureResponse:
+    return _json([{"symbol": t["symbol"], "price": t["lastPrice"]} for t in _json_fixture("binance_ticker_24hr.json")])
+
+
+def _binance_account(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("binance_account.json"))
+
+
+# === Naver / alternative.me / Google News ===
+
+def _naver_sise_quant(query) -> FixtureResponse:
+    market = "kosdaq" if _first(query, "sosok", "0") == "1" else "kospi"
+    return FixtureResponse(200, load_fixture(f"naver_sise_quant_{market}.html"), content_type="text/html; charset=euc-kr")
+
+
+def _naver_sise_group(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("naver_sise_group.html"), content_type="text/html; charset=euc-kr")
+
+
+@lru_cache(maxsize=None)
+def _naver_sise_group_detail_page(no: str) -> bytes:
+    """
+    기록된 업종 상세 페이지 하나를 업종 번호별로 재사용합니다.
+    업종마다 구성 종목이 겹치지 않도록 종목 코드를 업종 번호만큼 옮기고 이름에 업종 번호를 붙입니다.
+    """
+    html = load_fixture("naver_sise_group_detail.html").decode("euc-kr")
+    offset = int(no) * 1000 if no.isdigit() else 0
+
+    def shift(match: "re.Match") -> str:
+        code = f"{(int(match.group(1)) + offset) % 1_000_000:06d}"
+        return f'code={code}">{match.group(2)}-{no}<' if match.group(2) else f"code={code}"
+
+    return re.sub(r'code=(\d{6})(?:">([^<]+)<)?', shift, html).encode("euc-kr")
+
+
+def _naver_sise_group_detail(query) -> FixtureResponse:
+    page = _naver_sise_group_detail_page(_first(query, "no", "0"))
+    return FixtureResponse(200, page, content_type="text/html; charset=euc-kr")
+
+
+def _naver_realtime(codes: List[str]) -> FixtureResponse:
+    """네이버 실시간 시세 API. 종목 코드에서 결정적으로 만든 시세를 반환합니다."""
+    datas = []
+    for code in codes:
+        seed = int.from_bytes(hashlib.blake2b(code.encode(), digest_size=8).digest(), "big")
+        price = 1000 + seed % 300000
+        ratio = (seed >> 20) % 1600 / 100 - 8
+        volume = 1000 + (seed >> 32) % 5_000_000
+        datas.append({
+            "itemCode": code,
+            "stockName": f"종목{code}",
+            "closePrice": f"{price:,}",
+            "compareToPreviousClosePrice": f"{round(price * ratio / (100 + ratio)):,}",
+            "fluctuationsRatio": f"{ratio:.2f}",
+            "accumulatedTradingVolume": f"{volume:,}",
+            "accumulatedTradingValue": f"{price * volume // 1_000_000:,}백만",
+            "marketStatus": "OPEN",
+        })
+    return _json({"pollingInterval": 7000, "datas": datas, "time": time.strftime("%Y%m%d%H%M%S")})
+
+
+def _fear_greed(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("fng.json"))
+
+
+def _google_news(query) -> FixtureResponse:
+    return FixtureResponse(200, load_fixture("google_news_rss.xml"), content_type="application/rss+xml; charset=utf-8")
+
+
+# === Whale Alert ===
+
+def _whale_alert_transactions(query) -> FixtureResponse:
+    """기록된 트랜잭션의 마지막 시각을 현재 시각으로 옮긴 뒤 start 이후 것만 반환"""
+    transactions = _json_fixture("whale_alert_transactions.json")["transactions"]
+    shift = int(time.time()) - max(tx["timestamp"] for tx in transactions)
+    start = int(_first(query, "start", "0"))
+    items = [{**tx, "timestamp": tx["timestamp"] + shift} for tx in transactions if tx["timestamp"] + shift >= start]
+    return _json({"result": "success", "cursor": "0-0-0", "count": len(items), "transactions": items})
+
+
+# === Yahoo (v8 chart API) ===
+
+_RANGE_BARS = {"1d": 1, "5d": 5, "1mo": 22, "3mo": 66, "6mo": 130, "1y": 252}
+
+
+def _yahoo_chart(query, symbol: str) -> FixtureResponse:
+    bars = yahoo_bars().get(symbol)
+    if not bars:
+        return _json({"chart": {"result": None, "error": {"code": "Not Found", "description": "No data found"}}}, 404)
+    count = _RANGE_BARS.get(_first(query, "range", "1mo"), len(bars))
+    window = bars[-count:]
+    names = _json_fixture("yahoo_names.json")
+    prev_close = bars[-len(window) - 1]["close"] if len(bars) > len(window) else window[0]["open"]
+    last = window[-1]
+    result = {
+        "meta": {
+            "symbol": symbol,
+            "currency": "KRW" if symbol.startswith("^K") or symbol == "KRW=X" else "USD",
+            "regularMarketPrice": last["close"],
+            "regularMarketVolume": last["volume"],
+            "chartPreviousClose": prev_close,
+            "previousClose": bars[-2]["close"] if len(bars) > 1 else last["open"],
+            "shortName": names.get(symbol, symbol),
+            "longName": names.get(symbol, symbol),
+        },
+        "timestamp": [int(time.mktime(time.strptime(b["date"], "%Y-%m-%d"))) for b in window],
+        "indicators": {"quote": [{
+            "open": [b["open"] for b in window],
+            "high": [b["high"] for b in window],
+            "low": [b["low"] for b in window],
+            "close": [b["close"] for b in window],
+            "volume": [b["volume"] for b in window],
+        }]},
+    }
+    return _json({"chart": {"result": [result], "error": None}})
+
+
+_ROUTES: Dict[Tuple[str, str], Callable] = {
+    ("api.upbit.com", "/v1/market/all"): _upbit_market_all,
+    ("api.upbit.com", "/v1/ticker"): _upbit_ticker,
+    ("api.upbit.com", "/v1/accounts"): _upbit_accounts,
+    ("api.binance.com", "/api/v3/ping"): _binance_ping,
+    ("api.binance.com", "/api/v3/time"): _binance_time,
+    ("api.binance.com", "/api/v3/ticker/24hr"): _binance_ticker_24hr,
+    ("api.binance.com", "/api/v3/ticker/price"): _binance_ticker_price,
+    ("api.binance.com", "/api/v3/account"): _binance_account,
+    ("finance.naver.com", "/sise/sise_quant.naver"): _naver_sise_quant,
+    ("finance.naver.com", "/sise/sise_group.naver"): _naver_sise_group,
+    ("finance.naver.com", "/sise/sise_group_detail.naver"): _naver_sise_group_detail,
+    ("api.alternative.me", "/fng/"): _fear_greed,
+    ("news.google.com", "/rss/search"): _google_news,
+    ("api.whale-alert.io", "/v1/transactions"): _whale_alert_transactions,
+}
+
+
+def route(host: str, path: str, query_string: str = "") -> Optional[FixtureResponse]:
+    """(호스트, 경로, 쿼리)에 해당하는 기록된 응답을 반환합니다. 없으면 None."""
+    query = parse_qs(query_string)
+    handler = _ROUTES.get((host, path))
+    if handler:
+        return handler(query)
+    if host in ("query1.finance.yahoo.com", "query2.finance.yahoo.com") and path.startswith("/v8/finance/chart/"):
+        return _yahoo_chart(query, unquote(path.rsplit("/", 1)[-1]))
+    if host == "polling.finance.naver.com" and path.startswith("/api/realtime/domestic/stock/"):
+        return _naver_realtime([code for code in unquote(path.rsplit("/", 1)[-1]).split(",") if code])
+    return None
@@ -46,7 +46,8 @@ export function HoldingsTable({ exchange, holdings, loading }: HoldingsTableProp
         );
     }
 
-    const totalEval = holdings?.reduce((sum, h) => sum + h.eval_amount, 0) || 0;
+    // 현재가를 모르는(null) 코인은 합계에서 제외
+    const totalEval = holdings?.reduce((sum, h) => sum + (h.eval_amount ?? 0), 0) || 0;
 
     return (
         <Paper className="glass-card animate-fadeIn" p="xl" radius="lg">
@@ -129,9 +130,16 @@ export function HoldingsTable({ exchange, holdings, loading }: HoldingsTableProp
                                             </Table.Td>
                                             <Table.Td style={{ textAlign: "right" }}>
                                                 <Text size="sm" fw={500}>
-                                                    {formatNumber(holding.eval_amount, isUpbit ? 0 : 2)} {currency}
+                                                    {holding.eval_amount !== null
+                                                        ? `${formatNumber(holding.eval_amount, isUpbit ? 0 : 2)} ${currency}`
+                                                        : "-"}
                                                 </Text>
                                             </Table.Td>
+                                            {isUpbit && profitRate === null && (
+                                                <Table.Td style={{ textAlign: "right" }}>
+                                                    <Text size="sm" c="dimmed">-</Text>
+                                                </Table.Td>
+                                            )}
                                             {isUpbit && profitRate !== null && (
                                                 <Table.Td style={{ textAlign: "right" }}>
                                                     <Group gap={4} justify="flex-end">
@@ -16,12 +16,15 @@ export function TopVolumeTable({ exchange, coins, loading }: TopVolumeTableProps
     const gradientClass = isUpbit ? "upbit-gradient" : "binance-gradient";
 
     // 통일된 숫자 포맷 함수 - 모두 KRW 기준
-    const formatKRW = (num: number) => {
+    // 환율을 몰라 KRW 로 환산하지 못한 값(null)은 "-"
+    const formatKRW = (num: number | null) => {
+        if (num === null) return "-";
         return new Intl.NumberFormat("ko-KR").format(Math.round(num));
     };
 
     // 통일된 거래대금 포맷 함수 - 모두 억 KRW 단위
-    const formatVolumeKRW = (num: number) => {
+    const formatVolumeKRW = (num: number | null) => {
+        if (num === null) return "-";
         return `${(num / 100000000).toFixed(2)}억`;
     };
 
@@ -89,9 +92,9 @@ export function TopVolumeTable({ exchange, coins, loading }: TopVolumeTableProps
                             {coins.map((coin, index) => {
                                 let symbol: string;
                                 let name: string;
-                                let currentPriceKRW: number;
+                                let currentPriceKRW: number | null;
                                 let changeRate: number;
-                                let tradePriceKRW: number;
+                                let tradePriceKRW: number | null;
 
                                 if (isUpbit) {
                                     const upbitCoin = coin as UpbitTopCoin;
@@ -13,8 +13,8 @@ export interface UpbitHolding {
     total: number;
     avg_buy_price: number;
     current_price: number | null;
-    eval_amount: number;
-    profit_rate: number;
+    eval_amount: number | null;  // 현재가 조회 실패 시 null
+    profit_rate: number | null;
 }
 
 export interface UpbitTopCoin {
@@ -49,9 +49,9 @@ export interface BinanceTopCoin {
     volume: number;
     current_price: number;
     price_change_percent: number;
-    // KRW 변환 필드
-    current_price_krw: number;
-    quote_volume_krw: number;
+    // KRW 변환 필드 (USDT/KRW 환율 조회 실패 시 null)
+    current_price_krw: number | null;
+    quote_volume_krw: number | null;
 }
 
 export interface FearGreedIndex {
@@ -2,87 +2,119 @@
 암호화폐 자동매매 프로그램 - 메인 모듈 (CLI)
 업비트와 바이낸스 API를 통합하여 사용합니다.
 Async refactored using anyio.run
+
+    python main.py                                                  # 대화형 메뉴
+    python main.py snapshot --sources upbit,binance --format json   # 배치 조회 (JSON Lines / CSV 출력)
+    python main.py watch --sources upbit,binance                    # 실시간 모니터링 (바뀐 줄만 다시 표시)
 """
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import math
+import os
+import sys
+from datetime import datetime, timezone
+
 import anyio
 from backend.services.upbit_api import (
+    get_upbit_account,
     get_upbit_balance,
     get_upbit_holdings,
-    get_upbit_top_volume_coins
+    get_upbit_top_volume_coins,
+    get_usdt_krw_rate
 )
 from backend.services.binance_api import (
+    get_binance_account,
     get_binance_balance,
     get_binance_holdings,
     get_binance_top_volume_coins
 )
+from backend.services.quotes import binance_top_coin, to_rows, upbit_top_coin
 
 # === Print Helper Functions (Restored/Adapted) ===
 
+def _num(value, spec):
+    """숫자를 spec 형식으로 표시합니다. 값을 모르면(None/nan, 예: 현재가 조회 실패) 같은 폭의 "-" """
+    if value is None or value != value:
+        return f"{'-':>{len(format(0.0, spec))}}"
+    return format(value, spec)
+
+def _show_upbit_balance(balance):
+    if balance:
+        print("\n  [업비트 잔액]")
+        print(f"  총 보유자산: {balance['total_krw']:.0f} KRW")
+        print(f"  사용 가능: {balance['available_krw']:.0f} KRW")
+    else:
+        print("  잔액 정보를 가져올 수 없습니다.")
+
+def _show_upbit_holdings(holdings):
+    if holdings:
+        print(f"\n  [보유 코인] 총 {len(holdings)}개")
+        for item in holdings:
+            print(f"  - {item['coin']}: {item['total']}개 (평가: {_num(item['eval_amount'], '.0f')} KRW)")
+    else:
+        print("  보유 코인이 없거나 가져올 수 없습니다.")
+
+def _show_upbit_top_volume(coins, limit):
+    if coins:
+        print(f"\n  [업비트 거래량 Top {limit}]")
+        for i, coin in enumerate(coins, 1):
+            print(f"  {i}. {coin.name} ({coin.symbol}): {coin.price:.0f} KRW")
+    else:
+        print("  정보를 가져올 수 없습니다.")
+
+def _show_binance_balance(balance):
+    if balance:
+        print("\n  [바이낸스 잔액]")
+        print(f"  총 보유: {balance['total_usdt']:.2f} USDT")
+    else:
+        print("  잔액 정보를 가져올 수 없습니다.")
+
+def _show_binance_holdings(holdings):
+    if holdings:
+        print(f"\n  [바이낸스 보유] 총 {len(holdings)}개")
+        for item in holdings:
+            print(f"  - {item['symbol']}: {item['total']} (평가: {item['eval_amount']:.2f} USDT)")
+    else:
+        print("  보유 코인이 없습니다.")
+
+def _show_binance_top_volume(coins, limit):
+    if coins:
+        print(f"\n  [바이낸스 거래량 Top {limit}]")
+        for i, coin in enumerate(coins, 1):
+            print(f"  {i}. {coin.symbol}: {coin.price:.2f} USDT (Vol: {coin.trade_value:.0f})")
+
+
 def print_upbit_balance():
-    async def _run():
-        balance = await get_upbit_balance()
-        if balance:
-            print("\n  [업비트 잔액]")
-            print(f"  총 보유자산: {balance['total_krw']:.0f} KRW")
-            print(f"  사용 가능: {balance['available_krw']:.0f} KRW")
-        else:
-            print("  잔액 정보를 가져올 수 없습니다.")
-    anyio.run(_run)
+    _show_upbit_balance(anyio.run(get_upbit_balance))
 
 def print_upbit_holdings():
-    async def _run():
-        holdings = await get_upbit_holdings()
-        if holdings:
-            print(f"\n  [보유 코인] 총 {len(holdings)}개")
-            for item in holdings:
-                print(f"  - {item['coin']}: {item['total']}개 (평가: {item['eval_amount']:.0f} KRW)")
-        else:
-            print("  보유 코인이 없거나 가져올 수 없습니다.")
-    anyio.run(_run)
+    _show_upbit_holdings(anyio.run(get_upbit_holdings))
 
 def print_upbit_top_volume(limit=10):
-    async def _run():
-        coins = await get_upbit_top_volume_coins(limit)
-        if coins:
-            print(f"\n  [업비트 거래량 Top {limit}]")
-            for i, coin in enumerate(coins, 1):
-                print(f"  {i}. {coin['name']} ({coin['market']}): {coin['current_price']:.0f} KRW")
-        else:
-            print("  정보를 가져올 수 없습니다.")
-    anyio.run(_run)
+    _show_upbit_top_volume(anyio.run(get_upbit_top_volume_coins, limit), limit)
 
 def print_binance_balance():
-    async def _run():
-        balance = await get_binance_balance()
-        if balance:
-            print("\n  [바이낸스 잔액]")
-            print(f"  총 보유: {balance['total_usdt']:.2f} USDT")
-        else:
-            print("  잔액 정보를 가져올 수 없습니다.")
-    anyio.run(_run)
+    _show_binance_balance(anyio.run(get_binance_balance))
 
 def print_binance_holdings():
-    async def _run():
-        holdings = await get_binance_holdings()
-        if holdings:
-            print(f"\n  [바이낸스 보유] 총 {len(holdings)}개")
-            for item in holdings:
-                print(f"  - {item['symbol']}: {item['total']} (평가: {item['eval_amount']:.2f} USDT)")
-        else:
-            print("  보유 코인이 없습니다.")
-    anyio.run(_run)
+    _show_binance_holdings(anyio.run(get_binance_holdings))
 
 def print_binance_top_volume(limit=10):
-    async def _run():
-        coins = await get_binance_top_volume_coins(limit)
-        if coins:
-            print(f"\n  [바이낸스 거래량 Top {limit}]")
-            for i, coin in enumerate(coins, 1):
-                print(f"  {i}. {coin['symbol']}: {coin['current_price']:.2f} USDT (Vol: {coin['quote_volume']:.0f})")
-    anyio.run(_run)
+    _show_binance_top_volume(anyio.run(get_binance_top_volume_coins, limit), limit)
 
 
 def show_all_info():
-    """모든 거래소의 정보를 한 번에 조회합니다."""
+    """모든 거래소의 정보를 한 번에 조회합니다 (이벤트 루프 하나에서 동시에 조회)."""
+    async def _run():
+        return await asyncio.gather(
+            get_upbit_account(), get_upbit_top_volume_coins(10),
+            get_binance_account(), get_binance_top_volume_coins(10),
+        )
+    (upbit_balance, upbit_holdings), upbit_top, (binance_balance, binance_holdings), binance_top = anyio.run(_run)
+
     print("\n" + "🚀" * 25)
     print("      암호화폐 포트폴리오 대시보드")
     print("🚀" * 25)
@@ -91,23 +123,137 @@ def show_all_info():
     print("\n" + "─" * 50)
     print("                    📊 UPBIT")
     print("─" * 50)
-    print_upbit_balance()
-    print_upbit_holdings()
-    print_upbit_top_volume(10)
+    _show_upbit_balance(upbit_balance)
+    _show_upbit_holdings(upbit_holdings)
+    _show_upbit_top_volume(upbit_top, 10)
     
     # === 바이낸스 ===
     print("\n" + "─" * 50)
     print("                   📊 BINANCE")
     print("─" * 50)
-    print_binance_balance()
-    print_binance_holdings()
-    print_binance_top_volume(10)
+    _show_binance_balance(binance_balance)
+    _show_binance_holdings(binance_holdings)
+    _show_binance_top_volume(binance_top, 10)
     
     print("\n" + "🚀" * 25)
     print("              조회 완료!")
     print("🚀" * 25 + "\n")
 
 
+# === 배치 모드 (snapshot) ===
+# 요청한 거래소의 잔액/보유/거래량 상위를 이벤트 루프 하나에서 동시에 조회하고, 끝나는 순서대로 출력합니다.
+# 서비스 함수의 오류 메시지는 stderr 로 보내 stdout 에는 데이터만 남깁니다 (cron 등에서 파일로 저장).
+#
+#   json : 데이터 종류별 한 줄 (JSON Lines) {"fetched_at", "source", "dataset", "data"}
+#   csv  : 값 하나당 한 행 (fetched_at, source, dataset, row, field, value), 중첩 필드는 a.b 로 표기
+
+SNAPSHOT_SOURCES = ("upbit", "binance")
+SNAPSHOT_FORMATS = ("json", "csv")
+CSV_FIELDS = ("fetched_at", "source", "dataset", "row", "field", "value")
+
+
+async def _upbit_account():
+    balance, holdings = await get_upbit_account()
+    return [("balance", balance), ("holdings", holdings)]
+
+async def _upbit_top_volume(limit):
+    return [("top_volume", to_rows(upbit_top_coin, await get_upbit_top_volume_coins(limit)))]
+
+async def _binance_account():
+    balance, holdings = await get_binance_account()
+    return [("balance", balance), ("holdings", holdings)]
+
+async def _binance_top_volume(limit):
+    # KRW 환산 환율(업비트 USDT/KRW)을 먼저 조회
+    rate = await get_usdt_krw_rate()
+    return [("top_volume", to_rows(binance_top_coin, await get_binance_top_volume_coins(limit, rate)))]
+
+
+async def fetch_snapshot(sources, limit=10):
+    """(거래소, 데이터 종류, 데이터)를 조회가 끝나는 순서대로 반환합니다. 조회 실패는 데이터 None"""
+    jobs = []
+    if "upbit" in sources:
+        jobs += [("upbit", _upbit_account()), ("upbit", _upbit_top_volume(limit))]
+    if "binance" in sources:
+        jobs += [("binance", _binance_account()), ("binance", _binance_top_volume(limit))]
+
+    async def tagged(source, job):
+        return source, await job
+
+    for done in asyncio.as_completed([tagged(source, job) for source, job in jobs]):
+        source, results = await done
+        for dataset, data in results:
+            yield source, dataset, data
+
+
+def _json_safe(value):
+    """nan/inf 는 JSON 표준이 아니므로 None 으로 바꿉니다 (API 응답의 null 과 동일)"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}{key}.")
+    else:
+        yield prefix[:-1], "" if value is None else value
+
+
+class _JsonLinesWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, record):
+        self.out.write(json.dumps(_json_safe(record), ensure_ascii=False, allow_nan=False) + "\n")
+        self.out.flush()
+
+
+class _CsvWriter:
+    def __init__(self, out):
+        self.out = out
+        self.writer = csv.writer(out)
+        self.writer.writerow(CSV_FIELDS)
+
+    def write(self, record):
+        data = _json_safe(record["data"])
+        rows = data if isinstance(data, list) else [] if data is None else [data]
+        for i, row in enumerate(rows):
+            for field, value in _flatten(row):
+                self.writer.writerow((record["fetched_at"], record["source"], record["dataset"], i, field, value))
+        self.out.flush()
+
+
+def run_snapshot(sources, fmt="json", limit=10, out=None) -> int:
+    """조회 결과를 out(기본 stdout)에 쓰고, 실패한 데이터가 있으면 1을 반환합니다."""
+    out = out or sys.stdout
+    writer = _JsonLinesWriter(out) if fmt == "json" else _CsvWriter(out)
+    failed = []
+
+    async def _run():
+        async for source, dataset, data in fetch_snapshot(sources, limit):
+            if data is None:
+                failed.append(f"{source}.{dataset}")
+            writer.write({
+                "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "source": source,
+                "dataset": dataset,
+                "data": data,
+            })
+
+    with contextlib.redirect_stdout(sys.stderr):
+        anyio.run(_run)
+    if failed:
+        print(f"snapshot: unavailable: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main():
     """메인 메뉴를 표시하고 사용자 입력을 처리합니다."""
     
@@ -196,8 +342,198 @@ def binance_menu():
             print("\n  ⚠️ 올바른 번호를 선택해주세요.")
 
 
-if __name__ == "__main__":
+# === 실시간 모니터링 (watch) ===
+# 이벤트 루프 하나에서 거래소별 잔액/보유/거래량 상위를 각자의 주기로 다시 조회하고,
+# 화면에서는 내용이 바뀐 줄만 다시 그립니다 (ANSI 커서 이동, 패널별 고정 영역).
+# 터미널이 아니거나 --plain 이면 바뀐 줄만 시각과 함께 한 줄씩 출력합니다 (로그 파일용).
+
+WATCH_DATASETS = ("balance", "holdings", "top_volume")
+WATCH_INTERVALS = {"balance": 10.0, "holdings": 30.0, "top_volume": 5.0}  # 초
+
+
+def _upbit_balance_lines(balance):
+    return [f"총 보유자산 {balance['total_krw']:>16,.0f} KRW   사용 가능 {balance['available_krw']:>16,.0f}"
+            f"   주문 중 {balance['locked_krw']:>14,.0f}"]
+
+def _upbit_holdings_lines(holdings):
+    return [f"{h['coin']:<10}{h['total']:>18,.4f}{_num(h['current_price'], '>16,.2f')}{_num(h['eval_amount'], '>16,.0f')} KRW"
+            f"{_num(h['profit_loss_percent'], '>+9.2f')}%" for h in holdings]
+
+def _upbit_top_volume_lines(coins):
+    return [f"{i:>2}. {c.symbol:<14}{c.price:>16,.2f}{c.change_rate:>+9.2f}%{c.trade_value / 1e8:>12,.0f}억  {c.name}"
+            for i, c in enumerate(coins, 1)]
+
+def _binance_balance_lines(balance):
+    return [f"총 보유 {balance['total_usdt']:>14,.2f} USDT   사용 가능 {balance['available_usdt']:>14,.2f}"
+            f"   주문 중 {balance['locked_usdt']:>12,.2f}"]
+
+def _binance_holdings_lines(holdings):
+    return [f"{h['symbol']:<14}{h['total']:>18,.4f}{h['current_price']:>16,.4f}{h['eval_amount']:>14,.2f} USDT"
+            for h in holdings]
+
+def _binance_top_volume_lines(coins):
+    return [f"{i:>2}. {c.symbol:<14}{c.price:>16,.4f}{c.change_rate:>+9.2f}%{c.trade_value / 1e6:>12,.1f}M USDT"
+            for i, c in enumerate(coins, 1)]
+
+
+def _watch_panels(sources, limit, rows):
+    """(거래소, 데이터 종류) → (제목, 조회 함수, 줄 변환 함수, 높이)"""
+    panels = {}
+    if "upbit" in sources:
+        panels[("upbit", "balance")] = ("업비트 잔액", get_upbit_balance, _upbit_balance_lines, 1)
+        panels[("upbit", "holdings")] = ("업비트 보유", get_upbit_holdings, _upbit_holdings_lines, rows)
+        panels[("upbit", "top_volume")] = (f"업비트 거래대금 Top {limit}",
+                                           lambda: get_upbit_top_volume_coins(limit), _upbit_top_volume_lines, limit)
+    if "binance" in sources:
+        panels[("binance", "balance")] = ("바이낸스 잔액", get_binance_balance, _binance_balance_lines, 1)
+        panels[("binance", "holdings")] = ("바이낸스 보유", get_binance_holdings, _binance_holdings_lines, rows)
+        panels[("binance", "top_volume")] = (f"바이낸스 거래대금 Top {limit}",
+                                             lambda: get_binance_top_volume_coins(limit), _binance_top_volume_lines,
+                                             limit)
+    return panels
+
+
+class _Panel:
+    def __init__(self, title, height, top):
+        self.title = title
+        self.height = height
+        self.top = top             # 제목 줄의 화면 행 번호 (1부터)
+        self.header = ""
+        self.lines = [""] * height
+
+
+class WatchScreen:
+    """패널마다 고정된 화면 영역에 그리고, 이전과 달라진 줄만 다시 씁니다."""
+
+    def __init__(self, panels, out, ansi=True):
+        self.out = out
+        self.ansi = ansi
+        self.panels = {}
+        row = 1
+        for key, (title, height) in panels.items():
+            self.panels[key] = _Panel(title, height, row)
+            row += height + 2      # 제목 + 본문 + 빈 줄
+        self.bottom = row
+        if ansi:
+            self.out.write("\x1b[?25l\x1b[2J")   # 커서 숨김 + 화면 지우기 (시작 시 한 번)
+            self.out.flush()
+
+    def update(self, key, header, lines=None) -> int:
+        """패널 제목과 본문(None 이면 이전 본문 유지)을 반영하고, 다시 쓴 줄 수를 반환합니다."""
+        panel = self.panels[key]
+        changes = []
+        if header != panel.header:
+            panel.header = header
+            if self.ansi:
+                changes.append((panel.top, header))
+        if lines is not None:
+            if len(lines) > panel.height:
+                lines = lines[:panel.height - 1] + [f"... 외 {len(lines) - panel.height + 1}개"]
+            lines = lines + [""] * (panel.height - len(lines))
+            for i, line in enumerate(lines):
+                if line != panel.lines[i]:
+                    panel.lines[i] = line
+                    changes.append((panel.top + 1 + i, line))
+        if not changes:
+            return 0
+        if self.ansi:
+            # 줄마다 커서를 옮겨 덮어쓰고 줄 끝을 지운 뒤, 커서를 화면 아래로 돌려놓음
+            self.out.write("".join(f"\x1b[{row};1H{text}\x1b[K" for row, text in changes) + f"\x1b[{self.bottom};1H")
+        else:
+            stamp = datetime.now().strftime("%H:%M:%S")
+            self.out.write("".join(f"{stamp} [{panel.title}] {text}\n" for _, text in changes if text))
+        self.out.flush()
+        return len(changes)
+
+    def close(self):
+        if self.ansi:
+            self.out.write(f"\x1b[{self.bottom};1H\x1b[?25h\n")
+            self.out.flush()
+
+
+async def watch(screen, panels, intervals, duration=0.0):
+    """패널별로 조회 → 화면 반영 → 대기를 반복합니다. duration 이 0 이면 중단될 때까지 실행합니다."""
+    async def refresh(key, title, fetch, render, interval):
+        while True:
+            data = await fetch()
+            stamp = datetime.now().strftime("%H:%M:%S")
+            if data is None:
+                screen.update(key, f"[{title}] {stamp} 조회 실패 (이전 값 표시)")
+            else:
+                screen.update(key, f"[{title}] {stamp} ({interval:g}초마다 갱신)", render(data) or ["(없음)"])
+            await asyncio.sleep(interval)
+
+    tasks = [
+        asyncio.create_task(refresh(key, title, fetch, render, intervals[key[1]]))
+        for key, (title, fetch, render, _) in panels.items()
+    ]
+    try:
+        if duration > 0:
+            await asyncio.sleep(duration)
+        else:
+            await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_watch(sources, limit=10, rows=10, intervals=None, duration=0.0, plain=False, out=None) -> int:
+    out = out or sys.stdout
+    ansi = not plain and out.isatty()
+    if ansi and os.name == "nt":
+        os.system("")  # Windows 콘솔의 ANSI 이스케이프 처리 활성화
+    panels = _watch_panels(sources, limit, rows)
+    screen = WatchScreen({key: (title, height) for key, (title, _, _, height) in panels.items()}, out, ansi)
+    try:
+        # 서비스 함수의 오류 메시지가 화면 영역을 덮어쓰지 않도록 stderr 로 보냄
+        with contextlib.redirect_stdout(sys.stderr):
+            anyio.run(watch, screen, panels, {**WATCH_INTERVALS, **(intervals or {})}, duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        screen.close()
+    return 0
+
+
+def cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="암호화폐 포트폴리오 CLI (명령 없이 실행하면 대화형 메뉴)")
+    commands = parser.add_subparsers(dest="command")
+    snapshot = commands.add_parser("snapshot", help="잔액/보유/거래량 상위를 동시에 조회해 JSON Lines 또는 CSV 로 출력")
+    snapshot.add_argument("--sources", default=",".join(SNAPSHOT_SOURCES),
+                          help=f"쉼표 구분 거래소 ({','.join(SNAPSHOT_SOURCES)})")
+    snapshot.add_argument("--format", choices=SNAPSHOT_FORMATS, default="json")
+    snapshot.add_argument("--limit", type=int, default=10, help="거래량 상위 종목 수")
+    live = commands.add_parser("watch", help="잔액/보유/거래량 상위를 각자의 주기로 갱신하며 바뀐 줄만 다시 표시")
+    live.add_argument("--sources", default=",".join(SNAPSHOT_SOURCES),
+                      help=f"쉼표 구분 거래소 ({','.join(SNAPSHOT_SOURCES)})")
+    live.add_argument("--limit", type=int, default=10, help="거래량 상위 종목 수")
+    live.add_argument("--rows", type=int, default=10, help="보유 코인 패널 최대 줄 수")
+    for dataset in WATCH_DATASETS:
+        live.add_argument(f"--{dataset.replace('_', '-')}-interval", type=float, default=WATCH_INTERVALS[dataset],
+                          help=f"{dataset} 갱신 주기 (초)")
+    live.add_argument("--duration", type=float, default=0.0, help="실행 시간 (초, 0 이면 Ctrl+C 까지)")
+    live.add_argument("--plain", action="store_true", help="화면 갱신 대신 바뀐 줄만 한 줄씩 출력")
+    args = parser.parse_args(argv)
+
+    if args.command in ("snapshot", "watch"):
+        sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+        unknown = [s for s in sources if s not in SNAPSHOT_SOURCES]
+        if unknown or not sources:
+            parser.error(f"unknown source: {', '.join(unknown) or '(none)'} (available: {', '.join(SNAPSHOT_SOURCES)})")
+        if args.command == "snapshot":
+            return run_snapshot(sources, args.format, args.limit)
+        intervals = {dataset: getattr(args, f"{dataset}_interval") for dataset in WATCH_DATASETS}
+        if any(interval <= 0 for interval in intervals.values()):
+            parser.error("intervals must be positive")
+        return run_watch(sources, args.limit, max(1, args.rows), intervals, args.duration, args.plain)
+
     try:
         main()
     except KeyboardInterrupt:
         print("\n  종료합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
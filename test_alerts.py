@@ -0,0 +1,180 @@
+"""
+알림 규칙 테스트 (업스트림 호출 없음)
+거래량 상위 N개 밖 종목의 규칙도 전체 종목 섹션 시세로 평가되고,
+시세 소스에 없는 종목의 규칙은 등록 시 거부되어야 합니다.
+가격 규칙은 돌파 시점에만, 조건 규칙은 거짓 → 참으로 바뀔 때만 한 번 알립니다.
+
+    python -m pytest -q test_alerts.py
+"""
+import asyncio
+import os
+from dataclasses import replace
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+from fastapi import HTTPException
+
+from backend import api_server
+from backend.services import alerts
+from backend.services.alerts import AlertEngine, Tick
+from backend.services.quotes import Quote
+from backend.services.snapshot import SnapshotCache
+
+TOP_N = 10
+
+
+def _quote(i: int, price: float) -> Quote:
+    return Quote("upbit", f"KRW-C{i:02d}", f"코인{i}", price, 1.0, 1000.0 - i, price * (1000.0 - i), price, price * (1000.0 - i))
+
+
+class FakeUpbit:
+    """업비트 전체 KRW 마켓 20개 (거래량 순). 상위 섹션에는 앞의 10개만 나옴"""
+
+    def __init__(self):
+        self.prices = {i: 100.0 for i in range(20)}
+
+    async def universe(self):
+        return [_quote(i, price) for i, price in self.prices.items()]
+
+    async def top(self):
+        return (await self.universe())[:TOP_N]
+
+
+@pytest.fixture
+def upbit(monkeypatch):
+    fake = FakeUpbit()
+    sections = dict(api_server.SECTIONS)
+    sections["upbit_universe"] = replace(sections["upbit_universe"], fetch=fake.universe, ttl=0)
+    sections["upbit_top_volume"] = replace(sections["upbit_top_volume"], fetch=fake.top, ttl=0)
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+    monkeypatch.setattr(api_server, "ALERTS", AlertEngine())
+    return fake
+
+
+def _create(symbol: str, kind: str = "price_above", value: float = 150.0) -> dict:
+    request = api_server.AlertRuleRequest(symbol=symbol, kind=kind, value=value)
+    return asyncio.run(api_server.create_alert_rule(request))
+
+
+def _refresh(*names: str) -> None:
+    async def run():
+        for name in names:
+            await api_server.get_section(name)
+    asyncio.run(run())
+
+
+def test_rule_outside_top_n_fires(upbit):
+    symbol = "upbit:KRW-C15"   # 15위, 거래량 상위 섹션에는 없음
+    rule = _create(symbol)
+    assert rule["tracked"] is True
+
+    _refresh("upbit_top_volume")
+    upbit.prices[15] = 160.0
+    _refresh("upbit_top_volume", "upbit_universe")
+
+    alerts = api_server.ALERTS.recent()
+    assert [(a.rule_id, a.symbol, a.observed) for a in alerts] == [(rule["id"], symbol, 160.0)]
+
+
+def test_untracked_symbol_is_rejected(upbit):
+    with pytest.raises(HTTPException) as error:
+        _create("upbit:KRW-NOPE")
+    assert error.value.status_code == 400
+    assert "not tracked" in error.value.detail
+    assert api_server.ALERTS.rules() == []
+
+
+def test_rule_list_reports_symbols_that_left_the_source(upbit):
+    _create("upbit:KRW-C19")
+    del upbit.prices[19]   # 상장 폐지
+    _refresh("upbit_universe")
+
+    rules = asyncio.run(api_server.list_alert_rules())
+    assert [(r["symbol"], r["tracked"]) for r in rules] == [("upbit:KRW-C19", False)]
+
+
+# --- 규칙 엔진 ---
+
+def _tick(price: float = 100.0, volume: float = 1000.0, change_rate: float = 0.0, symbol: str = "upbit:KRW-BTC") -> Tick:
+    return Tick(symbol, price, volume, change_rate)
+
+
+def test_price_rules_fire_on_crossing_only():
+    engine = AlertEngine()
+    above = engine.add_rule("upbit:KRW-BTC", "price_above", 150.0)
+    below = engine.add_rule("upbit:KRW-BTC", "price_below", 90.0)
+
+    assert engine.evaluate([_tick(160.0)]) == []         # 첫 시세는 돌파가 아님
+    assert engine.evaluate([_tick(100.0)]) == []
+    (alert,) = engine.evaluate([_tick(150.0)])
+    assert (alert.rule_id, alert.observed) == (above.id, 150.0)
+    assert engine.evaluate([_tick(155.0)]) == []         # 이미 위에 있음
+    assert [a.rule_id for a in engine.evaluate([_tick(80.0)])] == [below.id]
+
+
+def test_condition_rules_fire_once_per_episode():
+    engine = AlertEngine()
+    engine.add_rule("upbit:KRW-BTC", "change_rate", 5.0)
+    fired = [len(engine.evaluate([_tick(price, change_rate=rate)]))
+             for price, rate in ((1, 1.0), (2, 6.0), (3, -7.0), (4, 2.0), (5, 5.0))]
+    assert fired == [0, 1, 0, 0, 1]
+
+
+def test_condition_rule_is_checked_against_the_last_tick_on_creation():
+    engine = AlertEngine()
+    engine.evaluate([_tick(change_rate=-8.0)])
+    queue = engine.subscribe()
+    engine.add_rule("upbit:KRW-BTC", "change_rate", 5.0)
+    assert queue.get_nowait().observed == -8.0
+
+
+def test_volume_spike_waits_for_a_stable_average():
+    engine = AlertEngine()
+    engine.add_rule("upbit:KRW-BTC", "volume_spike", 3.0)
+    # 표본이 부족한 동안에는 급증해도 평가하지 않음 (거래량이 바뀐 시세만 표본)
+    assert engine.evaluate([_tick(price=1, volume=1000.0)]) == []
+    assert engine.evaluate([_tick(price=2, volume=9000.0)]) == []
+    for i in range(alerts.VOLUME_MIN_SAMPLES):
+        engine.evaluate([_tick(price=3 + i, volume=1000.0 + i)])
+    (alert,) = engine.evaluate([_tick(price=99, volume=10000.0)])
+    assert alert.kind == "volume_spike"
+    assert alert.observed > 3.0
+
+
+def test_unchanged_ticks_are_skipped():
+    engine = AlertEngine()
+    engine.add_rule("upbit:KRW-BTC", "change_rate", 5.0)
+    assert len(engine.evaluate([_tick(change_rate=6.0)])) == 1
+    engine.remove_rule(engine.rules()[0].id)
+    assert engine.evaluate([_tick(change_rate=6.0)]) == []
+    assert engine.watched_sources() == set()
+
+
+@pytest.mark.parametrize("symbol, kind, value", [
+    ("upbit:KRW-BTC", "price_cross", 1.0),
+    ("bithumb:BTC", "price_above", 1.0),
+    ("upbit:", "price_above", 1.0),
+    ("upbit:KRW-BTC", "price_above", 0.0),
+])
+def test_invalid_rules_are_rejected(symbol, kind, value):
+    with pytest.raises(ValueError):
+        AlertEngine().add_rule(symbol, kind, value)
+
+
+def test_slow_subscriber_drops_oldest_alerts(monkeypatch):
+    monkeypatch.setattr(alerts, "SUBSCRIBER_QUEUE", 2)
+    engine = AlertEngine()
+    queue = engine.subscribe()
+    engine.add_rule("upbit:KRW-BTC", "price_above", 150.0)
+    engine.evaluate([_tick(100.0)])
+    for _ in range(3):
+        engine.evaluate([_tick(100.0)])
+        engine.evaluate([_tick(200.0)])
+
+    assert [queue.get_nowait().id for _ in range(queue.qsize())] == [2, 3]
+    assert [a.id for a in engine.recent(after_id=1)] == [2, 3]
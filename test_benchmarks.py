@@ -0,0 +1,51 @@
+"""
+벤치마크 도구 테스트 (네트워크 없음)
+기록된 응답 라우터는 요청한 종목만 돌려주고 기록이 없는 경로는 None 이어야 하며,
+실행기는 기준선보다 tolerance 이상 느려진 케이스만 회귀로 표시해야 합니다.
+
+    python -m pytest -q test_benchmarks.py
+"""
+import json
+
+from benchmarks.run import Result, _percentile, _summarize, compare
+from benchmarks.upstream import route
+
+
+def test_route_filters_recorded_tickers():
+    response = route("api.upbit.com", "/v1/ticker", "markets=KRW-BTC,KRW-ETH")
+    assert response.status == 200
+    assert [t["market"] for t in json.loads(response.body)] == ["KRW-BTC", "KRW-ETH"]
+
+
+def test_route_mirrors_upstream_errors_and_unknown_paths():
+    assert route("api.upbit.com", "/v1/ticker", "markets=KRW-NOPE").status == 404
+    assert route("api.upbit.com", "/v1/unknown") is None
+    assert route("example.com", "/") is None
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert _percentile(values, 50) == 50.0
+    assert _percentile(values, 99) == 99.0
+    assert _percentile([], 99) == 0.0
+
+
+def test_summary_reports_milliseconds_and_throughput():
+    result = _summarize("case", [0.001, 0.002, 0.003, 0.004])
+    assert (result.p50_ms, result.p99_ms, result.mean_ms, result.throughput) == (2.0, 4.0, 2.5, 400.0)
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance(capsys):
+    baseline = {
+        "fast": {"p50_ms": 10.0, "p99_ms": 20.0},
+        "slow_p50": {"p50_ms": 10.0, "p99_ms": 20.0},
+        "slow_p99": {"p50_ms": 10.0, "p99_ms": 20.0},
+    }
+    results = [
+        Result("fast", 50, 12.0, 25.0, 12.0, 80.0),        # +20%, +25%
+        Result("slow_p50", 50, 14.0, 20.0, 14.0, 70.0),    # +40%
+        Result("slow_p99", 50, 10.0, 30.0, 10.0, 100.0),   # p99 +50%
+        Result("new_case", 50, 99.0, 99.0, 99.0, 10.0),    # 기준선 없음
+    ]
+    assert compare(results, baseline, tolerance=0.30) == ["slow_p50", "slow_p99"]
+    assert capsys.readouterr().out.count("REGRESSION") == 2
@@ -0,0 +1,114 @@
+"""
+서킷 브레이커 테스트 (업스트림 호출 없음)
+연속 실패가 임계값에 닿으면 open 으로 즉시 거절하고, 재시도 시각이 지나면 half-open 에서 시험 호출 하나만 통과시키며,
+시험 호출 결과에 따라 closed/open 으로 전환되어야 합니다. 데드라인 초과는 성공/실패로 세지 않습니다.
+
+    python -m pytest -q test_circuit.py
+"""
+import pytest
+
+from backend.services import circuit
+from backend.services.circuit import CLOSED, HALF_OPEN, OPEN, CircuitOpenError
+from backend.services.deadline import DeadlineExceeded
+
+UPSTREAM = "test_upstream"
+
+
+@pytest.fixture
+def breaker():
+    circuit.reset(UPSTREAM)
+    breaker = circuit.get_breaker(UPSTREAM)
+    breaker.failure_threshold = 2
+    breaker.reset_timeout = 30.0
+    yield breaker
+    circuit.reset(UPSTREAM)
+
+
+def _fail():
+    with pytest.raises(ConnectionError):
+        with circuit.guard(UPSTREAM):
+            raise ConnectionError("down")
+
+
+def _succeed():
+    with circuit.guard(UPSTREAM):
+        pass
+
+
+def _wait_reset(breaker):
+    breaker.opened_at -= breaker.reset_timeout
+
+
+def test_opens_after_consecutive_failures_and_rejects(breaker):
+    _fail()
+    assert breaker.state == CLOSED
+    _fail()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        _succeed()
+    assert not breaker.probe_due()
+
+
+def test_success_resets_the_failure_count(breaker):
+    _fail()
+    _succeed()
+    _fail()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_one_trial_then_closes(breaker):
+    _fail()
+    _fail()
+    _wait_reset(breaker)
+    assert UPSTREAM in circuit.due_for_probe()
+
+    with circuit.guard(UPSTREAM):
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):   # 시험 호출 중 다른 호출은 거절
+            circuit.before_call(UPSTREAM)
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_failed_trial_reopens(breaker):
+    _fail()
+    _fail()
+    _wait_reset(breaker)
+    _fail()                                     # 임계값과 무관하게 한 번에 open
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        _succeed()
+
+
+def test_deadline_releases_the_trial_without_a_verdict(breaker):
+    _fail()
+    _fail()
+    _wait_reset(breaker)
+    with pytest.raises(DeadlineExceeded):
+        with circuit.guard(UPSTREAM):
+            raise DeadlineExceeded("request budget spent")
+    assert breaker.state == HALF_OPEN
+    assert breaker.failures == 2
+
+    _succeed()                                  # 돌려받은 시험 호출 자리로 다시 시도
+    assert breaker.state == CLOSED
+
+
+def test_deadline_is_not_a_failure_when_closed(breaker):
+    for _ in range(3):
+        with pytest.raises(DeadlineExceeded):
+            with circuit.guard(UPSTREAM):
+                raise DeadlineExceeded("request budget spent")
+    assert (breaker.state, breaker.failures) == (CLOSED, 0)
+
+
+def test_degraded_since(breaker):
+    _fail()
+    started = breaker.last_failure_at
+    assert circuit.degraded_since([UPSTREAM], started)
+    assert not circuit.degraded_since([UPSTREAM], started + 1)
+
+
+def test_upstream_names_by_host():
+    assert circuit.upstream_for("https://polling.finance.naver.com/api/realtime") == "naver"
+    assert circuit.upstream_for("https://example.com/x") == "example.com"
@@ -0,0 +1,168 @@
+"""
+CLI 배치/실시간 출력 테스트 (업스트림 호출 없음)
+현재가 조회에 실패한 보유 코인(nan)은 JSON 에서는 null, CSV 에서는 빈 값, 텍스트에서는 "-" 로 표시되어야 합니다.
+snapshot 은 거래소 조회를 동시에 실행해 stdout 에는 데이터만 쓰고, 조회 실패가 있으면 종료 코드 1 을 반환합니다.
+watch 화면은 바뀐 줄만 다시 쓰고, 조회에 실패한 패널은 이전 내용을 유지해야 합니다.
+
+    python -m pytest -q test_cli.py
+"""
+import asyncio
+import io
+import json
+import math
+import time
+
+import pytest
+
+import main
+from backend.services.quotes import Quote
+
+UNKNOWN_PRICE_HOLDING = {
+    "coin": "XYZ", "total": 2.0, "avg_buy_price": 100.0, "current_price": math.nan,
+    "eval_amount": math.nan, "buy_amount": 200.0, "profit_loss": math.nan, "profit_loss_percent": math.nan,
+}
+RECORD = {"fetched_at": "2026-01-01T00:00:00+00:00", "source": "upbit", "dataset": "holdings",
+          "data": [UNKNOWN_PRICE_HOLDING]}
+
+
+def test_json_writer_emits_null_for_unknown_price():
+    out = io.StringIO()
+    main._JsonLinesWriter(out).write(RECORD)
+
+    line = out.getvalue()
+    assert "NaN" not in line
+    row = json.loads(line)["data"][0]
+    assert row["current_price"] is None
+    assert row["eval_amount"] is None
+    assert row["buy_amount"] == 200.0
+
+
+def test_csv_writer_emits_empty_value_for_unknown_price():
+    out = io.StringIO()
+    main._CsvWriter(out).write(RECORD)
+
+    values = {row.split(",")[4]: row.split(",")[5] for row in out.getvalue().splitlines()[1:]}
+    assert values["current_price"] == ""
+    assert values["eval_amount"] == ""
+    assert values["buy_amount"] == "200.0"
+
+
+def test_text_lines_show_dash_for_unknown_price():
+    (line,) = main._upbit_holdings_lines([UNKNOWN_PRICE_HOLDING])
+    assert "nan" not in line
+    assert line.split() == ["XYZ", "2.0000", "-", "-", "KRW", "-%"]
+
+
+# --- snapshot ---
+
+DELAY = 0.2
+
+
+def _coin(symbol: str) -> Quote:
+    return Quote("upbit", symbol, "비트코인", 1.0e8, 1.5, 10.0, 1.0e9, 1.0e8, 1.0e9)
+
+
+@pytest.fixture
+def exchanges(monkeypatch):
+    """거래소 서비스 대역. 각 조회는 DELAY 초 걸리고, down 에 넣은 조회는 None 을 반환"""
+    down = set()
+
+    def fake(name, value):
+        async def fetch(*args):
+            print(f"{name} called")              # 서비스 함수의 로그 출력
+            await asyncio.sleep(DELAY)
+            return None if name in down else value
+        return fetch
+
+    async def account(name, balance, holdings):
+        await asyncio.sleep(DELAY)
+        return (None, None) if name in down else (balance, holdings)
+
+    monkeypatch.setattr(main, "get_upbit_account", lambda: account("upbit_account", {"total_krw": 1.0}, []))
+    monkeypatch.setattr(main, "get_binance_account", lambda: account("binance_account", {"total_usdt": 1.0}, []))
+    monkeypatch.setattr(main, "get_upbit_top_volume_coins", fake("upbit_top", [_coin("KRW-BTC")]))
+    monkeypatch.setattr(main, "get_usdt_krw_rate", fake("usdt_krw", 1400.0))
+    monkeypatch.setattr(main, "get_binance_top_volume_coins", fake("binance_top", [_coin("BTCUSDT")]))
+    return down
+
+
+def test_snapshot_fetches_concurrently_and_writes_only_data(exchanges, capsys):
+    out = io.StringIO()
+    started = time.perf_counter()
+    assert main.run_snapshot(["upbit", "binance"], "json", limit=1, out=out) == 0
+    # 바이낸스 거래량 상위는 환율 → 시세 순서라 두 번, 나머지는 모두 동시에
+    assert time.perf_counter() - started < 3 * DELAY
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted((r["source"], r["dataset"]) for r in records) == [
+        ("binance", "balance"), ("binance", "holdings"), ("binance", "top_volume"),
+        ("upbit", "balance"), ("upbit", "holdings"), ("upbit", "top_volume"),
+    ]
+    top = next(r for r in records if (r["source"], r["dataset"]) == ("upbit", "top_volume"))
+    assert top["data"][0]["market"] == "KRW-BTC"
+    assert "called" in capsys.readouterr().err
+
+
+def test_snapshot_reports_failures_with_exit_code(exchanges, capsys):
+    exchanges.add("upbit_top")
+    out = io.StringIO()
+    assert main.run_snapshot(["upbit"], "csv", limit=1, out=out) == 1
+    assert out.getvalue().splitlines()[0] == ",".join(main.CSV_FIELDS)
+    assert "unavailable: upbit.top_volume" in capsys.readouterr().err
+
+
+def test_unknown_source_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as error:
+        main.cli(["snapshot", "--sources", "kraken"])
+    assert error.value.code == 2
+    assert "unknown source: kraken" in capsys.readouterr().err
+
+
+# --- watch ---
+
+PANELS = {("upbit", "balance"): ("업비트 잔액", 1), ("upbit", "holdings"): ("업비트 보유", 3)}
+
+
+def test_screen_rewrites_only_changed_lines():
+    out = io.StringIO()
+    screen = main.WatchScreen(PANELS, out, ansi=True)
+    key = ("upbit", "holdings")
+    assert screen.update(key, "보유", ["BTC 1", "ETH 2"]) == 3      # 제목 + 두 줄
+    assert screen.update(key, "보유", ["BTC 1", "ETH 3"]) == 1
+    assert out.getvalue().endswith(f"\x1b[6;1HETH 3\x1b[K\x1b[{screen.bottom};1H")   # 보유 패널 제목은 4행
+    assert screen.update(key, "보유", ["BTC 1", "ETH 3"]) == 0
+    assert screen.update(key, "보유", ["BTC 1"]) == 1               # 사라진 줄은 지움
+
+
+def test_screen_truncates_long_panels():
+    screen = main.WatchScreen(PANELS, io.StringIO(), ansi=False)
+    screen.update(("upbit", "holdings"), "보유", [f"C{i}" for i in range(5)])
+    assert screen.panels[("upbit", "holdings")].lines == ["C0", "C1", "... 외 3개"]
+
+
+def test_plain_output_writes_changed_lines_with_a_title():
+    out = io.StringIO()
+    screen = main.WatchScreen(PANELS, out, ansi=False)
+    screen.update(("upbit", "balance"), "잔액", ["1,000 KRW"])
+    screen.update(("upbit", "balance"), "잔액", ["1,000 KRW"])
+    (line,) = out.getvalue().splitlines()
+    assert line.endswith("[업비트 잔액] 1,000 KRW")
+    screen.close()
+    assert "\x1b" not in out.getvalue()
+
+
+def test_failed_fetch_keeps_previous_lines():
+    results = [["1,000 KRW"], None]
+
+    async def fetch():
+        return results.pop(0) if results else ["2,000 KRW"]
+
+    screen = main.WatchScreen({("upbit", "balance"): ("업비트 잔액", 1)}, io.StringIO(), ansi=False)
+    panels = {("upbit", "balance"): ("업비트 잔액", fetch, lambda lines: lines, 1)}
+    seen = []
+    update = screen.update
+    screen.update = lambda key, header, lines=None: seen.append((header, lines)) or update(key, header, lines)
+
+    asyncio.run(main.watch(screen, panels, {"balance": 0.05}, duration=0.12))
+    assert [lines for _, lines in seen[:3]] == [["1,000 KRW"], None, ["2,000 KRW"]]
+    assert "조회 실패" in seen[1][0]
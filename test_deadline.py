@@ -0,0 +1,91 @@
+"""
+데드라인 테스트 (업스트림 호출 없음)
+바깥 예산보다 긴 안쪽 예산은 바깥 예산에 묶이고, 남은 시간이 없으면 하위 호출 타임아웃/대기는
+시작하지 않고 DeadlineExceeded 를 내며, 데드라인은 익스큐터 워커 스레드까지 전달되어야 합니다.
+
+    python -m pytest -q test_deadline.py
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.services import deadline, executors
+from backend.services.deadline import DeadlineExceeded
+
+
+def test_without_a_budget_defaults_are_kept():
+    assert deadline.remaining() is None
+    assert deadline.timeout(5.0) == 5.0
+    assert deadline.share(0.5) is None
+    assert deadline.share(0.5, cap=2.0) == 2.0
+    deadline.check()
+    with deadline.budget(None):
+        assert deadline.remaining() is None
+
+
+def test_inner_budget_is_bounded_by_the_outer_one():
+    with deadline.budget(1.0):
+        with deadline.budget(60.0):
+            assert deadline.remaining() <= 1.0
+        with deadline.budget(60.0, detached=True):   # 공유 작업은 먼저 온 요청의 예산에 묶이지 않음
+            assert deadline.remaining() > 1.0
+        with deadline.budget(0.5):
+            assert deadline.remaining() <= 0.5
+        assert 0.5 < deadline.remaining() <= 1.0
+    assert deadline.remaining() is None
+
+
+def test_timeout_and_share_use_the_remaining_time():
+    with deadline.budget(1.0):
+        assert deadline.timeout(10.0) <= 1.0
+        assert deadline.timeout(0.1) == 0.1
+        assert 0.4 < deadline.share(0.5) <= 0.5
+        assert deadline.share(0.5, cap=0.2) == 0.2
+
+
+def test_spent_budget_raises_deadline_exceeded():
+    with deadline.budget(0.01):
+        time.sleep(0.02)
+        assert deadline.expired()
+        assert deadline.share(0.5) == 0.0              # 음수 시간을 나눠 주지 않음
+        with pytest.raises(DeadlineExceeded):
+            deadline.timeout(5.0)
+        with pytest.raises(DeadlineExceeded):
+            deadline.check()
+    assert issubclass(DeadlineExceeded, TimeoutError)
+
+
+def test_wait_cancels_slow_work():
+    started = []
+
+    async def slow():
+        started.append(True)
+        await asyncio.sleep(1.0)
+
+    async def scenario():
+        with deadline.budget(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await deadline.wait(slow())
+            assert started == [True]
+            await asyncio.sleep(0.06)
+            with pytest.raises(DeadlineExceeded):    # 이미 지났으면 시작하지 않음
+                await deadline.wait(slow())
+            assert started == [True]
+        assert await deadline.wait(asyncio.sleep(0, "done")) == "done"
+
+    asyncio.run(scenario())
+
+
+def test_deadline_reaches_executor_threads():
+    async def scenario():
+        with deadline.budget(1.0):
+            left = await executors.run(executors.STORAGE, deadline.remaining)
+        assert left is not None and 0 < left <= 1.0
+        with deadline.budget(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await executors.run(executors.STORAGE, time.sleep, 0.5)
+            with pytest.raises(DeadlineExceeded):    # 지난 뒤에는 제출하지 않음
+                await executors.run(executors.STORAGE, deadline.remaining)
+
+    asyncio.run(scenario())
@@ -0,0 +1,200 @@
+"""
+순위 섹션 변경분 테스트 (업스트림 호출 없음)
+연속된 순위 스냅샷의 추가/변경/제외/순위 변경을 종목 키로 찾고, since 버전 이후 변경분만 돌려주며,
+조회 실패는 모든 행을 지우는 delta 가 아닌 마지막 스냅샷(stale)으로 처리되어야 합니다.
+
+    python -m pytest -q test_deltas.py
+"""
+import asyncio
+import math
+import os
+from dataclasses import replace
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+
+from backend import api_server
+from backend.services.alerts import AlertEngine
+from backend.services.deltas import DeltaBook, diff_rows
+from backend.services.quotes import Quote
+from backend.services.shared_cache import FileBackend
+from backend.services.snapshot import SnapshotCache
+
+SECTION = "upbit_top_volume"
+
+
+def _row(code: str, price: float) -> dict:
+    return {"symbol": code, "price": price}
+
+
+def _rows(*pairs) -> list:
+    return [_row(code, price) for code, price in pairs]
+
+
+def test_diff_rows_finds_inserts_updates_removals_and_ranks():
+    previous = _rows(("A", 1.0), ("B", 2.0), ("C", 3.0))
+    index = {"A": 0, "B": 1, "C": 2}
+    rows = _rows(("B", 2.5), ("A", 1.0), ("D", 4.0))
+
+    inserted, updated, removed, ranks, new_index = diff_rows("symbol", previous, index, rows)
+    assert inserted == [_row("D", 4.0)]
+    assert updated == {"B": {"price": 2.5}}
+    assert removed == ["C"]
+    assert ranks == {"B": 0, "A": 1, "D": 2}
+    assert new_index == {"B": 0, "A": 1, "D": 2}
+
+
+def test_diff_rows_treats_nan_as_unchanged():
+    previous = [{"symbol": "A", "price_krw": math.nan}]
+    rows = [{"symbol": "A", "price_krw": math.nan}]
+    assert diff_rows("symbol", previous, {"A": 0}, rows) == ([], {}, [], {}, {"A": 0})
+
+
+def test_unchanged_rows_keep_the_version():
+    book = DeltaBook({SECTION: "symbol"})
+    first = book.update(SECTION, _rows(("A", 1.0)))
+    assert first.base_version == 0
+    assert book.update(SECTION, _rows(("A", 1.0))) is None
+    assert book.current(SECTION)[0] == first.version
+
+
+def test_since_returns_only_newer_deltas_within_history():
+    book = DeltaBook({SECTION: "symbol"}, history=2)
+    versions = [0]
+    for price in (1.0, 2.0, 3.0):
+        versions.append(book.update(SECTION, _rows(("A", price))).version)
+
+    assert book.since(SECTION, versions[3]) == []
+    assert [d.version for d in book.since(SECTION, versions[1])] == versions[2:]
+    assert book.since(SECTION, versions[0]) is None        # 보관 범위 밖
+    assert book.since(SECTION, versions[3] + 1) is None    # 모르는(미래) 버전
+
+
+def test_failed_update_is_ignored():
+    book = DeltaBook({SECTION: "symbol"})
+    delta = book.update(SECTION, _rows(("A", 1.0)))
+    assert book.update(SECTION, None) is None
+    assert book.update(SECTION, []) is None
+    assert book.current(SECTION) == (delta.version, _rows(("A", 1.0)))
+
+
+# --- 섹션 생성 경로 ---
+
+def _quote(i: int, price: float) -> Quote:
+    return Quote("upbit", f"KRW-C{i:02d}", f"코인{i}", price, 1.0, 1000.0 - i, price * (1000.0 - i), price, price * (1000.0 - i))
+
+
+class FakeUpbit:
+    def __init__(self):
+        self.prices = {i: 100.0 for i in range(5)}
+        self.down = False
+
+    async def top(self):
+        if self.down:
+            return None
+        return [_quote(i, price) for i, price in self.prices.items()]
+
+
+@pytest.fixture
+def upbit(monkeypatch):
+    fake = FakeUpbit()
+    sections = dict(api_server.SECTIONS)
+    sections[SECTION] = replace(sections[SECTION], fetch=fake.top, ttl=0)
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+    monkeypatch.setattr(api_server, "ALERTS", AlertEngine())
+    monkeypatch.setattr(api_server, "DELTAS", DeltaBook({SECTION: "market"}))
+    return fake
+
+
+def _produce():
+    return asyncio.run(api_server.get_section(SECTION))
+
+
+def test_failed_fetch_serves_last_snapshot_without_a_delta(upbit):
+    first = _produce()
+    version, rows = api_server.DELTAS.current(SECTION)
+
+    upbit.down = True
+    snapshot = _produce()
+    assert snapshot.stale
+    assert snapshot.body == first.body
+    assert api_server.DELTAS.current(SECTION) == (version, rows)
+
+    upbit.down = False
+    upbit.prices[2] = 120.0
+    _produce()
+    (delta,) = api_server.DELTAS.since(SECTION, version)
+    assert (delta.inserted, delta.removed, list(delta.updated)) == ([], [], ["KRW-C02"])
+
+
+# --- 멀티 워커 (공유 저장소) ---
+
+class Worker:
+    """공유 저장소 하나를 함께 쓰는 uvicorn 워커 한 개 (스냅샷 캐시와 DeltaBook 은 워커별)"""
+
+    def __init__(self, backend, fetch, ttl: float):
+        self.snapshots = SnapshotCache(backend=backend)
+        self.deltas = DeltaBook({SECTION: "market"})
+        self.sections = dict(api_server.SECTIONS)
+        self.sections[SECTION] = replace(self.sections[SECTION], fetch=fetch, ttl=ttl)
+
+    def run(self, monkeypatch, coroutine_fn):
+        monkeypatch.setattr(api_server, "SECTIONS", self.sections)
+        monkeypatch.setattr(api_server, "SNAPSHOTS", self.snapshots)
+        monkeypatch.setattr(api_server, "DELTAS", self.deltas)
+        return asyncio.run(coroutine_fn())
+
+
+def _fields(delta):
+    return delta.version, delta.base_version, delta.inserted, delta.updated, delta.removed, delta.ranks
+
+
+def test_follower_serves_the_leaders_versions(upbit, monkeypatch, tmp_path):
+    backend = FileBackend(str(tmp_path))
+
+    async def not_called():
+        raise AssertionError("follower must read the shared snapshot")
+
+    leader = Worker(backend, upbit.top, ttl=0)
+    follower = Worker(backend, not_called, ttl=60)
+    produce = lambda: api_server.get_section(SECTION)
+    sync = lambda: api_server._synced_section(SECTION)
+
+    leader.run(monkeypatch, produce)
+    v1 = leader.deltas.current(SECTION)[0]
+    queue = follower.deltas.subscribe([SECTION])
+    follower.run(monkeypatch, sync)
+    assert follower.deltas.current(SECTION)[0] == v1
+
+    upbit.prices[3] = 150.0
+    leader.run(monkeypatch, produce)
+    v2 = leader.deltas.current(SECTION)[0]
+    follower.snapshots.clear()   # 팔로워의 로컬 사본 TTL 경과
+    follower.run(monkeypatch, sync)
+
+    # 팔로워 구독자도 리더와 같은 버전/내용의 delta 를 받음
+    published = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [(d.base_version, d.version) for d in published] == [(0, v1), (v1, v2)]
+    assert [_fields(d) for d in follower.deltas.since(SECTION, v1)] == \
+        [_fields(d) for d in leader.deltas.since(SECTION, v1)]
+    assert list(published[1].updated) == ["KRW-C03"]
+
+
+def test_new_leader_continues_from_the_shared_version(upbit, monkeypatch, tmp_path):
+    backend = FileBackend(str(tmp_path))
+    old_leader = Worker(backend, upbit.top, ttl=0)
+    old_leader.run(monkeypatch, lambda: api_server.get_section(SECTION))
+    shared = old_leader.deltas.current(SECTION)[0]
+
+    # 리더가 바뀐 뒤 새 리더(빈 DeltaBook)가 생성: 버전이 뒤로 가지 않고 바뀐 행만 delta 로 기록
+    upbit.prices[1] = 80.0
+    new_leader = Worker(backend, upbit.top, ttl=0)
+    snapshot = new_leader.run(monkeypatch, lambda: api_server.get_section(SECTION))
+    (delta,) = new_leader.deltas.since(SECTION, shared)
+    assert snapshot.version == delta.version > shared
+    assert (delta.inserted, delta.removed, list(delta.updated)) == ([], [], ["KRW-C01"])
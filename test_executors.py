@@ -0,0 +1,79 @@
+"""
+익스큐터 테스트 (업스트림 호출 없음)
+데드라인 초과로 기다림을 그만둔 뒤에도 워커를 점유 중인 작업은 실행 중인 작업 수(대기열 깊이)에 남아야 하고,
+대기열에서 시작하지 못한 작업은 취소되어야 합니다.
+
+    python -m pytest -q test_executors.py
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services import deadline, executors
+
+KIND = executors.STORAGE
+
+
+@pytest.fixture
+def single_worker(monkeypatch):
+    monkeypatch.setenv("EXECUTOR_STORAGE_WORKERS", "1")
+    monkeypatch.setattr(executors, "_executors", {})
+    monkeypatch.setattr(executors, "_inflight", {})
+    release = threading.Event()
+    yield release
+    release.set()
+    executors.get_executor(KIND).shutdown(wait=True)
+
+
+def _wait_for_idle(timeout: float = 2.0) -> None:
+    # 완료 콜백은 워커 스레드에서 호출되므로 잠시 기다림
+    limit = time.monotonic() + timeout
+    while executors._inflight[KIND] and time.monotonic() < limit:
+        time.sleep(0.01)
+
+
+def test_running_work_stays_inflight_after_deadline(single_worker):
+    release = single_worker
+
+    async def scenario():
+        with deadline.budget(0.05):
+            with pytest.raises(deadline.DeadlineExceeded):
+                await executors.run(KIND, release.wait)
+
+    asyncio.run(scenario())
+    assert executors._inflight[KIND] == 1   # 호출자는 포기했지만 워커는 아직 실행 중
+    release.set()
+    _wait_for_idle()
+    assert executors._inflight[KIND] == 0
+
+
+def test_queued_work_is_cancelled_after_deadline(single_worker):
+    release = single_worker
+    ran = []
+
+    async def scenario():
+        blocker = asyncio.ensure_future(executors.run(KIND, release.wait))
+        await asyncio.sleep(0.05)
+        with deadline.budget(0.05):
+            with pytest.raises(deadline.DeadlineExceeded):
+                await executors.run(KIND, ran.append, "queued")
+        assert executors._inflight[KIND] == 1   # 취소된 작업은 바로 빠지고 실행 중인 작업만 남음
+        release.set()
+        await blocker
+
+    asyncio.run(scenario())
+    _wait_for_idle()
+    assert executors._inflight[KIND] == 0
+    assert ran == []
+
+
+def test_worker_error_is_raised_to_caller(single_worker):
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(executors.run(KIND, fail))
+    _wait_for_idle()
+    assert executors._inflight[KIND] == 0
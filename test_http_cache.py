@@ -0,0 +1,110 @@
+"""
+조건부 응답/압축 테스트 (업스트림 호출 없음)
+Accept-Encoding 협상(q=0 제외), 압축 본문의 ETag 별 재사용, 표현별 ETag 와 304,
+?sections= 선택과 Cache-Control max-age 를 확인합니다.
+
+    python -m pytest -q test_http_cache.py
+"""
+import asyncio
+import gzip
+import json
+import os
+import time
+from dataclasses import replace
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from starlette.requests import Request
+
+from backend import api_server
+from backend.services import snapshot as snapshot_module
+from backend.services.snapshot import EncodedBodyCache, SnapshotCache, make_snapshot, negotiate_encoding
+
+
+def _request(headers=()):
+    return Request({"type": "http", "method": "GET", "query_string": b"",
+                    "headers": [(k.encode(), v.encode()) for k, v in headers]})
+
+
+def test_negotiate_encoding(monkeypatch):
+    monkeypatch.setattr(snapshot_module, "brotli", None)
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, br") is None
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("*, gzip;q=0") is None
+    assert negotiate_encoding("GZIP;q=bad") is None
+
+
+def test_encoded_bodies_are_compressed_once_per_etag(monkeypatch):
+    calls = []
+    monkeypatch.setattr(snapshot_module, "compress", lambda body, encoding: calls.append(body) or body[::-1])
+    cache = EncodedBodyCache(max_entries=1)
+    assert cache.get('"a"', b"abc", "gzip") == b"cba"
+    assert cache.get('"a"', b"abc", "gzip") == b"cba"
+    cache.get('"b"', b"xyz", "gzip")
+    cache.get('"a"', b"abc", "gzip")             # 최대 개수를 넘어 제거된 뒤 다시 압축
+    assert calls == [b"abc", b"xyz", b"abc"]
+
+
+def test_large_body_is_compressed_with_its_own_etag(monkeypatch):
+    monkeypatch.setattr(api_server, "ENCODED_BODIES", EncodedBodyCache())
+    body = json.dumps([{"i": i} for i in range(200)]).encode()
+    response = api_server._snapshot_response(_request([("accept-encoding", "gzip")]), body, '"abc"', 5)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"abc-gzip"'
+    assert response.headers["cache-control"] == "private, max-age=5"
+    assert gzip.decompress(response.body) == body
+
+    # 압축 표현의 ETag 로 재검증해도 304
+    revalidated = api_server._snapshot_response(
+        _request([("accept-encoding", "gzip"), ("if-none-match", '"abc-gzip"')]), body, '"abc"', 5)
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == '"abc-gzip"'
+
+
+def test_small_body_is_sent_uncompressed():
+    response = api_server._snapshot_response(_request([("accept-encoding", "gzip")]), b"[]", '"abc"', 5)
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+    assert api_server._snapshot_response(_request([("if-none-match", 'W/"abc"')]), b"[]", '"abc"', 5).status_code == 304
+
+
+# --- ?sections= ---
+
+@pytest.fixture
+def sections(monkeypatch):
+    async def nothing():
+        return None
+
+    patched = dict(api_server.SECTIONS)
+    for name in api_server.DASHBOARD_SECTIONS:
+        patched[name] = replace(patched[name], fetch=nothing, present=None)
+    monkeypatch.setattr(api_server, "SECTIONS", patched)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+
+
+def test_sections_query_selects_fields_in_fixed_order(sections):
+    response = asyncio.run(api_server.dashboard(_request(), sections="whale_alerts, fear_greed"))
+    assert list(json.loads(response.body)) == ["fear_greed", "whale_alerts", "last_updated"]
+    # 가장 먼저 만료되는 섹션(whale_alerts, 5초) 기준
+    assert response.headers["cache-control"] in ("private, max-age=4", "private, max-age=5")
+
+
+def test_unknown_section_is_400(sections):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(api_server.dashboard(_request(), sections="fear_greed,nope"))
+    assert error.value.status_code == 400
+    assert "nope" in error.value.detail
+
+
+def test_max_age_counts_down_from_the_last_check():
+    snapshot = replace(make_snapshot("x", 1, TypeAdapter(int)), created_at=time.time() - 20)
+    assert api_server._max_age([snapshot], [60]) in (39, 40)
+    assert api_server._max_age([snapshot], [10]) == 0
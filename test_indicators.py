@@ -0,0 +1,111 @@
+"""
+기술 지표 테스트 (업스트림 호출 없음)
+봉마다 차이만 반영하는 MA/볼린저/VWAP/RSI 는 같은 봉 전체로 다시 계산한 값과 같아야 하고(큰 가격 포함),
+저장된 봉으로 복원한 상태는 실시간으로 쌓은 상태와 같아야 합니다.
+
+    python -m pytest -q test_indicators.py
+"""
+import random
+
+import numpy as np
+import pytest
+
+from backend.services.indicators import BOLLINGER_K, RSI_PERIOD, WINDOW, BarStore, IndicatorEngine
+
+BAR = 60
+T0 = 1_700_000_040   # 봉 경계
+
+
+def _reference(closes, volumes) -> dict:
+    """전체 봉으로 직접 계산한 지표"""
+    window = np.array(closes[-WINDOW:])
+    vols = np.array(volumes[-WINDOW:])
+    deltas = np.diff(closes)
+    gain, loss = np.maximum(deltas, 0), np.maximum(-deltas, 0)
+    avg_gain, avg_loss = gain[:RSI_PERIOD].mean(), loss[:RSI_PERIOD].mean()
+    for g, l in zip(gain[RSI_PERIOD:], loss[RSI_PERIOD:]):
+        avg_gain += (g - avg_gain) / RSI_PERIOD
+        avg_loss += (l - avg_loss) / RSI_PERIOD
+    return {
+        "ma": window.mean(),
+        "bollinger_upper": window.mean() + BOLLINGER_K * window.std(),
+        "bollinger_lower": window.mean() - BOLLINGER_K * window.std(),
+        "vwap": (window * vols).sum() / vols.sum(),
+        "rsi": 100 - 100 / (1 + avg_gain / avg_loss),
+    }
+
+
+def _series(base: float, n: int, seed: int):
+    rng = random.Random(seed)
+    closes, volumes = [], []
+    price = base
+    for _ in range(n):
+        price *= rng.uniform(0.99, 1.01)
+        closes.append(price)
+        volumes.append(rng.uniform(1, 100))
+    return closes, volumes
+
+
+@pytest.mark.parametrize("base", [0.0123, 150.0, 140_000_000.0])
+def test_incremental_indicators_match_full_recompute(base):
+    closes, volumes = _series(base, 3 * WINDOW + 7, seed=int(base) + 1)
+    engine = IndicatorEngine(BAR)
+    rows = engine.rows_for(["upbit:KRW-BTC"])
+    for i, (close, volume) in enumerate(zip(closes, volumes)):
+        engine._push(rows, np.array([close]), np.array([volume]))
+        if i + 1 > RSI_PERIOD and i + 1 >= WINDOW:
+            (values,) = engine.values(rows)
+            expected = _reference(closes[:i + 1], volumes[:i + 1])
+            for name, value in expected.items():
+                assert values[name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_partial_window_reports_only_ready_indicators():
+    engine = IndicatorEngine(BAR)
+    rows = engine.rows_for(["a", "b"])
+    assert engine.values(rows) == [None, None]
+    engine._push(rows[:1], np.array([100.0]), np.array([2.0]))
+    (a, b) = engine.values(rows)
+    assert (a["ma"], a["rsi"], a["vwap"], a["bars"]) == (None, None, 100.0, 1)
+    assert b is None
+
+
+def test_observe_builds_bars_from_cumulative_volume():
+    engine = IndicatorEngine(BAR)
+    keys = ["upbit:KRW-BTC", "upbit:KRW-ETH"]
+    engine.observe(keys, np.array([100.0, 10.0]), np.array([1000.0, 500.0]), now=T0)
+    engine.observe(keys, np.array([101.0, 11.0]), np.array([1010.0, 520.0]), now=T0 + 30)
+    assert engine.drain_closed() == []
+    # 다음 봉: 이전 봉이 닫힘. 누적 거래량이 줄어든 경우(일 초기화)는 0
+    engine.observe(keys, np.array([102.0, 12.0]), np.array([1015.0, 5.0]), now=T0 + BAR)
+    assert engine.drain_closed() == [("upbit:KRW-BTC", T0, 101.0, 10.0), ("upbit:KRW-ETH", T0, 11.0, 20.0)]
+    engine.observe(keys, np.array([103.0, 13.0]), np.array([1016.0, 6.0]), now=T0 + 2 * BAR)
+    assert [bar[3] for bar in engine.drain_closed()] == [5.0, 0.0]
+
+
+def test_restored_state_matches_live_state(tmp_path):
+    live = IndicatorEngine(BAR)
+    store = BarStore(str(tmp_path / "bars.sqlite3"), BAR)
+    series = {key: _series(base, 40, seed) for seed, (key, base) in
+              enumerate((("upbit:KRW-BTC", 1.4e8), ("naver:005930", 70_000.0), ("yahoo:NVDA", 120.0)))}
+    for i in range(40):
+        # 늦게 상장된 종목은 봉 수가 다름
+        keys = [key for key in series if i >= 10 or key != "yahoo:NVDA"]
+        rows = live.rows_for(keys)
+        live._push(rows, np.array([series[k][0][i] for k in keys]), np.array([series[k][1][i] for k in keys]))
+        store.append([(k, T0 + i * BAR, series[k][0][i], series[k][1][i]) for k in keys])
+
+    restored = IndicatorEngine(BAR)
+    assert restored.load(store.recent(now=T0 + 40 * BAR)) == 3
+    keys = list(series)
+    for got, expected in zip(restored.values(restored.rows_for(keys)), live.values(live.rows_for(keys))):
+        assert got == pytest.approx(expected, rel=1e-9)
+    store.close()
+
+
+def test_store_returns_recent_bars_per_key(tmp_path):
+    store = BarStore(str(tmp_path / "bars.sqlite3"), BAR)
+    store.append([("a", T0 + i * BAR, float(i), 1.0) for i in range(5)] + [("b", T0, 9.0, 1.0)])
+    assert store.recent(limit=2, now=T0 + 5 * BAR) == [("a", T0 + 3 * BAR, 3.0, 1.0), ("a", T0 + 4 * BAR, 4.0, 1.0)]
+    assert [bar[0] for bar in store.recent(limit=10, now=T0 + 5 * BAR)] == ["a"] * 5 + ["b"]
+    store.close()
@@ -0,0 +1,56 @@
+"""
+지연 import 테스트
+서버/CLI 모듈을 불러올 때는 무거운 외부 라이브러리를 import 하지 않고, 첫 속성 접근이나 warm_up 시점에만 import 해야 합니다.
+
+    python -m pytest -q test_lazy.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from backend.services import lazy
+
+HEAVY = ("pandas", "yfinance", "pyupbit", "binance", "bs4")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(lazy, "_MODULES", {})
+    return lazy._MODULES
+
+
+def test_module_is_imported_on_first_attribute_access(registry):
+    module = lazy.lazy_import("json")
+    assert lazy.lazy_import("json") is module
+    assert not module.loaded
+    assert module.dumps([1]) == "[1]"
+    assert module.loaded
+    assert "loaded" in repr(module)
+
+
+def test_warm_up_loads_registered_modules_and_skips_missing(registry, capsys):
+    lazy.lazy_import("json")
+    lazy.lazy_import("no_such_module_for_lazy_test")
+    elapsed = lazy.warm_up()
+    assert list(elapsed) == ["json"]
+    assert "no_such_module_for_lazy_test" in capsys.readouterr().out
+    assert lazy.warm_up() == {}                  # 이미 불러온 모듈은 다시 측정하지 않음
+
+
+def test_missing_module_fails_on_use(registry):
+    module = lazy.lazy_import("no_such_module_for_lazy_test")
+    with pytest.raises(ImportError):
+        module.anything
+
+
+@pytest.mark.parametrize("entry", ["main", "backend.api_server"])
+def test_entry_points_do_not_import_heavy_libraries(entry):
+    code = f"import sys, {entry}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    env = dict(os.environ, SECTION_REFRESH="0", PORTFOLIO_HISTORY_INTERVAL="0", WHALE_POLL_INTERVAL="0",
+               INDICATOR_BAR_DB="")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, timeout=120,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
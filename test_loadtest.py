@@ -0,0 +1,71 @@
+"""
+부하 테스트 도구 테스트 (루프백만 사용)
+로컬 대체 업스트림은 /<호스트>/<경로> 요청을 기록된 응답으로 돌려주고 호스트별 장애를 주입하며,
+부하 단계는 목표 RPS 미달/오류율/p99 SLO 초과 시 포화로 판정해야 합니다.
+
+    python -m pytest -q test_loadtest.py
+"""
+import asyncio
+import json
+
+import pytest
+
+from benchmarks import fake_upstream
+from benchmarks.loadtest import StepResult, _percentile, http_get, is_saturated
+
+
+@pytest.fixture
+def upstream():
+    faults = fake_upstream.FaultConfig(
+        fake_upstream.Fault(),
+        fake_upstream._parse_host_faults(["api.alternative.me:error_rate=1.0,error_status=503"], fake_upstream.Fault()),
+    )
+    server = fake_upstream.start_in_thread(0, faults)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path: str):
+    return asyncio.run(http_get("127.0.0.1", server.server_address[1], path, timeout=5))
+
+
+def test_routes_recorded_responses(upstream):
+    status, body = _get(upstream, "/api.upbit.com/v1/ticker?markets=KRW-BTC")
+    assert status == 200
+    assert [t["market"] for t in json.loads(body)] == ["KRW-BTC"]
+    assert upstream.RequestHandlerClass.stats["api.upbit.com:ok"] == 1
+
+
+def test_unknown_upstream_and_missing_fixture_are_404(upstream):
+    assert _get(upstream, "/example.com/")[0] == 404
+    assert _get(upstream, "/api.upbit.com/v1/unknown")[0] == 404
+    assert upstream.RequestHandlerClass.stats["api.upbit.com:missing"] == 1
+
+
+def test_per_host_fault_injection(upstream):
+    assert _get(upstream, "/api.alternative.me/fng/")[0] == 503
+    assert upstream.RequestHandlerClass.stats["api.alternative.me:error"] == 1
+
+
+def test_host_fault_spec_overrides_only_given_fields():
+    base = fake_upstream.Fault(latency_ms=50.0, jitter_ms=20.0)
+    (fault,) = fake_upstream._parse_host_faults(["finance.naver.com:latency_ms=300,error_rate=0.1"], base).values()
+    assert (fault.latency_ms, fault.jitter_ms, fault.error_rate) == (300.0, 20.0, 0.1)
+    assert base.latency_ms == 50.0
+
+
+def _step(achieved_rps=10.0, errors=0, timeouts=0, p99_ms=100.0) -> StepResult:
+    return StepResult("dashboard", 10.0, achieved_rps, 100, errors, timeouts, 50.0, p99_ms, 4, 0.0)
+
+
+def test_saturation_criteria():
+    assert not is_saturated(_step(), slo_ms=500)
+    assert is_saturated(_step(achieved_rps=8.9), slo_ms=500)
+    assert is_saturated(_step(errors=1, timeouts=1), slo_ms=500)
+    assert is_saturated(_step(p99_ms=501.0), slo_ms=500)
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert (_percentile(values, 50), _percentile(values, 99)) == (50.0, 99.0)
@@ -0,0 +1,89 @@
+"""
+장 운영 시간 테스트 (시스템 시계와 무관)
+장중과 마감 확정(마감 + 유예) 전에는 기본 TTL, 확정 뒤에는 확정 이후 경과 시간(최대 MARKET_CLOSED_TTL)을 TTL 로 사용해
+휴장일/주말에도 마감 뒤 받은 스냅샷이 다음 개장 전까지 다시 조회되지 않아야 합니다.
+
+    python -m pytest -q test_market_hours.py
+"""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from backend.services import market_hours
+from backend.services.market_hours import KRX, US, MarketCalendar
+
+TTL = 30.0
+KST = ZoneInfo("Asia/Seoul")
+
+
+def _kst(*args) -> float:
+    return datetime(*args, tzinfo=KST).timestamp()
+
+
+@pytest.fixture(autouse=True)
+def calendars(monkeypatch):
+    monkeypatch.setattr(market_hours, "ENABLED", True)
+    monkeypatch.setattr(market_hours, "CLOSE_GRACE", 600.0)
+    monkeypatch.setattr(market_hours, "CLOSED_TTL", 3600.0)
+    monkeypatch.setattr(market_hours, "CALENDARS", {
+        # 2025-10-03 개천절(금), 2025-11-13 수능일 10:00-16:30
+        KRX: MarketCalendar(KRX, "Asia/Seoul", "09:00", "15:30", ["2025-10-03"],
+                            {"2025-11-13": ["10:00", "16:30"]}),
+        US: MarketCalendar(US, "America/New_York", "09:30", "16:00"),
+    })
+
+
+def _ttl(now: float, markets=(KRX,)) -> float:
+    return market_hours.section_ttl(markets, TTL, now)
+
+
+def test_open_market_uses_the_base_ttl():
+    assert _ttl(_kst(2025, 10, 2, 9, 0)) == TTL
+    assert _ttl(_kst(2025, 10, 2, 15, 35)) == TTL      # 마감 후 유예 중 (종가 확정 전)
+
+
+def test_after_close_ttl_grows_from_the_settlement():
+    settled = _kst(2025, 10, 2, 15, 40)
+    assert _ttl(settled + 10) == TTL                   # 확정 직후는 기본 TTL 보다 짧지 않음
+    assert _ttl(settled + 900) == 900
+    assert _ttl(_kst(2025, 10, 2, 23, 0)) == 3600      # MARKET_CLOSED_TTL 상한
+
+
+def test_holiday_and_weekend_keep_the_previous_close(monkeypatch):
+    monkeypatch.setattr(market_hours, "CLOSED_TTL", 0.0)
+    settled = _kst(2025, 10, 2, 15, 40)                # 목요일 마감
+    for now in (_kst(2025, 10, 3, 10, 0), _kst(2025, 10, 5, 12, 0), _kst(2025, 10, 6, 8, 59)):
+        # 확정 뒤 받은 스냅샷(나이 < now - settled)은 다음 개장까지 만료되지 않음
+        assert _ttl(now) == now - settled
+    assert _ttl(_kst(2025, 10, 6, 9, 0)) == TTL       # 월요일 개장
+
+
+def test_special_sessions_shift_open_and_close():
+    assert _ttl(_kst(2025, 11, 13, 9, 30)) > TTL       # 수능일은 10시 개장
+    assert _ttl(_kst(2025, 11, 13, 16, 0)) == TTL
+    assert _ttl(_kst(2025, 11, 13, 16, 35)) == TTL     # 16:30 마감 + 유예
+    assert _ttl(_kst(2025, 11, 13, 17, 0)) == 1200
+
+
+def test_any_open_market_keeps_the_base_ttl():
+    krx_closed_us_open = _kst(2025, 10, 2, 23, 0)      # 뉴욕 10:00
+    assert _ttl(krx_closed_us_open, (KRX,)) == 3600
+    assert _ttl(krx_closed_us_open, (KRX, US)) == TTL
+    assert market_hours.is_closed((KRX,), krx_closed_us_open)
+    assert not market_hours.is_closed((KRX, US), krx_closed_us_open)
+
+
+def test_sections_without_calendars_use_the_base_ttl(monkeypatch):
+    closed = _kst(2025, 10, 3, 10, 0)
+    assert _ttl(closed, ()) == TTL                      # 암호화폐/환율
+    assert _ttl(closed, ("lse",)) == TTL                # 달력 없음
+    assert not market_hours.is_closed((), closed)
+    monkeypatch.setattr(market_hours, "ENABLED", False)
+    assert _ttl(closed) == TTL
+
+
+def test_calendar_file_loads():
+    calendars = market_hours.load_calendars()
+    assert {KRX, US} <= set(calendars)
+    assert market_hours.load_calendars("/nonexistent/market_calendar.json") == {}
@@ -0,0 +1,85 @@
+"""
+메트릭 테스트 (업스트림 호출 없음)
+히스토그램은 누적 버킷으로 렌더링되고, instrument 는 서비스 함수의 결과(ok/empty/error)와
+업스트림 응답 바이트(중첩 호출은 바깥 호출에도 합산)를 기록해야 합니다.
+
+    python -m pytest -q test_metrics.py
+"""
+import pytest
+
+from backend.services import metrics
+
+
+def _sample(metric, line_prefix: str) -> float:
+    (line,) = [line for line in metric.samples() if line.startswith(line_prefix + " ")]
+    return float(line.rsplit(" ", 1)[1])
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("test_latency_seconds", "test", ["source"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, source="a")
+
+    assert histogram.samples() == [
+        'test_latency_seconds_bucket{source="a",le="0.1"} 1',
+        'test_latency_seconds_bucket{source="a",le="1"} 3',
+        'test_latency_seconds_bucket{source="a",le="+Inf"} 4',
+        'test_latency_seconds_sum{source="a"} 4.25',
+        'test_latency_seconds_count{source="a"} 4',
+    ]
+
+
+def test_labels_must_match_declaration():
+    counter = metrics.Counter("test_calls_total", "test", ["source"])
+    with pytest.raises(ValueError):
+        counter.inc(route="x")
+
+
+def test_label_values_are_escaped():
+    gauge = metrics.Gauge("test_gauge", "test", ["name"])
+    gauge.set(1, name='a"b\\c')
+    assert gauge.samples() == ['test_gauge{name="a\\"b\\\\c"} 1']
+
+
+def test_instrument_counts_outcomes():
+    @metrics.instrument("test_outcomes")
+    def fetch(result):
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    fetch([1, 2])
+    fetch([])
+    with pytest.raises(RuntimeError):
+        fetch(RuntimeError("boom"))
+
+    calls = 'dashboard_source_calls_total{source="test_outcomes",outcome="%s"}'
+    assert [_sample(metrics.SOURCE_CALLS, calls % outcome) for outcome in ("ok", "empty", "error")] == [1, 1, 1]
+    assert _sample(metrics.SOURCE_ERRORS, 'dashboard_source_errors_total{source="test_outcomes",kind="empty"}') == 1
+    assert _sample(metrics.SOURCE_PAYLOAD_ROWS, 'dashboard_source_payload_rows{source="test_outcomes"}') == 0
+
+
+def test_payload_bytes_include_nested_calls():
+    @metrics.instrument("test_inner")
+    def inner():
+        metrics.record_payload_bytes(300)
+        return [1]
+
+    @metrics.instrument("test_outer")
+    def outer():
+        metrics.record_payload_bytes(100)
+        return inner()
+
+    outer()
+    bytes_sample = 'dashboard_source_payload_bytes{source="%s"}'
+    assert _sample(metrics.SOURCE_PAYLOAD_BYTES, bytes_sample % "test_inner") == 300
+    assert _sample(metrics.SOURCE_PAYLOAD_BYTES, bytes_sample % "test_outer") == 400
+
+
+def test_calls_without_http_do_not_record_bytes():
+    @metrics.instrument("test_sdk_only")
+    def sdk_call():
+        return [1]
+
+    sdk_call()
+    assert not [line for line in metrics.SOURCE_PAYLOAD_BYTES.samples() if 'source="test_sdk_only"' in line]
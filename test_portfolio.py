@@ -0,0 +1,113 @@
+"""
+포트폴리오 엔진 테스트 (업스트림 호출 없음)
+가격/환율 틱을 행 단위로 반영한 결과는 같은 최종 상태로 테이블을 새로 만든 결과와 같아야 하며,
+현재가나 환율을 모르는(nan) 포지션은 0원 평가가 아닌 unpriced 로 합계에서 빠져야 합니다.
+
+    python -m pytest -q test_portfolio.py
+"""
+import math
+import random
+
+import pytest
+
+from backend.services.portfolio import Position, PositionTable, build_positions
+
+UPBIT_BALANCE = {"total_krw": 1_000_000.0}
+UPBIT_HOLDINGS = [
+    {"coin": "BTC", "total": 0.1, "avg_buy_price": 90_000_000.0, "current_price": 100_000_000.0},
+    {"coin": "XRP", "total": 1000.0, "avg_buy_price": 700.0, "current_price": 650.0},
+]
+BINANCE_BALANCE = {"total_usdt": 1000.0}
+BINANCE_HOLDINGS = [{"asset": "ETH", "total": 1.0, "current_price": 3000.0}]
+
+
+def _positions():
+    return build_positions(UPBIT_BALANCE, UPBIT_HOLDINGS, BINANCE_BALANCE, BINANCE_HOLDINGS)
+
+
+def _fresh(positions, fx):
+    table = PositionTable()
+    table.sync(positions, fx)
+    return table
+
+
+def _same(actual, expected):
+    """합계는 증분 갱신의 부동소수점 누적 오차만큼 허용하고, 나머지는 그대로 비교"""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _same(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _same(a, e)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-6)
+    else:
+        assert actual == expected
+
+
+def test_summary_values_in_krw():
+    summary = _fresh(_positions(), {"USDT": 1400.0}).summary()
+    assert summary["total_value_krw"] == pytest.approx(1_000_000 + 10_000_000 + 650_000 + 1_400_000 + 3000 * 1400)
+    assert summary["total_cost_krw"] == pytest.approx(9_000_000 + 700_000)
+    assert summary["total_pnl_krw"] == pytest.approx(1_000_000 - 50_000)
+    eth = next(p for p in summary["positions"] if p["asset"] == "ETH")
+    assert (eth["value_krw"], eth["pnl_krw"], eth["fx_rate"]) == (4_200_000.0, None, 1400.0)
+
+
+def test_unknown_price_is_excluded_not_zero():
+    positions = _positions()
+    table = _fresh(positions, {"USDT": 1400.0})
+    before = table.summary()
+    assert table.update_prices({("upbit", "XRP"): math.nan}) == 1
+
+    summary = table.summary()
+    assert summary["unpriced"] == ["upbit:XRP"]
+    assert summary["total_value_krw"] == pytest.approx(before["total_value_krw"] - 650_000)
+    assert summary["total_cost_krw"] == pytest.approx(before["total_cost_krw"] - 700_000)
+    xrp = next(p for p in summary["positions"] if p["asset"] == "XRP")
+    assert (xrp["price"], xrp["value_krw"], xrp["pnl_krw"], xrp["weight"]) == (None, None, None, None)
+    assert table.update_prices({("upbit", "XRP"): math.nan}) == 0   # nan → nan 은 변경 없음
+
+
+def test_unknown_fx_unprices_every_position_in_that_currency():
+    table = _fresh(_positions(), {"USDT": 1400.0})
+    assert table.set_fx("USDT", None) == 2
+    assert table.unpriced() == ["binance:USDT", "binance:ETH"]
+    assert table.summary()["fx_rates"]["USDT"] is None
+    assert table.set_fx("USDT", None) == 0
+
+
+def test_incremental_updates_match_full_recompute():
+    rng = random.Random(7)
+    positions = _positions()
+    table = _fresh(positions, {"USDT": 1400.0})
+    prices = {(p.venue, p.asset): p.price for p in positions}
+    fx = 1400.0
+    for _ in range(500):
+        if rng.random() < 0.1:
+            fx = rng.choice([math.nan, rng.uniform(1300, 1500)])
+            table.set_fx("USDT", None if math.isnan(fx) else fx)
+            continue
+        key = rng.choice([("upbit", "BTC"), ("upbit", "XRP"), ("binance", "ETH")])
+        if rng.random() < 0.15:
+            prices[key] = math.nan
+        elif math.isnan(prices[key]):
+            prices[key] = rng.uniform(100, 1000)
+        else:
+            prices[key] *= rng.uniform(0.95, 1.05)
+        table.update_prices({key: prices[key]})
+
+        final = [Position(p.venue, p.asset, p.quantity, p.avg_cost, prices[(p.venue, p.asset)], p.currency)
+                 for p in positions]
+        _same(table.summary(), _fresh(final, {"USDT": None if math.isnan(fx) else fx}).summary())
+
+
+def test_sync_rebuilds_on_layout_change():
+    positions = _positions()
+    table = _fresh(positions, {"USDT": 1400.0})
+    assert table.sync(positions, {"USDT": 1400.0}) == 0          # 변경 없음
+    assert table.sync(positions[:-1], {"USDT": 1400.0}) == len(positions) - 1
+    assert len(table) == len(positions) - 1
+    _same(table.summary(), _fresh(positions[:-1], {"USDT": 1400.0}).summary())
@@ -0,0 +1,194 @@
+"""
+포트폴리오 히스토리 기록 테스트 (업스트림 호출 없음)
+한 거래소 조회가 실패한 불완전한 포트폴리오는 자산 곡선에 기록하지 않아야 하며,
+기록 시점에 시간/일(KST 자정 기준) 단위 OHLC 집계가 갱신되고 보관 기간이 지난 원본은 정리되어야 합니다.
+
+    python -m pytest -q test_portfolio_history.py
+"""
+import asyncio
+import os
+from dataclasses import replace
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+
+from backend import api_server
+from backend.services import circuit, history
+from backend.services.portfolio import PositionTable
+from backend.services.snapshot import SnapshotCache
+
+UPBIT_BALANCE = {"total_krw": 1_000_000.0, "available_krw": 1_000_000.0, "locked_krw": 0.0}
+UPBIT_HOLDINGS = [{
+    "coin": "BTC", "total": 0.1, "avg_buy_price": 90_000_000.0, "current_price": 100_000_000.0,
+    "eval_amount": 10_000_000.0, "buy_amount": 9_000_000.0, "profit_loss": 1_000_000.0,
+    "profit_loss_percent": 11.1,
+}]
+BINANCE_BALANCE = {"total_usdt": 1000.0, "available_usdt": 1000.0, "locked_usdt": 0.0}
+BINANCE_HOLDINGS = [{"asset": "ETH", "symbol": "ETHUSDT", "total": 1.0, "current_price": 3000.0, "eval_amount": 3000.0}]
+
+
+class FakeExchanges:
+    """계정 섹션 서비스 대역. binance_down 이면 SDK 호출이 실패한 것처럼 브레이커에 실패를 기록하고 None 을 반환"""
+
+    def __init__(self):
+        self.binance_down = False
+
+    def upbit(self, value):
+        async def fetch():
+            return value
+        return fetch
+
+    def binance(self, value):
+        async def fetch():
+            if self.binance_down:
+                try:
+                    with circuit.guard("binance"):
+                        raise ConnectionError("binance unavailable")
+                except ConnectionError:
+                    return None
+            return value
+        return fetch
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    exchanges = FakeExchanges()
+    sections = dict(api_server.SECTIONS)
+    fetches = {
+        "upbit_balance": exchanges.upbit(UPBIT_BALANCE),
+        "upbit_holdings": exchanges.upbit(UPBIT_HOLDINGS),
+        "usdt_krw": exchanges.upbit(1400.0),
+        "binance_balance": exchanges.binance(BINANCE_BALANCE),
+        "binance_holdings": exchanges.binance(BINANCE_HOLDINGS),
+    }
+    for name, fetch in fetches.items():
+        # 호출마다 다시 조회하도록 TTL 0
+        sections[name] = replace(sections[name], fetch=fetch, ttl=0)
+    sections["portfolio"] = replace(sections["portfolio"], ttl=0)
+
+    samples = []
+
+    async def record_portfolio(portfolio):
+        samples.append(portfolio)
+
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+    monkeypatch.setattr(api_server, "PORTFOLIO", PositionTable())
+    monkeypatch.setattr(api_server, "record_portfolio", record_portfolio)
+    monkeypatch.setattr(api_server, "upbit_configured", lambda: True)
+    monkeypatch.setattr(api_server, "binance_configured", lambda: True)
+    circuit.reset()
+    yield exchanges, samples
+    circuit.reset()
+
+
+def _record_once() -> bool:
+    return asyncio.run(api_server._record_portfolio_sample())
+
+
+def test_complete_portfolio_is_recorded(recorded):
+    _, samples = recorded
+    assert _record_once()
+    assert len(samples) == 1
+    assert samples[0]["complete"]
+    assert samples[0]["total_value_krw"] == pytest.approx(1_000_000 + 10_000_000 + (1000 + 3000) * 1400)
+
+
+def test_failed_exchange_is_not_recorded(recorded):
+    exchanges, samples = recorded
+    exchanges.binance_down = True
+    assert not _record_once()
+    assert samples == []
+
+    portfolio = asyncio.run(api_server.get_section("portfolio")).data
+    assert not portfolio["complete"]
+    assert set(portfolio["degraded_sections"]) == {"binance_balance", "binance_holdings"}
+
+
+def test_stale_fallback_is_not_recorded(recorded):
+    exchanges, samples = recorded
+    assert _record_once()
+    # 장애 중에는 마지막 정상 스냅샷(stale)으로 값은 유지되지만 새 기록으로 남기지 않음
+    exchanges.binance_down = True
+    assert not _record_once()
+    assert len(samples) == 1
+
+    portfolio = asyncio.run(api_server.get_section("portfolio")).data
+    assert portfolio["total_value_krw"] == samples[0]["total_value_krw"]
+    assert not portfolio["complete"]
+
+
+def test_unconfigured_exchange_does_not_block_recording(recorded, monkeypatch):
+    exchanges, samples = recorded
+    exchanges.binance_down = True
+    monkeypatch.setattr(api_server, "binance_configured", lambda: False)
+    assert _record_once()
+    assert samples[0]["complete"]
+    assert samples[0]["total_value_krw"] == pytest.approx(1_000_000 + 10_000_000)
+
+
+# --- 히스토리 저장소 ---
+
+# 2024-01-01 00:00 KST
+MIDNIGHT_KST = 1704034800
+
+
+def _portfolio(value: float, pnl: float = 0.0) -> dict:
+    return {"total_value_krw": value, "total_cost_krw": value - pnl, "total_pnl_krw": pnl,
+            "positions": [{"venue": "upbit", "asset": "BTC", "quantity": 0.1, "value_krw": value}]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = history.HistoryStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_daily_buckets_start_at_kst_midnight():
+    assert history.bucket_start(MIDNIGHT_KST + 5, history.DAY) == MIDNIGHT_KST
+    assert history.bucket_start(MIDNIGHT_KST - 1, history.DAY) == MIDNIGHT_KST - history.DAY
+    assert history.bucket_start(MIDNIGHT_KST + 3700, history.HOUR) == MIDNIGHT_KST + history.HOUR
+
+
+def test_rollups_track_ohlc_per_bucket(store):
+    for offset, value in ((60, 100.0), (1200, 130.0), (2400, 90.0), (3000, 110.0), (3660, 120.0)):
+        store.record(_portfolio(value, pnl=value - 100), ts=MIDNIGHT_KST + offset)
+
+    hourly = store.equity_curve(MIDNIGHT_KST, MIDNIGHT_KST + history.DAY, "hourly")
+    assert [(p["ts"], p["open"], p["high"], p["low"], p["close"], p["pnl"], p["samples"]) for p in hourly] == [
+        (MIDNIGHT_KST, 100.0, 130.0, 90.0, 110.0, 10.0, 4),
+        (MIDNIGHT_KST + history.HOUR, 120.0, 120.0, 120.0, 120.0, 20.0, 1),
+    ]
+    (daily,) = store.equity_curve(MIDNIGHT_KST, MIDNIGHT_KST + history.DAY, "daily")
+    assert (daily["open"], daily["high"], daily["low"], daily["close"], daily["samples"]) == (100.0, 130.0, 90.0, 120.0, 5)
+
+
+def test_history_picks_resolution_and_summarizes(store):
+    for hour, value in enumerate((100.0, 150.0, 80.0, 120.0)):
+        store.record(_portfolio(value), ts=MIDNIGHT_KST + hour * history.HOUR)
+    now = MIDNIGHT_KST + 4 * history.HOUR
+
+    raw = store.history(history.DAY, now=now)
+    assert raw["resolution"] == "raw"
+    assert [p["close"] for p in raw["points"]] == [100.0, 150.0, 80.0, 120.0]
+    assert raw["summary"] == {"start_value": 100.0, "end_value": 120.0, "change": 20.0,
+                              "change_percent": 20.0, "high": 150.0, "low": 80.0}
+    assert store.history(30 * history.DAY, now=now)["resolution"] == "hourly"
+    assert store.history(365 * history.DAY, now=now)["resolution"] == "daily"
+    assert store.history(history.DAY, now=now - 2 * history.DAY)["summary"] is None
+
+
+def test_old_raw_samples_are_pruned_but_rollups_kept(store):
+    old = MIDNIGHT_KST
+    store.record(_portfolio(100.0), ts=old)
+    now = old + history.RETENTION["raw"] + history.DAY
+    store.record(_portfolio(200.0), ts=now)
+
+    assert [p["ts"] for p in store.equity_curve(old, now, "raw")] == [now]
+    assert [p["ts"] for p in store.equity_curve(old, now, "daily")][0] == old
+    assert [p["ts"] for p in store.equity_curve(old, now, "hourly")][0] == old
@@ -0,0 +1,108 @@
+"""
+김치 프리미엄 테스트 (업스트림 호출 없음)
+양쪽 거래소에 모두 있는 코인만 순위에 들고, 바뀐 행만 다시 계산한 결과가 전체 재계산과 같으며,
+이동평균은 이력 버퍼에서 밀려난 기록을 빼고 계산되어야 합니다.
+
+    python -m pytest -q test_premium.py
+"""
+import random
+
+import pytest
+
+from backend.services.premium import PremiumBook
+
+UPBIT = {"BTC": 141_000_000.0, "ETH": 4_200_000.0, "XRP": 700.0}
+BINANCE = {"BTC": 100_000.0, "ETH": 3_000.0, "SOL": 150.0}
+
+
+def _book(history_size: int = 10) -> PremiumBook:
+    book = PremiumBook(history_size)
+    book.set_rate(1400.0)
+    book.update_upbit(UPBIT)
+    book.update_binance(BINANCE)
+    return book
+
+
+def _premiums(book: PremiumBook) -> dict:
+    return {row["asset"]: row["premium_percent"] for row in book.ranked()}
+
+
+def test_only_common_assets_are_ranked():
+    rows = _book().ranked()
+    assert [row["asset"] for row in rows] == ["BTC", "ETH"]
+    btc = rows[0]
+    assert btc["binance_krw"] == 140_000_000.0
+    assert btc["premium_percent"] == pytest.approx((141 / 140 - 1) * 100)
+    assert _book().ranked(limit=1)[0]["asset"] == "BTC"
+
+
+def test_unchanged_prices_recompute_nothing():
+    book = _book()
+    assert book.update_upbit(dict(UPBIT)) == 0
+    assert book.update_binance({**BINANCE, "ETH": 3_100.0}) == 1
+    assert book.set_rate(1400.0) == 0
+
+
+def test_delisted_asset_leaves_the_ranking():
+    book = _book()
+    upbit = dict(UPBIT)
+    del upbit["ETH"]
+    assert book.update_upbit(upbit) == 1
+    assert list(_premiums(book)) == ["BTC"]
+
+
+def test_unknown_rate_clears_every_premium():
+    book = _book()
+    assert book.set_rate(None) == len(book)
+    assert book.ranked() == []
+    book.set_rate(1400.0)
+    assert list(_premiums(book)) == ["BTC", "ETH"]
+
+
+def test_incremental_updates_match_a_fresh_book():
+    rng = random.Random(3)
+    book = _book()
+    upbit, binance, rate = dict(UPBIT), dict(BINANCE), 1400.0
+    for _ in range(200):
+        choice = rng.random()
+        if choice < 0.1:
+            rate = rng.uniform(1300, 1500)
+            book.set_rate(rate)
+        elif choice < 0.55:
+            asset = rng.choice(list(UPBIT))
+            upbit[asset] = UPBIT[asset] * rng.uniform(0.9, 1.1)
+            book.update_upbit(upbit)
+        else:
+            asset = rng.choice(list(BINANCE))
+            binance[asset] = BINANCE[asset] * rng.uniform(0.9, 1.1)
+            book.update_binance(binance)
+
+        fresh = PremiumBook()
+        fresh.set_rate(rate)
+        fresh.update_upbit(upbit)
+        fresh.update_binance(binance)
+        assert _premiums(book) == pytest.approx(_premiums(fresh))
+
+
+def test_moving_average_drops_evicted_samples():
+    book = _book(history_size=3)
+    rate_premiums = []
+    for rate in (1400.0, 1410.0, 1420.0, 1430.0, 1440.0):
+        book.set_rate(rate)
+        book.record()
+        rate_premiums.append((141_000_000.0 / (100_000.0 * rate) - 1) * 100)
+
+    btc = book.ranked()[0]
+    assert btc["samples"] == 3
+    assert btc["average_percent"] == pytest.approx(sum(rate_premiums[-3:]) / 3)
+
+
+def test_average_skips_samples_without_a_premium():
+    book = _book(history_size=5)
+    book.record()
+    book.set_rate(None)
+    book.record()                 # 환율을 모르는 동안의 기록은 평균에 넣지 않음
+    book.set_rate(1400.0)
+    btc = book.ranked()[0]
+    assert btc["samples"] == 1
+    assert btc["average_percent"] == pytest.approx(btc["premium_percent"])
@@ -0,0 +1,67 @@
+"""
+시세 레코드 테스트 (업스트림 호출 없음)
+레코드는 행마다 __dict__ 를 만들지 않고, 순위 섹션 변환 결과는 각 응답 모델로 검증되며,
+전체 종목 열 배열은 nan 없이 JSON 으로 직렬화되어야 합니다.
+
+    python -m pytest -q test_quotes.py
+"""
+import json
+import math
+import os
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+
+from backend import api_server
+from backend.services.quotes import COLUMN_FIELDS, Quote, to_columns, to_rows
+from backend.services.snapshot import make_snapshot
+
+
+def _quote(source: str = "upbit", symbol: str = "KRW-BTC", trade_value: float = 1.4e12,
+           price_krw: float = 140_000_000.0) -> Quote:
+    return Quote(source, symbol, "비트코인", 140_000_000.0, 1.5, 10_000.0, trade_value, price_krw, trade_value,
+                 english_name="Bitcoin")
+
+
+def test_quote_uses_slots():
+    quote = _quote()
+    assert not hasattr(quote, "__dict__")
+    with pytest.raises(AttributeError):
+        quote.extra = 1
+    assert quote.key == "upbit:KRW-BTC"
+
+
+@pytest.mark.parametrize("section", ["upbit_top_volume", "binance_top_volume", "kospi_top", "us_top", "etf_ranking"])
+def test_ranking_rows_validate_against_the_response_model(section):
+    spec = api_server.SECTIONS[section]
+    quote = _quote(price_krw=math.nan) if section == "binance_top_volume" else _quote()
+    quote.indicators = {"ma": None, "rsi": 55.0, "vwap": 1.0, "bollinger_upper": None, "bollinger_lower": None,
+                        "bars": 3}
+    (row,) = json.loads(make_snapshot(section, spec.present([quote]), spec.adapter).body)
+    assert row["current_price"] == 140_000_000.0
+    if section != "etf_ranking":   # ETF 순위에는 지표 필드가 없음
+        assert row["indicators"] == quote.indicators
+    if section == "binance_top_volume":
+        assert row["current_price_krw"] is None   # 환율을 모르면 null
+    assert spec.present([]) is None
+
+
+def test_columns_are_json_safe():
+    quotes = [_quote(), _quote(symbol="KRW-ETH", trade_value=math.nan, price_krw=math.nan)]
+    columns = to_columns(quotes)
+    assert list(columns) == list(COLUMN_FIELDS)
+    assert columns["symbol"] == ["KRW-BTC", "KRW-ETH"]
+    assert columns["trade_value"] == [1.4e12, None]
+    assert columns["price_krw"] == [140_000_000.0, None]
+    json.dumps(columns, allow_nan=False)
+    assert to_columns([]) is None
+
+
+def test_to_rows_keeps_order():
+    quotes = [_quote(symbol=f"KRW-C{i}") for i in range(3)]
+    assert [row["market"] for row in to_rows(lambda q: {"market": q.symbol}, quotes)] == ["KRW-C0", "KRW-C1", "KRW-C2"]
+    assert to_rows(lambda q: {}, None) is None
@@ -0,0 +1,128 @@
+"""
+스크리너 테스트 (업스트림 호출 없음)
+필터 식은 <열><연산자><숫자> 형식만 받고, 정렬 인덱스로 찾은 결과는 전체 행을 직접 거른 결과와 같아야 하며,
+미국 주식과 ETF 목록에 모두 있는 종목은 한 번만 나와야 합니다.
+
+    python -m pytest -q test_screener.py
+"""
+import math
+import operator
+import random
+
+import pytest
+
+from backend.services.screener import COLUMNS, MARKETS, Condition, ScreenerTable, parse_filter
+
+USD_KRW = 1400.0
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("change_rate>5", Condition("change_rate", ">", 5.0)),
+    (" trade_value >= 1e10 ", Condition("trade_value", ">=", 1e10)),
+    ("price<-0.5", Condition("price", "<", -0.5)),
+    ("volume<=.5", Condition("volume", "<=", 0.5)),
+    ("price=7.", Condition("price", "=", 7.0)),
+    ("change_rate>+2.5E-1", Condition("change_rate", ">", 0.25)),
+])
+def test_parse_filter(expression, expected):
+    assert parse_filter(expression) == expected
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("change_rate", "Invalid filter"),
+    ("change_rate=>5", "Invalid filter"),
+    ("price>1.2.3", "Invalid filter"),
+    ("price>.", "Invalid filter"),
+    ("price>nan", "Invalid filter"),
+    ("price>5 and volume>1", "Invalid filter"),
+    ("market_cap>5", "Unknown filter column"),
+])
+def test_invalid_filters_are_rejected(expression, message):
+    with pytest.raises(ValueError, match=message):
+        parse_filter(expression)
+
+
+def _columns(market: str, n: int, rng: random.Random) -> dict:
+    symbols = [f"{market.upper()}{i:03d}" for i in range(n)]
+    price = [round(rng.uniform(1, 1000), 1) for _ in range(n)]
+    krw = 1.0 if market in ("kospi", "kosdaq", "upbit") else USD_KRW
+    return {
+        "symbol": symbols,
+        "name": [f"{market} {i}" for i in range(n)],
+        "price": price,
+        "price_krw": [p * krw for p in price],
+        "change_rate": [round(rng.uniform(-10, 10), 1) for _ in range(n)],
+        "volume": [None if rng.random() < 0.1 else float(rng.randint(1, 100)) for _ in range(n)],
+        "trade_value_krw": [None if rng.random() < 0.1 else float(rng.randint(1, 10**6)) for _ in range(n)],
+    }
+
+
+@pytest.fixture
+def table():
+    rng = random.Random(11)
+    table = ScreenerTable()
+    for market in MARKETS:
+        table.sync(market, "v1", _columns(market, 40, rng), USD_KRW)
+    table.refresh()
+    return table
+
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq}
+
+
+def _brute_force(table, conditions, markets, sort, descending):
+    rows = table.rows(range(len(table.symbol)))
+    for condition in conditions:
+        rows = [r for r in rows if r[condition.column] is not None and not math.isnan(r[condition.column])
+                and OPS[condition.op](r[condition.column], condition.value)]
+    if markets:
+        rows = [r for r in rows if r["market"] in markets]
+    known = sorted((r for r in rows if r[sort] is not None), key=lambda r: r[sort], reverse=descending)
+    return known, [r for r in rows if r[sort] is None]
+
+
+def test_indexed_query_matches_brute_force(table):
+    rng = random.Random(5)
+    for _ in range(200):
+        conditions = [Condition(rng.choice(COLUMNS), rng.choice(list(OPS)), rng.choice([0.0, 5.0, 50.0, 5e4]))
+                      for _ in range(rng.randint(0, 3))]
+        markets = rng.sample(MARKETS, rng.randint(1, 3)) if rng.random() < 0.5 else None
+        sort = rng.choice(COLUMNS)
+        descending = rng.random() < 0.5
+        got = table.query(conditions, markets, sort, descending, limit=1000)
+        known, missing = _brute_force(table, conditions, markets, sort, descending)
+        # 같은 값끼리의 순서는 구현에 따라 다를 수 있으므로 정렬 값과 행 집합으로 비교, 값이 없는 행은 맨 뒤
+        assert [r[sort] for r in got[:len(known)]] == [r[sort] for r in known]
+        assert sorted(r["symbol"] for r in got) == sorted(r["symbol"] for r in known + missing)
+        assert all(r[sort] is None for r in got[len(known):])
+
+
+def test_limit_and_unknown_names(table):
+    assert len(table.query([], limit=7)) == 7
+    with pytest.raises(ValueError, match="Unknown sort column"):
+        table.query([], sort="market_cap")
+    with pytest.raises(ValueError, match="Unknown market"):
+        table.query([], markets=["nyse"])
+
+
+def test_etf_listed_as_us_stock_appears_once():
+    table = ScreenerTable()
+    us = {"symbol": ["SPY", "NVDA"], "name": ["SPDR", "NVIDIA"], "price": [500.0, 120.0],
+          "price_krw": [700_000.0, 168_000.0], "change_rate": [0.1, 2.0], "volume": [1.0, 2.0],
+          "trade_value_krw": [7e5, 3.36e5]}
+    etf = {"symbol": ["SPY", "QQQ"], "name": ["SPDR", "Invesco"], "price": [500.0, 450.0],
+           "price_krw": [None, None], "change_rate": [0.1, 0.5], "volume": [1.0, 3.0], "trade_value_krw": [None, None]}
+    table.sync("us", "v1", us, USD_KRW)
+    table.sync("etf", "v1", etf, USD_KRW)
+    table.refresh()
+    rows = {(r["market"], r["symbol"]): r for r in table.query([], limit=10)}
+    assert sorted(rows) == [("etf", "QQQ"), ("us", "NVDA"), ("us", "SPY")]
+    assert rows[("etf", "QQQ")]["price"] == 450.0 * USD_KRW   # ETF 는 환율로 환산
+
+
+def test_same_version_does_not_rebuild(table):
+    assert not table.sync("kospi", "v1", None, USD_KRW)
+    assert not table.refresh()
+    assert table.sync("kospi", "v2", None, USD_KRW)
+    assert table.refresh()
+    assert not table.query([], markets=["kospi"])
@@ -0,0 +1,85 @@
+"""
+섹션별 엔드포인트 테스트 (업스트림 호출 없음)
+섹션 엔드포인트는 대시보드와 같은 스냅샷을 공유하고,
+백그라운드 선갱신은 최근 조회된 섹션만 TTL 만료 전에 갱신해야 합니다.
+
+    python -m pytest -q test_section_endpoints.py
+"""
+import asyncio
+import json
+import os
+from dataclasses import replace
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+from starlette.requests import Request
+
+from backend import api_server
+from backend.services.alerts import AlertEngine
+from backend.services.deltas import DeltaBook
+from backend.services.snapshot import SnapshotCache
+
+FEAR_GREED = {"value": 40, "value_classification": "Fear", "timestamp": 1700000000}
+
+
+def _request():
+    return Request({"type": "http", "method": "GET", "query_string": b"", "headers": []})
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    counts = {}
+
+    def fake(name, value):
+        async def fetch():
+            counts[name] = counts.get(name, 0) + 1
+            return value
+        return fetch
+
+    values = {"fear_greed": FEAR_GREED, "usdt_krw": 1400.0, "usd_krw": 1350.0}
+    sections = dict(api_server.SECTIONS)
+    for name, value in values.items():
+        sections[name] = replace(sections[name], fetch=fake(name, value))
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+    monkeypatch.setattr(api_server, "ALERTS", AlertEngine())
+    monkeypatch.setattr(api_server, "DELTAS", DeltaBook({}))
+    return counts
+
+
+def test_section_endpoint_shares_the_dashboard_snapshot(calls):
+    section = asyncio.run(api_server.crypto_fear_greed(_request()))
+    dashboard = asyncio.run(api_server.dashboard(_request(), sections="fear_greed"))
+    assert json.loads(section.body) == FEAR_GREED
+    assert json.loads(dashboard.body)["fear_greed"] == FEAR_GREED
+    assert section.headers["etag"] != dashboard.headers["etag"]
+    assert calls == {"fear_greed": 1}
+
+
+def test_fx_composes_both_rates(calls):
+    body = json.loads(asyncio.run(api_server.fx_rates(_request())).body)
+    assert (body["usdt_krw"], body["usd_krw"]) == (1400.0, 1350.0)
+    assert set(body) == {"usdt_krw", "usd_krw", "last_updated"}
+
+
+def test_refresher_renews_only_recently_requested_sections(calls, monkeypatch):
+    sections = dict(api_server.SECTIONS)
+    for name in ("fear_greed", "usd_krw"):
+        sections[name] = replace(sections[name], ttl=0.2)
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+
+    async def scenario():
+        await api_server.get_section("fear_greed")
+        await api_server.get_section("usd_krw")
+        api_server.SNAPSHOTS._last_access["usd_krw"] -= api_server.REFRESH_IDLE_AFTER + 1
+        refresher = asyncio.create_task(api_server._refresh_sections(interval=0.02))
+        await asyncio.sleep(0.5)
+        refresher.cancel()
+
+    asyncio.run(scenario())
+    assert calls["fear_greed"] >= 2   # 0.16초(TTL 의 80%)마다 갱신
+    assert calls["usd_krw"] == 1
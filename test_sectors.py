@@ -0,0 +1,109 @@
+"""
+업종 상세 테스트 (업스트림 호출 없음)
+업종 하나의 상세는 전체 업종 히트맵을 기다리지 않고 그 업종만 조회해 업종별로 캐시하고,
+히트맵이 이미 최신이면 그 결과를 그대로 사용해야 합니다.
+
+    python -m pytest -q test_sectors.py
+"""
+import asyncio
+import json
+import os
+from dataclasses import replace
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend import api_server
+from backend.services.quotes import Quote
+from backend.services.snapshot import SnapshotCache
+
+GROUPS = [{"code": "278", "name": "반도체", "change_rate": 1.5, "volume": "1,000"},
+          {"code": "261", "name": "자동차", "change_rate": -0.5, "volume": "500"}]
+
+
+def _quote(code: str, price: int, volume: int) -> Quote:
+    return Quote("naver", code, f"종목{code}", price, 0.0, volume, price * volume, price, price * volume)
+
+
+class FakeNaver:
+    """업종 목록/업종 상세 대역. 전체 히트맵 조회 횟수와 업종별 상세 조회 기록을 남김"""
+
+    def __init__(self):
+        self.detail_calls = []
+        self.heatmap_calls = 0
+        self.down = False
+
+    async def groups(self):
+        return GROUPS
+
+    async def constituents(self, codes):
+        self.detail_calls.append(list(codes))
+        if self.down:
+            return {code: None for code in codes}
+        return {code: [_quote("000660", 200_000, 10), _quote("005930", 70_000, 100)] for code in codes}
+
+    async def heatmap(self):
+        self.heatmap_calls += 1
+        return [{"code": "278", "name": "반도체", "change_rate": 1.5, "stocks": []}]
+
+
+@pytest.fixture
+def naver(monkeypatch):
+    fake = FakeNaver()
+    sections = dict(api_server.SECTIONS)
+    sections["sector_groups"] = replace(sections["sector_groups"], fetch=fake.groups)
+    sections["sector_heatmap"] = replace(sections["sector_heatmap"], fetch=fake.heatmap, markets=())
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+    monkeypatch.setattr(api_server, "SECTOR_DETAIL_SNAPSHOTS", SnapshotCache(max_entries=128))
+    monkeypatch.setattr(api_server, "fetch_constituents", fake.constituents)
+    return fake
+
+
+def _detail(code: str):
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    return asyncio.run(api_server.stock_sector_detail(code, request))
+
+
+def test_cold_heatmap_fetches_only_that_sector(naver):
+    response = _detail("278")
+    body = json.loads(response.body)
+    assert body["name"] == "반도체"
+    assert [s["code"] for s in body["stocks"]] == ["005930", "000660"]   # 거래대금 내림차순
+    assert naver.detail_calls == [["278"]]
+    assert naver.heatmap_calls == 0
+
+    _detail("278")   # 업종별 캐시
+    assert naver.detail_calls == [["278"]]
+
+
+def test_warm_heatmap_is_reused(naver):
+    asyncio.run(api_server.get_section("sector_heatmap"))
+    response = _detail("278")
+    assert json.loads(response.body)["stocks"] == []
+    assert naver.detail_calls == []
+
+
+def test_unknown_sector_is_404(naver):
+    with pytest.raises(HTTPException) as error:
+        _detail("999")
+    assert error.value.status_code == 404
+    assert naver.detail_calls == []
+
+
+def test_failed_fetch_serves_last_detail_as_stale(naver):
+    first = _detail("278")
+    cached = api_server.SECTOR_DETAIL_SNAPSHOTS.peek("278")
+    api_server.SECTOR_DETAIL_SNAPSHOTS.put(replace(cached, created_at=0.0))   # TTL 만료
+    naver.down = True
+
+    response = _detail("278")
+    assert naver.detail_calls == [["278"], ["278"]]
+    assert response.headers["X-Stale-Sections"] == "sector"
+    assert response.body == first.body
@@ -0,0 +1,88 @@
+"""
+공유 스냅샷 저장소 테스트 (임시 디렉터리만 사용)
+워커 간 스냅샷은 본문/ETag/버전까지 그대로 전달되고, 리더는 한 번에 하나의 워커만 될 수 있으며,
+TTL 안의 공유 스냅샷이 있으면 다른 워커는 업스트림을 호출하지 않아야 합니다.
+
+    python -m pytest -q test_shared_cache.py
+"""
+import asyncio
+import os
+
+import pytest
+from pydantic import TypeAdapter
+
+from backend.services import shared_cache
+from backend.services.shared_cache import FileBackend, LeaderElection, MemoryBackend, decode_snapshot, encode_snapshot
+from backend.services.snapshot import SnapshotCache, make_snapshot
+
+
+def _snapshot():
+    return make_snapshot("fear_greed", {"value": 40, "label": "공포"}, TypeAdapter(dict))
+
+
+def test_encoding_round_trips_every_field():
+    snapshot = _snapshot().as_stale()
+    decoded = decode_snapshot(encode_snapshot(snapshot))
+    assert decoded == snapshot
+
+
+def test_file_backend_store_and_load(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    assert backend.load("fear_greed") is None
+    snapshot = _snapshot()
+    backend.store(snapshot)
+    assert FileBackend(str(tmp_path)).load("fear_greed") == snapshot
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".")]   # 임시 파일 정리
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    (tmp_path / "fear_greed.snapshot").write_bytes(b"{not json\n[]")
+    assert backend.load("fear_greed") is None
+
+
+def test_last_access_is_shared(tmp_path):
+    FileBackend(str(tmp_path)).touch("kospi_top", 1_700_000_000.0)
+    assert FileBackend(str(tmp_path)).last_access("kospi_top") == 1_700_000_000.0
+    assert FileBackend(str(tmp_path)).last_access("us_top") is None
+
+
+@pytest.mark.skipif(shared_cache.fcntl is None, reason="flock 필요")
+def test_only_one_worker_is_leader(tmp_path):
+    first, second = LeaderElection(FileBackend(str(tmp_path))), LeaderElection(FileBackend(str(tmp_path)))
+    assert first.check()
+    assert first.check()                # 재확인해도 유지
+    assert not second.check()
+    first.release()
+    assert second.check()
+    assert (tmp_path / "leader.lock").read_text() == shared_cache.WORKER_ID
+    second.release()
+
+
+def test_memory_backend_is_always_leader():
+    assert LeaderElection(MemoryBackend()).check()
+
+
+def test_redis_without_package_falls_back_to_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(shared_cache, "redis", None)
+    monkeypatch.setenv("SNAPSHOT_BACKEND", "redis")
+    monkeypatch.setenv("SNAPSHOT_DIR", str(tmp_path))
+    assert isinstance(shared_cache.backend_from_env(), FileBackend)
+    monkeypatch.setenv("SNAPSHOT_BACKEND", "memory")
+    assert isinstance(shared_cache.backend_from_env(), MemoryBackend)
+
+
+def test_fresh_shared_snapshot_skips_the_producer(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    snapshot = _snapshot()
+
+    async def produce():
+        return snapshot
+
+    async def not_called():
+        raise AssertionError("shared snapshot is still fresh")
+
+    asyncio.run(SnapshotCache(backend=backend).get("fear_greed", produce, ttl=60))
+    follower = SnapshotCache(backend=backend)
+    assert asyncio.run(follower.get("fear_greed", not_called, ttl=60)) == snapshot
+    assert follower.peek("fear_greed") == snapshot   # 로컬 L1 에도 채움
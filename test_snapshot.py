@@ -0,0 +1,117 @@
+"""
+섹션 스냅샷 테스트 (업스트림 호출 없음)
+섹션 데이터는 생성 시 한 번만 검증/인코딩(alias 기준)되고, 대시보드 응답은 저장된 섹션 바이트를 이어 붙이며,
+동시 요청은 하나의 생성 작업을 함께 기다려야 합니다.
+
+    python -m pytest -q test_snapshot.py
+"""
+import asyncio
+import json
+import os
+from dataclasses import replace
+from typing import List, Optional
+
+os.environ.setdefault("SECTION_REFRESH", "0")
+os.environ.setdefault("PORTFOLIO_HISTORY_INTERVAL", "0")
+os.environ.setdefault("WHALE_POLL_INTERVAL", "0")
+os.environ.setdefault("INDICATOR_BAR_DB", "")
+
+import pytest
+from pydantic import TypeAdapter
+from starlette.requests import Request
+
+from backend import api_server
+from backend.services.snapshot import SnapshotCache, compose_object, make_snapshot
+
+WHALE = {"coin": "BTC", "amount": 12.5, "from": "unknown", "to": "binance", "value_usd": 1.2e6, "time": "12:00"}
+FEAR_GREED = {"value": 40, "value_classification": "Fear", "timestamp": 1700000000}
+
+
+def test_snapshot_is_encoded_by_alias():
+    adapter = TypeAdapter(Optional[List[api_server.WhaleAlert]])
+    snapshot = make_snapshot("whale_alerts", [WHALE], adapter)
+    assert json.loads(snapshot.body) == [WHALE]
+    assert snapshot.data == [WHALE]
+    assert snapshot.etag == make_snapshot("whale_alerts", [dict(WHALE)], adapter).etag
+
+
+def test_compose_object_joins_encoded_fields():
+    body = compose_object([("a", b"[1,2]"), ("b", b"null"), ("c", b'"x"')])
+    assert json.loads(body) == {"a": [1, 2], "b": None, "c": "x"}
+
+
+def test_concurrent_requests_share_one_producer():
+    cache = SnapshotCache()
+    adapter = TypeAdapter(int)
+    calls = []
+
+    async def producer():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return make_snapshot("n", len(calls), adapter)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("n", producer, ttl=60) for _ in range(5)))
+
+    snapshots = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert {s.body for s in snapshots} == {b"1"}
+    assert asyncio.run(cache.get("n", producer, ttl=60)).body == b"1"   # TTL 안에서는 캐시 히트
+
+
+def test_lru_evicts_least_recently_used():
+    cache = SnapshotCache(max_entries=2)
+    adapter = TypeAdapter(int)
+    for name in ("a", "b"):
+        cache.put(make_snapshot(name, 1, adapter))
+    cache._fresh("a", ttl=60)                   # a 를 최근 사용으로 갱신
+    cache.put(make_snapshot("c", 1, adapter))
+    assert [name for name in "abc" if cache.peek(name)] == ["a", "c"]
+
+
+# --- 대시보드 응답 ---
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = {}
+
+    def fake(name, value):
+        async def fetch():
+            calls[name] = calls.get(name, 0) + 1
+            return value
+        return fetch
+
+    values = {"fear_greed": FEAR_GREED, "whale_alerts": [WHALE]}
+    sections = dict(api_server.SECTIONS)
+    for name in api_server.DASHBOARD_SECTIONS:
+        sections[name] = replace(sections[name], fetch=fake(name, values.get(name)), present=None)
+    monkeypatch.setattr(api_server, "SECTIONS", sections)
+    monkeypatch.setattr(api_server, "SNAPSHOTS", SnapshotCache())
+    return calls
+
+
+def _dashboard(headers=()):
+    request = Request({"type": "http", "method": "GET", "query_string": b"",
+                       "headers": [(k.encode(), v.encode()) for k, v in headers]})
+    return asyncio.run(api_server.dashboard(request))
+
+
+def test_dashboard_matches_response_model(fetches):
+    response = _dashboard()
+    body = json.loads(response.body)
+    expected = api_server.DashboardData.model_validate(body).model_dump(mode="json", by_alias=True)
+    assert body == expected
+    assert body["whale_alerts"] == [WHALE]
+    assert body["fear_greed"] == FEAR_GREED
+    assert body["upbit_balance"] is None
+
+
+def test_cached_dashboard_skips_fetches_and_answers_304(fetches):
+    first = _dashboard()
+    second = _dashboard()
+    assert second.body == first.body
+    assert set(fetches.values()) == {1}
+
+    not_modified = _dashboard([("if-none-match", first.headers["etag"])])
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
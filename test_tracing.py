@@ -0,0 +1,73 @@
+"""
+트레이싱 테스트 (업스트림 호출 없음)
+스팬은 같은 trace 안에서 부모-자식으로 이어지고(익스큐터 워커 스레드 포함), 예외는 ERROR 상태로 기록되며,
+내보내기가 꺼져 있으면 아무것도 기록하지 않아야 합니다.
+
+    python -m pytest -q test_tracing.py
+"""
+import asyncio
+import io
+import json
+
+import pytest
+
+from backend.services import executors, tracing
+
+
+@pytest.fixture
+def exported():
+    out = io.StringIO()
+    tracing.set_exporter(tracing.JsonLinesExporter(out))
+
+    def spans():
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        return {span["name"]: span for record in records
+                for span in record["resourceSpans"][0]["scopeSpans"][0]["spans"]}
+
+    yield spans
+    tracing.set_exporter(None)
+
+
+def test_child_spans_share_the_trace(exported):
+    with tracing.span("request", kind=tracing.KIND_SERVER, route="/api/dashboard"):
+        with tracing.span("fetch", rows=3) as sp:
+            sp.set_attribute("result.bytes", 120)
+
+    spans = exported()
+    parent, child = spans["request"], spans["fetch"]
+    assert child["traceId"] == parent["traceId"]
+    assert child["parentSpanId"] == parent["spanId"]
+    assert "parentSpanId" not in parent
+    assert parent["kind"] == tracing.KIND_SERVER
+    assert {a["key"]: a["value"] for a in child["attributes"]} == {
+        "rows": {"intValue": "3"}, "result.bytes": {"intValue": "120"}}
+
+
+def test_executor_work_is_a_child_of_the_submitting_span(exported):
+    def work():
+        with tracing.span("worker"):
+            return 1
+
+    async def scenario():
+        with tracing.span("request"):
+            await executors.run(executors.EXCHANGE, work)
+
+    asyncio.run(scenario())
+    spans = exported()
+    assert spans["worker"]["parentSpanId"] == spans["request"]["spanId"]
+
+
+def test_exception_marks_span_as_error(exported):
+    with pytest.raises(ValueError):
+        with tracing.span("parse"):
+            raise ValueError("bad html")
+
+    status = exported()["parse"]["status"]
+    assert status == {"code": tracing.STATUS_ERROR, "message": "ValueError: bad html"}
+
+
+def test_disabled_tracing_records_nothing():
+    assert not tracing.enabled()
+    with tracing.span("request") as sp:
+        sp.set_attribute("rows", 1)
+        assert tracing.current_span() is None
@@ -0,0 +1,75 @@
+"""
+업비트 KRW 마켓 이름 캐시 테스트 (업스트림 호출 없음)
+이름 목록은 TTL 이 지나거나 목록에 없는 마켓(신규 상장)이 보이면 다시 받고, 실패하면 이전 목록을 유지해야 합니다.
+
+    python -m pytest -q test_upbit_api.py
+"""
+import pytest
+
+from backend.services import upbit_api
+
+
+class FakeResponse:
+    def __init__(self, markets):
+        self.status_code = 200
+        self._markets = markets
+
+    def json(self):
+        return [{"market": m, "korean_name": m[4:], "english_name": m[4:]} for m in self._markets]
+
+
+class FakeMarketList:
+    def __init__(self, monkeypatch):
+        self.markets = ["KRW-BTC", "KRW-ETH", "BTC-ETH"]
+        self.calls = 0
+        self.down = False
+        monkeypatch.setattr(upbit_api.httpclient, "get", self.get)
+
+    @staticmethod
+    def age(seconds: float) -> None:
+        """마지막으로 받은 시각을 seconds 초 앞당김"""
+        upbit_api._MARKET_NAMES_CHECKED -= seconds
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("upbit unavailable")
+        return FakeResponse(self.markets)
+
+
+@pytest.fixture
+def market_list(monkeypatch):
+    monkeypatch.setattr(upbit_api, "_UPBIT_MARKET_NAMES", {})
+    monkeypatch.setattr(upbit_api, "_MARKET_NAMES_CHECKED", 0.0)
+    return FakeMarketList(monkeypatch)
+
+
+def test_names_are_cached_until_ttl(market_list):
+    assert set(upbit_api._get_market_names()) == {"KRW-BTC", "KRW-ETH"}
+    market_list.age(upbit_api.MARKET_NAMES_TTL - 1)
+    upbit_api._get_market_names(["KRW-BTC"])
+    assert market_list.calls == 1
+
+    market_list.markets.append("KRW-NEW")
+    market_list.age(2)
+    assert "KRW-NEW" in upbit_api._get_market_names()
+    assert market_list.calls == 2
+
+
+def test_unknown_market_triggers_refresh(market_list):
+    upbit_api._get_market_names()
+    market_list.markets.append("KRW-NEW")
+
+    market_list.age(1)   # 방금 받았으면 다시 받지 않음
+    assert "KRW-NEW" not in upbit_api._get_market_names(["KRW-BTC", "KRW-NEW"])
+    market_list.age(upbit_api.MARKET_NAMES_RETRY)
+    assert upbit_api._get_market_names(["KRW-BTC", "KRW-NEW"])["KRW-NEW"]["korean_name"] == "NEW"
+    assert market_list.calls == 2
+
+
+def test_failed_refresh_keeps_previous_names(market_list):
+    upbit_api._get_market_names()
+    market_list.down = True
+    market_list.age(upbit_api.MARKET_NAMES_TTL)
+    assert set(upbit_api._get_market_names()) == {"KRW-BTC", "KRW-ETH"}
+    assert market_list.calls == 2
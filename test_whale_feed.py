@@ -0,0 +1,80 @@
+"""
+고래 이체 피드 테스트 (업스트림 호출 없음)
+같은 트랜잭션 해시는 여러 번 수집되어도 한 번만 보관하고, 링 버퍼가 가득 차면 가장 오래된 이체부터
+해시 집합/코인별 색인과 함께 정리되어야 합니다.
+
+    python -m pytest -q test_whale_feed.py
+"""
+import os
+
+from backend.services.whale_feed import ReplaySource, Transfer, TransferRing, WhaleFeed, parse_whale_alert
+
+REPLAY_FILE = os.path.join("benchmarks", "fixtures", "whale_alert_transactions.json")
+
+
+def _transfer(i: int, coin: str = "BTC") -> Transfer:
+    return Transfer(f"bitcoin:{i:04x}", coin, 10.0, 500_000.0 + i, "Binance", "Unknown Wallet", 1_700_000_000.0 + i)
+
+
+class FixedSource:
+    """호출마다 정해진 배치를 돌려주는 소스 (겹치는 구간 포함)"""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.since = []
+
+    def fetch(self, since):
+        self.since.append(since)
+        return self.batches.pop(0) if self.batches else []
+
+
+def test_overlapping_polls_are_deduplicated():
+    source = FixedSource([_transfer(2), _transfer(1), _transfer(2)], [_transfer(2), _transfer(3)])
+    feed = WhaleFeed(source)
+    assert feed.poll() == 2
+    assert feed.poll() == 1
+    assert [t.key for t in feed.ring.latest(10)] == [_transfer(i).key for i in (3, 2, 1)]
+    assert source.since == [0.0, _transfer(2).ts]   # 다음 조회는 마지막으로 받은 시각부터
+
+
+def test_ring_evicts_oldest_with_its_indexes():
+    ring = TransferRing(capacity=3)
+    for i, coin in enumerate(["BTC", "ETH", "BTC", "XRP"]):
+        assert ring.add(_transfer(i, coin))
+    assert len(ring) == 3
+    assert _transfer(0).key not in ring
+    assert ring.add(_transfer(0))                     # 밀려난 해시는 다시 받을 수 있음
+    assert [t.key for t in ring.latest(5, coin="BTC")] == [_transfer(0).key, _transfer(2).key]
+    assert sorted(ring.coins()) == ["BTC", "XRP"]     # 마지막 ETH 가 밀려나면 색인에서도 제거
+
+
+def test_since_stops_at_older_transfers():
+    ring = TransferRing(capacity=10)
+    for i in range(5):
+        ring.add(_transfer(i))
+    assert [t.key for t in ring.since(_transfer(3).ts)] == [_transfer(4).key, _transfer(3).key]
+
+
+def test_parse_whale_alert_formats_parties():
+    transfer = parse_whale_alert({
+        "blockchain": "ethereum", "symbol": "eth", "hash": "0xabc", "timestamp": 1_700_000_000,
+        "amount": 2489.17, "amount_usd": 7_467_524.45,
+        "from": {"owner_type": "exchange", "owner": "bitfinex"}, "to": {"owner_type": "unknown"},
+    })
+    assert (transfer.key, transfer.coin, transfer.sender, transfer.receiver) == \
+        ("ethereum:0xabc", "ETH", "Bitfinex", "Unknown Wallet")
+    alert = transfer.as_alert()
+    assert (alert["from"], alert["to"], alert["value_usd"]) == ("Bitfinex", "Unknown Wallet", 7_467_524.45)
+
+
+def test_replay_repeats_with_new_hashes():
+    source = ReplaySource(REPLAY_FILE, batch=40)
+    recorded = [f"{tx['blockchain']}:{tx['hash']}" for tx in source._transactions]
+    cycles = recorded + [f"{key}#1" for key in recorded]
+    feed = WhaleFeed(source, capacity=200)
+    added = feed.poll() + feed.poll() + feed.poll()
+    # 기록에 겹쳐 수집된 해시는 한 번만, 두 번째 회차는 해시에 회차가 붙어 새 이체
+    # (처음으로 되돌아가는 배치에서도 앞 회차 항목의 해시는 그대로)
+    assert len(set(recorded)) < len(recorded)
+    assert added == len(set(cycles[:120]))
+    assert {t.key for t in feed.ring.latest(200)} == set(cycles[:120])